@@ -15,6 +15,8 @@ from supabase import create_client
 from dotenv import load_dotenv
 import os
 from datetime import datetime
+from bulk_loader import connect
+from division_update import normalize_mapping, apply_division_mapping
 
 load_dotenv()
 supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
@@ -103,25 +105,19 @@ print("\n" + "=" * 100)
 print("STEP 3: Create Correct Division Mapping")
 print("=" * 100)
 
-# Merge source mapping with current blocks
-df_blocks_fix = df_blocks[['id', 'block_code']].merge(
-    df_mapping[['KODE_BLOK', 'DIVISI']],
-    left_on='block_code',
-    right_on='KODE_BLOK',
-    how='left'
-)
+# Diff source mapping against current blocks (dry run - nothing written yet)
+db_conn = connect()
+fix_mapping = normalize_mapping(df_mapping, block_col='KODE_BLOK', division_col='DIVISI')
+preview = apply_division_mapping(fix_mapping, conn=db_conn, supabase=supabase, dry_run=True)
 
-# Count how many will be updated
-updates_needed = df_blocks_fix[df_blocks_fix['DIVISI'] != df_blocks.set_index('id').loc[df_blocks_fix['id'].values, 'division'].values]
-print(f"\nRecords needing update: {len(updates_needed)}")
+print(f"\nRecords needing update: {preview['changed']}")
+print(f"Already correct: {preview['unchanged']}")
+print(f"Blocks not in source mapping (left unchanged): {preview['unmapped']}")
 
-if len(updates_needed) > 0:
+if preview['changed'] > 0:
     print("\nSample updates:")
-    for idx in updates_needed.head(10).index:
-        old = df_blocks.loc[df_blocks['id'] == df_blocks_fix.loc[idx, 'id'], 'division'].values[0]
-        new = df_blocks_fix.loc[idx, 'DIVISI']
-        code = df_blocks_fix.loc[idx, 'block_code']
-        print(f"  {code}: {old} -> {new}")
+    for row in preview['changes'].head(10).itertuples(index=False):
+        print(f"  {row.block_code}: {row.old} -> {row.new}")
 
 # STEP 4: Execute fix  
 print("\n" + "=" * 100)
@@ -132,25 +128,11 @@ proceed = input("\n⚠️ This will UPDATE division data in Supabase. Proceed? (
 
 if proceed.lower() == 'yes':
     print("\nUpdating divisions...")
-    update_count = 0
-    error_count = 0
-    
-    for idx, row in df_blocks_fix.iterrows():
-        try:
-            result = supabase.table('blocks').update({
-                'division': row['DIVISI']
-            }).eq('id', row['id']).execute()
-            
-            update_count += 1
-            if update_count % 100 == 0:
-                print(f"  Updated {update_count} records...")
-        except Exception as e:
-            print(f"  ERROR updating block {row['block_code']}: {e}")
-            error_count += 1
+    result = apply_division_mapping(fix_mapping, conn=db_conn, supabase=supabase)
     
     print(f"\n✅ Update complete!")
-    print(f"  Updated: {update_count}")
-    print(f"  Errors: {error_count}")
+    print(f"  Updated: {result['changed']}")
+    print(f"  Unchanged: {result['unchanged']}")
     
     # STEP 5: Re-validate
     print("\n" + "=" * 100)
@@ -189,4 +171,7 @@ if proceed.lower() == 'yes':
 else:
     print("\n❌ Fix cancelled by user")
 
+if db_conn is not None:
+    db_conn.close()
+
 print(f"\nCompleted: {datetime.now()}")
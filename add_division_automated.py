@@ -13,7 +13,8 @@ from supabase import create_client
 from dotenv import load_dotenv
 import os
 import pandas as pd
-import time
+from bulk_loader import connect
+from division_update import load_division_mapping, apply_division_mapping, print_report
 
 # Load environment
 load_dotenv()
@@ -57,111 +58,40 @@ CREATE INDEX IF NOT EXISTS idx_blocks_division ON blocks(division);
 
 # Step 2: Load division mapping
 print('\nStep 2: Loading division mapping...')
-df_mapping = pd.read_csv('output/block_division_mapping.csv')
-
-# Remove duplicates - keep first occurrence
-df_mapping = df_mapping.drop_duplicates(subset=['block_code'], keep='first')
+df_mapping = load_division_mapping('output/block_division_mapping.csv')
 
 print(f'   Loaded {len(df_mapping)} unique block->division mappings')
 print(f'\nDivision breakdown:')
-for div in sorted(df_mapping['division'].unique()):
-    count = len(df_mapping[df_mapping['division'] == div])
+for div, count in df_mapping['division'].value_counts().sort_index().items():
     print(f'   {div}: {count} blocks')
 
-# Step 3: Get all blocks from Supabase
-print('\n\nStep 3: Fetching blocks from Supabase...')
-
-# Fetch in pages
-all_blocks = []
-page_size = 1000
-page = 0
-
-while True:
-    start = page * page_size
-    end = start + page_size - 1
-    
-    response = supabase.table('blocks').select('id, block_code').range(start, end).execute()
-    
-    if not response.data:
-        break
-    
-    all_blocks.extend(response.data)
-    
-    if len(response.data) < page_size:
-        break
-    
-    page += 1
-    print(f'   Fetched page {page} ({len(all_blocks)} blocks so far)...')
-
-blocks_db = pd.DataFrame(all_blocks)
-print(f'   Found {len(blocks_db)} blocks in database')
-
-# Step 4: Match and update
-print('\n\nStep 4: Matching blocks with divisions...')
-blocks_to_update = blocks_db.merge(
-    df_mapping[['block_code', 'division']],
-    on='block_code',
-    how='left'
-)
-
-blocks_with_division = blocks_to_update[blocks_to_update['division'].notna()]
-print(f'   {len(blocks_with_division)} blocks have division mapping')
-
-blocks_without = blocks_to_update[blocks_to_update['division'].isna()]
-if len(blocks_without) > 0:
-    print(f'   ⚠️  {len(blocks_without)} blocks have NO division (will be skipped)')
-    print(f'      Examples: {blocks_without["block_code"].head(5).tolist()}')
-
-# Step 5: Update in batches
-print('\n\nStep 5: Updating Supabase...')
-print(f'   Processing {len(blocks_with_division)} blocks in batches of 100')
+# Step 3-5: Match with database blocks and update in one batch
+# (set-based UPDATE over SUPABASE_DB_URL, else one REST update per division)
+print('\n\nStep 3: Updating Supabase...')
+db_conn = connect()
+try:
+    report = apply_division_mapping(df_mapping, conn=db_conn, supabase=supabase)
+except Exception as e:
+    print(f'   ❌ Division update failed: {e}')
+    exit(1)
+finally:
+    if db_conn is not None:
+        db_conn.close()
 
-batch_size = 100
-total_updated = 0
-errors = 0
-error_details = []
+print_report(report)
 
-for i in range(0, len(blocks_with_division), batch_size):
-    batch = blocks_with_division.iloc[i:i+batch_size]
-    
-    for _, row in batch.iterrows():
-        try:
-            result = supabase.table('blocks').update({
-                'division': row['division']
-            }).eq('id', row['id']).execute()
-            
-            total_updated += 1
-            
-            # Progress indicator
-            if total_updated % 50 == 0:
-                pct = (total_updated / len(blocks_with_division)) * 100
-                print(f'   Progress: {total_updated}/{len(blocks_with_division)} ({pct:.1f}%)')
-            
-            # Small delay to avoid rate limiting
-            if total_updated % 100 == 0:
-                time.sleep(0.5)
-                
-        except Exception as e:
-            errors += 1
-            error_details.append({
-                'block_code': row['block_code'],
-                'division': row['division'],
-                'error': str(e)
-            })
-            
-            if errors <= 5:  # Show first 5 errors
-                print(f'   ⚠️  Error updating {row["block_code"]}: {e}')
+if report['unmapped'] > 0:
+    print(f'\n   ⚠️  {report["unmapped"]} blocks have NO division (left unchanged)')
 
 print(f'\n✅ Update complete!')
-print(f'   Successfully updated: {total_updated} blocks')
-print(f'   Errors: {errors}')
+print(f'   Successfully updated: {report["changed"]} blocks')
 
-if error_details:
-    print(f'\n⚠️  Error details saved to: division_update_errors.csv')
-    pd.DataFrame(error_details).to_csv('division_update_errors.csv', index=False)
+if report['changed']:
+    report['changes'].to_csv('division_update_changes.csv', index=False)
+    print(f'   Changes saved to: division_update_changes.csv')
 
-# Step 6: Verify
-print('\n\nStep 6: Verifying update...')
+# Step 4: Verify
+print('\n\nStep 4: Verifying update...')
 
 # Get sample
 response = supabase.table('blocks').select('block_code, division').limit(10).execute()
@@ -0,0 +1,507 @@
+"""
+OFFLINE BENCHMARK SUITE
+=======================
+Purpose: Reproducible timings of the dashboard data path - loaders,
+         aggregations and the dashboard data layer - against a LOCAL Postgres
+         seeded from output/normalized_tables (or a synthetic_data.py dataset,
+         --data), instead of benchmark_performance.py's single time.time()
+         calls against the live Supabase project.
+
+Per dataset scale (1× = the real tables, 10× / 100× = synthetic copies of
+every block with their child rows, see scale_tables()):
+1. a database bench_x<scale> is seeded once with COPY (bulk_loader) and the
+   dashboard views are migrated (dashboard_views); it is re-seeded only when
+   the source CSVs change
+2. every benchmark runs `warmup` untimed + `iterations` timed rounds
+   (perf_counter) → p50 / p95 / min / max
+3. p50 is compared with the stored baseline; slower by more than
+   --tolerance (and more than NOISE_FLOOR_MS) is flagged as a regression and
+   the run exits with code 1
+
+REST code paths (fetch_table, dashboard_cache, dashboard_data via Supabase)
+run through pg_rest_client.LocalRestClient, a PostgREST stand-in; --latency
+adds a per-request round trip to mimic the cloud.
+
+Postgres: --db-url / BENCH_DB_URL, otherwise an embedded server from the
+optional `pgserver` package (pip install pgserver) in output/.cache/bench_pg.
+
+Output (output/benchmarks/):
+- results_<timestamp>.json   every run
+- baseline.json              written with --save-baseline; not shipped - timings
+                             are machine specific, so record it on the machine
+                             that runs the comparison (and commit it there).
+                             Without it the suite stops before running anything.
+
+Usage:
+    python benchmark_suite.py                          # scales 1, 10, 100
+    python benchmark_suite.py --scales 1,10 --iterations 10
+    python benchmark_suite.py --only aggregate         # benchmarks whose name contains this
+    python benchmark_suite.py --latency 30             # 30 ms per REST request
+    python benchmark_suite.py --save-baseline          # first run: store this run as the baseline
+    python benchmark_suite.py --data output/synthetic/b20000 --scales 1   # generated dataset
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import dashboard_metrics
+from bulk_loader import load_order, load_table
+from dashboard_cache import cached_tables, clear_cache
+from dashboard_data import division_gano, load_cube, top_performers
+from dashboard_views import migrate, refresh
+from gano_index import build_gano_index
+from kpi_cube import build_cube
+from monthly_store import build_store
+from pg_rest_client import LocalRestClient
+from supabase_fetch import fetch_table, fetch_tables
+
+BENCH_DIR = 'output/benchmarks'
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+PG_DATA_DIR = 'output/.cache/bench_pg'
+
+DEFAULT_SCALES = [1, 10, 100]
+WARMUP = 1
+ITERATIONS = 5
+REGRESSION_TOLERANCE = 0.25  # p50 slower than baseline by more than 25% ...
+NOISE_FLOOR_MS = 5.0         # ... and by more than 5 ms
+
+SEED_TABLES = ['estates', 'divisions', 'blocks', 'block_land_infrastructure', 'block_pest_disease',
+               'production_annual', 'production_monthly']
+REQUIRED_TABLES = ['estates', 'blocks', 'block_land_infrastructure', 'block_pest_disease', 'production_annual']
+CUBE_TABLES = ['production_annual', 'blocks', 'block_land_infrastructure', 'block_pest_disease']
+SCALE_VERSION = 1  # bump when scale_tables() changes, forces a re-seed
+
+
+# ============================================================================
+# DATASETS
+# ============================================================================
+
+def source_tables(data_dir=None):
+    """
+    Normalized tables from the phase 1-3 outputs, or from a synthetic_data.py
+    output directory (+ divisions derived from blocks.division when missing)
+    """
+    if data_dir:
+        from synthetic_data import table_paths
+        paths, hint = table_paths(data_dir), f"python synthetic_data.py --out {data_dir}"
+    else:
+        from phase4_integration import ALL_TABLES
+        paths, hint = ALL_TABLES, "python run_pipeline.py"
+
+    paths = {name: path for name, path in paths.items() if name in SEED_TABLES}
+    missing = [name for name in REQUIRED_TABLES if not os.path.exists(paths.get(name, ''))]
+    if missing:
+        raise FileNotFoundError(f"Missing normalized tables {missing} - run: {hint}")
+
+    tables = {name: pd.read_csv(path) for name, path in paths.items() if os.path.exists(path)}
+    stamp = {name: [path, os.path.getsize(path), os.path.getmtime(path)] for name, path in paths.items()
+             if os.path.exists(path)}
+    return with_divisions(tables), stamp
+
+
+def with_divisions(tables):
+    """divisions table + blocks.division_id, the way restructure_divisions.sql derives them"""
+    tables = dict(tables)
+    blocks = tables['blocks'].copy()
+    if 'divisions' in tables or 'division' not in blocks.columns:
+        return tables
+
+    codes = blocks[['division', 'estate_id']].dropna(subset=['division']).drop_duplicates('division')
+    divisions = pd.DataFrame({
+        'id': np.arange(1, len(codes) + 1),
+        'division_code': codes['division'].to_numpy(),
+        'division_name': [f"{code[:3]} Division {code[3:]}" for code in codes['division']],
+        'estate_id': codes['estate_id'].to_numpy(),
+    })
+    blocks['division_id'] = blocks['division'].map(dict(zip(divisions['division_code'], divisions['id'])))
+    tables['divisions'] = divisions
+    tables['blocks'] = blocks
+    return tables
+
+
+def scale_tables(tables, factor, seed=42):
+    """
+    factor × the blocks: copy k of every block gets new ids and the code
+    '<code>.<k>' (same estate prefix), its own division copies, and all of
+    its child rows with metrics scaled by a per-block factor ~ U(0.85, 1.15).
+    """
+    if factor <= 1:
+        return tables
+    rng = np.random.default_rng(seed)
+    blocks = tables['blocks']
+    block_offset = int(blocks['id'].max())
+    divisions = tables.get('divisions')
+    division_offset = int(divisions['id'].max()) if divisions is not None else 0
+
+    def copy_code(codes, k):
+        return codes if k == 0 else codes.astype(str) + f".{k}"
+
+    scaled = {name: [] for name in tables}
+    scaled['estates'] = [tables['estates']]
+    for k in range(factor):
+        if divisions is not None:
+            div = divisions.copy()
+            div['id'] += k * division_offset
+            div['division_code'] = copy_code(div['division_code'], k)
+            scaled['divisions'].append(div)
+
+        blk = blocks.copy()
+        blk['id'] += k * block_offset
+        blk['block_code'] = copy_code(blk['block_code'], k)
+        if 'division_id' in blk.columns:
+            blk['division_id'] += k * division_offset
+        if 'division' in blk.columns:
+            blk['division'] = copy_code(blk['division'], k)
+        scaled['blocks'].append(blk)
+
+        block_factor = pd.Series(rng.uniform(0.85, 1.15, len(blocks)) if k else np.ones(len(blocks)),
+                                 index=blocks['id'].to_numpy())
+        for name, df in tables.items():
+            if name in ('estates', 'divisions', 'blocks'):
+                continue
+            child = df.copy()
+            factor_per_row = child['block_id'].map(block_factor).fillna(1).to_numpy()
+            if 'id' in child.columns:
+                child['id'] += k * int(df['id'].max())
+            child['block_id'] += k * block_offset
+            if 'block_code' in child.columns:
+                child['block_code'] = copy_code(child['block_code'], k)
+            for col in child.columns:
+                # Volumes scale with the block; ids, years, percentages and rates stay as they are
+                if child[col].dtype.kind == 'f' and not any(t in col for t in ('id', 'year', 'pct', 'persen', 'rate')):
+                    child[col] = child[col] * factor_per_row
+            scaled[name].append(child)
+
+    return {name: pd.concat(parts, ignore_index=True) for name, parts in scaled.items() if parts}
+
+
+# ============================================================================
+# POSTGRES
+# ============================================================================
+
+def start_postgres(db_url=None):
+    """Base connection URL: --db-url / BENCH_DB_URL, else an embedded pgserver instance"""
+    db_url = db_url or os.getenv('BENCH_DB_URL')
+    if db_url:
+        return db_url
+    try:
+        import pgserver
+    except ImportError:
+        raise RuntimeError("No Postgres - set BENCH_DB_URL or pip install pgserver")
+    os.makedirs(PG_DATA_DIR, exist_ok=True)
+    return pgserver.get_server(PG_DATA_DIR).get_uri()
+
+
+def dataset_url(base_url, scale):
+    """Connection string of database bench_x<scale> (created when missing)"""
+    import psycopg
+    from psycopg.conninfo import make_conninfo
+
+    name = f"bench_x{scale}"
+    with psycopg.connect(base_url, autocommit=True) as conn:
+        exists = conn.execute("SELECT 1 FROM pg_database WHERE datname = %s", (name,)).fetchone()
+        if not exists:
+            conn.execute(f'CREATE DATABASE "{name}"')
+    return make_conninfo(base_url, dbname=name)
+
+
+def _pg_type(series):
+    return {'i': 'BIGINT', 'u': 'BIGINT', 'f': 'NUMERIC', 'b': 'BOOLEAN'}.get(series.dtype.kind, 'TEXT')
+
+
+def seed_database(url, tables, fingerprint):
+    """Create + COPY the tables and migrate the dashboard views, unless this fingerprint is already loaded"""
+    import psycopg
+
+    with psycopg.connect(url) as conn:
+        with conn.cursor() as cur:
+            cur.execute("CREATE TABLE IF NOT EXISTS bench_meta (fingerprint TEXT, seeded_at TIMESTAMP)")
+            cur.execute("SELECT fingerprint FROM bench_meta")
+            row = cur.fetchone()
+        conn.commit()
+        if row and row[0] == fingerprint:
+            return False
+
+        with conn.cursor() as cur:
+            cur.execute("DROP SCHEMA public CASCADE")
+            cur.execute("CREATE SCHEMA public")
+            for name in load_order(tables):
+                df = tables[name]
+                columns = ', '.join(f'"{col}" {_pg_type(df[col])}' + (' PRIMARY KEY' if col == 'id' else '')
+                                    for col in df.columns)
+                cur.execute(f'CREATE TABLE "{name}" ({columns})')
+        conn.commit()
+
+        for name in load_order(tables):
+            result = load_table(name, tables[name], conn=conn, if_exists='append')
+            if result['status'] != '✅':
+                raise RuntimeError(f"Seeding {name} failed: {result['error']}")
+
+        with conn.cursor() as cur:
+            # The indexes create_tables_final.sql defines for the dashboard's joins
+            for name, df in tables.items():
+                if 'block_id' in df.columns:
+                    cur.execute(f'CREATE INDEX ON "{name}" (block_id)')
+            cur.execute("CREATE INDEX ON blocks (block_code)")
+            cur.execute("ANALYZE")
+            cur.execute("CREATE TABLE bench_meta (fingerprint TEXT, seeded_at TIMESTAMP)")
+            cur.execute("INSERT INTO bench_meta VALUES (%s, NOW())", (fingerprint,))
+        conn.commit()
+        migrate(conn, force=True)
+    return True
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def _rows(result):
+    if isinstance(result, dict) and 'cube' in result:
+        return len(result['cube'])
+    if isinstance(result, dict) and 'values' in result:
+        return int(sum(v.size for v in result['values'].values()))
+    if isinstance(result, dict):
+        return int(sum(len(v) for v in result.values() if hasattr(v, '__len__')))
+    return len(result) if hasattr(result, '__len__') else 0
+
+
+def measure(func, warmup=WARMUP, iterations=ITERATIONS):
+    """Untimed warmup rounds, then timed rounds → stats dict (ms)"""
+    result = None
+    for _ in range(warmup):
+        result = func()
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+    times = np.array(times)
+    return {
+        'p50_ms': float(np.percentile(times, 50)),
+        'p95_ms': float(np.percentile(times, 95)),
+        'min_ms': float(times.min()),
+        'max_ms': float(times.max()),
+        'rows': _rows(result),
+    }
+
+
+def benchmarks(conn, client, tables, cache_dir):
+    """[(name, func)] - loaders over REST, in-memory aggregations, dashboard data layer"""
+    cube_frames = {name: tables[name] for name in CUBE_TABLES}
+
+    def cold_cache():
+        clear_cache(cache_dir)
+        return cached_tables(client, CUBE_TABLES, cache_dir=cache_dir)
+
+    tests = [
+        # Loaders: paginated REST reads and the dashboards' disk cache
+        ('loader.fetch_table.production_annual', lambda: fetch_table(client, 'production_annual')),
+        ('loader.fetch_tables.cube_tables', lambda: fetch_tables(client, {name: {} for name in CUBE_TABLES})),
+        ('loader.cached_tables.cold', cold_cache),
+        # probe_interval=0: every call probes Supabase, then serves memory/disk
+        ('loader.cached_tables.warm', lambda: cached_tables(client, CUBE_TABLES, probe_interval=0, cache_dir=cache_dir)),
+
+        # Aggregations on already loaded frames (client-side fallback path)
+        ('aggregate.kpi_cube', lambda: build_cube(cube_frames['production_annual'], cube_frames['blocks'],
+                                                  cube_frames['block_land_infrastructure'],
+                                                  cube_frames['block_pest_disease'])),
+        ('aggregate.gano_index', lambda: build_gano_index(tables['block_pest_disease'], tables['blocks'],
+                                                          tables['divisions'], tables['estates'])),
+
+        # Dashboard data layer: server-side views over SQL and over REST
+        ('data.refresh_views.sql', lambda: refresh(conn)),
+        ('data.load_cube.sql', lambda: load_cube(conn)),
+        ('data.load_cube.rest', lambda: load_cube(client)),
+        ('data.load_cube_kpis_only.rest', lambda: load_cube(client, with_performers=False)),
+        ('data.top_performers.rpc', lambda: top_performers(client)),
+        ('data.division_gano.rest', lambda: division_gano(client)),
+    ]
+    if 'production_monthly' in tables:
+        tests.insert(6, ('aggregate.monthly_store',
+                         lambda: build_store(tables['production_monthly'], tables['blocks'])))
+    return tests
+
+
+def run_scale(base_url, source, stamp, scale, args):
+    import psycopg
+
+    print("\n" + "=" * 100)
+    print(f"SCALE {scale}×")
+    print("=" * 100)
+
+    tables = scale_tables(source, scale)
+    fingerprint = json.dumps({'source': stamp, 'scale': scale, 'version': SCALE_VERSION}, sort_keys=True)
+    url = dataset_url(base_url, scale)
+
+    start = time.time()
+    seeded = seed_database(url, tables, fingerprint)
+    n_rows = sum(len(df) for df in tables.values())
+    print(f"{'✅ Seeded' if seeded else '♻️  Reusing'} bench_x{scale}: {len(tables['blocks']):,} blocks, "
+          f"{n_rows:,} rows ({time.time() - start:.1f}s)")
+
+    cache_dir = tempfile.mkdtemp(prefix='bench_cache_')
+    client = LocalRestClient(url, latency_ms=args.latency)
+    results = {}
+    try:
+        with psycopg.connect(url) as conn:
+            for name, func in benchmarks(conn, client, tables, cache_dir):
+                if args.only and args.only not in name:
+                    continue
+                print(f"  ⏱️  {name:45s}", end=' ', flush=True)
+                try:
+                    stats = measure(func, args.warmup, args.iterations)
+                except Exception as e:
+                    print(f"❌ {str(e)[:60]}")
+                    continue
+                results[name] = stats
+                print(f"p50 {stats['p50_ms']:9.1f} ms   p95 {stats['p95_ms']:9.1f} ms   {stats['rows']:>10,} rows")
+    finally:
+        client.close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+# ============================================================================
+# BASELINES & REPORT
+# ============================================================================
+
+def load_baseline(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('results', {})
+
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """{scale: {name: status}} - 'regression' | 'improved' | 'ok' | 'new'"""
+    statuses = {}
+    for scale, tests in results.items():
+        for name, stats in tests.items():
+            base = baseline.get(scale, {}).get(name)
+            if base is None:
+                status = 'new'
+            elif (stats['p50_ms'] > base['p50_ms'] * (1 + tolerance)
+                  and stats['p50_ms'] - base['p50_ms'] > NOISE_FLOOR_MS):
+                status = 'regression'
+            elif stats['p50_ms'] < base['p50_ms'] * (1 - tolerance):
+                status = 'improved'
+            else:
+                status = 'ok'
+            statuses.setdefault(scale, {})[name] = status
+    return statuses
+
+
+def print_report(results, baseline, statuses):
+    icons = {'regression': '❌ REGRESSION', 'improved': '🚀 improved', 'ok': '✅', 'new': '🆕 no baseline'}
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK SUMMARY")
+    print("=" * 100)
+    print(f"\n{'Scale':>6s}  {'Benchmark':45s} {'p50 ms':>10s} {'p95 ms':>10s} {'Base p50':>10s} {'Δ':>8s}  Status")
+    print("─" * 100)
+    for scale, tests in results.items():
+        for name, stats in tests.items():
+            base = baseline.get(scale, {}).get(name)
+            base_text = f"{base['p50_ms']:10.1f}" if base else f"{'-':>10s}"
+            delta = f"{(stats['p50_ms'] / base['p50_ms'] - 1) * 100:+7.0f}%" if base and base['p50_ms'] else f"{'-':>8s}"
+            print(f"{scale:>6s}  {name:45s} {stats['p50_ms']:10.1f} {stats['p95_ms']:10.1f} {base_text} {delta}  "
+                  f"{icons[statuses[scale][name]]}")
+
+    # Scaling: how p50 grows with the data (1.0 per 1× = linear)
+    scales = sorted(results, key=lambda s: int(s.lstrip('x')))
+    if len(scales) > 1 and scales[0] == 'x1':
+        print("\nScaling vs 1× (p50 ratio; linear = the data factor)")
+        print(f"{'Benchmark':45s}" + ''.join(f"{s:>10s}" for s in scales[1:]))
+        for name, stats in results['x1'].items():
+            ratios = [results[s][name]['p50_ms'] / stats['p50_ms'] if name in results[s] and stats['p50_ms'] else np.nan
+                      for s in scales[1:]]
+            print(f"{name:45s}" + ''.join(f"{r:9.1f}×" if np.isfinite(r) else f"{'-':>10s}" for r in ratios))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite (local Postgres)')
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help='Comma separated data scales, e.g. 1,10,100')
+    parser.add_argument('--iterations', type=int, default=ITERATIONS)
+    parser.add_argument('--warmup', type=int, default=WARMUP)
+    parser.add_argument('--latency', type=float, default=0, help='Simulated ms per REST request')
+    parser.add_argument('--only', help='Only benchmarks whose name contains this')
+    parser.add_argument('--data', help='synthetic_data.py output directory instead of output/normalized_tables')
+    parser.add_argument('--db-url', help='Postgres to use (default: BENCH_DB_URL or embedded pgserver)')
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help='Allowed p50 slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    args = parser.parse_args()
+
+    # Benchmark spans must not end up in the dashboards' production metrics
+    dashboard_metrics.ENABLED = False
+
+    print("=" * 100)
+    print("OFFLINE BENCHMARK SUITE")
+    print("=" * 100)
+    print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | {args.iterations} iterations + {args.warmup} warmup"
+          f" | REST latency {args.latency:g} ms")
+
+    # Without a baseline every benchmark is 'new' and nothing could regress
+    if not args.save_baseline and not load_baseline():
+        print(f"❌ No baseline at {BASELINE_FILE} - record one first: python benchmark_suite.py --save-baseline")
+        exit(2)
+
+    try:
+        source, stamp = source_tables(args.data)
+        base_url = start_postgres(args.db_url)
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"❌ {e}")
+        exit(2)
+
+    results = {}
+    for scale in [int(s) for s in args.scales.split(',') if s.strip()]:
+        results[f"x{scale}"] = run_scale(base_url, source, stamp, scale, args)
+
+    baseline = load_baseline()
+    statuses = compare(results, baseline, args.tolerance)
+    print_report(results, baseline, statuses)
+
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'latency_ms': args.latency,
+        'results': results,
+    }
+    results_file = os.path.join(BENCH_DIR, f"results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(results_file, 'w', encoding='utf-8') as f:
+        json.dump(run, f, indent=2)
+    print(f"\n💾 Results: {results_file}")
+
+    if args.save_baseline:
+        # Merge, so a partial run (--only / --scales) keeps the other baselines
+        merged = load_baseline()
+        for scale, tests in results.items():
+            merged.setdefault(scale, {}).update(tests)
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(dict(run, results=merged), f, indent=2)
+        print(f"💾 Baseline saved: {BASELINE_FILE}")
+
+    regressions = [(scale, name) for scale, tests in statuses.items()
+                   for name, status in tests.items() if status == 'regression']
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s): " + ', '.join(f"{n} ({s})" for s, n in regressions))
+        exit(1)
+    print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+BLOCK CONTENT HASHES
+====================
+Purpose: Know which blocks a source update actually touched. Every data row
+         of every source sheet is hashed, the row hashes are combined per
+         (block_code, sheet) and kept between runs, so
+         `run_pipeline.py --incremental` reprocesses and re-uploads only the
+         blocks whose rows changed (e.g. the AME 2023 corrections) instead
+         of all of them.
+
+Sources (SOURCES):
+- data_gabungan.xlsx [Lembar1]                      block column K001 (code row)
+- Realisasi vs Potensi PT SR.xlsx [Inti] / [Plasma] block column 'blok'
+- normalized_production_data_COMPLETE.csv           block column block_code
+
+Hashing:
+- Sheets are read with sheet_layout.read_with_layout - the same cached grid
+  the phases read afterwards, so a changed workbook is parsed only once.
+- One uint64 per row (pd.util.hash_pandas_object; numbers as float64 so 5
+  and 5.0 hash alike), mixed with the row's occurrence number inside its
+  block and XOR-combined per block. A block listed twice (F005A) changes
+  when either row changes or the rows swap.
+- A source file with the same SHA-256 as last time is not read at all.
+- The header fingerprint (sheet layout fingerprint / CSV column list) is
+  kept as well. When it changes, columns may have moved and block hashes
+  are not comparable - the caller has to run everything.
+
+State (output/.cache/block_hashes.json):
+- sources         per source: path, digest, header, hashed_at, blocks {code: hash}
+- pending_upload  block codes rebuilt locally but not uploaded yet
+- pending_full    a full rebuild (ids may be renumbered) is not uploaded yet -
+                  the next upload has to replace every block
+
+Usage:
+    python block_hashes.py              # blocks changed since the last committed run
+    python block_hashes.py --commit     # accept the current sources as the baseline
+
+    from block_hashes import scan_sources, diff_sources
+    changes = diff_sources(load_state()['sources'], scan_sources(load_state()))
+    changes['blocks']                    # {'A001A', 'F005A', ...}
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from excel_cache import file_digest
+
+STATE_FILE = 'output/.cache/block_hashes.json'
+STATE_VERSION = 1  # bump when the hashing rules change → every block counts as changed once
+
+GABUNGAN_XLSX = 'source/data_gabungan.xlsx'
+REALISASI_XLSX = 'source/Realisasi vs Potensi PT SR.xlsx'
+COMPLETE_CSV = 'output/normalized_production_data_COMPLETE.csv'
+
+SOURCES = [
+    {'name': 'data_gabungan', 'path': GABUNGAN_XLSX, 'sheet': 'Lembar1',
+     'names': 'codes', 'block_column': 'K001'},
+    {'name': 'realisasi_inti', 'path': REALISASI_XLSX, 'sheet': 'Real VS Potensi Inti',
+     'names': 'columns', 'block_column': 'blok'},
+    {'name': 'realisasi_plasma', 'path': REALISASI_XLSX, 'sheet': 'Real VS Potensi Plasma',
+     'names': 'columns', 'block_column': 'blok'},
+    {'name': 'production_complete', 'path': COMPLETE_CSV, 'block_column': 'block_code'},
+]
+
+
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    return state if state.get('version') == STATE_VERSION else {}
+
+
+def save_state(state, path=STATE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    state = dict(state, version=STATE_VERSION)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def hash_blocks(df, block_column):
+    """{block_code: 16-hex hash of all its rows}; rows without a block code are ignored"""
+    codes = df[block_column].where(df[block_column].notna(), None).astype(object)
+    codes = codes.map(lambda v: str(v).strip() if v is not None else '')
+    keep = (codes != '').to_numpy()
+    if not keep.any():
+        return {}
+
+    values = df.loc[keep].reset_index(drop=True)
+    codes = codes[keep].reset_index(drop=True)
+    # Numbers as float64, everything else as text: a column whose inferred
+    # dtype flips (int → float) must not change every row's hash
+    values = pd.DataFrame({
+        i: values[col].astype('float64') if pd.api.types.is_numeric_dtype(values[col]) else values[col].astype(str)
+        for i, col in enumerate(values.columns)
+    })
+    row_hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+    occurrence = codes.groupby(codes, sort=False).cumcount().to_numpy()
+    mixed = pd.util.hash_pandas_object(
+        pd.DataFrame({'row': row_hashes, 'n': occurrence}), index=False).to_numpy()
+
+    # XOR per block: sort by block, reduce each contiguous run
+    block_codes, uniques = pd.factorize(codes)
+    order = np.argsort(block_codes, kind='stable')
+    starts = np.flatnonzero(np.r_[True, np.diff(block_codes[order]) != 0])
+    combined = np.bitwise_xor.reduceat(mixed[order], starts)
+    return {code: f"{h:016x}" for code, h in zip(uniques[block_codes[order][starts]], combined)}
+
+
+def read_source_frame(source):
+    """(DataFrame of the data rows, header fingerprint) of one source"""
+    if source['path'].endswith('.csv'):
+        df = pd.read_csv(source['path'])
+        header = hashlib.sha256(json.dumps(list(df.columns)).encode()).hexdigest()[:16]
+        return df, header
+
+    from sheet_layout import read_with_layout
+    df, layout = read_with_layout(source['path'], source['sheet'], names=source.get('names', 'columns'))
+    return df, layout['fingerprint']
+
+
+def scan_sources(state=None, sources=SOURCES):
+    """
+    Current {source name: record} (see module docstring). Records of files
+    whose digest matches `state` are reused without reading the file;
+    missing files are left out.
+    """
+    saved = (state or {}).get('sources', {})
+    current = {}
+    for source in sources:
+        if not os.path.exists(source['path']):
+            continue
+        digest = file_digest(source['path'])
+        previous = saved.get(source['name'])
+        if previous and previous.get('digest') == digest:
+            current[source['name']] = previous
+            continue
+
+        df, header = read_source_frame(source)
+        if source['block_column'] not in df.columns:
+            raise ValueError(f"{source['path']}: block column '{source['block_column']}' not found")
+        current[source['name']] = {
+            'path': source['path'],
+            'digest': digest,
+            'header': header,
+            'hashed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'blocks': hash_blocks(df, source['block_column']),
+        }
+    return current
+
+
+def diff_sources(saved, current):
+    """
+    Compare two {source name: record} snapshots. Returns
+    {'full': reason or None, 'sources': {name: {'added', 'changed', 'removed'}}, 'blocks': set}
+    where 'blocks' is every block code added, changed or removed in any source.
+    """
+    result = {'full': None, 'sources': {}, 'blocks': set()}
+    if not saved:
+        result['full'] = 'no recorded block hashes yet'
+        return result
+
+    for name in sorted(set(saved) | set(current)):
+        if name not in current:
+            result['full'] = f"source '{name}' is missing"
+            continue
+        if name not in saved:
+            result['full'] = f"source '{name}' is new"
+            continue
+        if saved[name]['header'] != current[name]['header']:
+            result['full'] = f"header layout of '{name}' changed"
+            continue
+
+        old, new = saved[name]['blocks'], current[name]['blocks']
+        changes = {
+            'added': sorted(set(new) - set(old)),
+            'changed': sorted(code for code in set(new) & set(old) if new[code] != old[code]),
+            'removed': sorted(set(old) - set(new)),
+        }
+        result['sources'][name] = changes
+        for codes in changes.values():
+            result['blocks'].update(codes)
+    return result
+
+
+def commit(current, pending_upload=(), pending_full=False, path=STATE_FILE):
+    """Store `current` as the baseline for the next diff"""
+    save_state({'sources': current, 'pending_upload': sorted(set(pending_upload)), 'pending_full': pending_full,
+                'committed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}, path)
+
+
+def print_changes(changes):
+    if changes['full']:
+        print(f"⚠️  Full run needed: {changes['full']}")
+        return
+    for name, source_changes in changes['sources'].items():
+        counts = ', '.join(f"{len(codes)} {kind}" for kind, codes in source_changes.items())
+        print(f"  {name:22s} {counts}")
+        for kind, codes in source_changes.items():
+            if codes:
+                print(f"    {kind:8s} {', '.join(codes[:10])}{' ...' if len(codes) > 10 else ''}")
+    print(f"\n📦 Changed blocks: {len(changes['blocks'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show which blocks changed in the source files')
+    parser.add_argument('--commit', action='store_true', help='Accept the current sources as the baseline')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BLOCK CONTENT HASHES")
+    print("=" * 80)
+
+    state = load_state()
+    current = scan_sources(state)
+    print_changes(diff_sources(state.get('sources'), current))
+    if state.get('pending_upload'):
+        print(f"⬆️  Not uploaded yet: {len(state['pending_upload'])} blocks")
+
+    if args.commit:
+        commit(current, state.get('pending_upload', []), state.get('pending_full', False))
+        print(f"✅ Baseline saved: {STATE_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,7 @@
 CHECK AME 2023 BLOCKS IN SUPABASE
 """
 
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("="*80)
 print("CHECKING AME 2023 BLOCKS IN SUPABASE")
@@ -16,26 +10,12 @@ print("="*80)
 
 # Load production data
 print("\nLoading production_annual data...")
-all_prod = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_prod.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df_prod = pd.DataFrame(all_prod)
+df_prod = read_table('production_annual')
 print(f"Total production records: {len(df_prod)}")
 
 # Load blocks
 print("Loading blocks table...")
-blocks_data = supabase.table('blocks').select('*').execute()
-df_blocks = pd.DataFrame(blocks_data.data)
+df_blocks = read_table('blocks')
 print(f"Total blocks in database: {len(df_blocks)}")
 
 # Merge to get block codes
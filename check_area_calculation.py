@@ -1,34 +1,15 @@
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("CHECKING TOTAL AREA CALCULATION")
 print("="*70)
 
 # Load production data
-all_data = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_data.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df_prod = pd.DataFrame(all_data)
+df_prod = read_table('production_annual')
 print(f"\n1. Production records: {len(df_prod)}")
 print(f"   Years: {sorted(df_prod['year'].unique())}")
 
 # Load infrastructure
-df_infra = pd.DataFrame(supabase.table('block_land_infrastructure').select('*').execute().data)
+df_infra = read_table('block_land_infrastructure')
 print(f"\n2. Infrastructure records: {len(df_infra)}")
 
 # Merge
@@ -75,7 +56,7 @@ print("CORRECT TOTAL AREA BY ESTATE:")
 print("="*70)
 
 # Load blocks to get estate mapping
-df_blocks = pd.DataFrame(supabase.table('blocks').select('*').execute().data)
+df_blocks = read_table('blocks')
 df_full = df_infra.merge(df_blocks[['id', 'block_code']], left_on='block_id', right_on='id', how='left')
 
 # Extract estate code
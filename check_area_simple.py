@@ -1,16 +1,10 @@
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("AREA CALCULATION CHECK")
 print("="*70)
 
 # Method 1: Direct from infrastructure (CORRECT)
-df_infra = pd.DataFrame(supabase.table('block_land_infrastructure').select('*').execute().data)
+df_infra = read_table('block_land_infrastructure')
 total_area_correct = df_infra['total_luas_sd_2025_ha'].sum()
 unique_blocks = len(df_infra)
 
@@ -20,20 +14,7 @@ print(f"  Unique blocks: {unique_blocks}")
 print(f"  Total Area (SD 2025): {total_area_correct:,.2f} Ha")
 
 # Method 2: What dashboard currently does (merge with production - WRONG if not deduped)
-all_data = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_data.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df_prod = pd.DataFrame(all_data)
+df_prod = read_table('production_annual')
 df_merged = df_prod.merge(df_infra[['block_id', 'total_luas_sd_2025_ha']], on='block_id', how='left')
 
 total_area_if_sum_all = df_merged['total_luas_sd_2025_ha'].sum()
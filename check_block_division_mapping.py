@@ -1,20 +1,12 @@
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-import pandas as pd
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
+from snapshot_store import read_table
 
 print("BLOCK-DIVISION MAPPING STATUS")
 print("=" * 80)
 
 # Get blocks and divisions
-blocks = supabase.table('blocks').select('id, block_code, division_id').execute()
-df_blocks = pd.DataFrame(blocks.data)
+df_blocks = read_table('blocks')[['id', 'block_code', 'division_id']]
 
-divisions = supabase.table('divisions').select('*').execute()
-df_divs = pd.DataFrame(divisions.data)
+df_divs = read_table('divisions')
 
 # Stats
 total_blocks = len(df_blocks)
@@ -3,13 +3,7 @@ CHECK PROPER ESTATE RELATIONSHIP
 Using: blocks -> division -> estate
 """
 
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("="*80)
 print("CHECKING DATABASE STRUCTURE: Estate -> Division -> Blocks")
@@ -19,8 +13,7 @@ print("="*80)
 print("\nLoading tables...")
 
 # Blocks table
-blocks_data = supabase.table('blocks').select('*').execute()
-df_blocks = pd.DataFrame(blocks_data.data)
+df_blocks = read_table('blocks')
 print(f"  Blocks: {len(df_blocks)}")
 print(f"  Columns: {df_blocks.columns.tolist()}")
 
@@ -30,8 +23,7 @@ if 'division' in df_blocks.columns or 'division_id' in df_blocks.columns:
     
     # Check divisions table
     try:
-        divisions_data = supabase.table('divisions').select('*').execute()
-        df_divisions = pd.DataFrame(divisions_data.data)
+        df_divisions = read_table('divisions')
         print(f"\n  Divisions table: {len(df_divisions)}")
         print(f"  Columns: {df_divisions.columns.tolist()}")
         
@@ -48,8 +40,7 @@ else:
 
 # Check estates table
 try:
-    estates_data = supabase.table('estates').select('*').execute()
-    df_estates = pd.DataFrame(estates_data.data)
+    df_estates = read_table('estates')
     print(f"\n  Estates table: {len(df_estates)}")
     print(f"  Columns: {df_estates.columns.tolist()}")
     print("\n  Sample estates:")
@@ -1,10 +1,5 @@
 import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("CHECKING 60 EXTRA BLOCKS IN SUPABASE")
 print("="*60)
@@ -19,22 +14,8 @@ excel_blocks = set(df_excel['BLOCK'].unique())
 print(f"\nExcel blocks: {len(excel_blocks)}")
 
 # Load Supabase
-all_prod = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_prod.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df_prod = pd.DataFrame(all_prod)
-blocks_data = supabase.table('blocks').select('*').execute()
-df_blocks = pd.DataFrame(blocks_data.data)
+df_prod = read_table('production_annual')
+df_blocks = read_table('blocks')
 
 df = df_prod.merge(df_blocks[['id', 'block_code']], left_on='block_id', right_on='id', suffixes=('', '_b'), how='left')
 df_ame = df[(df['year'] == 2023) & (df['block_code'].str[0].isin(['A', 'B', 'C', 'E', 'F']))]
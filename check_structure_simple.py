@@ -1,24 +1,16 @@
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("CHECKING DATABASE STRUCTURE")
 print("="*60)
 
 # Blocks
-blocks_data = supabase.table('blocks').select('*').execute()
-df_blocks = pd.DataFrame(blocks_data.data)
+df_blocks = read_table('blocks')
 print(f"\nBlocks table: {len(df_blocks)}")
 print(f"Columns: {df_blocks.columns.tolist()}")
 
 # Divisions
 try:
-    divisions_data = supabase.table('divisions').select('*').execute()
-    df_divisions = pd.DataFrame(divisions_data.data)
+    df_divisions = read_table('divisions')
     print(f"\nDivisions table: {len(df_divisions)}")
     print(f"Columns: {df_divisions.columns.tolist()}")
     print("\nSample:")
@@ -29,8 +21,7 @@ except Exception as e:
 
 # Estates
 try:
-    estates_data = supabase.table('estates').select('*').execute()
-    df_estates = pd.DataFrame(estates_data.data)
+    df_estates = read_table('estates')
     print(f"\nEstates table: {len(df_estates)}")
     print(f"Columns: {df_estates.columns.tolist()}")
     print("\nAll estates:")
@@ -0,0 +1,209 @@
+"""
+COLUMN SCHEMA REGISTRY
+======================
+Purpose: One versioned definition of the data_gabungan.xlsx code columns
+         (K001/K002/NOMOR, C001-C056, P001-P115) shared by every script,
+         instead of each script rebuilding code → name lookups from
+         output/column_name_mapping_fixed.csv.
+
+column_registry.csv (first line carries the version):
+- code          K001 / C019 / P089 (the code row of data_gabungan.xlsx)
+- excel_column  source column letter in sheet Lembar1 (C019 = W, P089 = EU)
+- name          unique meaningful name (realisasi_tanam_komposisi_pokok_2009,
+                real_ton_2023, ...)
+- legacy_name   name from column_name_mapping_fixed.csv (may repeat - 'sisip',
+                'ton'); still written to normalized_production_data_COMPLETE.csv
+                because phase1.5-3 select its columns by those names
+- aliases       other spellings found in intermediate CSVs ('|'-separated)
+- dtype / unit  pandas dtype (float64 / string) and measurement unit
+- table         target Supabase table ('' = reference only, not loaded)
+
+Usage:
+    from column_registry import apply_registry, read_source, usecols
+
+    df, unmapped = apply_registry(df)                    # one rename + one astype
+    df = read_source(table='production_annual', skiprows=10)   # only the columns needed
+    usecols(table='block_pest_disease')                  # 'BD:BG'
+
+    python column_registry.py                # summary per table
+    python column_registry.py --table production_annual
+"""
+
+import argparse
+import os
+import re
+
+import pandas as pd
+
+from excel_cache import excel_col_to_index, read_columns_cached
+
+REGISTRY_FILE = 'column_registry.csv'
+SOURCE_FILE = 'source/data_gabungan.xlsx'
+SOURCE_SHEET = 'Lembar1'
+
+_VERSION_RE = re.compile(r'version:\s*(\S+)')
+_cache = {}
+
+
+def load_registry(path=REGISTRY_FILE):
+    """Registry as a DataFrame (read once per file version); version in .attrs['version']"""
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key not in _cache:
+        with open(path, 'r', encoding='utf-8') as f:
+            first_line = f.readline()
+        match = _VERSION_RE.search(first_line)
+
+        registry = pd.read_csv(path, comment='#', dtype=str, keep_default_na=False)
+        if not registry['name'].is_unique:
+            dupes = registry.loc[registry['name'].duplicated(), 'name'].tolist()
+            raise ValueError(f"{path}: duplicate names {dupes}")
+
+        registry['position'] = registry['excel_column'].map(excel_col_to_index)
+        registry.attrs['version'] = match.group(1) if match else None
+        _cache.clear()
+        _cache[key] = registry
+    return _cache[key]
+
+
+def select(registry=None, table=None, codes=None):
+    """Registry rows for one target table and/or a list of codes"""
+    registry = load_registry() if registry is None else registry
+    mask = pd.Series(True, index=registry.index)
+    if table is not None:
+        tables = [table] if isinstance(table, str) else list(table)
+        mask &= registry['table'].isin(tables)
+    if codes is not None:
+        mask &= registry['code'].isin([c.upper() for c in codes])
+    return registry[mask]
+
+
+def _dedupe(names):
+    """Names as pandas labels duplicated columns on read: sisip, sisip.1, sisip.2 ..."""
+    seen = {}
+    labels = []
+    for name in names:
+        count = seen.get(name, 0)
+        labels.append(name if count == 0 else f"{name}.{count}")
+        seen[name] = count + 1
+    return labels
+
+
+def rename_map(registry=None, target='name', table=None, codes=None):
+    """
+    {existing column label: target name} covering every spelling a column
+    is found under: code (K001 / k001), duplicate-suffixed legacy name
+    ('sisip.3'), alias and source position (header=None reads).
+    """
+    registry = load_registry() if registry is None else registry
+    rows = select(registry, table, codes)
+
+    mapping = dict(zip(rows['name'], rows[target]))  # already renamed → idempotent
+    legacy = pd.Series(_dedupe(registry['legacy_name'].str.lower()), index=registry.index)
+    for labels in (legacy[rows.index], rows['position']):
+        mapping.update(zip(labels, rows[target]))
+    aliases = rows['aliases'].str.split('|').explode()
+    aliases = aliases[aliases != '']
+    mapping.update(zip(aliases, rows.loc[aliases.index, target]))
+    mapping.update(zip(rows['code'].str.lower(), rows[target]))
+    mapping.update(zip(rows['code'], rows[target]))
+    return mapping
+
+
+def dtype_map(registry=None, target='name', table=None, codes=None):
+    rows = select(registry, table, codes)
+    return dict(zip(rows[target], rows['dtype']))
+
+
+def usecols(registry=None, table=None, codes=None):
+    """Excel column letters for read_excel(usecols=...), consecutive runs collapsed: 'A:C,EU:FU'"""
+    rows = select(registry, table, codes).sort_values('position')
+    parts = []
+    run = []
+    for position, letter in zip(rows['position'], rows['excel_column']):
+        if run and position != run[-1][0] + 1:
+            parts.append(run)
+            run = []
+        run.append((position, letter))
+    if run:
+        parts.append(run)
+    return ','.join(r[0][1] if len(r) == 1 else f"{r[0][1]}:{r[-1][1]}" for r in parts)
+
+
+def apply_registry(df, registry=None, target='name', table=None, codes=None):
+    """
+    Rename every known column and cast it to its registry dtype in one pass.
+
+    Columns are recognised by code, legacy name or source position; other
+    columns are kept as they are. Returns (DataFrame, unmapped column list).
+    """
+    registry = load_registry() if registry is None else registry
+    mapping = rename_map(registry, target, table, codes)
+    dtypes = dtype_map(registry, target, table, codes)
+
+    def lookup(col):
+        if col in mapping:
+            return mapping[col]
+        return mapping.get(col.lower()) if isinstance(col, str) else None
+
+    original = list(df.columns)
+    targets = [lookup(col) for col in original]
+    unmapped = [col for col, name in zip(original, targets) if name is None]
+
+    # Work on positions so duplicate labels (legacy names repeat) are safe
+    df = df.set_axis(range(df.shape[1]), axis=1)
+    numeric = [i for i, name in enumerate(targets) if name is not None and dtypes[name] != 'string']
+    text = [i for i, name in enumerate(targets) if name is not None and dtypes[name] == 'string']
+    if numeric:
+        # '-' and other placeholder text in numeric cells become NaN
+        df[numeric] = df[numeric].apply(pd.to_numeric, errors='coerce').astype(
+            {i: dtypes[targets[i]] for i in numeric})
+    if text:
+        # Plain object columns (not StringDtype) so existing dtype == 'object' checks keep working
+        df[text] = df[text].astype(str).where(df[text].notna(), None)
+
+    labels = [col if name is None else name for col, name in zip(original, targets)]
+    return df.set_axis(labels, axis=1), unmapped
+
+
+def read_source(path=SOURCE_FILE, sheet_name=SOURCE_SHEET, table=None, codes=None,
+                skiprows=None, nrows=None, target='name', registry=None):
+    """
+    Data rows of data_gabungan.xlsx with only the registry columns for
+    `table`/`codes`, already renamed and typed. skiprows = number of rows
+    above the first data row (title + multi-row header band).
+    """
+    registry = load_registry() if registry is None else registry
+    rows = select(registry, table, codes)
+    # Only these columns are streamed out of the sheet; numeric ones straight into float64
+    dtypes = {letter: 'float64' for letter, dtype in zip(rows['excel_column'], rows['dtype']) if dtype != 'string'}
+    df = read_columns_cached(path, usecols(registry, table, codes), sheet_name=sheet_name,
+                             skiprows=skiprows, nrows=nrows, dtypes=dtypes)
+    # Source positions, as a header=None read labels them
+    df.columns = [excel_col_to_index(letter) for letter in df.columns]
+    df, _ = apply_registry(df, registry, target, table, codes)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the data_gabungan.xlsx column registry')
+    parser.add_argument('--table', help='Only columns loaded into this table')
+    args = parser.parse_args()
+
+    registry = load_registry()
+    print("=" * 100)
+    print(f"COLUMN REGISTRY v{registry.attrs['version']} - {len(registry)} columns ({REGISTRY_FILE})")
+    print("=" * 100)
+
+    if args.table:
+        rows = select(registry, args.table)
+        print(f"\n{args.table}: usecols='{usecols(registry, args.table)}'")
+        for row in rows.itertuples(index=False):
+            print(f"  {row.code:6s} {row.excel_column:3s} {row.name:45s} {row.dtype:8s} {row.unit}")
+        return
+
+    for table, rows in registry.groupby(registry['table'].replace('', '(reference)')):
+        print(f"  {table:28s} {len(rows):4d} columns  usecols='{usecols(registry, codes=rows['code'])}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,20 @@
 """
-Complete Column Mapping dan Lengkapi Data total_kenthosan
-Berdasarkan mapping dictionary yang tersedia
+Complete Column Mapping dan Lengkapi Data total_kentosan
+Berdasarkan column registry (column_registry.csv)
 """
 
 import pandas as pd
 import numpy as np
 
+from column_registry import apply_registry, load_registry
+
 print("=" * 100)
 print("COMPLETE COLUMN MAPPING & DATA CLEANUP")
 print("=" * 100)
 
-# Load mapping dictionary
-mapping_df = pd.read_csv('output/column_name_mapping_fixed.csv')
-print(f"\n✅ Loaded mapping dictionary: {len(mapping_df)} rows")
-
-# Create mapping dictionary (dari code ke meaningful_name)
-column_mapping = dict(zip(mapping_df['code'].str.lower(), mapping_df['meaningful_name']))
+# Load column registry (column_registry.csv)
+registry = load_registry()
+print(f"\n✅ Loaded column registry v{registry.attrs['version']}: {len(registry)} columns")
 
 # Load current production data
 df_prod = pd.read_csv('output/normalized_production_data_v2_fixed.csv')
@@ -26,78 +25,50 @@ current_cols = list(df_prod.columns)
 for i, col in enumerate(current_cols[:52], 1):
     print(f"  {i:2d}. {col}")
 
-# Create new column names by applying mapping
-new_column_names = []
-unmapped_cols = []
+# Apply registry names (codes k001/c001/p001 and legacy names) in one rename
+df_prod, unmapped_cols = apply_registry(df_prod, registry)
+new_column_names = list(df_prod.columns)
 
-for col in df_prod.columns:
-    col_lower = col.lower()
-    
-    # Skip id dan block_id
-    if col in ['id', 'block_id']:
-        new_column_names.append(col)
-        continue
-    
-    # Check if column exists in mapping
-    if col_lower in column_mapping:
-        mapped_name = column_mapping[col_lower]
-        new_column_names.append(mapped_name)
-    elif col_lower.startswith('k00') or col_lower.startswith('c0') or col_lower.startswith('p0'):
-        # Columns dengan format k001, c001, p001
-        code_upper = col_lower.upper()
-        if code_upper in mapping_df['code'].values:
-            mapped_name = mapping_df[mapping_df['code'] == code_upper]['meaningful_name'].iloc[0]
-            new_column_names.append(mapped_name)
-        else:
-            unmapped_cols.append(col)
-            new_column_names.append(col)  # Keep original
-    else:
-        # Keep columns that start with recognized patterns
-        if any(col.startswith(prefix) for prefix in ['thn_', 'total_', 'realisasi_']):
-            new_column_names.append(col)
-        else:
-            unmapped_cols.append(col)
-            new_column_names.append(col)
+# id/block_id and thn_*/total_*/realisasi_* columns are kept as they are
+unmapped_cols = [col for col in unmapped_cols
+                 if col not in ['id', 'block_id']
+                 and not any(col.startswith(prefix) for prefix in ['thn_', 'total_', 'realisasi_'])]
 
 print(f"\n⚠️  Unmapped columns ({len(unmapped_cols)}):")
 for col in unmapped_cols:
     print(f"  - {col}")
 
-# Apply new column names
-df_prod.columns = new_column_names
-
 print(f"\n✅ Applied new column names")
 
-# Now calculate total_kenthosan if missing
-# total_kenthosan = sisip_kentosan(C040) + C043 + C044 + C047
-# which should now be: thn_2023_sisip_kentosan + thn_2024_kentosan + ... + thn_2025_kenthosan
+# Now calculate total_kentosan if missing
+# total_kentosan = sisip_kentosan(C040) + C043 + C047 (registry names)
 
 kentosan_columns = [
-    'thn_2023_sisip_kentosan',
-    'thn_2024_kentosan', 
-    'thn_2025_kenthosan'
+    'sisip_kentosan_2023',
+    'sisip_kentosan_2024',
+    'sisip_kentosan_2025'
 ]
 
 # Check if these columns exist
 existing_kentosan = [col for col in kentosan_columns if col in df_prod.columns]
 print(f"\n📊 Found kentosan columns: {existing_kentosan}")
 
-if 'total_kenthosan' in df_prod.columns and existing_kentosan:
-    print(f"\n🔄 Calculating total_kenthosan...")
+if 'total_kentosan' in df_prod.columns and existing_kentosan:
+    print(f"\n🔄 Calculating total_kentosan...")
     
     # Calculate sum of all kentosan columns (fillna with 0)
-    df_prod['total_kenthosan'] = df_prod[existing_kentosan].fillna(0).sum(axis=1)
+    df_prod['total_kentosan'] = df_prod[existing_kentosan].fillna(0).sum(axis=1)
     
     # Replace 0 with empty string for cleaner output
-    df_prod['total_kenthosan'] = df_prod['total_kenthosan'].replace(0, '')
+    df_prod['total_kentosan'] = df_prod['total_kentosan'].replace(0, '')
     
-    print(f"✅ Completed total_kenthosan calculation for all {len(df_prod)} rows")
+    print(f"✅ Completed total_kentosan calculation for all {len(df_prod)} rows")
     
     # Show sample
-    sample_with_kentosan = df_prod[df_prod['total_kenthosan'] != ''].head(10)
+    sample_with_kentosan = df_prod[df_prod['total_kentosan'] != ''].head(10)
     if len(sample_with_kentosan) > 0:
-        print(f"\n📋 Sample rows with total_kenthosan:")
-        print(sample_with_kentosan[['id', 'block_id'] + existing_kentosan + ['total_kenthosan']])
+        print(f"\n📋 Sample rows with total_kentosan:")
+        print(sample_with_kentosan[['id', 'block_id'] + existing_kentosan + ['total_kentosan']])
 
 # Save the corrected data
 df_prod.to_csv('output/normalized_production_data_v2_complete.csv', index=False, encoding='utf-8')
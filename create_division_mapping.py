@@ -1,7 +1,7 @@
-import pandas as pd
+from sheet_layout import read_with_layout
 
-# Read Excel properly
-df = pd.read_excel('source/data_gabungan.xlsx', sheet_name=0, skiprows=4)
+# Read Excel properly: data rows only, header band detected once and cached
+df, layout = read_with_layout('source/data_gabungan.xlsx', sheet_name=0)
 
 # Rename columns for clarity
 df.columns = ['block_code', 'year', 'nomor', 'estate_lama', 'estate', 'division_lama', 'division', 'block_lama', 'block_baru'] + list(df.columns[9:])
@@ -11,6 +11,8 @@ from supabase import create_client, Client
 import os
 from dotenv import load_dotenv
 import time
+import functools
+from dashboard_metrics import Sections, cache_miss, render_diagnostics, span
 
 # Load environment variables
 load_dotenv()
@@ -26,6 +28,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Hidden diagnostics page (span latencies, cache hit rate): open with ?diagnostics=1
+if st.query_params.get('diagnostics'):
+    render_diagnostics()
+    st.stop()
+
+sections = Sections('app')
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -69,10 +78,18 @@ supabase = init_supabase()
 
 # Performance monitoring decorator
 def monitor_performance(func):
-    """Decorator to monitor query performance"""
+    """
+    Decorator to monitor query performance. Goes ABOVE @st.cache_data, so
+    cache hits are timed too (the loader calls cache_miss() when it runs);
+    every call is also recorded as span app.load.<name> (dashboard_metrics).
+    """
+    name = f"app.load.{func.__name__}"
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         start_time = time.time()
-        result = func(*args, **kwargs)
+        with span(name, cached=True):
+            result = func(*args, **kwargs)
         elapsed = (time.time() - start_time) * 1000  # Convert to ms
         
         # Store performance data in session state
@@ -88,17 +105,19 @@ def monitor_performance(func):
     return wrapper
 
 # Data loading functions with caching and performance monitoring
-@st.cache_data(ttl=600)
 @monitor_performance
+@st.cache_data(ttl=600)
 def load_estates():
     """Load estates data"""
+    cache_miss()
     response = supabase.table('estates').select('*').execute()
     return pd.DataFrame(response.data)
 
-@st.cache_data(ttl=600)
 @monitor_performance
+@st.cache_data(ttl=600)
 def load_blocks(estate_filter=None):
     """Load blocks data with optional estate filter"""
+    cache_miss()
     query = supabase.table('blocks').select('*')
     
     if estate_filter and estate_filter != 'All':
@@ -107,10 +126,11 @@ def load_blocks(estate_filter=None):
     response = query.execute()
     return pd.DataFrame(response.data)
 
-@st.cache_data(ttl=600)
 @monitor_performance
+@st.cache_data(ttl=600)
 def load_production_data(block_codes=None):
     """Load production data"""
+    cache_miss()
     query = supabase.table('production_data').select('block_code, id')
     
     if block_codes:
@@ -119,10 +139,11 @@ def load_production_data(block_codes=None):
     response = query.execute()
     return pd.DataFrame(response.data)
 
-@st.cache_data(ttl=600)
 @monitor_performance
+@st.cache_data(ttl=600)
 def load_estate_summary():
     """Load pre-computed estate summary from materialized view"""
+    cache_miss()
     try:
         response = supabase.table('mv_estate_summary').select('*').execute()
         return pd.DataFrame(response.data)
@@ -150,6 +171,7 @@ def compute_estate_summary():
 st.markdown('<div class="main-header">🌴 Palm Oil Estate Dashboard</div>', unsafe_allow_html=True)
 
 # Sidebar
+sections.start('sidebar')
 with st.sidebar:
     st.header("⚙️ Dashboard Controls")
     
@@ -207,6 +229,7 @@ tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "📈 Analytics", "🔍 Detai
 # TAB 1: OVERVIEW
 # ============================================================================
 
+sections.start('overview')
 with tab1:
     st.header("Estate Overview")
     
@@ -238,33 +261,36 @@ with tab1:
     with col1:
         st.subheader("Blocks by Estate")
         if 'total_blocks' in summary_df.columns:
-            fig1 = px.bar(
-                summary_df,
-                x='estate_code',
-                y='total_blocks',
-                title="Number of Blocks per Estate",
-                color='total_blocks',
-                color_continuous_scale='Greens'
-            )
-            fig1.update_layout(height=400)
-            st.plotly_chart(fig1, use_container_width=True)
+            with span('app.chart.blocks_by_estate'):
+                fig1 = px.bar(
+                    summary_df,
+                    x='estate_code',
+                    y='total_blocks',
+                    title="Number of Blocks per Estate",
+                    color='total_blocks',
+                    color_continuous_scale='Greens'
+                )
+                fig1.update_layout(height=400)
+                st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
         st.subheader("Area Distribution")
         if 'total_area_ha' in summary_df.columns:
-            fig2 = px.pie(
-                summary_df,
-                values='total_area_ha',
-                names='estate_code',
-                title="Area Distribution by Estate"
-            )
-            fig2.update_layout(height=400)
-            st.plotly_chart(fig2, use_container_width=True)
+            with span('app.chart.area_distribution'):
+                fig2 = px.pie(
+                    summary_df,
+                    values='total_area_ha',
+                    names='estate_code',
+                    title="Area Distribution by Estate"
+                )
+                fig2.update_layout(height=400)
+                st.plotly_chart(fig2, use_container_width=True)
 
 # ============================================================================
 # TAB 2: ANALYTICS
 # ============================================================================
 
+sections.start('analytics')
 with tab2:
     st.header("Block Analytics")
     
@@ -283,31 +309,34 @@ with tab2:
         st.subheader("Planting Timeline")
         if not filtered_blocks.empty and 'year_planted' in filtered_blocks.columns:
             year_counts = filtered_blocks['year_planted'].value_counts().sort_index()
-            fig3 = px.line(
-                x=year_counts.index,
-                y=year_counts.values,
-                title="Blocks Planted by Year",
-                labels={'x': 'Year', 'y': 'Number of Blocks'}
-            )
-            fig3.update_traces(mode='lines+markers')
-            st.plotly_chart(fig3, use_container_width=True)
+            with span('app.chart.planting_timeline'):
+                fig3 = px.line(
+                    x=year_counts.index,
+                    y=year_counts.values,
+                    title="Blocks Planted by Year",
+                    labels={'x': 'Year', 'y': 'Number of Blocks'}
+                )
+                fig3.update_traces(mode='lines+markers')
+                st.plotly_chart(fig3, use_container_width=True)
     
     with col2:
         st.subheader("Area Size Distribution")
         if not filtered_blocks.empty and 'area_ha' in filtered_blocks.columns:
-            fig4 = px.histogram(
-                filtered_blocks,
-                x='area_ha',
-                title="Distribution of Block Sizes",
-                labels={'area_ha': 'Area (hectares)'},
-                nbins=20
-            )
-            st.plotly_chart(fig4, use_container_width=True)
+            with span('app.chart.area_histogram'):
+                fig4 = px.histogram(
+                    filtered_blocks,
+                    x='area_ha',
+                    title="Distribution of Block Sizes",
+                    labels={'area_ha': 'Area (hectares)'},
+                    nbins=20
+                )
+                st.plotly_chart(fig4, use_container_width=True)
 
 # ============================================================================
 # TAB 3: DETAILS
 # ============================================================================
 
+sections.start('details')
 with tab3:
     st.header("Block Details")
     
@@ -340,6 +369,7 @@ with tab3:
 # TAB 4: PERFORMANCE BENCHMARK
 # ============================================================================
 
+sections.start('performance')
 with tab4:
     st.header("⚡ Performance Benchmark")
     
@@ -441,3 +471,5 @@ st.markdown("""
     <p>⚡ Powered by Optimized Schema with Indexes & Materialized Views</p>
 </div>
 """, unsafe_allow_html=True)
+
+sections.finish()
@@ -0,0 +1,227 @@
+"""
+DASHBOARD DISK CACHE
+====================
+Purpose: Keep the tables the dashboards read on local disk, shared by every
+         Streamlit session and surviving restarts, and re-download a table
+         only when it actually changed - instead of a full paginated
+         download every time a 60 s st.cache_data TTL runs out.
+
+Change probe (two tiny requests per table): exact row count + newest
+updated_at (or created_at). Probes run at most every PROBE_INTERVAL seconds
+per table; within that window - also right after a restart - the copy on
+disk is served without asking Supabase at all.
+Note: tables without updated_at/created_at only notice inserts/deletes (the
+manifest remembers watermark_column '' so they are not probed for the
+columns again); press "Clear Cache & Reload" (clear_cache()) after in-place
+UPDATEs.
+
+Layout (output/.cache/dashboard/):
+- manifest.json   per table: last probe (rows, watermark column/value,
+                  probed_at) and the probe the file was downloaded at
+- <table>.parquet one file per table (<table>.pkl when pyarrow is missing)
+
+Usage:
+    from dashboard_cache import cached_table, cached_tables, table_versions
+    df_prod = cached_table(supabase, 'production_annual')
+    tables = cached_tables(supabase, ['blocks', 'divisions'])      # concurrently
+    version = table_versions(supabase, ['production_annual', 'blocks'])  # cache key for derived data
+
+    python dashboard_cache.py            # show what is cached
+    python dashboard_cache.py --clear
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from dashboard_metrics import record_cache, span
+from snapshot_store import read_frame, save_frame
+from supabase_fetch import fetch_count, fetch_table
+
+CACHE_DIR = 'output/.cache/dashboard'
+MANIFEST_FILE = 'manifest.json'
+PROBE_INTERVAL = 30  # seconds between change probes of one table
+WATERMARK_COLUMNS = ('updated_at', 'created_at')
+NO_WATERMARK = ''  # watermark_column of tables that have none - row count only
+UNDEFINED_COLUMN = '42703'  # Postgres SQLSTATE: APIError.code (PostgREST), .sqlstate (psycopg)
+
+_lock = threading.Lock()  # manifest read-modify-write and the lock registry
+_table_locks = {}          # one download at a time per table, other tables are not blocked
+_memory = {}               # (cache_dir, table) -> (version, DataFrame), saves the disk read on every rerun
+
+
+def _manifest_path(cache_dir):
+    return os.path.join(cache_dir, MANIFEST_FILE)
+
+
+def load_manifest(cache_dir=CACHE_DIR):
+    path = _manifest_path(cache_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest, cache_dir):
+    path = _manifest_path(cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _update_manifest(cache_dir, entries):
+    with _lock:
+        os.makedirs(cache_dir, exist_ok=True)
+        manifest = load_manifest(cache_dir)
+        for table, entry in entries.items():
+            manifest[table] = dict(manifest.get(table, {}), **entry)
+        _save_manifest(manifest, cache_dir)
+
+
+def _table_lock(cache_dir, table):
+    with _lock:
+        return _table_locks.setdefault((cache_dir, table), threading.Lock())
+
+
+def _latest(client, table, column):
+    response = client.table(table).select(column).order(column, desc=True).limit(1).execute()
+    return str(response.data[0][column]) if response.data else None
+
+
+def _is_missing_column(error):
+    return UNDEFINED_COLUMN in (getattr(error, 'code', None), getattr(error, 'sqlstate', None))
+
+
+def probe(client, table, watermark_column=None):
+    """
+    (rows, watermark_column, watermark) - what changes when the table changes.
+    watermark_column None = not known yet (try WATERMARK_COLUMNS),
+    NO_WATERMARK = the table has none, only the row count is probed.
+    """
+    rows = fetch_count(client, table)
+    if watermark_column == NO_WATERMARK:
+        return rows, NO_WATERMARK, None
+    columns = [watermark_column] if watermark_column else list(WATERMARK_COLUMNS)
+    for column in columns:
+        try:
+            return rows, column, _latest(client, table, column)
+        except Exception as e:
+            if not _is_missing_column(e):
+                raise
+    return rows, NO_WATERMARK, None
+
+
+def _refresh_probe(client, table, entry, probe_interval):
+    """Entry with a fresh probe (rows, watermark) when the last one is older than probe_interval"""
+    if entry and time.time() - entry.get('probed_at', 0) < probe_interval:
+        return entry
+    try:
+        with span(f"fetch.{table}.probe"):
+            rows, column, watermark = probe(client, table, entry.get('watermark_column') if entry else None)
+    except Exception as e:
+        if entry:
+            print(f"⚠️  {table}: change probe failed ({str(e)[:60]}) - serving cached copy")
+            return entry
+        raise
+    return dict(entry or {}, rows=rows, watermark_column=column, watermark=watermark, probed_at=time.time())
+
+
+def cached_table(client, table, probe_interval=PROBE_INTERVAL, cache_dir=CACHE_DIR):
+    """Whole table as a DataFrame - from memory/disk unless the change probe says it changed"""
+    key = (cache_dir, table)
+    start = time.perf_counter()
+    with _table_lock(cache_dir, table):
+        entry = _refresh_probe(client, table, load_manifest(cache_dir).get(table), probe_interval)
+        version = [entry['rows'], entry['watermark']]
+        on_disk = 'file' in entry and os.path.exists(os.path.join(cache_dir, entry['file']))
+
+        # file_version = probe the file was downloaded at (table_versions() only moves the probe)
+        hit = on_disk and entry.get('file_version') == version
+        if not hit:
+            with span(f"fetch.{table}"):
+                df = fetch_table(client, table)
+            os.makedirs(cache_dir, exist_ok=True)
+            entry['rows'] = len(df)
+            entry.update(file=save_frame(df, table, cache_dir), file_version=[len(df), entry['watermark']],
+                         fetched_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            _memory[key] = entry['file_version'], df
+        elif key not in _memory or _memory[key][0] != entry['file_version']:
+            _memory[key] = entry['file_version'], read_frame(entry['file'], cache_dir)
+
+        _update_manifest(cache_dir, {table: entry})
+        df = _memory[key][1].copy()
+    record_cache(f"cache.{table}", hit, (time.perf_counter() - start) * 1000)
+    return df
+
+
+def cached_tables(client, tables, probe_interval=PROBE_INTERVAL, cache_dir=CACHE_DIR):
+    """{table: DataFrame} for several tables - probes and downloads run concurrently"""
+    with ThreadPoolExecutor(max_workers=max(1, len(tables))) as pool:
+        futures = {table: pool.submit(cached_table, client, table, probe_interval, cache_dir)
+                   for table in tables}
+        return {table: future.result() for table, future in futures.items()}
+
+
+def table_versions(client, tables, probe_interval=PROBE_INTERVAL, cache_dir=CACHE_DIR):
+    """
+    Tuple of (table, rows, watermark) from the same change probe, without
+    downloading anything - a cache key for data derived from these tables.
+    """
+    manifest = load_manifest(cache_dir)
+    with ThreadPoolExecutor(max_workers=max(1, len(tables))) as pool:
+        futures = {table: pool.submit(_refresh_probe, client, table, manifest.get(table), probe_interval)
+                   for table in tables}
+        entries = {table: future.result() for table, future in futures.items()}
+    # Probe fields only - never overwrite what a concurrent download just wrote
+    probe_fields = ('rows', 'watermark_column', 'watermark', 'probed_at')
+    _update_manifest(cache_dir, {table: {k: entry[k] for k in probe_fields} for table, entry in entries.items()})
+    return tuple((table, entry['rows'], entry['watermark']) for table, entry in entries.items())
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """Drop every cached table (next read downloads again)"""
+    with _lock:
+        for key in [k for k in _memory if k[0] == cache_dir]:
+            del _memory[key]
+        if not os.path.isdir(cache_dir):
+            return
+        for file_name in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, file_name))
+
+
+def print_info(cache_dir=CACHE_DIR):
+    manifest = load_manifest(cache_dir)
+    if not manifest:
+        print(f"❌ Nothing cached in {cache_dir}")
+        return
+
+    print(f"\n{'Table':30s} {'Rows':>8s}  {'Watermark':28s} {'Fetched':19s} Probed")
+    for table, entry in sorted(manifest.items()):
+        watermark = f"{entry['watermark_column']}={entry['watermark']}" if entry.get('watermark') else '-'
+        probed = datetime.fromtimestamp(entry['probed_at']).strftime('%H:%M:%S')
+        print(f"{table:30s} {entry['rows']:8,d}  {watermark[:28]:28s} {entry.get('fetched_at', '-'):19s} {probed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dashboard disk cache')
+    parser.add_argument('--clear', action='store_true', help='Delete every cached table')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"DASHBOARD DISK CACHE ({CACHE_DIR})")
+    print("=" * 80)
+
+    if args.clear:
+        clear_cache()
+        print("✅ Cache cleared")
+        return
+    print_info()
+
+
+if __name__ == "__main__":
+    main()
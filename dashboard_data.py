@@ -0,0 +1,123 @@
+"""
+DASHBOARD DATA LAYER
+====================
+Purpose: Read the server-side dashboard aggregates (see dashboard_views.py)
+         instead of whole tables. Every function takes a `source`: either a
+         Supabase client (REST / RPC) or a direct Postgres connection (local
+         test database, bulk_loader.connect()).
+
+- estate_year_kpis()   mv_estate_year_kpi rows (estate 'All' / year 0 = roll-ups)
+- division_gano()      mv_division_gano rows
+- risk_distribution()  v_risk_distribution rows for one filter
+- top_performers()     dashboard_performers() RPC
+- performer_rows()     mv_block_performers lists in the cube's format
+- load_cube()          the same dict kpi_cube.build_cube() returns, assembled
+                       from ~20 KPI rows + the performer lists
+
+Usage:
+    from dashboard_data import load_cube
+    cube = load_cube(supabase)          # raises when the views are not migrated
+    cube = load_cube(supabase, with_performers=False)   # KPI view only
+"""
+
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from dashboard_metrics import span
+from dashboard_views import ALL, GANO_VIEW, KPI_VIEW, PERFORMERS_VIEW, RISK_VIEW, UNMAPPED_ESTATE
+from kpi_cube import ALL_YEARS, DIMENSIONS, SUM_COLUMNS, TOP_N, assemble_cube
+from supabase_fetch import fetch_table
+
+
+def _is_connection(source):
+    return hasattr(source, 'cursor')
+
+
+def query_frame(conn, sql, params=None):
+    """Query result as a DataFrame; numeric (Decimal) columns become float"""
+    with conn.cursor() as cur:
+        cur.execute(sql, params)
+        columns = [col[0] for col in cur.description]
+        df = pd.DataFrame(cur.fetchall(), columns=columns)
+    conn.commit()
+    for col in df.columns:
+        non_null = df[col].dropna()
+        if len(non_null) and isinstance(non_null.iloc[0], Decimal):
+            df[col] = df[col].astype(float)
+    return df
+
+
+def read_view(source, name, filters=None):
+    """All rows of a view, filters as {column: value}"""
+    filters = filters or {}
+    with span(f"query.{name}"):
+        if _is_connection(source):
+            where = ' AND '.join(f"{column} = %({column})s" for column in filters)
+            return query_frame(source, f"SELECT * FROM {name}" + (f" WHERE {where}" if where else ''), filters)
+        return fetch_table(source, name, filters=filters, order=None)
+
+
+def call_rpc(source, function, params):
+    """Rows returned by an RPC function"""
+    with span(f"query.{function}"):
+        if _is_connection(source):
+            args = ', '.join(f"{name} => %({name})s" for name in params)
+            return query_frame(source, f"SELECT * FROM {function}({args})", params)
+        return pd.DataFrame(source.rpc(function, params).execute().data)
+
+
+def estate_year_kpis(source, year=None, estate=None):
+    filters = {}
+    if year is not None:
+        filters['year'] = year
+    if estate is not None:
+        filters['estate'] = estate
+    return read_view(source, KPI_VIEW, filters)
+
+
+def division_gano(source, estate=None):
+    return read_view(source, GANO_VIEW, {'estate_code': estate} if estate else None)
+
+
+def risk_distribution(source, year=ALL_YEARS, estate=ALL):
+    return read_view(source, RISK_VIEW, {'year': year, 'estate': estate})
+
+
+def top_performers(source, side='top', year=ALL_YEARS, estate=ALL, limit=TOP_N):
+    return call_rpc(source, 'dashboard_performers',
+                    {'p_side': side, 'p_year': year, 'p_estate': estate, 'p_limit': limit})
+
+
+def performer_rows(source, top_n=TOP_N):
+    """Precomputed top/bottom lists (mv_block_performers) in the cube's performer format"""
+    with span(f"query.{PERFORMERS_VIEW}"):
+        if _is_connection(source):
+            lists = query_frame(source, f"SELECT * FROM {PERFORMERS_VIEW} WHERE rank <= %s", (top_n,))
+        else:
+            lists = fetch_table(source, PERFORMERS_VIEW, filters=[('lte', 'rank', top_n)], order=None)
+    lists = lists.sort_values(['filter_year', 'filter_estate', 'side', 'rank'])
+    lists['estate'] = lists['estate'].replace(UNMAPPED_ESTATE, np.nan)
+    return lists[['block_code', 'estate', 'real_ton', 'gap_pct_ton',
+                  'filter_year', 'filter_estate', 'side']].reset_index(drop=True)
+
+
+def load_cube(source, top_n=TOP_N, with_performers=True):
+    """
+    kpi_cube-compatible dict built from the views (raises ValueError when they
+    are empty). with_performers=False reads only the KPI view - a single small
+    query; cube['performers'] is then None, fill it from performer_rows().
+    """
+    kpis = estate_year_kpis(source)
+    if kpis.empty:
+        raise ValueError(f"{KPI_VIEW} is empty - run: python dashboard_views.py")
+
+    # The cube keeps per-estate rows only; 'All' totals are sums over estates
+    rows = kpis[kpis['estate'] != ALL].copy()
+    rows['estate'] = rows['estate'].replace(UNMAPPED_ESTATE, np.nan)
+    rows['division'] = '-'
+    rows['category'] = '-'
+    rows = rows[DIMENSIONS + SUM_COLUMNS].reset_index(drop=True)
+
+    return assemble_cube(rows, performer_rows(source, top_n) if with_performers else None)
@@ -0,0 +1,317 @@
+"""
+DASHBOARD METRICS
+=================
+Purpose: Find out which part of a dashboard is slow in production.
+         Timed spans around data fetches, merges, aggregations and chart
+         builds are written to a local SQLite file, so p50/p95 per span and
+         the cache hit rate survive sessions and restarts.
+
+- span(name)            with-block timer
+- timed(name)           decorator; timed(name, cached=True) above an
+                        @st.cache_data loader also counts a hit or a miss -
+                        the loader calls cache_miss() when its body runs
+- record_cache(...)     hit/miss for caches that know it themselves
+                        (dashboard_cache.cached_table)
+- Sections(prefix)      top-level script sections of a Streamlit page:
+                        start('heatmap') ends the previous section
+- flush()               write buffered spans (end of every dashboard run)
+- summary()             calls, p50, p95, max, hits, misses per span
+- render_diagnostics()  the hidden diagnostics page: open a dashboard with
+                        ?diagnostics=1
+
+Span names are dotted, dashboard first: 'executive.section.heatmap',
+'executive.load.kpi_cube', 'fetch.production_annual' (shared layers).
+
+Storage: output/.cache/dashboard_metrics.sqlite, one row per span, rows
+older than RETENTION_DAYS are pruned. Set DASHBOARD_METRICS=0 to disable.
+
+Usage:
+    from dashboard_metrics import span, timed, cache_miss, flush
+    with span('executive.section.heatmap'):
+        ...
+
+    python dashboard_metrics.py               # p50/p95 table, last 24 h
+    python dashboard_metrics.py --hours 168
+    python dashboard_metrics.py --clear
+"""
+
+import argparse
+import functools
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+METRICS_DB = 'output/.cache/dashboard_metrics.sqlite'
+RETENTION_DAYS = 14
+FLUSH_AT = 500  # buffered spans before flush() runs by itself
+ENABLED = os.getenv('DASHBOARD_METRICS', '1') != '0'
+
+# Latency classes on the diagnostics page (ms)
+SLOW_MS = 1000
+WARN_MS = 300
+
+_lock = threading.Lock()
+_buffer = []                 # (ts, name, ms, cache_hit) - cache_hit 1/0, None = not a cache lookup
+_local = threading.local()   # per thread: stack of open cached spans
+
+
+def record(name, ms, cache_hit=None):
+    """Buffer one span (flushed in batches)"""
+    if not ENABLED:
+        return
+    with _lock:
+        _buffer.append((time.time(), name, float(ms), cache_hit))
+        full = len(_buffer) >= FLUSH_AT
+    if full:
+        flush()
+
+
+def record_cache(name, hit, ms=0.0):
+    record(name, ms, int(bool(hit)))
+
+
+@contextmanager
+def span(name, cached=False):
+    """Time the with-block as span `name`; cached=True also records hit/miss (see cache_miss)"""
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    state = {'miss': False}
+    if cached:
+        stack.append(state)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        if cached:
+            stack.pop()
+        record(name, ms, (0 if state['miss'] else 1) if cached else None)
+
+
+def cache_miss():
+    """Call first thing inside an @st.cache_data function - marks the enclosing timed(cached=True) span a miss"""
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        stack[-1]['miss'] = True
+
+
+def timed(name, cached=False):
+    """Decorator form of span()"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, cached=cached):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class Sections:
+    """
+    Consecutive sections of a top-level Streamlit script, timed without
+    re-indenting them: start(name) closes the previous section, finish()
+    closes the last one and records the whole page as '<prefix>.page'.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._page_start = time.perf_counter()
+        self._name = None
+        self._start = None
+
+    def start(self, name):
+        self._close()
+        self._name, self._start = name, time.perf_counter()
+
+    def _close(self):
+        if self._name:
+            record(f"{self.prefix}.section.{self._name}", (time.perf_counter() - self._start) * 1000)
+            self._name = None
+
+    def finish(self):
+        self._close()
+        record(f"{self.prefix}.page", (time.perf_counter() - self._page_start) * 1000)
+        flush()
+
+
+def _connect(db_path):
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")  # sessions flush while the diagnostics page reads
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS spans (
+            ts REAL NOT NULL,
+            name TEXT NOT NULL,
+            ms REAL NOT NULL,
+            cache_hit INTEGER
+        )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS spans_name_ts ON spans (name, ts)")
+    return conn
+
+
+def flush(db_path=METRICS_DB):
+    """Write buffered spans to SQLite; returns how many were written"""
+    with _lock:
+        rows = _buffer[:]
+        del _buffer[:]
+    if not rows:
+        return 0
+    try:
+        conn = _connect(db_path)
+        with conn:
+            conn.executemany("INSERT INTO spans (ts, name, ms, cache_hit) VALUES (?, ?, ?, ?)", rows)
+            conn.execute("DELETE FROM spans WHERE ts < ?", (time.time() - RETENTION_DAYS * 86400,))
+        conn.close()
+    except sqlite3.Error as e:
+        # Metrics must never break a dashboard
+        print(f"⚠️  dashboard metrics not saved: {e}")
+        return 0
+    return len(rows)
+
+
+def read_spans(hours=24, prefix=None, db_path=METRICS_DB):
+    """Raw spans of the last `hours` as a DataFrame (ts as datetime)"""
+    if not os.path.exists(db_path):
+        return pd.DataFrame(columns=['ts', 'name', 'ms', 'cache_hit'])
+    conn = _connect(db_path)
+    sql = "SELECT ts, name, ms, cache_hit FROM spans WHERE ts >= ?"
+    params = [time.time() - hours * 3600]
+    if prefix:
+        sql += " AND name LIKE ?"
+        params.append(prefix + '%')
+    df = pd.read_sql_query(sql, conn, params=params)
+    conn.close()
+    df['ts'] = pd.to_datetime(df['ts'], unit='s')
+    return df
+
+
+def summary(hours=24, prefix=None, db_path=METRICS_DB):
+    """Per span: calls, p50/p95/max ms, cache hits/misses/hit rate - slowest p95 first"""
+    df = read_spans(hours, prefix, db_path)
+    columns = ['name', 'calls', 'p50_ms', 'p95_ms', 'max_ms', 'total_ms', 'hits', 'misses', 'hit_rate']
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    grouped = df.groupby('name')
+    result = pd.DataFrame({
+        'calls': grouped.size(),
+        'p50_ms': grouped['ms'].quantile(0.50),
+        'p95_ms': grouped['ms'].quantile(0.95),
+        'max_ms': grouped['ms'].max(),
+        'total_ms': grouped['ms'].sum(),
+        'hits': grouped['cache_hit'].apply(lambda s: (s == 1).sum()),
+        'misses': grouped['cache_hit'].apply(lambda s: (s == 0).sum()),
+    })
+    lookups = result['hits'] + result['misses']
+    result['hit_rate'] = np.where(lookups > 0, result['hits'] / lookups.where(lookups > 0) * 100, np.nan)
+    return result.reset_index().sort_values('p95_ms', ascending=False)[columns].reset_index(drop=True)
+
+
+def clear(db_path=METRICS_DB):
+    with _lock:
+        del _buffer[:]
+    if os.path.exists(db_path):
+        conn = _connect(db_path)
+        with conn:
+            conn.execute("DELETE FROM spans")
+        conn.close()
+
+
+def render_diagnostics():
+    """Hidden diagnostics page (Streamlit) - both dashboards show it for ?diagnostics=1"""
+    import plotly.express as px
+    import streamlit as st
+
+    flush()
+    st.title("🩺 Dashboard Diagnostics")
+    st.caption(f"Spans from {METRICS_DB} - latency includes cache hits, so p50 is what users usually wait")
+
+    col_hours, col_prefix = st.columns(2)
+    with col_hours:
+        hours = st.selectbox("Window", [1, 24, 168, RETENTION_DAYS * 24], index=1,
+                             format_func=lambda h: f"Last {h} h" if h < 48 else f"Last {h // 24} days")
+    with col_prefix:
+        prefix = st.selectbox("Spans", ['All', 'executive.', 'app.', 'fetch.', 'query.', 'cache.', 'aggregate.'])
+    stats = summary(hours, None if prefix == 'All' else prefix)
+
+    if stats.empty:
+        st.info("No spans recorded yet - open the dashboards first")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    lookups = stats['hits'].sum() + stats['misses'].sum()
+    with col1:
+        st.metric("Spans recorded", f"{int(stats['calls'].sum()):,}")
+    with col2:
+        st.metric("Cache hit rate", f"{stats['hits'].sum() / lookups * 100:.1f}%" if lookups else "-")
+    with col3:
+        slowest = stats.iloc[0]
+        st.metric("Slowest p95", f"{slowest['p95_ms']:,.0f} ms", slowest['name'], delta_color="off")
+
+    sections = stats[stats['name'].str.contains(r'\.section\.')]
+    if len(sections) > 0:
+        st.subheader("Sections (p95)")
+        fig = px.bar(sections.sort_values('p95_ms'), x='p95_ms', y='name', orientation='h',
+                     color='p95_ms', color_continuous_scale=['green', 'yellow', 'red'],
+                     range_color=[0, SLOW_MS], labels={'p95_ms': 'p95 (ms)', 'name': ''})
+        fig.update_layout(height=max(250, 35 * len(sections)), coloraxis_showscale=False)
+        st.plotly_chart(fig, use_container_width=True)
+
+    def latency_color(val):
+        if isinstance(val, (int, float)) and val >= SLOW_MS:
+            return 'background-color: #FEE2E2; color: #991B1B'
+        if isinstance(val, (int, float)) and val >= WARN_MS:
+            return 'background-color: #FEF3C7; color: #92400E'
+        return ''
+
+    st.subheader("All spans")
+    table = stats.round({'p50_ms': 1, 'p95_ms': 1, 'max_ms': 1, 'total_ms': 0, 'hit_rate': 1})
+    st.dataframe(table.style.applymap(latency_color, subset=['p50_ms', 'p95_ms', 'max_ms']),
+                 hide_index=True, use_container_width=True)
+
+    cache = stats[stats['hits'] + stats['misses'] > 0]
+    if len(cache) > 0:
+        st.subheader("Cache hits / misses")
+        st.dataframe(cache[['name', 'hits', 'misses', 'hit_rate']].round({'hit_rate': 1}),
+                     hide_index=True, use_container_width=True)
+
+    if st.button("🗑️ Clear metrics"):
+        clear()
+        st.rerun()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dashboard latency metrics')
+    parser.add_argument('--hours', type=float, default=24, help='Window to summarize (default 24)')
+    parser.add_argument('--prefix', help="Only spans starting with this, e.g. 'executive.'")
+    parser.add_argument('--clear', action='store_true', help='Delete every recorded span')
+    args = parser.parse_args()
+
+    print("=" * 100)
+    print(f"DASHBOARD METRICS ({METRICS_DB})")
+    print("=" * 100)
+
+    if args.clear:
+        clear()
+        print("✅ Metrics cleared")
+        return
+
+    stats = summary(args.hours, args.prefix)
+    if stats.empty:
+        print(f"❌ No spans in the last {args.hours:g} h")
+        return
+
+    print(f"\n{'Span':45s} {'Calls':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'Max ms':>9s}  Hit rate")
+    for row in stats.itertuples(index=False):
+        hit_rate = f"{row.hit_rate:5.1f}% ({row.hits}/{row.hits + row.misses})" if row.hits + row.misses else '-'
+        print(f"{row.name[:45]:45s} {row.calls:7,d} {row.p50_ms:9.1f} {row.p95_ms:9.1f} {row.max_ms:9.1f}  {hit_rate}")
+
+
+if __name__ == "__main__":
+    main()
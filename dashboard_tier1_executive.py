@@ -15,6 +15,12 @@ from supabase import create_client
 from dotenv import load_dotenv
 import os
 import numpy as np
+from dashboard_cache import PROBE_INTERVAL, cached_tables, clear_cache, table_versions
+from kpi_cube import ALL_YEARS, build_cube, totals, breakdown, performers, shortfall, loss_breakdown, loss_rupiah
+from gano_index import build_gano_index, division_count, estate_divisions, division_blocks
+from monthly_store import MONTH_LABELS, build_store, group_totals, seasonal_index, trend_frame
+from dashboard_data import load_cube, performer_rows
+from dashboard_metrics import Sections, cache_miss, render_diagnostics, span, timed
 
 # Page config
 st.set_page_config(
@@ -24,6 +30,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Hidden diagnostics page (span latencies, cache hit rate): open with ?diagnostics=1
+if st.query_params.get('diagnostics'):
+    render_diagnostics()
+    st.stop()
+
+sections = Sections('executive')
+
 # Load environment
 load_dotenv()
 
@@ -38,125 +51,81 @@ def init_supabase():
 supabase = init_supabase()
 
 # Load data with caching
-@st.cache_data(ttl=60)  # Cache for 1 minute only
-def load_production_data():
-    """Load production annual data - ALL RECORDS using pagination"""
-    # Supabase limit() is capped at 1000! Need to use range() for more
-    # Load in chunks and combine
-    all_data = []
-    page_size = 1000
-    page = 0
-    
-    while True:
-        start = page * page_size
-        end = start + page_size - 1
-        response = supabase.table('production_annual').select('*').range(start, end).execute()
-        
-        if not response.data:
-            break
-            
-        all_data.extend(response.data)
-        
-        if len(response.data) < page_size:
-            break
-            
-        page += 1
-    
-    return pd.DataFrame(all_data)
-
-@st.cache_data(ttl=60)
-def load_blocks_data():
-    """Load blocks master data"""
-    response = supabase.table('blocks').select('*').execute()
-    return pd.DataFrame(response.data)
-
-@st.cache_data(ttl=60)
-def load_estates_data():
-    """Load estates data"""
-    response = supabase.table('estates').select('*').execute()
-    return pd.DataFrame(response.data)
-
-@st.cache_data(ttl=60)
-def load_infrastructure_data():
-    """Load infrastructure data"""
-    response = supabase.table('block_land_infrastructure').select('*').execute()
-    return pd.DataFrame(response.data)
-
-@st.cache_data(ttl=60)
-def load_ganoderma_data():
-    """Load ganoderma/pest disease data"""
-    all_data = []
-    page_size = 1000
-    page = 0
-    
-    while True:
-        start = page * page_size
-        end = start + page_size - 1
-        response = supabase.table('block_pest_disease').select('*').range(start, end).execute()
-        
-        if not response.data:
-            break
-            
-        all_data.extend(response.data)
-        
-        if len(response.data) < page_size:
-            break
-            
-        page += 1
-    
-    return pd.DataFrame(all_data)
-
-@st.cache_data(ttl=60)
-def load_divisions_data():
-    """Load divisions data with estate relationship"""
-    response = supabase.table('divisions').select('*').execute()
-    return pd.DataFrame(response.data)
-
-# Load all data
-df_prod = load_production_data()
-df_blocks = load_blocks_data()
-df_estates = load_estates_data()
-df_infra = load_infrastructure_data()
-df_gano = load_ganoderma_data()
-df_divisions = load_divisions_data()  # Load divisions hierarchy
+# Tables live in a disk cache shared by all sessions (dashboard_cache.py) and
+# are only downloaded again when their row count / updated_at changed.
+# Nothing is loaded up front - every section asks for the tables it needs,
+# and those are fetched concurrently.
+CUBE_TABLES = ['production_annual', 'blocks', 'block_land_infrastructure', 'block_pest_disease']
+GANO_TABLES = ['block_pest_disease', 'blocks', 'divisions', 'estates']
+MONTHLY_TABLES = ['production_monthly', 'blocks']
+
+def load_tables(tables):
+    """{table: DataFrame} - probes/downloads of all tables run concurrently"""
+    return cached_tables(supabase, tables)
+
+@timed('executive.load.kpi_cube', cached=True)
+@st.cache_data(ttl=PROBE_INTERVAL)
+def load_kpi_cube():
+    """KPI aggregates - one query on the server-side KPI view (tens of rows), else built from the full tables"""
+    cache_miss()
+    try:
+        return load_cube(supabase, with_performers=False)
+    except Exception:
+        # Views not migrated yet (python dashboard_views.py) - aggregate client-side
+        return build_table_cube(table_versions(supabase, CUBE_TABLES))
+
+# Derived data is keyed by the source tables' version - rebuilt only after a change
+@timed('executive.load.table_cube', cached=True)
+@st.cache_data(max_entries=2)
+def build_table_cube(version):
+    """KPI cube aggregated client-side from the full tables"""
+    cache_miss()
+    tables = load_tables(CUBE_TABLES)
+    return build_cube(tables['production_annual'], tables['blocks'],
+                      tables['block_land_infrastructure'], tables['block_pest_disease'])
+
+@timed('executive.load.performers', cached=True)
+@st.cache_data(ttl=PROBE_INTERVAL)
+def load_performer_rows():
+    """Top/bottom performer lists - only read when the performers section renders"""
+    cache_miss()
+    return performer_rows(supabase)
+
+@timed('executive.load.gano_index', cached=True)
+@st.cache_data(max_entries=2)
+def load_gano_index(version):
+    """Ganoderma survey joined block → division → estate and grouped per drill level"""
+    cache_miss()
+    tables = load_tables(GANO_TABLES)
+    return build_gano_index(tables['block_pest_disease'], tables['blocks'],
+                            tables['divisions'], tables['estates'])
+
+@timed('executive.load.monthly_store', cached=True)
+@st.cache_data(max_entries=2)
+def load_monthly_store(version):
+    """production_monthly as (blocks × months) float32 arrays - see monthly_store.py"""
+    cache_miss()
+    tables = load_tables(MONTHLY_TABLES)
+    return build_store(tables['production_monthly'], tables['blocks'])
+
+# Hero KPIs need only the cube - the Ganoderma index loads when the drill-down opens
+sections.start('load')
+cube = load_kpi_cube()
 
 # DEBUG: Show what years we actually loaded
+sections.start('sidebar')
 st.sidebar.markdown("---")
 st.sidebar.markdown("**🔍 Data Loaded:**")
-years_loaded = sorted(df_prod['year'].unique())
+years_loaded = cube['years']
 st.sidebar.write(f"Years: {years_loaded}")
-st.sidebar.write(f"Total records: {len(df_prod)}")
+st.sidebar.write(f"Total records: {int(totals(cube)['records'])}")
 
 # Add clear cache button
 if st.sidebar.button("🔄 Clear Cache & Reload"):
     st.cache_data.clear()
+    clear_cache()
     st.rerun()
 
-# Merge for complete view - rename columns to avoid conflicts
-df = df_prod.merge(
-    df_blocks[['id', 'block_code', 'category']].rename(columns={'id': 'blocks_id'}), 
-    left_on='block_id', 
-    right_on='blocks_id', 
-    how='left',
-    suffixes=('_prod', '_block')
-)
-
-df = df.merge(df_infra[['block_id', 'total_luas_sd_2025_ha']], 
-              on='block_id', how='left')
-
-# Use block_code from production_annual (block_code_prod) or blocks table (block_code_block)
-# Prioritize block_code_block as it's from master table
-df['block_code_final'] = df['block_code_block'].fillna(df.get('block_code_prod', df['block_code_block']))
-
-# Extract estate code from block_code (first letter)
-df['estate_code'] = df['block_code_final'].str[0]
-estate_map = {'A': 'AME', 'O': 'OLE', 'D': 'DBE', 'B': 'AME', 'E': 'AME', 
-              'F': 'AME', 'K': 'OLE', 'L': 'OLE', 'M': 'DBE', 'N': 'DBE'}
-df['estate'] = df['estate_code'].map(estate_map)
-
-# Rename for clarity in later use
-df['block_code'] = df['block_code_final']
-
 # ============================================================================
 # HEADER
 # ============================================================================
@@ -165,41 +134,13 @@ st.markdown("### 11,000 Ha Palm Oil Plantation Performance Analytics")
 st.markdown("---")
 
 # ============================================================================
-# SIDEBAR - CONFIGURATION & FILTERS
+# SIDEBAR - FILTERS
 # ============================================================================
-st.sidebar.header("⚙️ Configuration")
-
-# TBS Price Slider (in Kg)
-st.sidebar.markdown("**💰 TBS Price (Rp/Kg)**")
-st.sidebar.caption("Adjust to see impact on opportunity loss calculation")
-
-tbs_price_kg = st.sidebar.slider(
-    "Price",
-    min_value=1_000,
-    max_value=5_000,
-    value=2_500,
-    step=100,
-    format="Rp %d",
-    label_visibility="collapsed"
-)
-
-# Convert to price per ton for calculation (1 Ton = 1000 Kg)
-cpo_price = tbs_price_kg * 1000
-
-st.sidebar.info(f"""
-**Current TBS Price:**  
-Rp {tbs_price_kg:,}/Kg  
-(Rp {cpo_price:,}/Ton)
-
-**Formula:**  
-Loss = Gap (Ton) × Price (Rp/Ton)
-""")
-
-st.sidebar.markdown("---")
+# TBS price slider lives in the loss section (render_loss_overview fragment)
 st.sidebar.header("🔍 Filters")
 
 # Year filter with "All Years" option
-years = sorted(df['year'].unique())
+years = cube['years']
 year_options = ['All Years'] + years
 selected_year = st.sidebar.selectbox(
     "Select Year",
@@ -208,30 +149,28 @@ selected_year = st.sidebar.selectbox(
 )
 
 # Estate filter
-estates = ['All'] + sorted(df['estate'].dropna().unique().tolist())
+estates = ['All'] + cube['estates']
 selected_estate = st.sidebar.selectbox("Select Estate", estates)
 
-# Filter data based on selection
+# KPIs for the selection - a lookup on the precomputed cube
+cube_year = ALL_YEARS if selected_year == 'All Years' else selected_year
+kpi = totals(cube, cube_year, selected_estate)
 if selected_year == 'All Years':
-    df_filtered = df.copy()
     year_label = f"{min(years_loaded)}-{max(years_loaded)} (All Data)"
 else:
-    df_filtered = df[df['year'] == selected_year].copy()
     year_label = str(selected_year)
 
-if selected_estate != 'All':
-    df_filtered = df_filtered[df_filtered['estate'] == selected_estate]
-
 st.sidebar.markdown("---")
 st.sidebar.markdown(f"**Data Coverage:**")
-st.sidebar.metric("Total Blocks", df_filtered['block_id'].nunique())
-st.sidebar.metric("Total Records", len(df_filtered))
+st.sidebar.metric("Total Blocks", int(kpi['blocks']))
+st.sidebar.metric("Total Records", int(kpi['records']))
 st.sidebar.metric("Year", year_label)
 st.sidebar.metric("Estate", selected_estate)
 
 # Add data availability info
 st.sidebar.markdown("---")
-years_info = "\n".join([f"- {year}: {len(df[df['year']==year])} records" for year in years_loaded])
+records_by_year = breakdown(cube, 'year').set_index('year')['records']
+years_info = "\n".join([f"- {year}: {int(records_by_year.get(year, 0))} records" for year in years_loaded])
 st.sidebar.info(f"""
 **Available Data:**
 {years_info}
@@ -240,43 +179,62 @@ st.sidebar.info(f"""
 # ============================================================================
 # HERO METRICS (Top KPIs)
 # ============================================================================
+sections.start('hero')
 period_display = year_label if selected_year == 'All Years' else f"Year {selected_year}"
 st.header(f"📊 Portfolio Performance - {period_display}")
 
-# Calculate metrics
-# Fix: Deduplicate blocks to avoid counting same block multiple times across years
-df_unique_blocks = df_filtered.drop_duplicates(subset=['block_id'])
-total_area = df_unique_blocks['total_luas_sd_2025_ha'].sum()
-total_production_actual = df_filtered['real_ton'].sum()
-total_production_target = df_filtered['potensi_ton'].sum()
+# Calculate metrics (blocks are counted once across years in the cube)
+total_area = kpi['area_ha']
+total_production_actual = kpi['real_ton']
+total_production_target = kpi['potensi_ton']
 total_gap = total_production_actual - total_production_target
-achievement_pct = (total_production_actual / total_production_target * 100) if total_production_target > 0 else 0
+achievement_pct = kpi['achievement_pct']
 
 # Count risk blocks
-critical_blocks = len(df_filtered[df_filtered['gap_pct_ton'] < -20])
-high_risk_blocks = len(df_filtered[(df_filtered['gap_pct_ton'] >= -20) & (df_filtered['gap_pct_ton'] < -10)])
+critical_blocks = int(kpi['critical'])
+high_risk_blocks = int(kpi['high'])
 total_risk_blocks = critical_blocks + high_risk_blocks
 
-# Calculate opportunity loss using dynamic TBS price
-opportunity_loss = abs(total_gap) * cpo_price if total_gap < 0 else 0
-
 # ============================================================================
 # BIG HERO METRIC - TOTAL LOSS (When viewing All data)
 # ============================================================================
-if selected_year == 'All Years' and selected_estate == 'All':
-    st.markdown("---")
+@st.fragment
+@timed('executive.fragment.loss_overview')
+def render_loss_overview(cube, total_gap, total_production_target):
+    """
+    Opportunity loss cards. Loss is linear in the TBS price, so the ton
+    shortfalls come from the cached cube and are only multiplied here -
+    moving the slider reruns this fragment, not the whole dashboard.
+    """
+    # TBS Price Slider (in Kg)
+    col_price, col_formula = st.columns([2, 1])
+    with col_price:
+        tbs_price_kg = st.slider(
+            "💰 TBS Price (Rp/Kg) - adjust to see impact on opportunity loss",
+            min_value=1_000,
+            max_value=5_000,
+            value=2_500,
+            step=100,
+            format="Rp %d",
+            key='tbs_price_kg'
+        )
+
+    # Convert to price per ton for calculation (1 Ton = 1000 Kg)
+    cpo_price = tbs_price_kg * 1000
+
+    with col_formula:
+        st.caption(f"Rp {tbs_price_kg:,}/Kg (Rp {cpo_price:,}/Ton)  \n"
+                   f"Loss = Gap (Ton) × Price (Rp/Ton)")
+
+    opportunity_loss = loss_rupiah(abs(total_gap) if total_gap < 0 else 0, cpo_price)
     
     # Calculate yearly breakdown
     yearly_loss = []
-    for year in sorted(years_loaded):
-        df_year = df[df['year'] == year]
-        if selected_estate != 'All':
-            df_year = df_year[df_year['estate'] == selected_estate]
-        
-        year_gap = df_year['gap_ton'].sum()
-        year_loss = abs(year_gap) * cpo_price if year_gap < 0 else 0
+    for row in loss_breakdown(cube, 'year').itertuples(index=False):
+        year_gap = row.gap_ton
+        year_loss = loss_rupiah(row.shortfall_ton, cpo_price)
         yearly_loss.append({
-            'year': year,
+            'year': row.year,
             'gap_ton': year_gap,
             'loss_billion': year_loss / 1_000_000_000
         })
@@ -287,36 +245,37 @@ if selected_year == 'All Years' and selected_estate == 'All':
     
     with col_pie:
         # PIE CHART - Yearly Breakdown
-        fig_pie = go.Figure(data=[go.Pie(
-            labels=[str(item['year']) for item in yearly_loss],
-            values=[item['loss_billion'] for item in yearly_loss],
-            hole=0.5,
-            marker=dict(
-                colors=['#2d5016', '#558b2f', '#7cb342'],  # Plantation greens: dark to light
-                line=dict(color='#1f2937', width=3)
-            ),
-            textinfo='label+percent',
-            textfont=dict(size=15, color='white', family='Arial Black'),
-            hovertemplate="<b>%{label}</b><br>" +
-                         "Loss: Rp %{value:.2f} Milyar<br>" +
-                         "<extra></extra>"
-        )])
+        with span('executive.chart.loss_by_year'):
+            fig_pie = go.Figure(data=[go.Pie(
+                labels=[str(item['year']) for item in yearly_loss],
+                values=[item['loss_billion'] for item in yearly_loss],
+                hole=0.5,
+                marker=dict(
+                    colors=['#2d5016', '#558b2f', '#7cb342'],  # Plantation greens: dark to light
+                    line=dict(color='#1f2937', width=3)
+                ),
+                textinfo='label+percent',
+                textfont=dict(size=15, color='white', family='Arial Black'),
+                hovertemplate="<b>%{label}</b><br>" +
+                             "Loss: Rp %{value:.2f} Milyar<br>" +
+                             "<extra></extra>"
+            )])
         
-        fig_pie.update_layout(
-            showlegend=False,
-            height=380,
-            margin=dict(l=20, r=20, t=30, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            annotations=[dict(
-                text=f'<b>Total</b><br>Rp {opportunity_loss/1_000_000_000:.1f}M',
-                x=0.5, y=0.5,
-                font=dict(size=18, color='#e5e7eb'),
-                showarrow=False
-            )]
-        )
+            fig_pie.update_layout(
+                showlegend=False,
+                height=380,
+                margin=dict(l=20, r=20, t=30, b=20),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                annotations=[dict(
+                    text=f'<b>Total</b><br>Rp {opportunity_loss/1_000_000_000:.1f}M',
+                    x=0.5, y=0.5,
+                    font=dict(size=18, color='#e5e7eb'),
+                    showarrow=False
+                )]
+            )
         
-        st.plotly_chart(fig_pie, use_container_width=True)
+            st.plotly_chart(fig_pie, use_container_width=True)
     
     with col_total:
         # TOTAL LOSS DISPLAY
@@ -371,7 +330,7 @@ if selected_year == 'All Years' and selected_estate == 'All':
         
         with st.expander(f"📍 **Estate Breakdown for Year {selected_yr}**", expanded=True):
             # Calculate estate breakdown for selected year
-            df_selected_year = df[df['year'] == selected_yr]
+            estate_kpis = breakdown(cube, 'estate', year=selected_yr).set_index('estate')
             
             estate_breakdown = []
             estate_colors = {
@@ -381,13 +340,12 @@ if selected_year == 'All Years' and selected_estate == 'All':
             }
             
             for estate_code in ['AME', 'OLE', 'DBE']:
-                df_estate = df_selected_year[df_selected_year['estate'] == estate_code]
-                
-                if len(df_estate) > 0:
-                    estate_gap = df_estate['gap_ton'].sum()
-                    estate_loss = abs(estate_gap) * cpo_price if estate_gap < 0 else 0
-                    estate_blocks = len(df_estate)
-                    estate_gap_pct = df_estate['gap_pct_ton'].mean()  # Use gap_pct_ton
+                if estate_code in estate_kpis.index and estate_kpis.loc[estate_code, 'records'] > 0:
+                    estate_kpi_row = estate_kpis.loc[estate_code]
+                    estate_gap = estate_kpi_row['gap_ton']
+                    estate_loss = loss_rupiah(shortfall(cube, selected_yr, estate_code), cpo_price)
+                    estate_blocks = int(estate_kpi_row['records'])
+                    estate_gap_pct = estate_kpi_row['avg_gap_pct']  # Mean gap_pct_ton
                     
                     estate_breakdown.append({
                         'estate': estate_code,
@@ -404,42 +362,43 @@ if selected_year == 'All Years' and selected_estate == 'All':
             # BAR CHART - Estate Loss Comparison
             st.markdown(f"### Estate Loss Breakdown - Year {selected_yr}")
             
-            fig_estate = go.Figure()
+            with span('executive.chart.estate_loss'):
+                fig_estate = go.Figure()
             
-            for item in estate_breakdown:
-                fig_estate.add_trace(go.Bar(
-                    y=[item['estate']],
-                    x=[item['loss']],
-                    orientation='h',
-                    name=item['estate'],
-                    text=[f"Rp {item['loss']:.1f} M"],
-                    textposition='auto',
-                    marker=dict(
-                        color=item['color'],
-                        line=dict(color='rgba(255,255,255,0.5)', width=2)
-                    ),
-                    hovertemplate='<b>%{y}</b><br>Loss: Rp %{x:.2f}M<extra></extra>'
-                ))
+                for item in estate_breakdown:
+                    fig_estate.add_trace(go.Bar(
+                        y=[item['estate']],
+                        x=[item['loss']],
+                        orientation='h',
+                        name=item['estate'],
+                        text=[f"Rp {item['loss']:.1f} M"],
+                        textposition='auto',
+                        marker=dict(
+                            color=item['color'],
+                            line=dict(color='rgba(255,255,255,0.5)', width=2)
+                        ),
+                        hovertemplate='<b>%{y}</b><br>Loss: Rp %{x:.2f}M<extra></extra>'
+                    ))
             
-            fig_estate.update_layout(
-                showlegend=False,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white', size=14),
-                xaxis=dict(
-                    title="Loss (Rp Milyar = Billion)",
-                    gridcolor='rgba(255,255,255,0.1)',
-                    showgrid=True
-                ),
-                yaxis=dict(
-                    title="",
-                    showgrid=False
-                ),
-                height=250,
-                margin=dict(l=80, r=20, t=20, b=60)
-            )
+                fig_estate.update_layout(
+                    showlegend=False,
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='white', size=14),
+                    xaxis=dict(
+                        title="Loss (Rp Milyar = Billion)",
+                        gridcolor='rgba(255,255,255,0.1)',
+                        showgrid=True
+                    ),
+                    yaxis=dict(
+                        title="",
+                        showgrid=False
+                    ),
+                    height=250,
+                    margin=dict(l=80, r=20, t=20, b=60)
+                )
             
-            st.plotly_chart(fig_estate, use_container_width=True)
+                st.plotly_chart(fig_estate, use_container_width=True)
             
             # DETAILED METRICS - 3 cards
             st.markdown("---")
@@ -484,14 +443,7 @@ if selected_year == 'All Years' and selected_estate == 'All':
                 # Calculate ganoderma per estate for 2025
                 gano_estate_cards = []
                 for estate_code in ['AME', 'OLE', 'DBE']:
-                    df_estate_blocks = df_selected_year[df_selected_year['estate'] == estate_code]
-                    block_ids = df_estate_blocks['block_id'].unique()
-                    df_gano_estate = df_gano[df_gano['block_id'].isin(block_ids)]
-                    
-                    if len(df_gano_estate) > 0:
-                        avg_gano = df_gano_estate['pct_serangan'].mean() * 100
-                    else:
-                        avg_gano = 0
+                    avg_gano = totals(cube, selected_yr, estate_code)['gano_pct']
                     
                     gano_estate_cards.append({
                         'estate': estate_code,
@@ -508,9 +460,16 @@ if selected_year == 'All Years' and selected_estate == 'All':
                             delta="Attack Rate",
                             delta_color="off"
                         )
+
+if selected_year == 'All Years' and selected_estate == 'All':
+    sections.start('loss_overview')
+    st.markdown("---")
+    render_loss_overview(cube, total_gap, total_production_target)
+    
     
     
     # GANODERMA ATTACK RATE SECTION - Per Estate (Foundation for Division/Block Drilldown)
+    sections.start('ganoderma')
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("### 🦠 Ganoderma Attack Rate by Estate")
     st.markdown("<p style='color: #9ca3af; font-size: 0.9em;'>📊 Data from 2025 field survey | Click estate for division breakdown (coming soon)</p>", unsafe_allow_html=True)
@@ -520,20 +479,10 @@ if selected_year == 'All Years' and selected_estate == 'All':
     gano_blocks_count = {}
     
     for estate_code in ['AME', 'OLE', 'DBE']:
-        # Get blocks for this estate from main dataframe
-        df_estate_blocks = df[df['estate'] == estate_code]
-        block_ids = df_estate_blocks['block_id'].unique()
-        
-        # Get ganoderma data for these blocks
-        df_gano_estate = df_gano[df_gano['block_id'].isin(block_ids)]
-        
-        if len(df_gano_estate) > 0:
-            avg_gano_pct = df_gano_estate['pct_serangan'].mean() * 100
-            gano_by_estate[estate_code] = avg_gano_pct
-            gano_blocks_count[estate_code] = len(df_gano_estate)
-        else:
-            gano_by_estate[estate_code] = 0
-            gano_blocks_count[estate_code] = 0
+        # Survey rows of this estate's blocks, from the cube
+        estate_kpi = totals(cube, ALL_YEARS, estate_code)
+        gano_by_estate[estate_code] = estate_kpi['gano_pct']
+        gano_blocks_count[estate_code] = int(estate_kpi['gano_blocks'])
     
     # Display as 3 columns with gradient cards
     col_ame, col_ole, col_dbe = st.columns(3)
@@ -589,207 +538,137 @@ if selected_year == 'All Years' and selected_estate == 'All':
                 st.session_state.selected_gano_estate = None
                 st.rerun()
             
-            # Get estate_id from estates table
-            estate_row = df_estates[df_estates['estate_code'] == sel_estate]
-            if len(estate_row) > 0:
-                estate_id = estate_row['id'].values[0]
+            # Drill-down lookups on the prebuilt Ganoderma index (no per-click filtering),
+            # loaded only once the drill-down is opened
+            gano_index = load_gano_index(table_versions(supabase, GANO_TABLES))
+            n_divisions = division_count(gano_index, sel_estate)
+            if n_divisions is None:
+                st.error(f"Estate {sel_estate} not found")
+            elif n_divisions == 0:
+                st.warning(f"No divisions found for {sel_estate}")
+            else:
+                st.write(f"**{n_divisions} divisions in {sel_estate}**")
                 
-                # Get divisions for this estate from divisions table (CLEAN!)
-                estate_divisions = df_divisions[df_divisions['estate_id'] == estate_id]
+                # Division stats, sorted by attack rate descending
+                div_stats = estate_divisions(gano_index, sel_estate)
                 
-                if len(estate_divisions) > 0:
-                    st.write(f"**{len(estate_divisions)} divisions in {sel_estate}**")
+                if len(div_stats) > 0:
+                    # Initialize session state for selected division
+                    if 'selected_gano_division' not in st.session_state:
+                        st.session_state.selected_gano_division = None
                     
-                    # For each division, calculate ganoderma stats
-                    div_stats = []
-                    for _, div_row in estate_divisions.iterrows():
-                        # Get blocks in this division using division_id
-                        div_blocks = df_blocks[df_blocks['division_id'] == div_row['id']]
-                        block_ids = div_blocks['id'].tolist()
-                        
-                        # Get ganoderma data for these blocks
-                        div_gano = df_gano[df_gano['block_id'].isin(block_ids)]
-                        
-                        if len(div_gano) > 0:
-                            avg_rate = div_gano['pct_serangan'].mean() * 100
-                            div_stats.append({
-                                'division': div_row['division_code'],
-                                'attack_rate': avg_rate,
-                                'block_count': len(div_gano)
-                            })
+                    severity_icons = {'CRITICAL': "🔴", 'HIGH': "🟠", 'MEDIUM': "🟡", 'LOW': "🟢"}
                     
-                    if div_stats:
-                        # Sort by attack rate descending
-                        div_stats = sorted(div_stats, key=lambda x: x['attack_rate'], reverse=True)
+                    # Display division cards - CLICKABLE
+                    div_records = div_stats.to_dict('records')
+                    cols_per_row = 5
+                    for i in range(0, len(div_records), cols_per_row):
+                        cols = st.columns(cols_per_row)
+                        for j in range(min(cols_per_row, len(div_records) - i)):
+                            row = div_records[i + j]
+                            with cols[j]:
+                                rate = row['attack_rate']
+                                icon = severity_icons[row['severity']]
+                                
+                                # Clickable button for division
+                                if st.button(
+                                    f"{icon} {row['division_code']}\n{rate:.1f}%\n{int(row['block_count'])} blk",
+                                    key=f"div_{row['division_code']}",
+                                    use_container_width=True,
+                                    help="Click to see blocks"
+                                ):
+                                    st.session_state.selected_gano_division = row['division_code']
+                                    st.rerun()
+                    
+                    # Block-level breakdown if division selected
+                    if st.session_state.selected_gano_division:
+                        sel_division = st.session_state.selected_gano_division
                         
-                        # Initialize session state for selected division
-                        if 'selected_gano_division' not in st.session_state:
-                            st.session_state.selected_gano_division = None
+                        st.markdown("---")
+                        st.markdown(f"### 📦 Block Breakdown - {sel_division}")
                         
-                        # Display division cards - CLICKABLE
-                        cols_per_row = 5
-                        for i in range(0, len(div_stats), cols_per_row):
-                            cols = st.columns(cols_per_row)
-                            for j in range(min(cols_per_row, len(div_stats) - i)):
-                                row = div_stats[i + j]
-                                with cols[j]:
-                                    rate = row['attack_rate']
-                                    
-                                    # Color coding
-                                    if rate >= 15:
-                                        label = "CRITICAL"
-                                        icon = "🔴"
-                                    elif rate >= 10:
-                                        label = "HIGH"
-                                        icon = "🟠"
-                                    elif rate >= 5:
-                                        label = "MEDIUM"
-                                        icon = "🟡"
-                                    else:
-                                        label = "LOW"
-                                        icon = "🟢"
-                                    
-                                    # Clickable button for division
-                                    if st.button(
-                                        f"{icon} {row['division']}\n{rate:.1f}%\n{int(row['block_count'])} blk",
-                                        key=f"div_{row['division']}",
-                                        use_container_width=True,
-                                        help="Click to see blocks"
-                                    ):
-                                        st.session_state.selected_gano_division = row['division']
-                                        st.rerun()
+                        col_close, col_back = st.columns([6, 1])
+                        with col_back:
+                            if st.button("⬅️ Back", key="back_to_divisions"):
+                                st.session_state.selected_gano_division = None
+                                st.rerun()
                         
-                        # Block-level breakdown if division selected
-                        if st.session_state.selected_gano_division:
-                            sel_division = st.session_state.selected_gano_division
-                            
+                        # Block stats, sorted by attack rate descending (initial)
+                        block_stats = division_blocks(gano_index, sel_estate, sel_division)
+                        
+                        if len(block_stats) > 0:
+                            # SEARCH & FILTER CONTROLS
                             st.markdown("---")
-                            st.markdown(f"### 📦 Block Breakdown - {sel_division}")
+                            col_search, col_severity, col_sort = st.columns([3, 2, 2])
                             
-                            col_close, col_back = st.columns([6, 1])
-                            with col_back:
-                                if st.button("⬅️ Back", key="back_to_divisions"):
-                                    st.session_state.selected_gano_division = None
-                                    st.rerun()
+                            with col_search:
+                                search_term = st.text_input(
+                                    "🔍 Search Block Code",
+                                    key=f"search_{sel_division}",
+                                    placeholder="e.g. A001, B002..."
+                                )
                             
-                            # Get division_id
-                            div_row = estate_divisions[estate_divisions['division_code'] == sel_division]
-                            if len(div_row) > 0:
-                                division_id = div_row.iloc[0]['id']
-                                
-                                # Get blocks in this division
-                                div_blocks_df = df_blocks[df_blocks['division_id'] == division_id]
-                                
-                                # Get ganoderma data for these blocks
-                                block_stats = []
-                                for _, block_row in div_blocks_df.iterrows():
-                                    block_gano = df_gano[df_gano['block_id'] == block_row['id']]
-                                    
-                                    if len(block_gano) > 0:
-                                        block_rate = block_gano['pct_serangan'].values[0] * 100
-                                        stadium_1_2 = block_gano['serangan_ganoderma_pkk_stadium_1_2'].values[0]
-                                        stadium_3_4 = block_gano['stadium_3_4'].values[0]
-                                        
-                                        # Handle NaN values
-                                        stadium_1_2 = 0 if pd.isna(stadium_1_2) else int(stadium_1_2)
-                                        stadium_3_4 = 0 if pd.isna(stadium_3_4) else int(stadium_3_4)
-                                        
-                                        block_stats.append({
-                                            'block_code': block_row['block_code'],
-                                            'attack_rate': block_rate,
-                                            'stadium_1_2': stadium_1_2,
-                                            'stadium_3_4': stadium_3_4,
-                                            'total_infected': stadium_1_2 + stadium_3_4
-                                        })
+                            with col_severity:
+                                severity_filter = st.selectbox(
+                                    "Filter by Severity",
+                                    ["All", "Critical (≥15%)", "High (≥10%)", "Medium (≥5%)", "Low (<5%)"],
+                                    key=f"severity_{sel_division}"
+                                )
+                            
+                            with col_sort:
+                                sort_by = st.selectbox(
+                                    "Sort by",
+                                    ["Attack Rate ↓", "Attack Rate ↑", "Block Code A-Z", "Block Code Z-A"],
+                                    key=f"sort_{sel_division}"
+                                )
+                            
+                            # Apply filters
+                            filtered_blocks = block_stats
+                            
+                            # Search filter
+                            if search_term:
+                                filtered_blocks = filtered_blocks[
+                                    filtered_blocks['block_code'].str.upper().str.contains(search_term.upper(), regex=False)
+                                ]
+                            
+                            # Severity filter
+                            if severity_filter != "All":
+                                filtered_blocks = filtered_blocks[filtered_blocks['severity'] == severity_filter.split(' ')[0].upper()]
+                            
+                            # Sort
+                            sort_options = {
+                                "Attack Rate ↓": ('attack_rate', False),
+                                "Attack Rate ↑": ('attack_rate', True),
+                                "Block Code A-Z": ('block_code', True),
+                                "Block Code Z-A": ('block_code', False),
+                            }
+                            sort_col, ascending = sort_options[sort_by]
+                            filtered_blocks = filtered_blocks.sort_values(sort_col, ascending=ascending, kind='stable')
+                            
+                            # Display results count
+                            st.write(f"**Showing {len(filtered_blocks)} of {len(block_stats)} blocks**")
+                            
+                            if len(filtered_blocks) > 0:
+                                severity_colors = {
+                                    'CRITICAL': "#b91c1c",  # Solid red
+                                    'HIGH': "#c2410c",      # Solid orange
+                                    'MEDIUM': "#d97706",    # Solid amber
+                                    'LOW': "#059669"        # Solid green
+                                }
                                 
-                                if block_stats:
-                                    # Sort by attack rate descending (initial)
-                                    block_stats = sorted(block_stats, key=lambda x: x['attack_rate'], reverse=True)
-                                    
-                                    # SEARCH & FILTER CONTROLS
-                                    st.markdown("---")
-                                    col_search, col_severity, col_sort = st.columns([3, 2, 2])
-                                    
-                                    with col_search:
-                                        search_term = st.text_input(
-                                            "🔍 Search Block Code",
-                                            key=f"search_{sel_division}",
-                                            placeholder="e.g. A001, B002..."
-                                        )
-                                    
-                                    with col_severity:
-                                        severity_filter = st.selectbox(
-                                            "Filter by Severity",
-                                            ["All", "Critical (≥15%)", "High (≥10%)", "Medium (≥5%)", "Low (<5%)"],
-                                            key=f"severity_{sel_division}"
-                                        )
-                                    
-                                    with col_sort:
-                                        sort_by = st.selectbox(
-                                            "Sort by",
-                                            ["Attack Rate ↓", "Attack Rate ↑", "Block Code A-Z", "Block Code Z-A"],
-                                            key=f"sort_{sel_division}"
-                                        )
-                                    
-                                    # Apply filters
-                                    filtered_blocks = block_stats.copy()
-                                    
-                                    # Search filter
-                                    if search_term:
-                                        filtered_blocks = [
-                                            b for b in filtered_blocks 
-                                            if search_term.upper() in b['block_code'].upper()
-                                        ]
-                                    
-                                    # Severity filter
-                                    if severity_filter != "All":
-                                        if "Critical" in severity_filter:
-                                            filtered_blocks = [b for b in filtered_blocks if b['attack_rate'] >= 15]
-                                        elif "High" in severity_filter:
-                                            filtered_blocks = [b for b in filtered_blocks if 10 <= b['attack_rate'] < 15]
-                                        elif "Medium" in severity_filter:
-                                            filtered_blocks = [b for b in filtered_blocks if 5 <= b['attack_rate'] < 10]
-                                        elif "Low" in severity_filter:
-                                            filtered_blocks = [b for b in filtered_blocks if b['attack_rate'] < 5]
-                                    
-                                    # Sort
-                                    if sort_by == "Attack Rate ↓":
-                                        filtered_blocks = sorted(filtered_blocks, key=lambda x: x['attack_rate'], reverse=True)
-                                    elif sort_by == "Attack Rate ↑":
-                                        filtered_blocks = sorted(filtered_blocks, key=lambda x: x['attack_rate'])
-                                    elif sort_by == "Block Code A-Z":
-                                        filtered_blocks = sorted(filtered_blocks, key=lambda x: x['block_code'])
-                                    elif sort_by == "Block Code Z-A":
-                                        filtered_blocks = sorted(filtered_blocks, key=lambda x: x['block_code'], reverse=True)
-                                    
-                                    # Display results count
-                                    st.write(f"**Showing {len(filtered_blocks)} of {len(block_stats)} blocks**")
-                                    
-                                    if len(filtered_blocks) > 0:
-                                        # Display block cards - 4 per row for stadium details
-                                        cols_per_row = 4
-                                        for i in range(0, len(filtered_blocks), cols_per_row):
-                                            cols = st.columns(cols_per_row)
-                                            for j in range(min(cols_per_row, len(filtered_blocks) - i)):
-                                                block = filtered_blocks[i + j]
-                                                with cols[j]:
-                                                    rate = block['attack_rate']
-                                                    
-                                                    # Color coding - solid colors
-                                                    if rate >= 15:
-                                                        bg_color = "#b91c1c"  # Solid red
-                                                        label = "CRITICAL"
-                                                    elif rate >= 10:
-                                                        bg_color = "#c2410c"  # Solid orange
-                                                        label = "HIGH"
-                                                    elif rate >= 5:
-                                                        bg_color = "#d97706"  # Solid amber
-                                                        label = "MEDIUM"
-                                                    else:
-                                                        bg_color = "#059669"  # Solid green
-                                                        label = "LOW"
-                                                    
-                                                    html_card = f"""
+                                # Display block cards - 4 per row for stadium details
+                                block_records = filtered_blocks.to_dict('records')
+                                cols_per_row = 4
+                                for i in range(0, len(block_records), cols_per_row):
+                                    cols = st.columns(cols_per_row)
+                                    for j in range(min(cols_per_row, len(block_records) - i)):
+                                        block = block_records[i + j]
+                                        with cols[j]:
+                                            rate = block['attack_rate']
+                                            label = block['severity']
+                                            bg_color = severity_colors[label]
+                                            
+                                            html_card = f"""
 <div style="background: {bg_color}; padding: 14px; border-radius: 8px; text-align: center; border: 1px solid rgba(255,255,255,0.2); box-shadow: 0 2px 4px rgba(0,0,0,0.3);">
     <p style="color: white; margin: 0; font-size: 1.1em; font-weight: bold;">{block['block_code']}</p>
     <p style="color: white; font-size: 2.2em; font-weight: bold; margin: 10px 0;">{rate:.1f}%</p>
@@ -801,17 +680,13 @@ if selected_year == 'All Years' and selected_estate == 'All':
     </div>
 </div>
 """
-                                                    st.markdown(html_card, unsafe_allow_html=True)
-                                    else:
-                                        st.info("No blocks match your filter criteria")
-                                else:
-                                    st.info(f"No ganoderma data for blocks in {sel_division}")
-                    else:
-                        st.info(f"No ganoderma data for divisions in {sel_estate}")
+                                            st.markdown(html_card, unsafe_allow_html=True)
+                            else:
+                                st.info("No blocks match your filter criteria")
+                        else:
+                            st.info(f"No ganoderma data for blocks in {sel_division}")
                 else:
-                    st.warning(f"No divisions found for {sel_estate}")
-            else:
-                st.error(f"Estate {sel_estate} not found")
+                    st.info(f"No ganoderma data for divisions in {sel_estate}")
     
     
     st.markdown("---")
@@ -820,6 +695,7 @@ if selected_year == 'All Years' and selected_estate == 'All':
 # ============================================================================
 # SUPPORTING METRICS (4 columns)
 # ============================================================================
+sections.start('kpis')
 st.subheader("Key Performance Indicators")
 
 col1, col2, col3, col4 = st.columns(4)
@@ -850,7 +726,7 @@ with col4:
     st.metric(
         "Risk Exposure",
         f"{total_risk_blocks} Blocks",
-        delta=f"{(total_risk_blocks/len(df_filtered)*100):.1f}% of portfolio",
+        delta=f"{(total_risk_blocks/kpi['records']*100):.1f}% of portfolio",
         delta_color="inverse"
     )
 
@@ -859,94 +735,127 @@ st.markdown("---")
 # ============================================================================
 # ESTATE PERFORMANCE HEATMAP
 # ============================================================================
+sections.start('heatmap')
 st.header("🔥 Estate Performance Heatmap (2023-2025)")
 
 # Calculate achievement % by estate and year
-heatmap_data = df.groupby(['estate', 'year']).agg({
-    'real_ton': 'sum',
-    'potensi_ton': 'sum'
-}).reset_index()
+heatmap_data = breakdown(cube, ['estate', 'year'])
 heatmap_data['achievement_pct'] = (heatmap_data['real_ton'] / heatmap_data['potensi_ton'] * 100).round(1)
 
 # Pivot for heatmap
 heatmap_pivot = heatmap_data.pivot(index='estate', columns='year', values='achievement_pct')
 
 # Create heatmap
-fig_heatmap = px.imshow(
-    heatmap_pivot,
-    labels=dict(x="Year", y="Estate", color="Achievement %"),
-    x=heatmap_pivot.columns,
-    y=heatmap_pivot.index,
-    color_continuous_scale='RdYlGn',
-    color_continuous_midpoint=100,
-    text_auto='.1f'
-)
+with span('executive.chart.heatmap'):
+    fig_heatmap = px.imshow(
+        heatmap_pivot,
+        labels=dict(x="Year", y="Estate", color="Achievement %"),
+        x=heatmap_pivot.columns,
+        y=heatmap_pivot.index,
+        color_continuous_scale='RdYlGn',
+        color_continuous_midpoint=100,
+        text_auto='.1f'
+    )
 
-fig_heatmap.update_layout(
-    title="Estate Performance Trends - Are We Improving?",
-    height=300
-)
+    fig_heatmap.update_layout(
+        title="Estate Performance Trends - Are We Improving?",
+        height=300
+    )
 
-st.plotly_chart(fig_heatmap, use_container_width=True)
+    st.plotly_chart(fig_heatmap, use_container_width=True)
 
 # ============================================================================
-# SECTION 3: RISK DISTRIBUTION
+# MONTHLY TREND (production_monthly, loaded on demand)
 # ============================================================================
-st.header("⚠️ Risk Distribution Analysis")
+TREND_METRICS = {
+    'Production (Ton)': 'real_ton',
+    'Target (Ton)': 'potensi_ton',
+    'Gap (Ton)': 'gap_ton',
+}
+TREND_VIEWS = {'Monthly': 'monthly', 'Rolling 3 Months': 'rolling', 'Year to Date': 'ytd'}
+
+@st.fragment
+@timed('executive.fragment.monthly_trend')
+def render_monthly_trend(selected_year, selected_estate):
+    """Trend lines per estate (per division inside one estate) - the controls rerun only this fragment"""
+    if not st.toggle("Show monthly trend", key='show_monthly_trend'):
+        st.caption("📊 Monthly production per estate/division - loaded when switched on")
+        return
+
+    store = load_monthly_store(table_versions(supabase, MONTHLY_TABLES))
+
+    col_metric, col_view = st.columns([1, 2])
+    with col_metric:
+        metric_label = st.selectbox("Metric", list(TREND_METRICS), key='trend_metric')
+    with col_view:
+        view_label = st.radio("View", list(TREND_VIEWS), horizontal=True, key='trend_view')
+    metric = TREND_METRICS[metric_label]
+
+    # Portfolio: one line per estate | one estate: one line per division
+    by = 'estate' if selected_estate == 'All' else 'division'
+    trend = trend_frame(store, metric, by=by, estate=selected_estate, view=TREND_VIEWS[view_label])
+    if selected_year != 'All Years':
+        # Rolling/YTD were computed on the full history, so January still sees December
+        trend = trend[trend['period'].dt.year == selected_year]
+
+    if trend.empty:
+        st.info(f"No monthly data for {selected_estate} in {selected_year}")
+        return
+
+    with span('executive.chart.monthly_trend'):
+        fig_trend = px.line(
+            trend,
+            x='period',
+            y='value',
+            color='group',
+            markers=True,
+            labels={'period': 'Month', 'value': f"{metric_label} - {view_label}", 'group': by.capitalize()},
+            title=f"{metric_label} per {by.capitalize()} - {view_label}"
+        )
+        if metric == 'gap_ton':
+            fig_trend.add_hline(y=0, line_dash='dash', line_color='gray')
+        fig_trend.update_layout(height=400, hovermode='x unified')
+        st.plotly_chart(fig_trend, use_container_width=True)
+
+    if metric != 'gap_ton':
+        # Seasonal index: average calendar month as % of the average month, over all years
+        labels, group_series = group_totals(store, metric, by=by, estate=selected_estate)
+        season = pd.DataFrame(seasonal_index(group_series).T, index=MONTH_LABELS, columns=labels)
+        season = season.reset_index().melt(id_vars='index', var_name='group', value_name='index_pct')
+        with span('executive.chart.seasonal_index'):
+            fig_season = px.line(
+                season.dropna(subset=['index_pct']),
+                x='index',
+                y='index_pct',
+                color='group',
+                markers=True,
+                labels={'index': 'Month', 'index_pct': 'Seasonal Index (100 = average month)', 'group': by.capitalize()},
+                title=f"Seasonal Pattern {min(store['years'])}-{max(store['years'])}"
+            )
+            fig_season.add_hline(y=100, line_dash='dash', line_color='gray')
+            fig_season.update_layout(height=320)
+            st.plotly_chart(fig_season, use_container_width=True)
 
-col1, col2 = st.columns(2)
+sections.start('monthly_trend')
+st.header("📈 Monthly Production Trend")
+render_monthly_trend(selected_year, selected_estate)
 
-with col1:
-    # Risk categorization
-    def categorize_risk(gap_pct):
-        if pd.isna(gap_pct):
-            return 'Unknown'
-        elif gap_pct < -20:
-            return '🔴 Critical (< -20%)'
-        elif gap_pct < -10:
-            return '🟠 High (-10% to -20%)'
-        elif gap_pct < 0:
-            return '🟡 Medium (0% to -10%)'
-        else:
-            return '🟢 On Target (≥ 0%)'
-    
-    df_filtered['risk_category'] = df_filtered['gap_pct_ton'].apply(categorize_risk)
-    
-    # Count by risk
-    risk_counts = df_filtered['risk_category'].value_counts().reset_index()
-    risk_counts.columns = ['Risk Category', 'Count']
-    
-    # Pie chart
-    fig_pie = px.pie(
-        risk_counts,
-        values='Count',
-        names='Risk Category',
-        title=f'Block Risk Distribution ({year_label})',
-        color='Risk Category',
-        color_discrete_map={
-            '🔴 Critical (< -20%)': '#EF4444',
-            '🟠 High (-10% to -20%)': '#F97316',
-            '🟡 Medium (0% to -10%)': '#EAB308',
-            '🟢 On Target (≥ 0%)': '#10B981'
-        }
-    )
-    
-    st.plotly_chart(fig_pie, use_container_width=True)
 
-with col2:
-    # Financial impact
-    st.subheader("💰 Financial Impact Estimate")
-    
+@st.fragment
+@timed('executive.fragment.financial_impact')
+def render_financial_impact(total_gap):
+    """Opportunity loss for the selection - the price input reruns only this card"""
     # Assume CPO price (Crude Palm Oil)
     cpo_price = st.number_input(
         "CPO Price (Rp/Ton)",
         value=2_500_000,
         step=100_000,
-        format="%d"
+        format="%d",
+        key='cpo_price_ton'
     )
     
-    # Calculate opportunity loss
-    opportunity_loss = abs(total_gap) * cpo_price if total_gap < 0 else 0
+    # Calculate opportunity loss (price × precomputed shortfall, no data access)
+    opportunity_loss = loss_rupiah(abs(total_gap) if total_gap < 0 else 0, cpo_price)
     
     st.metric(
         "Opportunity Loss from Gap",
@@ -963,20 +872,72 @@ with col2:
     *This represents unrealized revenue if we achieved 100% of target.*
     """)
 
+
+# ============================================================================
+# SECTION 3: RISK DISTRIBUTION
+# ============================================================================
+sections.start('risk')
+st.header("⚠️ Risk Distribution Analysis")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    # Risk categorization (bucket counts precomputed in the cube)
+    risk_labels = {
+        'critical': '🔴 Critical (< -20%)',
+        'high': '🟠 High (-10% to -20%)',
+        'medium': '🟡 Medium (0% to -10%)',
+        'on_target': '🟢 On Target (≥ 0%)',
+        'unknown': 'Unknown'
+    }
+    
+    # Count by risk
+    risk_counts = pd.DataFrame({
+        'Risk Category': list(risk_labels.values()),
+        'Count': [int(kpi[bucket]) for bucket in risk_labels]
+    })
+    risk_counts = risk_counts[risk_counts['Count'] > 0].sort_values('Count', ascending=False)
+    
+    # Pie chart
+    with span('executive.chart.risk_distribution'):
+        fig_pie = px.pie(
+            risk_counts,
+            values='Count',
+            names='Risk Category',
+            title=f'Block Risk Distribution ({year_label})',
+            color='Risk Category',
+            color_discrete_map={
+                '🔴 Critical (< -20%)': '#EF4444',
+                '🟠 High (-10% to -20%)': '#F97316',
+                '🟡 Medium (0% to -10%)': '#EAB308',
+                '🟢 On Target (≥ 0%)': '#10B981'
+            }
+        )
+    
+        st.plotly_chart(fig_pie, use_container_width=True)
+
+with col2:
+    # Financial impact
+    st.subheader("💰 Financial Impact Estimate")
+    
+    render_financial_impact(total_gap)
+
 st.markdown("---")
 
 # ============================================================================
 # SECTION 4: TOP & BOTTOM PERFORMERS
 # ============================================================================
+sections.start('performers')
 st.header("🏆 Top & Bottom Performers")
 
+# Performer lists come with the cube only on the client-side path; from the views they load here
+performer_cube = cube if cube['performers'] is not None else dict(cube, performers=load_performer_rows())
+
 col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("✅ Top 10 Best Performers")
-    top_10 = df_filtered.nlargest(10, 'gap_pct_ton')[
-        ['block_code', 'estate', 'real_ton', 'gap_pct_ton']
-    ].copy()
+    top_10 = performers(performer_cube, 'top', cube_year, selected_estate)
     top_10.columns = ['Block', 'Estate', 'Production (Ton)', 'Gap %']
     top_10['Gap %'] = top_10['Gap %'].round(1)
     top_10['Production (Ton)'] = top_10['Production (Ton)'].round(0)
@@ -984,9 +945,7 @@ with col1:
 
 with col2:
     st.subheader("❌ Bottom 10 Worst Performers")
-    bottom_10 = df_filtered.nsmallest(10, 'gap_pct_ton')[
-        ['block_code', 'estate', 'real_ton', 'gap_pct_ton']
-    ].copy()
+    bottom_10 = performers(performer_cube, 'bottom', cube_year, selected_estate)
     bottom_10.columns = ['Block', 'Estate', 'Production (Ton)', 'Gap %']
     bottom_10['Gap %'] = bottom_10['Gap %'].round(1)
     bottom_10['Production (Ton)'] = bottom_10['Production (Ton)'].round(0)
@@ -1011,8 +970,10 @@ st.markdown(f"""
 **Dashboard Info:**
 - Data Source: Supabase Production Database
 - Last Updated: Real-time
-- Total Records Analyzed: {len(df_filtered):,}
+- Total Records Analyzed: {int(kpi['records']):,}
 - Coverage: {selected_year} | {selected_estate}
 """)
 
 st.markdown("*Built with Streamlit + Python | © 2026 PT SR Analytics*")
+
+sections.finish()
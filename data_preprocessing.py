@@ -10,16 +10,132 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import warnings
+from excel_cache import file_digest, read_excel_cached
+from sheet_layout import detect_layout, read_with_layout
 warnings.filterwarnings('ignore')
 
+TYPE_SCHEMA_FILE = 'output/data_types_schema.json'
+
+BOOLEAN_VALUES = {
+    'yes': True, 'no': False,
+    'true': True, 'false': False,
+    '1': True, '0': False,
+    'ya': True, 'tidak': False
+}
+
+
+def infer_column_types(df, sample_size=10):
+    """
+    Klasifikasi semua kolom sekaligus: numeric / datetime / boolean / string.
+
+    Semua kolom diperiksa dalam satu Series panjang (N nilai non-null pertama
+    per kolom), bukan try/except per kolom. Aturannya sama seperti sebelumnya:
+    numeric/datetime jika semua nilai sample bisa di-parse (datetime per kolom,
+    format ditebak dari nilai pertama seperti pd.to_datetime default), boolean
+    jika semua nilai kolom termasuk yes/no/true/false/1/0/ya/tidak. Kolom
+    kosong dilewati.
+    """
+    if df.shape[1] == 0:
+        return {}
+
+    # Posisi kolom sebagai key, supaya nama kolom duplikat tetap aman
+    positional = df.set_axis(range(df.shape[1]), axis=1)
+    notna = positional.notna()
+    non_empty = notna.any()
+    if not non_empty.any():
+        return {}
+
+    in_sample = notna & (notna.cumsum() <= sample_size)
+    sample = positional.where(in_sample).stack()
+    text = sample.astype(str).str.strip()
+    col_of = text.index.get_level_values(1)
+
+    is_numeric = pd.to_numeric(text, errors='coerce').notna().groupby(col_of).all()
+    remaining = is_numeric.index[~is_numeric]
+
+    is_datetime = pd.Series(False, index=remaining)
+    if len(remaining):
+        # Per kolom: satu format per kolom, bukan per nilai (format='mixed' lebih longgar)
+        rest = text[col_of.isin(remaining)]
+        is_datetime = rest.groupby(rest.index.get_level_values(1)).apply(
+            lambda values: pd.to_datetime(values, errors='coerce').notna().all())
+    remaining = is_datetime.index[~is_datetime]
+
+    is_boolean = pd.Series(False, index=remaining)
+    if len(remaining):
+        values = positional[list(remaining)].stack().astype(str).str.strip().str.lower()
+        is_boolean = values.isin(list(BOOLEAN_VALUES)).groupby(values.index.get_level_values(1)).all()
+
+    types = {}
+    for pos in np.flatnonzero(non_empty.to_numpy()):
+        if is_numeric.get(pos, False):
+            types[df.columns[pos]] = 'numeric'
+        elif is_datetime.get(pos, False):
+            types[df.columns[pos]] = 'datetime'
+        elif is_boolean.get(pos, False):
+            types[df.columns[pos]] = 'boolean'
+        else:
+            types[df.columns[pos]] = 'string'
+    return types
+
+
+def apply_column_types(df, types):
+    """Terapkan hasil infer / schema tersimpan ke DataFrame"""
+    df = df.copy()
+    for col, dtype in types.items():
+        if col not in df.columns:
+            continue
+        if dtype == 'numeric':
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        elif dtype == 'datetime':
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        elif dtype == 'boolean':
+            df[col] = df[col].astype(str).str.strip().str.lower().map(BOOLEAN_VALUES).where(df[col].notna())
+    return df
+
+
+def load_type_schema(path=TYPE_SCHEMA_FILE, source=None, digest=None):
+    """
+    {nama_kolom: tipe} dari run sebelumnya. {} jika belum ada, atau jika
+    schema dibuat dari file lain / isi file yang berbeda (digest) - tipe lama
+    bisa salah (kolom angka jadi teks → to_numeric membuat semuanya NaN).
+    """
+    import json
+    import os
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    if source is not None and (schema.get('source') != source or schema.get('digest') != digest):
+        return {}
+    return schema.get('columns', {})
+
+
+def save_type_schema(path, types, source, sample_size, digest=None):
+    import json
+    import os
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'source': source,
+            'digest': digest,
+            'sample_size': sample_size,
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'columns': types,
+        }, f, indent=2, ensure_ascii=False)
+
+
 class DataPreprocessor:
     """
     Kelas untuk melakukan normalisasi dan pre-processing data
     dengan pendekatan best practices
     """
     
-    def __init__(self, input_file):
+    def __init__(self, input_file, schema_file=TYPE_SCHEMA_FILE, type_sample_size=10, reinfer_types=False):
         self.input_file = input_file
+        self.schema_file = schema_file
+        self.type_sample_size = type_sample_size
+        self.reinfer_types = reinfer_types
         self.df_raw = None
         self.df_clean = None
         self.preprocessing_report = {}
@@ -33,7 +149,7 @@ class DataPreprocessor:
         # Coba baca dengan beberapa metode untuk menangani header yang kompleks
         try:
             # Metode 1: Baca dengan skiprows untuk skip header yang tidak relevan
-            self.df_raw = pd.read_excel(self.input_file, skiprows=0)
+            self.df_raw = read_excel_cached(self.input_file, skiprows=0)
             print(f"✓ Data berhasil dimuat: {self.df_raw.shape[0]} baris x {self.df_raw.shape[1]} kolom")
             
             # Simpan snapshot data mentah
@@ -86,22 +202,17 @@ class DataPreprocessor:
         print("TAHAP 3: PERBAIKAN HEADER/KOLOM")
         print("=" * 80)
         
-        # Identifikasi baris yang sebenarnya adalah header
-        # Biasanya di baris 4-5 berdasarkan output sebelumnya
-        
-        # Strategi: Baca ulang dengan header yang tepat
+        # Header multi-baris (kategori / sub / kode) dideteksi oleh sheet_layout;
+        # layout di-cache per hash workbook, jadi run berikutnya tidak scan ulang
         try:
-            # Coba deteksi baris header otomatis
-            df_test = pd.read_excel(self.input_file, header=None, nrows=10)
+            layout = detect_layout(self.input_file)
+            header_row = layout['header_row']
             
-            # Cari baris dengan konten yang paling banyak (kemungkinan header)
-            non_null_counts = df_test.count(axis=1)
-            header_row = non_null_counts.idxmax()
+            print(f"✓ Header terdeteksi di baris: {header_row} "
+                  f"(band {layout['band_rows']}, data mulai baris {layout['data_start']})")
             
-            print(f"✓ Header terdeteksi di baris: {header_row}")
-            
-            # Baca ulang dengan header yang benar
-            self.df_raw = pd.read_excel(self.input_file, header=header_row)
+            # Baca baris data saja, kolom diberi nama dari baris kode (K001, C001, ...)
+            self.df_raw, _ = read_with_layout(self.input_file, names='codes')
             
             # Bersihkan nama kolom
             self.df_raw.columns = [
@@ -116,6 +227,8 @@ class DataPreprocessor:
             
             self.preprocessing_report['header_fix'] = {
                 'header_row': header_row,
+                'data_start': layout['data_start'],
+                'layout_fingerprint': layout['fingerprint'],
                 'new_columns': list(self.df_raw.columns)
             }
             
@@ -166,62 +279,33 @@ class DataPreprocessor:
         }
     
     def handle_data_types(self):
-        """Konversi tipe data ke format yang sesuai"""
+        """Konversi tipe data ke format yang sesuai (schema tersimpan dipakai ulang)"""
         print("\n" + "=" * 80)
         print("TAHAP 5: KONVERSI TIPE DATA")
         print("=" * 80)
         
-        type_conversions = {}
+        # Pakai schema dari run sebelumnya (hanya untuk isi file yang sama); hanya kolom baru yang di-infer
+        digest = file_digest(self.input_file)
+        saved_types = {} if self.reinfer_types else load_type_schema(self.schema_file, self.input_file, digest)
+        if not saved_types and not self.reinfer_types and load_type_schema(self.schema_file):
+            print(f"⚠️  Schema {self.schema_file} dibuat dari versi file lain - tipe di-infer ulang")
+        known = {col: saved_types[str(col)] for col in self.df_raw.columns if str(col) in saved_types}
+        new_cols = [col for col in self.df_raw.columns if str(col) not in saved_types]
         
-        for col in self.df_raw.columns:
-            # Skip jika kolom kosong
-            if self.df_raw[col].isnull().all():
-                continue
-            
-            # Ambil sample data non-null
-            sample_data = self.df_raw[col].dropna().astype(str).str.strip()
-            
-            if len(sample_data) == 0:
-                continue
-            
-            # Deteksi tipe data
-            # 1. Numerik (integer atau float)
-            try:
-                # Cek apakah bisa dikonversi ke numeric
-                pd.to_numeric(sample_data.head(10), errors='raise')
-                # Coba konversi semua data
-                self.df_raw[col] = pd.to_numeric(self.df_raw[col], errors='coerce')
-                type_conversions[col] = 'numeric'
-                continue
-            except:
-                pass
-            
-            # 2. Tanggal
-            try:
-                pd.to_datetime(sample_data.head(10), errors='raise')
-                self.df_raw[col] = pd.to_datetime(self.df_raw[col], errors='coerce')
-                type_conversions[col] = 'datetime'
-                continue
-            except:
-                pass
-            
-            # 3. Boolean
-            unique_vals = sample_data.str.lower().unique()
-            if set(unique_vals).issubset({'yes', 'no', 'true', 'false', '1', '0', 'ya', 'tidak'}):
-                self.df_raw[col] = self.df_raw[col].map({
-                    'yes': True, 'no': False,
-                    'true': True, 'false': False,
-                    '1': True, '0': False,
-                    'ya': True, 'tidak': False
-                })
-                type_conversions[col] = 'boolean'
-                continue
-            
-            # 4. Default: tetap sebagai string
-            type_conversions[col] = 'string'
+        inferred = infer_column_types(self.df_raw[new_cols], self.type_sample_size) if new_cols else {}
+        type_conversions = {**known, **inferred}
+        
+        self.df_raw = apply_column_types(self.df_raw, type_conversions)
+        
+        if known:
+            print(f"✓ Schema dipakai ulang: {len(known)} kolom dari {self.schema_file}")
+        if inferred:
+            print(f"✓ Tipe di-infer: {len(inferred)} kolom (sample {self.type_sample_size} nilai/kolom)")
+            save_type_schema(self.schema_file, {**saved_types, **{str(c): t for c, t in inferred.items()}},
+                             self.input_file, self.type_sample_size, digest)
         
         print(f"✓ Konversi tipe data selesai:")
-        for dtype, count in pd.Series(type_conversions).value_counts().items():
+        for dtype, count in pd.Series(type_conversions, dtype=object).value_counts().items():
             print(f"   {dtype}: {count} kolom")
         
         self.preprocessing_report['type_conversions'] = type_conversions
@@ -11,6 +11,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import warnings
+from sheet_layout import detect_layout, read_with_layout
 warnings.filterwarnings('ignore')
 
 print("=" * 100)
@@ -36,81 +37,32 @@ df_raw.to_csv('output/realisasi_raw_preview.csv', index=False)
 print(f"\n✓ Raw preview saved to: output/realisasi_raw_preview.csv")
 
 # ============================================================================
-# STEP 2: DETECT HEADER ROW
+# STEP 2-3: DETECT HEADER LAYOUT
 # ============================================================================
 
 print("\n" + "=" * 100)
-print("STEP 2: HEADER DETECTION")
+print("STEP 2-3: HEADER LAYOUT DETECTION (year → month → metric bands)")
 print("=" * 100)
 
-print("\nAnalyzing row by row to find header...")
+layout = detect_layout('source/Realisasi vs Potensi PT SR.xlsx')
 
-for row_idx in range(15):
-    row_data = df_raw.iloc[row_idx]
-    non_null_count = row_data.notna().sum()
-    unique_count = len(row_data.dropna().unique())
-    
-    print(f"\nRow {row_idx}:")
-    print(f"  Non-null cells: {non_null_count}/{len(row_data)}")
-    print(f"  Unique values: {unique_count}")
-    print(f"  Sample values: {list(row_data.dropna().head(10))}")
-    
-    # Heuristic: header row biasanya punya banyak non-null dan unique values
-    if non_null_count > len(row_data) * 0.5:
-        print(f"  → Possible header row!")
-
-# ============================================================================
-# STEP 3: TRY DIFFERENT HEADER CONFIGURATIONS
-# ============================================================================
-
-print("\n" + "=" * 100)
-print("STEP 3: TESTING DIFFERENT HEADER CONFIGURATIONS")
-print("=" * 100)
-
-best_config = None
-best_score = 0
-
-for skip_rows in range(10):
-    try:
-        # Try reading with different skip rows
-        df_test = pd.read_excel('source/Realisasi vs Potensi PT SR.xlsx', 
-                                header=0, 
-                                skiprows=range(skip_rows) if skip_rows > 0 else None,
-                                nrows=10)
-        
-        # Score this configuration
-        # Good config has: many named columns, few "Unnamed", reasonable data
-        unnamed_count = sum(1 for col in df_test.columns if 'Unnamed' in str(col))
-        named_count = len(df_test.columns) - unnamed_count
-        score = named_count * 10 - unnamed_count
-        
-        print(f"\nConfig: skip_rows={skip_rows}")
-        print(f"  Total columns: {len(df_test.columns)}")
-        print(f"  Named columns: {named_count}")
-        print(f"  Unnamed columns: {unnamed_count}")
-        print(f"  Score: {score}")
-        print(f"  First 10 columns: {list(df_test.columns[:10])}")
-        
-        if score > best_score:
-            best_score = score
-            best_config = skip_rows
-            
-    except Exception as e:
-        print(f"\nConfig: skip_rows={skip_rows} → Error: {str(e)[:50]}")
-
-print(f"\n🎯 Best configuration: skip_rows={best_config} (score: {best_score})")
+print(f"\n  Title rows: {layout['title_rows']}")
+print(f"  Header band rows: {layout['band_rows']} (leaf row {layout['header_row']})")
+for row_idx in layout['band_rows']:
+    row_data = df_raw.iloc[row_idx] if row_idx < len(df_raw) else pd.Series(dtype=object)
+    print(f"    Row {row_idx}: {list(row_data.dropna().head(10))}")
+print(f"  Data starts at row: {layout['data_start']}")
+print(f"  Layout fingerprint: {layout['fingerprint']} (detected {layout['detected_at']})")
 
 # ============================================================================
-# STEP 4: LOAD WITH BEST CONFIGURATION
+# STEP 4: LOAD WITH DETECTED LAYOUT
 # ============================================================================
 
 print("\n" + "=" * 100)
-print(f"STEP 4: LOADING WITH BEST CONFIG (skip_rows={best_config})")
+print(f"STEP 4: LOADING WITH DETECTED LAYOUT (skiprows={layout['data_start']})")
 print("=" * 100)
 
-df_realisasi = pd.read_excel('source/Realisasi vs Potensi PT SR.xlsx',
-                             header=0,
-                             skiprows=range(best_config) if best_config > 0 else None)
+df_realisasi, _ = read_with_layout('source/Realisasi vs Potensi PT SR.xlsx')
 
 print(f"\n✓ Loaded successfully!")
 print(f"  Shape: {df_realisasi.shape}")
@@ -334,8 +286,8 @@ else:
     insights.append("✗ NO OVERLAP: Files appear to contain different data entities")
 
 # Insight 2: Structure
-if best_config > 0:
-    insights.append(f"⚠ Header at row {best_config} - file has preamble/title rows")
+if layout['header_row'] > 0:
+    insights.append(f"⚠ Header band at rows {layout['band_rows']} - file has preamble/title rows")
 else:
     insights.append("✓ Clean structure - header at row 0")
 
@@ -421,7 +373,7 @@ summary = f"""
 
 1. FILE STRUCTURE
    - Original shape: {df_raw.shape[0]} rows × {df_raw.shape[1]} columns
-   - Header detected at row: {best_config}
+   - Header detected at row: {layout['header_row']} (band {layout['band_rows']}, data from row {layout['data_start']})
    - Final shape: {df_realisasi_clean.shape[0]} rows × {df_realisasi_clean.shape[1]} columns
 
 2. DATA QUALITY
@@ -0,0 +1,215 @@
+"""
+SET-BASED DIVISION UPDATE
+=========================
+Purpose: Apply a block_code → division mapping to the Supabase `blocks` table
+         in one statement instead of one HTTP UPDATE per block.
+
+- Direct Postgres connection (SUPABASE_DB_URL, see bulk_loader.py):
+  a single UPDATE blocks ... FROM (VALUES ...) inside one transaction.
+- REST fallback: the current divisions are fetched once, diffed in pandas,
+  and only changed blocks are updated - one request per target division
+  (.in_('id', [...])) rather than one per block.
+
+Both paths report changed / unchanged / missing (mapping codes not in the
+database) / unmapped (database blocks without a mapping) counts.
+
+Usage:
+    python division_update.py                              # block_division_mapping.csv
+    python division_update.py output/block_division_mapping.csv --dry-run
+
+Reused by update_division_supabase.py, add_division_automated.py and
+CRITICAL_fix_divisions.py.
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+from bulk_loader import connect
+from supabase_fetch import fetch_table
+
+DEFAULT_MAPPING_FILE = 'block_division_mapping.csv'
+REST_ID_CHUNK = 300  # keep the ?id=in.(...) query string short
+
+
+def load_division_mapping(path=DEFAULT_MAPPING_FILE):
+    """block_code/division pairs from a mapping CSV ('division' or 'division_code' column)"""
+    df = pd.read_csv(path)
+    division_col = 'division' if 'division' in df.columns else 'division_code'
+    return normalize_mapping(df, division_col=division_col)
+
+
+def normalize_mapping(df, block_col='block_code', division_col='division'):
+    """Two clean columns (block_code, division); first mapping wins for duplicate blocks"""
+    mapping = df[[block_col, division_col]].rename(columns={block_col: 'block_code', division_col: 'division'})
+    mapping = mapping.dropna()
+    mapping['block_code'] = mapping['block_code'].astype(str).str.strip()
+    mapping['division'] = mapping['division'].astype(str).str.strip()
+    return mapping.drop_duplicates(subset=['block_code'], keep='first').reset_index(drop=True)
+
+
+def _empty_report(mapping):
+    return {'mapped': len(mapping), 'changed': 0, 'unchanged': 0, 'missing': 0, 'unmapped': 0,
+            'method': None, 'dry_run': False, 'changes': pd.DataFrame(columns=['block_code', 'old', 'new'])}
+
+
+def _apply_sql(conn, mapping, dry_run):
+    report = _empty_report(mapping)
+    report['method'] = 'sql'
+
+    # VALUES () is invalid SQL - nothing to map, every block is unmapped
+    if mapping.empty:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM blocks")
+            report['unmapped'] = cur.fetchone()[0]
+        conn.rollback()
+        return report
+
+    values = ', '.join(['(%s, %s)'] * len(mapping))
+    params = [v for pair in mapping[['block_code', 'division']].itertuples(index=False) for v in pair]
+
+    try:
+        changes, missing, unmapped, matched = _run_sql(conn, values, params, dry_run)
+    except Exception:
+        conn.rollback()
+        raise
+
+    if dry_run:
+        conn.rollback()
+    else:
+        conn.commit()
+
+    report['changes'] = pd.DataFrame(changes, columns=['block_code', 'old', 'new'])
+    report.update(changed=len(changes), unchanged=matched - len(changes), missing=missing, unmapped=unmapped)
+    return report
+
+
+def _run_sql(conn, values, params, dry_run):
+    with conn.cursor() as cur:
+        # Snapshot of what will change, then the single set-based UPDATE
+        cur.execute(f"""
+            WITH m(block_code, division) AS (VALUES {values})
+            SELECT b.block_code, b.division, m.division
+            FROM blocks b JOIN m ON b.block_code = m.block_code
+            WHERE b.division IS DISTINCT FROM m.division
+        """, params)
+        changes = cur.fetchall()
+
+        cur.execute(f"""
+            WITH m(block_code, division) AS (VALUES {values})
+            SELECT
+                (SELECT COUNT(*) FROM m WHERE NOT EXISTS (SELECT 1 FROM blocks b WHERE b.block_code = m.block_code)),
+                (SELECT COUNT(*) FROM blocks b WHERE NOT EXISTS (SELECT 1 FROM m WHERE m.block_code = b.block_code)),
+                (SELECT COUNT(*) FROM blocks b JOIN m ON b.block_code = m.block_code)
+        """, params)
+        missing, unmapped, matched = cur.fetchone()
+
+        if not dry_run and changes:
+            cur.execute(f"""
+                UPDATE blocks AS b
+                SET division = m.division
+                FROM (VALUES {values}) AS m(block_code, division)
+                WHERE b.block_code = m.block_code
+                  AND b.division IS DISTINCT FROM m.division
+            """, params)
+    return changes, missing, unmapped, matched
+
+
+def _apply_rest(supabase, mapping, dry_run):
+    report = _empty_report(mapping)
+    report['method'] = 'rest'
+
+    blocks_db = fetch_table(supabase, 'blocks', columns='id, block_code, division')
+    merged = blocks_db.merge(mapping, on='block_code', how='outer', suffixes=('_db', ''), indicator=True)
+
+    matched = merged[merged['_merge'] == 'both']
+    changed = matched[matched['division_db'].fillna('\0') != matched['division']]
+
+    # One request per target division (and id chunk) instead of one per block
+    if not dry_run:
+        for division, group in changed.groupby('division'):
+            ids = [int(i) for i in group['id']]
+            for start in range(0, len(ids), REST_ID_CHUNK):
+                supabase.table('blocks').update({'division': division}).in_('id', ids[start:start + REST_ID_CHUNK]).execute()
+
+    report['changes'] = changed[['block_code', 'division_db', 'division']].rename(
+        columns={'division_db': 'old', 'division': 'new'}).reset_index(drop=True)
+    report.update(changed=len(changed), unchanged=len(matched) - len(changed),
+                  missing=int((merged['_merge'] == 'right_only').sum()),
+                  unmapped=int((merged['_merge'] == 'left_only').sum()))
+    return report
+
+
+def apply_division_mapping(mapping, conn=None, supabase=None, dry_run=False):
+    """
+    Set blocks.division from `mapping` (DataFrame with block_code + division).
+
+    Uses `conn` (direct Postgres) when given, otherwise the Supabase client.
+    dry_run computes the report without writing. Returns a report dict with
+    changed/unchanged/missing/unmapped counts and a `changes` DataFrame
+    (block_code, old, new).
+    """
+    if not {'block_code', 'division'} <= set(mapping.columns):
+        raise ValueError("mapping needs 'block_code' and 'division' columns")
+    mapping = normalize_mapping(mapping)
+
+    if conn is not None:
+        report = _apply_sql(conn, mapping, dry_run)
+    elif supabase is not None:
+        report = _apply_rest(supabase, mapping, dry_run)
+    else:
+        raise ValueError('apply_division_mapping needs a Postgres connection or a Supabase client')
+
+    report['dry_run'] = dry_run
+    return report
+
+
+def print_report(report):
+    mode = ' (dry run - nothing written)' if report['dry_run'] else ''
+    print(f"\n📊 Division update via {report['method']}{mode}:")
+    print(f"   Mappings:  {report['mapped']}")
+    print(f"   Changed:   {report['changed']}")
+    print(f"   Unchanged: {report['unchanged']}")
+    print(f"   Missing:   {report['missing']} (mapping block_code not in database)")
+    print(f"   Unmapped:  {report['unmapped']} (database blocks without mapping)")
+    if report['changed']:
+        print("\n   Sample changes:")
+        for row in report['changes'].head(10).itertuples(index=False):
+            print(f"     {row.block_code}: {row.old} -> {row.new}")
+
+
+def main():
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description='Apply a block → division mapping to Supabase in one batch')
+    parser.add_argument('mapping', nargs='?', default=DEFAULT_MAPPING_FILE, help='Mapping CSV')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    print("=" * 80)
+    print("SET-BASED DIVISION UPDATE")
+    print("=" * 80)
+
+    mapping = load_division_mapping(args.mapping)
+    print(f"\n✅ Loaded {len(mapping)} block->division mappings from {args.mapping}")
+
+    conn = connect()
+    supabase = None
+    if conn is None:
+        from supabase import create_client
+        supabase = create_client(os.getenv('SUPABASE_URL'),
+                                 os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_KEY'))
+
+    try:
+        report = apply_division_mapping(mapping, conn=conn, supabase=supabase, dry_run=args.dry_run)
+        print_report(report)
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,505 @@
+"""
+EXCEL PARSE CACHE
+=================
+Purpose: Parse each sheet of a source workbook (data_gabungan.xlsx,
+         Realisasi vs Potensi PT SR.xlsx, ...) ONCE with openpyxl and serve
+         every later pd.read_excel-style read from a local cache.
+
+How it works:
+- The cache key is the SHA-256 of the xlsx bytes, so any edit to the
+  workbook automatically invalidates the cached sheets.
+- Each sheet is stored as its raw cell grid (every row, including the
+  multi-row header band), so a header sniff (header=None, nrows=20) and the
+  full read (skiprows=N) of the same sheet share one parse. Grids are
+  pickled rather than written as Parquet: header bands mix text and numbers
+  in the same column, which Arrow cannot store without lossy casts.
+- header/skiprows/nrows/usecols are applied on the cached grid with the
+  same semantics as pd.read_excel. Options that are not emulated fall back
+  to pd.read_excel directly.
+- read_columns_cached serves column slices ("A:I,EU:FU") without parsing
+  the whole sheet: they are streamed by excel_stream and cached per slice.
+
+Cache layout:
+- output/.cache/excel/<stem>-<digest>/manifest.json
+  (updated key by key under manifest.lock - run_pipeline runs phases in
+  parallel processes that fill the same entry)
+- output/.cache/excel/<stem>-<digest>/<sheet>.pkl
+- output/.cache/excel/<stem>-<digest>/<sheet>.columns-<key>.pkl
+
+Usage:
+    from excel_cache import read_excel_cached
+    df = read_excel_cached('source/data_gabungan.xlsx', sheet_name='Lembar1', skiprows=9)
+
+    python excel_cache.py            # warm cache for all source/*.xlsx
+    python excel_cache.py --clear    # remove all cached sheets
+"""
+
+import hashlib
+import json
+import numbers
+import os
+import re
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = 'output/.cache/excel'
+LOCK_STALE_SECONDS = 30  # an older manifest.lock was left behind by a crashed process
+
+# Same strings pd.read_excel treats as NaN by default
+NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+    'n/a', 'nan', 'null',
+}
+
+# (abspath, mtime_ns, size) -> digest, so a file is hashed once per process
+_digest_memo = {}
+
+
+def excel_col_to_index(col_letter):
+    """Convert Excel column letter to 0-indexed column number"""
+    result = 0
+    for i, char in enumerate(reversed(col_letter.strip().upper())):
+        result += (ord(char) - ord('A') + 1) * (26 ** i)
+    return result - 1
+
+
+def parse_column_letters(spec):
+    """
+    Parse an Excel column spec such as "A:I", "EU:FU" or "A,C,EU:FU"
+    into a sorted list of 0-indexed column numbers.
+    """
+    indices = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if ':' in part:
+            start, end = part.split(':', 1)
+            indices.update(range(excel_col_to_index(start), excel_col_to_index(end) + 1))
+        else:
+            indices.add(excel_col_to_index(part))
+    return sorted(indices)
+
+
+def file_digest(path):
+    """SHA-256 of the file contents (memoized per mtime/size within a process)"""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if memo_key in _digest_memo:
+        return _digest_memo[memo_key]
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+
+    digest = sha.hexdigest()
+    _digest_memo[memo_key] = digest
+    return digest
+
+
+def _slug(name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(name)).strip('_') or 'sheet'
+
+
+def _entry_dir(path, digest, cache_dir):
+    stem = _slug(os.path.splitext(os.path.basename(path))[0])
+    return os.path.join(cache_dir, f"{stem}-{digest[:16]}")
+
+
+def _read_manifest(entry_dir):
+    manifest_path = os.path.join(entry_dir, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _replace_atomically(target, write):
+    """write(tmp_path) next to target, then swap it in - readers never see a half-written file"""
+    # pid in the name: concurrent pipeline phases may fill the same entry
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_manifest(entry_dir, manifest):
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    _replace_atomically(os.path.join(entry_dir, 'manifest.json'), write)
+
+
+@contextmanager
+def _manifest_lock(entry_dir):
+    """Cross-process lock around a manifest read-modify-write (lock file created with O_EXCL)"""
+    lock_path = os.path.join(entry_dir, 'manifest.lock')
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_STALE_SECONDS:
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+
+def _update_manifest(entry_dir, section, key, value):
+    """
+    manifest[section][key] = value on the manifest as it is on disk now, under
+    the lock - a whole-manifest write from a copy read earlier would drop the
+    entries another process added meanwhile. Returns the updated manifest.
+    """
+    with _manifest_lock(entry_dir):
+        manifest = _read_manifest(entry_dir)
+        manifest.setdefault(section, {})[key] = value
+        _write_manifest(entry_dir, manifest)
+    return manifest
+
+
+def _prune_stale_entries(path, keep_dir, cache_dir):
+    """Remove cache entries of the same workbook built from older contents"""
+    if not os.path.isdir(cache_dir):
+        return
+    source = os.path.abspath(path)
+    for name in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, name)
+        if entry_dir == keep_dir or not os.path.isdir(entry_dir):
+            continue
+        manifest = _read_manifest(entry_dir)
+        if manifest and manifest.get('source') == source:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+
+def _open_entry(path, cache_dir):
+    """Return (entry_dir, manifest) for the current contents of `path`"""
+    digest = file_digest(path)
+    entry_dir = _entry_dir(path, digest, cache_dir)
+    manifest = _read_manifest(entry_dir)
+
+    if manifest is None:
+        from excel_stream import workbook_sheets
+
+        # Names straight from xl/workbook.xml; openpyxl would scan every sheet's size
+        sheets = workbook_sheets(path)
+
+        os.makedirs(entry_dir, exist_ok=True)
+        with _manifest_lock(entry_dir):
+            # Another process may have created it while we read the sheet names
+            manifest = _read_manifest(entry_dir)
+            if manifest is None:
+                manifest = {
+                    'source': os.path.abspath(path),
+                    'digest': digest,
+                    'sheets': sheets,
+                    'parsed': {},
+                    'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                }
+                _write_manifest(entry_dir, manifest)
+        _prune_stale_entries(path, entry_dir, cache_dir)
+
+    return entry_dir, manifest
+
+
+def _resolve_sheet(manifest, sheet_name):
+    sheets = manifest['sheets']
+    if isinstance(sheet_name, numbers.Integral):
+        return sheets[int(sheet_name)]
+    if sheet_name not in sheets:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    return sheet_name
+
+
+def _convert_cell(value):
+    # Mirror pandas' openpyxl reader: integral floats become ints
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value == '':
+        return None
+    return value
+
+
+def _parse_sheet_grid(path, sheet):
+    """Parse one worksheet into a raw object grid (no header handling)"""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    ws = wb[sheet]
+    if hasattr(ws, 'reset_dimensions'):
+        ws.reset_dimensions()
+
+    rows = []
+    last_data_row = -1
+    width = 0
+    for row in ws.iter_rows(values_only=True):
+        converted = [_convert_cell(v) for v in row]
+        # Trim trailing empty cells
+        while converted and converted[-1] is None:
+            converted.pop()
+        rows.append(converted)
+        if converted:
+            last_data_row = len(rows) - 1
+            width = max(width, len(converted))
+    wb.close()
+
+    # Trim trailing empty rows
+    rows = rows[:last_data_row + 1]
+    rows = [r + [None] * (width - len(r)) for r in rows]
+
+    return pd.DataFrame(rows, columns=range(width), dtype=object)
+
+
+def load_sheet_grid(path, sheet_name=0, cache_dir=CACHE_DIR):
+    """
+    Load the raw cell grid of one worksheet, parsing the workbook only when
+    its contents changed since the last parse.
+
+    Rows and columns are 0-indexed Excel positions (row 0 = Excel row 1).
+    """
+    entry_dir, manifest = _open_entry(path, cache_dir)
+    sheet = _resolve_sheet(manifest, sheet_name)
+
+    grid_file = manifest['parsed'].get(sheet)
+    if grid_file and os.path.exists(os.path.join(entry_dir, grid_file)):
+        return pd.read_pickle(os.path.join(entry_dir, grid_file))
+
+    grid = _parse_sheet_grid(path, sheet)
+
+    grid_file = f"{_slug(sheet)}.pkl"
+    _replace_atomically(os.path.join(entry_dir, grid_file), grid.to_pickle)
+    _update_manifest(entry_dir, 'parsed', sheet, grid_file)
+
+    return grid
+
+
+def sheet_names(path, cache_dir=CACHE_DIR):
+    """List worksheet names of a workbook (served from the cache manifest)"""
+    _, manifest = _open_entry(path, cache_dir)
+    return list(manifest['sheets'])
+
+
+def _header_names(values):
+    """Column names the way pd.read_excel builds them (Unnamed: i, dedup .1)"""
+    names = []
+    counts = {}
+    for i, value in enumerate(values):
+        name = f"Unnamed: {i}" if pd.isna(value) else value
+        cur_count = counts.get(name, 0)
+        while cur_count > 0:
+            counts[name] = cur_count + 1
+            name = f"{name}.{cur_count}"
+            cur_count = counts.get(name, 0)
+        counts[name] = cur_count + 1
+        names.append(name)
+    return names
+
+
+def _infer_column(series):
+    """Give one object column the dtype pd.read_excel would infer for it"""
+    is_na_string = series.map(lambda v: isinstance(v, str) and v in NA_STRINGS)
+    if is_na_string.any():
+        series = series.mask(is_na_string, None)
+
+    non_null = series.dropna()
+    if non_null.empty:
+        return pd.Series(float('nan'), index=series.index, dtype='float64')
+
+    inferred = series.infer_objects()
+    if inferred.dtype == object:
+        numeric = pd.to_numeric(non_null, errors='coerce')
+        if numeric.notna().all():
+            inferred = pd.to_numeric(series, errors='coerce')
+    if inferred.dtype == object:
+        # read_excel marks empty cells in object columns with NaN, not None
+        inferred = inferred.where(inferred.notna(), np.nan)
+    return inferred
+
+
+def _infer_dtypes(df):
+    columns = list(df.columns)
+    inferred = [_infer_column(df.iloc[:, i]) for i in range(df.shape[1])]
+    if not inferred:
+        return df
+    result = pd.concat(inferred, axis=1, ignore_index=True)
+    result.columns = columns
+    return result
+
+
+def frame_from_grid(grid, header=0, skiprows=None, nrows=None, usecols=None):
+    """
+    Build a DataFrame from a raw sheet grid using pd.read_excel semantics
+    for header, skiprows, nrows and usecols.
+    """
+    body = grid
+
+    if skiprows is not None:
+        if isinstance(skiprows, numbers.Integral):
+            body = body.iloc[int(skiprows):]
+        else:
+            body = body.drop(index=[r for r in skiprows if r in body.index])
+
+    if header is None:
+        columns = list(range(body.shape[1]))
+    else:
+        header = int(header)
+        if header >= len(body):
+            raise ValueError(f"header row {header} is beyond the sheet's {len(body)} rows")
+        columns = _header_names(body.iloc[header].tolist())
+        body = body.iloc[header + 1:]
+
+    if nrows is not None:
+        body = body.iloc[:nrows]
+
+    # Drop unused columns before building the frame so they are never typed
+    if usecols is not None:
+        if isinstance(usecols, str):
+            positions = parse_column_letters(usecols)
+        elif all(isinstance(c, numbers.Integral) for c in usecols):
+            positions = usecols
+        else:
+            wanted = set(usecols)
+            positions = [i for i, c in enumerate(columns) if c in wanted]
+        positions = [p for p in positions if p < body.shape[1]]
+        body = body.iloc[:, positions]
+        columns = [columns[p] for p in positions]
+
+    df = pd.DataFrame(body.to_numpy(), columns=columns)
+
+    return _infer_dtypes(df)
+
+
+def read_excel_cached(io, sheet_name=0, header=0, skiprows=None, nrows=None,
+                      usecols=None, cache_dir=CACHE_DIR, **kwargs):
+    """
+    Drop-in replacement for pd.read_excel backed by the parse cache.
+
+    Supports sheet_name (name, index or None for all sheets), header (int or
+    None), skiprows (int or list of rows), nrows and usecols (Excel letters
+    like "A:I", positions, or names). Anything else falls back to
+    pd.read_excel so callers never get silently different results.
+    """
+    unsupported = (
+        kwargs
+        or not isinstance(io, (str, os.PathLike))
+        or (header is not None and not isinstance(header, numbers.Integral))
+        or callable(skiprows)
+        or callable(usecols)
+    )
+    if unsupported:
+        return pd.read_excel(io, sheet_name=sheet_name, header=header, skiprows=skiprows,
+                             nrows=nrows, usecols=usecols, **kwargs)
+
+    if sheet_name is None:
+        return {
+            name: read_excel_cached(io, sheet_name=name, header=header, skiprows=skiprows,
+                                    nrows=nrows, usecols=usecols, cache_dir=cache_dir)
+            for name in sheet_names(io, cache_dir=cache_dir)
+        }
+
+    grid = load_sheet_grid(io, sheet_name, cache_dir=cache_dir)
+    return frame_from_grid(grid, header=header, skiprows=skiprows, nrows=nrows, usecols=usecols)
+
+
+def read_columns_cached(path, columns, sheet_name=0, skiprows=0, nrows=None, dtypes=None,
+                        stop_at_blank=None, cache_dir=CACHE_DIR):
+    """
+    excel_stream.read_columns backed by the parse cache: a full-sheet grid
+    that is already cached is sliced instead of re-reading the xlsx,
+    otherwise only the requested columns are streamed and the slice is
+    cached on its own (keyed by sheet, columns and row window).
+    """
+    from excel_stream import column_letter, read_columns
+
+    entry_dir, manifest = _open_entry(path, cache_dir)
+    sheet = _resolve_sheet(manifest, sheet_name)
+    spec = columns if isinstance(columns, str) else ','.join(columns)
+
+    key = json.dumps([sheet, spec.upper(), skiprows, nrows, dtypes, stop_at_blank], sort_keys=True, default=str)
+    slice_file = manifest.setdefault('columns', {}).get(key)
+    if slice_file and os.path.exists(os.path.join(entry_dir, slice_file)):
+        return pd.read_pickle(os.path.join(entry_dir, slice_file))
+
+    grid_file = manifest['parsed'].get(sheet)
+    if grid_file and os.path.exists(os.path.join(entry_dir, grid_file)) and not (dtypes or stop_at_blank):
+        positions = parse_column_letters(spec)
+        df = frame_from_grid(pd.read_pickle(os.path.join(entry_dir, grid_file)), header=None,
+                             skiprows=skiprows or None, nrows=nrows, usecols=positions)
+        df = df.reindex(columns=positions)
+        df.columns = [column_letter(p) for p in positions]
+        return df
+
+    df = read_columns(path, spec, sheet_name=sheet, skiprows=skiprows, nrows=nrows,
+                      dtypes=dtypes, stop_at_blank=stop_at_blank)
+    slice_file = f"{_slug(sheet)}.columns-{hashlib.sha256(key.encode()).hexdigest()[:12]}.pkl"
+    _replace_atomically(os.path.join(entry_dir, slice_file), df.to_pickle)
+    _update_manifest(entry_dir, 'columns', key, slice_file)
+    return df
+
+
+def clear_cache(path=None, cache_dir=CACHE_DIR):
+    """Remove cached sheets of one workbook, or of every workbook when path is None"""
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    removed = 0
+    source = os.path.abspath(path) if path else None
+    for name in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, name)
+        if not os.path.isdir(entry_dir):
+            continue
+        manifest = _read_manifest(entry_dir)
+        if source is None or (manifest and manifest.get('source') == source):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def main():
+    """Warm the cache for every workbook in source/ (or clear it with --clear)"""
+    if '--clear' in sys.argv[1:]:
+        removed = clear_cache()
+        print(f"✅ Removed {removed} cached workbook(s) from {CACHE_DIR}")
+        return
+
+    source_dir = 'source'
+    workbooks = sorted(f for f in os.listdir(source_dir) if f.endswith('.xlsx') and not f.startswith('~$'))
+
+    print("=" * 80)
+    print("EXCEL PARSE CACHE")
+    print("=" * 80)
+
+    for filename in workbooks:
+        path = os.path.join(source_dir, filename)
+        print(f"\n📂 {filename} ({file_digest(path)[:16]})")
+        for sheet in sheet_names(path):
+            grid = load_sheet_grid(path, sheet)
+            print(f"   ✓ {sheet}: {grid.shape[0]} rows x {grid.shape[1]} cols")
+
+    print(f"\n✅ Cache ready: {CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
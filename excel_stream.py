@@ -0,0 +1,342 @@
+"""
+STREAMING EXCEL COLUMN READER
+=============================
+Purpose: Read a few columns ("A", "A:I,EU:FU") out of a wide worksheet
+         without building the whole sheet in memory - the header sniff in
+         phase3 and column_registry.read_source only need a slice of the
+         177 columns of data_gabungan.xlsx.
+
+How it works:
+- An .xlsx is a zip of XML parts. The worksheet XML is streamed with
+  ElementTree.iterparse one <row> at a time and every row is cleared once
+  read, so memory holds one row plus the output arrays.
+- Cells are matched on their reference ('EU12') before any conversion;
+  cells outside the requested columns are skipped without touching shared
+  strings or number parsing. (openpyxl's read_only mode still converts
+  every cell of a row and only drops columns afterwards, so min_col/max_col
+  do not make it faster.)
+- Values go straight into one preallocated NumPy array per column -
+  float64 (NaN = empty) for numeric columns, object otherwise - sized from
+  the sheet's <dimension> and trimmed after the last row that has a value
+  in one of the requested columns.
+
+Values follow excel_cache: integral numbers become int in object columns,
+'' and NA strings ('#N/A', 'null', ...) become None, error cells become
+None. Formula cells give their cached value (like data_only=True).
+Date-formatted cells come back as Excel serial numbers - styles are not
+read; use read_excel_cached for sheets with dates.
+
+Usage:
+    from excel_stream import read_columns
+    df = read_columns('source/data_gabungan.xlsx', 'A:I,EU:FU', sheet_name='Lembar1',
+                      skiprows=10, dtypes={'EU': 'float64'})
+    df['EU']                                   # columns are labelled by Excel letter
+
+    python excel_stream.py source/data_gabungan.xlsx A:I --sheet Lembar1 --nrows 20
+"""
+
+import argparse
+import numbers
+import posixpath
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+from excel_cache import NA_STRINGS, _infer_column, excel_col_to_index, parse_column_letters
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+ROW = NS_MAIN + 'row'
+CELL = NS_MAIN + 'c'
+VALUE = NS_MAIN + 'v'
+DIMENSION = NS_MAIN + 'dimension'
+
+DIGITS = '0123456789'
+INITIAL_ROWS = 1024  # capacity when the sheet has no usable <dimension>
+
+# Cell letters → 0-indexed column, shared across reads ('EU' is parsed once per process)
+_column_memo = {}
+
+
+def column_letter(index):
+    """0-indexed column number → Excel letter (inverse of excel_col_to_index)"""
+    letters = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord('A') + rest) + letters
+    return letters
+
+
+def _column_of(letters):
+    index = _column_memo.get(letters)
+    if index is None:
+        index = _column_memo[letters] = excel_col_to_index(letters)
+    return index
+
+
+def sheet_members(zf):
+    """{sheet name: worksheet part inside the zip}, in workbook order"""
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    targets = {}
+    for rel in rels.iter(NS_PKG_REL + 'Relationship'):
+        target = rel.get('Target')
+        # Targets are relative to xl/ unless absolute ('/xl/worksheets/sheet1.xml')
+        targets[rel.get('Id')] = target.lstrip('/') if target.startswith('/') else posixpath.normpath('xl/' + target)
+
+    workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+    return {sheet.get('name'): targets[sheet.get(NS_REL + 'id')]
+            for sheet in workbook.iter(NS_MAIN + 'sheet')}
+
+
+def workbook_sheets(path):
+    """Sheet names of a workbook without reading any worksheet"""
+    with zipfile.ZipFile(path) as zf:
+        return list(sheet_members(zf))
+
+
+def _resolve_member(zf, sheet_name):
+    members = sheet_members(zf)
+    if isinstance(sheet_name, numbers.Integral):
+        return list(members.values())[int(sheet_name)]
+    if sheet_name not in members:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    return members[sheet_name]
+
+
+def _shared_strings(zf):
+    """Shared string table; rich-text entries are joined from their runs"""
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    strings = []
+    with zf.open('xl/sharedStrings.xml') as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag == NS_MAIN + 'si':
+                strings.append(''.join(t.text or '' for t in elem.iter(NS_MAIN + 't')))
+                elem.clear()
+    return strings
+
+
+def _cell_value(cell, shared):
+    """Raw value of one <c> element (None when empty or an error)"""
+    kind = cell.get('t', 'n')
+    if kind == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(NS_MAIN + 't'))
+    v = cell.find(VALUE)
+    if v is None or v.text is None:
+        return None
+    text = v.text
+    if kind == 'n':
+        return float(text)
+    if kind == 's':
+        return shared[int(text)]
+    if kind == 'b':
+        return text == '1'
+    if kind == 'e':
+        return None
+    return text  # 'str' (formula result) / 'd' (ISO date)
+
+
+def _to_float(value):
+    if isinstance(value, float):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            return np.nan  # '-' and other placeholder text, like pd.to_numeric(errors='coerce')
+    return float(value)
+
+
+def _to_object(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in NA_STRINGS:
+        return None
+    return value
+
+
+def read_columns(path, columns, sheet_name=0, skiprows=0, nrows=None, dtypes=None,
+                 stop_at_blank=None):
+    """
+    DataFrame of the requested columns only, labelled by Excel letter.
+
+    columns       Excel spec ("A:I,EU:FU") or list of letters
+    skiprows      rows above the first returned row (header=None semantics)
+    nrows         stop after this many rows
+    dtypes        {letter: dtype}; numeric dtypes are read into float64 and
+                  cast, anything else stays object. Columns without a dtype
+                  are inferred the way pd.read_excel would.
+    stop_at_blank letter of a key column: stop at the first row where it is
+                  empty (totals or notes below the table are never read)
+    """
+    spec = columns if isinstance(columns, str) else ','.join(columns)
+    positions = parse_column_letters(spec)
+    letters = [column_letter(p) for p in positions]
+    dtypes = {k.upper(): v for k, v in (dtypes or {}).items()}
+    numeric = [letter in dtypes and pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtypes[letter]))
+               for letter in letters]
+    slot_of = {p: i for i, p in enumerate(positions)}
+    last_position = positions[-1]
+    stop_slot = slot_of[excel_col_to_index(stop_at_blank)] if stop_at_blank else None
+    skiprows = int(skiprows or 0)
+
+    arrays = None
+    filled = 0  # rows up to the last one with a requested value
+
+    with zipfile.ZipFile(path) as zf:
+        member = _resolve_member(zf, sheet_name)
+        shared = _shared_strings(zf)
+
+        capacity = nrows
+        expected = skiprows  # next row index, to notice rows missing from the XML
+        with zf.open(member) as f:
+            for _, elem in ET.iterparse(f):
+                tag = elem.tag
+                if tag == DIMENSION and capacity is None:
+                    last_ref = elem.get('ref', '').split(':')[-1]
+                    max_row = int(last_ref.lstrip('ABCDEFGHIJKLMNOPQRSTUVWXYZ') or 0)
+                    capacity = max(max_row - skiprows, 0) or None
+                    continue
+                if tag != ROW:
+                    continue
+
+                r = elem.get('r')
+                row = int(r) - 1 if r is not None else expected
+                i = row - skiprows
+                if i < 0:
+                    expected = row + 1
+                    elem.clear()
+                    continue
+                if nrows is not None and i >= nrows:
+                    break
+                # Rows left out of the XML are blank, key column included
+                if stop_slot is not None and row > expected:
+                    break
+                expected = row + 1
+
+                if arrays is None:
+                    size = max(capacity or INITIAL_ROWS, i + 1)
+                    arrays = [np.full(size, np.nan) if is_num else np.full(size, None, dtype=object)
+                              for is_num in numeric]
+                elif i >= len(arrays[0]):
+                    size = max(2 * len(arrays[0]), i + 1)
+                    arrays = [np.concatenate([a, np.full(size - len(a), np.nan if is_num else None,
+                                                         dtype=a.dtype)])
+                              for a, is_num in zip(arrays, numeric)]
+
+                found = False
+                key_found = stop_slot is None
+                col = -1
+                for cell in elem:
+                    ref = cell.get('r')
+                    col = _column_of(ref.rstrip(DIGITS)) if ref is not None else col + 1
+                    if col > last_position:
+                        break  # cells are stored left to right
+                    slot = slot_of.get(col)
+                    if slot is None:
+                        continue
+                    value = _cell_value(cell, shared)
+                    if value is None:
+                        continue
+                    if numeric[slot]:
+                        value = _to_float(value)
+                        if value != value:
+                            continue
+                    else:
+                        value = _to_object(value)
+                        if value is None:
+                            continue
+                    arrays[slot][i] = value
+                    found = True
+                    if slot == stop_slot:
+                        key_found = True
+                elem.clear()
+
+                if not key_found:
+                    break
+                if found:
+                    filled = i + 1
+
+    if arrays is None:
+        arrays = [np.array([], dtype=float if is_num else object) for is_num in numeric]
+
+    data = {}
+    for letter, values in zip(letters, arrays):
+        series = pd.Series(values[:filled], copy=False)
+        if letter in dtypes:
+            if pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtypes[letter])):
+                series = series.astype(dtypes[letter])
+            else:
+                series = series.where(series.notna(), None)
+        else:
+            series = _infer_column(series)
+        data[letter] = series
+    return pd.DataFrame(data, columns=letters)
+
+
+def head_rows(path, sheet_name=0, nrows=20):
+    """
+    The first `nrows` rows as plain lists (every column, padded to the
+    widest row) - for sniffing title and header bands without knowing the
+    sheet's width. Values are converted like read_columns' object columns.
+    """
+    rows = []
+    with zipfile.ZipFile(path) as zf:
+        member = _resolve_member(zf, sheet_name)
+        shared = _shared_strings(zf)
+        with zf.open(member) as f:
+            for _, elem in ET.iterparse(f):
+                if elem.tag != ROW:
+                    continue
+                r = elem.get('r')
+                row = int(r) - 1 if r is not None else len(rows)
+                if row >= nrows:
+                    break
+                rows.extend([] for _ in range(row - len(rows) + 1))
+                values = {}
+                col = -1
+                for cell in elem:
+                    ref = cell.get('r')
+                    col = _column_of(ref.rstrip(DIGITS)) if ref is not None else col + 1
+                    value = _cell_value(cell, shared)
+                    if value is not None:
+                        value = _to_object(value)
+                    if value is not None:
+                        values[col] = value
+                elem.clear()
+                rows[row] = [values.get(i) for i in range(max(values) + 1)] if values else []
+
+    width = max((len(row) for row in rows), default=0)
+    return [row + [None] * (width - len(row)) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream selected columns out of an xlsx sheet')
+    parser.add_argument('path')
+    parser.add_argument('columns', help='Excel column spec, e.g. "A:I,EU:FU"')
+    parser.add_argument('--sheet', default=0, help='Sheet name (default: first sheet)')
+    parser.add_argument('--skiprows', type=int, default=0)
+    parser.add_argument('--nrows', type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = read_columns(args.path, args.columns, sheet_name=args.sheet, skiprows=args.skiprows, nrows=args.nrows)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print(f"STREAMING READ: {args.path} [{args.sheet}] {args.columns}")
+    print("=" * 80)
+    print(df.head(20).to_string())
+    print(f"\n✅ {len(df):,} rows × {df.shape[1]} columns in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,36 +2,16 @@
 Final check - Did the 3 blocks get inserted?
 """
 
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("FINAL CHECK - 3 Missing Blocks")
 print("="*60)
 
 # Load production
-all_prod = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_prod.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df_prod = pd.DataFrame(all_prod)
+df_prod = read_table('production_annual')
 
 # Load blocks
-blocks_data = supabase.table('blocks').select('*').execute()
-df_blocks = pd.DataFrame(blocks_data.data)
+df_blocks = read_table('blocks')
 
 # Merge
 df = df_prod.merge(df_blocks[['id', 'block_code']], 
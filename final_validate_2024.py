@@ -1,10 +1,5 @@
 import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 # Excel
 df_excel = pd.read_excel('source/data_produksi_AME_2024.xlsx')
@@ -18,26 +13,10 @@ print("FINAL VALIDATION AME 2024")
 print("="*60)
 
 # Supabase
-all_prod = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_prod.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df_prod = pd.DataFrame(all_prod)
-blocks_data = supabase.table('blocks').select('*').execute()
-df_blocks = pd.DataFrame(blocks_data.data)
-divisions_data = supabase.table('divisions').select('*').execute()
-df_divisions = pd.DataFrame(divisions_data.data)
-estates_data = supabase.table('estates').select('*').execute()
-df_estates = pd.DataFrame(estates_data.data)
+df_prod = read_table('production_annual')
+df_blocks = read_table('blocks')
+df_divisions = read_table('divisions')
+df_estates = read_table('estates')
 
 df = df_prod.merge(df_blocks[['id', 'block_code', 'division_id']], left_on='block_id', right_on='id', suffixes=('', '_b'), how='left')
 df = df.merge(df_divisions[['id', 'estate_id']], left_on='division_id', right_on='id', suffixes=('', '_d'), how='left')
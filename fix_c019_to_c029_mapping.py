@@ -7,6 +7,8 @@ REALISASI TANAM SD NOVEMBER 2025 - KOMPOSISI POKOK dengan tahun 2009-2019
 import pandas as pd
 import numpy as np
 
+from column_registry import select
+
 print("=" * 80)
 print("FIXING C019-C029 COLUMN MAPPING")
 print("=" * 80)
@@ -21,20 +23,10 @@ print(f"\nCurrent columns (first 35):")
 for i, col in enumerate(current_cols[:35]):
     print(f"  {i+1}. {col}")
 
-# Define the mapping for c019-c029
-column_rename_map = {
-    'c019': 'realisasi_tanam_komposisi_pokok_2009',
-    'c020': 'realisasi_tanam_komposisi_pokok_2010',
-    'c021': 'realisasi_tanam_komposisi_pokok_2011',
-    'c022': 'realisasi_tanam_komposisi_pokok_2012',
-    'c023': 'realisasi_tanam_komposisi_pokok_2013',
-    'c024': 'realisasi_tanam_komposisi_pokok_2014',
-    'c025': 'realisasi_tanam_komposisi_pokok_2015',
-    'c026': 'realisasi_tanam_komposisi_pokok_2016',
-    'c027': 'realisasi_tanam_komposisi_pokok_2017',
-    'c028': 'realisasi_tanam_komposisi_pokok_2018',
-    'c029': 'realisasi_tanam_komposisi_pokok_2019'
-}
+# Mapping for c019-c029 from the column registry (column_registry.csv)
+codes = [f"C{i:03d}" for i in range(19, 30)]
+registry_rows = select(codes=codes)
+column_rename_map = dict(zip(registry_rows['code'].str.lower(), registry_rows['name']))
 
 print(f"\n📋 Renaming columns:")
 for old_name, new_name in column_rename_map.items():
@@ -54,12 +46,11 @@ print(f"\n✅ Saved: output/normalized_production_data_v2_fixed.csv")
 mapping_df = pd.read_csv('output/column_name_mapping.csv')
 print(f"\n✅ Loaded mapping file: {len(mapping_df)} rows")
 
-# Update the mapping
-for old_code, new_name in column_rename_map.items():
-    mask = mapping_df['code'] == old_code.upper()
-    if mask.any():
-        mapping_df.loc[mask, 'meaningful_name'] = new_name
-        print(f"  ✓ Updated {old_code.upper()} → {new_name}")
+# Update the mapping (one vectorized assignment)
+new_names = mapping_df['code'].str.lower().map(column_rename_map)
+mapping_df['meaningful_name'] = new_names.fillna(mapping_df['meaningful_name'])
+for code, new_name in zip(mapping_df.loc[new_names.notna(), 'code'], new_names.dropna()):
+    print(f"  ✓ Updated {code} → {new_name}")
 
 # Save updated mapping
 mapping_df.to_csv('output/column_name_mapping_fixed.csv', index=False, encoding='utf-8')
@@ -0,0 +1,134 @@
+"""
+GANODERMA DRILL-DOWN INDEX
+==========================
+Purpose: Join block_pest_disease to blocks → divisions → estates ONCE and
+         group it per drill level, so the dashboard's estate → division →
+         block drill-down is a dictionary lookup per click instead of
+         filtering df_blocks / df_gano for every division and every block.
+
+Index (dict):
+- divisions  {estate_code: DataFrame}  one row per surveyed division
+             (division_id, division_code, attack_rate, block_count, severity)
+- blocks     {division_id: DataFrame}  one row per surveyed block
+             (block_id, block_code, attack_rate, stadium_1_2, stadium_3_4,
+             total_infected, severity)
+- division_ids / division_counts       (estate, division_code) → id, estate → n
+
+Rates are in percent (pct_serangan × 100). A division's attack_rate is the
+mean over all its survey rows and block_count the number of rows; a block
+shows its first survey row - the same figures the drill-down showed before,
+also when blocks get several survey rounds.
+
+Usage:
+    from gano_index import build_gano_index, estate_divisions, division_blocks
+    index = build_gano_index(df_gano, df_blocks, df_divisions, df_estates)
+    estate_divisions(index, 'AME')              # division cards
+    division_blocks(index, 'AME', 'AME01')      # block cards
+
+    python gano_index.py                        # summary from the local snapshot
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard_metrics import timed
+
+SEVERITY_LEVELS = [(15, 'CRITICAL'), (10, 'HIGH'), (5, 'MEDIUM')]  # else LOW
+
+DIVISION_COLUMNS = ['division_id', 'division_code', 'attack_rate', 'block_count', 'severity']
+BLOCK_COLUMNS = ['block_id', 'block_code', 'attack_rate', 'stadium_1_2', 'stadium_3_4',
+                 'total_infected', 'severity']
+
+
+def severity(attack_rate):
+    """CRITICAL (>= 15%), HIGH (>= 10%), MEDIUM (>= 5%) or LOW for each rate (vectorized)"""
+    attack_rate = pd.Series(attack_rate, dtype=float)
+    return pd.Series(np.select([attack_rate >= level for level, _ in SEVERITY_LEVELS],
+                               [label for _, label in SEVERITY_LEVELS], default='LOW'),
+                     index=attack_rate.index)
+
+
+def _sort_by_rate(df):
+    # Stable, so ties keep the table order the cards always had
+    return df.sort_values('attack_rate', ascending=False, kind='stable').reset_index(drop=True)
+
+
+@timed('aggregate.gano_index')
+def build_gano_index(df_gano, df_blocks, df_divisions, df_estates):
+    """Joined + grouped Ganoderma survey, see module docstring"""
+    divisions = df_divisions[['id', 'division_code', 'estate_id']].merge(
+        df_estates[['id', 'estate_code']].rename(columns={'id': 'estate_id'}), on='estate_id', how='inner')
+    divisions = divisions.rename(columns={'id': 'division_id'})
+
+    survey = df_gano[['block_id', 'pct_serangan', 'serangan_ganoderma_pkk_stadium_1_2', 'stadium_3_4']].rename(
+        columns={'serangan_ganoderma_pkk_stadium_1_2': 'stadium_1_2'})
+    survey = survey.merge(df_blocks[['id', 'block_code', 'division_id']].rename(columns={'id': 'block_id'}),
+                          on='block_id', how='inner')
+    survey['attack_rate'] = survey['pct_serangan'] * 100
+
+    # Division level: mean over every survey row of the division's blocks
+    div_stats = survey.groupby('division_id', sort=False).agg(attack_rate=('attack_rate', 'mean'),
+                                                               block_count=('block_id', 'size'))
+    div_stats = divisions.merge(div_stats, left_on='division_id', right_index=True, how='inner')
+    div_stats['severity'] = severity(div_stats['attack_rate']).to_numpy()
+
+    # Block level: first survey row per block, in blocks table order
+    block_order = pd.Series(np.arange(len(df_blocks)), index=df_blocks['id'].to_numpy())
+    block_stats = survey.drop_duplicates('block_id', keep='first').copy()
+    block_stats['order'] = block_stats['block_id'].map(block_order)
+    block_stats = block_stats.sort_values('order', kind='stable')
+    for col in ('stadium_1_2', 'stadium_3_4'):
+        block_stats[col] = pd.to_numeric(block_stats[col], errors='coerce').fillna(0).astype(int)
+    block_stats['total_infected'] = block_stats['stadium_1_2'] + block_stats['stadium_3_4']
+    block_stats['severity'] = severity(block_stats['attack_rate']).to_numpy()
+
+    return {
+        'divisions': {estate: _sort_by_rate(rows[DIVISION_COLUMNS])
+                      for estate, rows in div_stats.groupby('estate_code', sort=False)},
+        'blocks': {division_id: _sort_by_rate(rows[BLOCK_COLUMNS])
+                   for division_id, rows in block_stats.groupby('division_id', sort=False)},
+        'division_ids': divisions.drop_duplicates(['estate_code', 'division_code'])
+                                 .set_index(['estate_code', 'division_code'])['division_id'].to_dict(),
+        'division_counts': divisions.groupby('estate_code').size().to_dict(),
+        'estates': set(df_estates['estate_code']),
+    }
+
+
+def division_count(index, estate_code):
+    """Divisions of an estate (surveyed or not); None when the estate is unknown"""
+    if estate_code not in index['estates']:
+        return None
+    return index['division_counts'].get(estate_code, 0)
+
+
+def estate_divisions(index, estate_code):
+    """Surveyed divisions of an estate, highest attack rate first"""
+    return index['divisions'].get(estate_code, pd.DataFrame(columns=DIVISION_COLUMNS))
+
+
+def division_blocks(index, estate_code, division_code):
+    """Surveyed blocks of a division, highest attack rate first"""
+    division_id = index['division_ids'].get((estate_code, division_code))
+    return index['blocks'].get(division_id, pd.DataFrame(columns=BLOCK_COLUMNS))
+
+
+def main():
+    from snapshot_store import read_table
+
+    print("=" * 80)
+    print("GANODERMA DRILL-DOWN INDEX")
+    print("=" * 80)
+
+    index = build_gano_index(read_table('block_pest_disease'), read_table('blocks'),
+                             read_table('divisions'), read_table('estates'))
+    for estate in sorted(index['estates']):
+        divisions = estate_divisions(index, estate)
+        print(f"\n{estate}: {division_count(index, estate)} divisions, {len(divisions)} surveyed")
+        for row in divisions.itertuples(index=False):
+            n_blocks = len(division_blocks(index, estate, row.division_code))
+            print(f"  {row.division_code:10s} {row.attack_rate:6.2f}%  {row.severity:8s} "
+                  f"{row.block_count:4d} rows  {n_blocks:4d} blocks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+EXECUTIVE KPI CUBE
+==================
+Purpose: Aggregate production_annual ONCE per data refresh so the executive
+         dashboard answers every filter change with a lookup over a few
+         hundred group rows, instead of re-merging blocks/infrastructure and
+         re-running every groupby on each Streamlit rerun.
+
+Cube grain: one row per (estate, division, year, category)
+- real_ton / potensi_ton / gap_ton sums, records (block-years)
+- blocks, area_ha (each block counted once per group)
+- risk bucket counts on gap_pct_ton: critical (< -20%), high (-20% to -10%),
+  medium (-10% to 0%), on_target (>= 0%), unknown (no gap %)
+- gap_pct_sum / gap_pct_n and gano_* sums so averages can be re-derived for
+  any roll-up
+- year = ALL_YEARS (0) rows roll the years up with blocks/area still counted
+  once, so "All Years" never needs the block-level table
+
+Infrastructure (area) is taken once per block - the first row when a block
+is listed more than once (F005A 4×, K023B 2×). The dashboard's old
+production × infrastructure merge fanned those duplicates out, so its
+records and ton totals were higher than the cube's (F005A counted 4×:
++9 records / +342 t real_ton on the 2023-2025 data).
+
+Blocks belong to exactly one estate/division/category, so every column can be
+summed across those dimensions; only the year dimension needs the ALL_YEARS
+rows. Top/bottom performer lists are precomputed per year × estate filter.
+
+Usage:
+    from kpi_cube import build_cube, totals, breakdown, performers
+    cube = build_cube(df_prod, df_blocks, df_infra, df_gano)
+    kpi = totals(cube, year=2024, estate='AME')
+    loss = loss_rupiah(shortfall(cube, 2024, 'AME'), price_per_ton=2_500_000)
+
+    python kpi_cube.py      # build from the local snapshot and print totals
+"""
+
+import os
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dashboard_metrics import span, timed
+
+ALL_YEARS = 0
+ALL = 'All'
+CUBE_FILE = 'output/.cache/kpi_cube.pkl'
+
+DIMENSIONS = ['estate', 'division', 'year', 'category']
+
+# Estate from the first letter of the block code (as used by the dashboards)
+ESTATE_BY_PREFIX = {'A': 'AME', 'O': 'OLE', 'D': 'DBE', 'B': 'AME', 'E': 'AME',
+                    'F': 'AME', 'K': 'OLE', 'L': 'OLE', 'M': 'DBE', 'N': 'DBE'}
+
+RISK_BUCKETS = ['critical', 'high', 'medium', 'on_target', 'unknown']
+
+SUM_COLUMNS = ['real_ton', 'potensi_ton', 'gap_ton', 'records', 'gap_pct_sum', 'gap_pct_n',
+               'blocks', 'area_ha', 'gano_blocks', 'gano_pct_sum', 'gano_pct_n'] + RISK_BUCKETS
+
+TOP_N = 10
+
+
+def risk_bucket(gap_pct):
+    """Risk bucket name for each gap_pct_ton value (vectorized)"""
+    gap_pct = pd.Series(gap_pct)
+    return pd.Series(np.select(
+        [gap_pct.isna(), gap_pct < -20, gap_pct < -10, gap_pct < 0],
+        ['unknown', 'critical', 'high', 'medium'],
+        default='on_target'
+    ), index=gap_pct.index)
+
+
+@timed('aggregate.kpi_cube.merge')
+def build_base(df_prod, df_blocks, df_infra, df_gano=None):
+    """Block-year rows with estate/division/category/area attached (merged once)"""
+    blocks = df_blocks.rename(columns={'id': 'block_id'})
+    block_cols = ['block_id', 'block_code'] + [c for c in ('category', 'division') if c in blocks.columns]
+
+    df = df_prod.merge(blocks[block_cols], on='block_id', how='left', suffixes=('_prod', ''))
+    if 'block_code_prod' in df.columns:
+        # Master block_code first, production_annual's copy as fallback
+        df['block_code'] = df['block_code'].fillna(df['block_code_prod'])
+
+    # One area per block: duplicate infrastructure rows must not duplicate production rows
+    area = df_infra[['block_id', 'total_luas_sd_2025_ha']].drop_duplicates('block_id')
+    df = df.merge(area.rename(columns={'total_luas_sd_2025_ha': 'area_ha'}), on='block_id', how='left')
+
+    df['estate'] = df['block_code'].str[0].map(ESTATE_BY_PREFIX)
+    for col in ('division', 'category'):
+        df[col] = df[col].fillna('-') if col in df.columns else '-'
+
+    df['risk'] = risk_bucket(df['gap_pct_ton']).to_numpy()
+
+    # Ganoderma survey per block: rows, and sum/count of pct_serangan for averages
+    if df_gano is not None and len(df_gano):
+        gano = df_gano.groupby('block_id').agg(gano_blocks=('block_id', 'size'),
+                                               gano_pct_sum=('pct_serangan', 'sum'),
+                                               gano_pct_n=('pct_serangan', 'count'))
+        df = df.merge(gano, left_on='block_id', right_index=True, how='left')
+    for col in ('gano_blocks', 'gano_pct_sum', 'gano_pct_n'):
+        df[col] = df[col].fillna(0) if col in df.columns else 0
+
+    keep = ['block_id', 'block_code', 'estate', 'division', 'category', 'year', 'real_ton', 'potensi_ton',
+            'gap_ton', 'gap_pct_ton', 'risk', 'area_ha', 'gano_blocks', 'gano_pct_sum', 'gano_pct_n']
+    return df[keep]
+
+
+def _aggregate(base, keys):
+    grouped = base.groupby(keys, dropna=False)
+    sums = grouped.agg(real_ton=('real_ton', 'sum'),
+                       potensi_ton=('potensi_ton', 'sum'),
+                       gap_ton=('gap_ton', 'sum'),
+                       records=('block_id', 'size'),
+                       gap_pct_sum=('gap_pct_ton', 'sum'),
+                       gap_pct_n=('gap_pct_ton', 'count'))
+
+    risk = pd.get_dummies(base['risk']).reindex(columns=RISK_BUCKETS, fill_value=0).astype(int)
+    risk = risk.groupby([base[k] for k in keys], dropna=False).sum()
+
+    # Per-block measures count each block once per group, however many years it has
+    per_block = base.drop_duplicates(keys + ['block_id']).groupby(keys, dropna=False).agg(
+        blocks=('block_id', 'size'),
+        area_ha=('area_ha', 'sum'),
+        gano_blocks=('gano_blocks', 'sum'),
+        gano_pct_sum=('gano_pct_sum', 'sum'),
+        gano_pct_n=('gano_pct_n', 'sum'))
+
+    return sums.join(per_block).join(risk).reset_index()
+
+
+def _performers(base, years, estates, top_n):
+    """Top/bottom blocks by gap_pct_ton for every (year, estate) filter combination"""
+    frames = []
+    cols = ['block_code', 'estate', 'real_ton', 'gap_pct_ton']
+    for year in [ALL_YEARS] + years:
+        by_year = base if year == ALL_YEARS else base[base['year'] == year]
+        for estate in [ALL] + estates:
+            subset = by_year if estate == ALL else by_year[by_year['estate'] == estate]
+            for side, rows in (('top', subset.nlargest(top_n, 'gap_pct_ton')),
+                               ('bottom', subset.nsmallest(top_n, 'gap_pct_ton'))):
+                frames.append(rows[cols].assign(filter_year=year, filter_estate=estate, side=side))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=cols)
+
+
+def _loss_table(rows):
+    """
+    gap_ton and shortfall_ton (Ton below target, >= 0) per (year, estate,
+    division) plus estate and portfolio roll-ups (division / estate = 'All').
+    The shortfall is clipped at every level separately, like the loss cards,
+    so look a level up instead of summing its children.
+    """
+    rows = rows[['year', 'estate', 'division', 'gap_ton']]
+    loss = pd.concat([
+        rows.groupby(['year', 'estate', 'division'], dropna=False)['gap_ton'].sum().reset_index(),
+        rows.groupby(['year', 'estate'], dropna=False)['gap_ton'].sum().reset_index().assign(division=ALL),
+        rows.groupby('year')['gap_ton'].sum().reset_index().assign(estate=ALL, division=ALL),
+    ], ignore_index=True)
+    loss['shortfall_ton'] = (-loss['gap_ton']).clip(lower=0)
+    return loss[['year', 'estate', 'division', 'gap_ton', 'shortfall_ton']]
+
+
+def build_cube(df_prod, df_blocks, df_infra, df_gano=None, top_n=TOP_N):
+    """
+    Build the cube from the raw tables. Returns a dict:
+    cube (DataFrame), loss (DataFrame), performers (DataFrame), years,
+    estates, built_at.
+    """
+    base = build_base(df_prod, df_blocks, df_infra, df_gano)
+
+    with span('aggregate.kpi_cube.rollup'):
+        by_year = _aggregate(base, DIMENSIONS)
+        all_years = _aggregate(base, [d for d in DIMENSIONS if d != 'year'])
+        all_years['year'] = ALL_YEARS
+        cube = pd.concat([by_year, all_years[by_year.columns]], ignore_index=True)
+
+    years = sorted(int(y) for y in base['year'].dropna().unique())
+    estates = sorted(base['estate'].dropna().unique().tolist())
+    with span('aggregate.kpi_cube.performers'):
+        performer_rows = _performers(base, years, estates, top_n)
+    return assemble_cube(cube, performer_rows)
+
+
+def assemble_cube(rows, performer_rows):
+    """
+    Cube dict from already aggregated rows (DIMENSIONS + SUM_COLUMNS, with
+    ALL_YEARS roll-ups) and performer rows - used by build_cube() and by
+    dashboard_data.load_cube() for the server-side views.
+    """
+    rows = rows.copy()
+    rows['year'] = rows['year'].astype(int)
+    return {
+        'cube': rows,
+        'loss': _loss_table(rows),
+        'performers': performer_rows,
+        'years': sorted(int(y) for y in rows['year'].unique() if y != ALL_YEARS),
+        'estates': sorted(rows['estate'].dropna().unique().tolist()),
+        'built_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def _year_key(year):
+    return ALL_YEARS if year in (None, ALL, 'All Years') else int(year)
+
+
+def select(cube, year=ALL_YEARS, estate=ALL, **dims):
+    """Cube rows for a year (ALL_YEARS = roll-up) and optional estate/division/category"""
+    rows = cube['cube']
+    mask = rows['year'] == _year_key(year)
+    if estate not in (None, ALL):
+        mask &= rows['estate'] == estate
+    for dim, value in dims.items():
+        if value not in (None, ALL):
+            mask &= rows[dim] == value
+    return rows[mask]
+
+
+def _derive(sums):
+    """Ratios and averages from summed cube columns (one row per group)"""
+    potensi = sums['potensi_ton'].where(sums['potensi_ton'] != 0)
+    sums['achievement_pct'] = (sums['real_ton'] / potensi * 100).where(sums['potensi_ton'] > 0, 0)
+    sums['gap_pct'] = (sums['gap_ton'] / potensi * 100).fillna(0)
+    sums['avg_gap_pct'] = sums['gap_pct_sum'] / sums['gap_pct_n'].where(sums['gap_pct_n'] > 0)
+    sums['gano_pct'] = (sums['gano_pct_sum'] / sums['gano_pct_n'].where(sums['gano_pct_n'] > 0) * 100).fillna(0)
+    sums['risk_blocks'] = sums['critical'] + sums['high']
+    return sums
+
+
+def totals(cube, year=ALL_YEARS, estate=ALL, **dims):
+    """All KPIs for one filter combination as a dict"""
+    sums = select(cube, year, estate, **dims)[SUM_COLUMNS].sum().to_frame().T
+    return _derive(sums).iloc[0].to_dict()
+
+
+def breakdown(cube, by, year=ALL_YEARS, estate=ALL, **dims):
+    """KPIs per value of one or more dimensions, e.g. by='estate' or by=['estate', 'year']"""
+    by = [by] if isinstance(by, str) else list(by)
+    if 'year' in by and year in (None, ALL, ALL_YEARS, 'All Years'):
+        rows = cube['cube'][cube['cube']['year'] != ALL_YEARS]
+        if estate not in (None, ALL):
+            rows = rows[rows['estate'] == estate]
+    else:
+        rows = select(cube, year, estate, **dims)
+    return _derive(rows.groupby(by)[SUM_COLUMNS].sum()).reset_index()
+
+
+def performers(cube, side='top', year=ALL_YEARS, estate=ALL):
+    """Precomputed top/bottom blocks for a year/estate filter"""
+    year = _year_key(year)
+    rows = cube['performers']
+    rows = rows[(rows['filter_year'] == year) & (rows['filter_estate'] == (estate or ALL)) & (rows['side'] == side)]
+    return rows[['block_code', 'estate', 'real_ton', 'gap_pct_ton']].reset_index(drop=True)
+
+
+def shortfall(cube, year=ALL_YEARS, estate=ALL, division=ALL):
+    """Ton below target for one year/estate/division filter (0 when on target)"""
+    loss = cube['loss']
+    rows = loss[(loss['year'] == _year_key(year)) & (loss['estate'] == (estate or ALL))
+                & (loss['division'] == (division or ALL))]
+    return float(rows['shortfall_ton'].sum())
+
+
+def loss_breakdown(cube, by, year=ALL_YEARS, estate=ALL):
+    """gap_ton / shortfall_ton per year, estate or division under the other filters"""
+    loss = cube['loss']
+    year, estate = _year_key(year), estate or ALL
+    if by == 'year':
+        mask = (loss['year'] != ALL_YEARS) & (loss['estate'] == estate) & (loss['division'] == ALL)
+    elif by == 'estate':
+        mask = (loss['year'] == year) & (loss['estate'] != ALL) & (loss['division'] == ALL)
+    elif by == 'division':
+        mask = (loss['year'] == year) & (loss['estate'] == estate) & (loss['division'] != ALL)
+    else:
+        raise ValueError(f"loss_breakdown by must be year, estate or division, not {by!r}")
+    return loss.loc[mask, [by, 'gap_ton', 'shortfall_ton']].reset_index(drop=True)
+
+
+def loss_rupiah(shortfall_ton, price_per_ton):
+    """Rp lost for a shortfall in Ton (scalar or Series) - the only price-dependent step"""
+    return shortfall_ton * price_per_ton
+
+
+def save_cube(cube, path=CUBE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(cube, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_cube(path=CUBE_FILE):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def main():
+    from snapshot_store import read_table
+
+    print("=" * 80)
+    print("BUILD EXECUTIVE KPI CUBE")
+    print("=" * 80)
+
+    cube = build_cube(read_table('production_annual'), read_table('blocks'),
+                      read_table('block_land_infrastructure'), read_table('block_pest_disease'))
+    save_cube(cube)
+    print(f"✅ {len(cube['cube']):,} group rows, years {cube['years']} → {CUBE_FILE}")
+
+    print(f"\n{'Year':>6s} {'Estate':6s} {'Real Ton':>12s} {'Potensi Ton':>12s} {'Gap Ton':>12s} {'Blocks':>7s} {'Risk':>5s}")
+    for year in [ALL_YEARS] + cube['years']:
+        for estate in [ALL] + cube['estates']:
+            kpi = totals(cube, year, estate)
+            print(f"{year or 'All':>6} {estate:6s} {kpi['real_ton']:12,.0f} {kpi['potensi_ton']:12,.0f} "
+                  f"{kpi['gap_ton']:12,.0f} {int(kpi['blocks']):7d} {int(kpi['risk_blocks']):5d}")
+
+
+if __name__ == "__main__":
+    main()
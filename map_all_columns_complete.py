@@ -1,32 +1,21 @@
 """
 COMPLETE MAPPING - ALL 156 COLUMNS
 Menggunakan file normalized_production_data.csv yang LENGKAP
-dengan mapping dictionary yang lengkap
+dengan column registry (column_registry.csv)
 """
 
 import pandas as pd
 import numpy as np
 
+from column_registry import apply_registry, load_registry
+
 print("=" * 100)
 print("COMPLETE MAPPING FOR ALL PRODUCTION DATA COLUMNS")
 print("=" * 100)
 
-# Load mapping dictionary
-mapping_df = pd.read_csv('output/column_name_mapping_fixed.csv')
-print(f"\n✅ Loaded mapping dictionary: {len(mapping_df)} rows")
-
-# Create mapping dict (code -> meaningful_name)
-code_to_name = dict(zip(mapping_df['code'].str.upper(), mapping_df['meaningful_name']))
-
-# Add special mappings for columns tidak ada di dictionary
-special_mappings = {
-    'ID': 'id',
-    'BLOCK_CODE': 'block_code',
-    'C010': 'penambahan_luas_ha',  # Missing from dict
-}
-code_to_name.update(special_mappings)
-
-print(f"✅ Total mappings available: {len(code_to_name)}")
+# Load column registry (column_registry.csv)
+registry = load_registry()
+print(f"\n✅ Loaded column registry v{registry.attrs['version']}: {len(registry)} columns")
 
 # Load FULL production data (156 columns)
 df_full = pd.read_csv('output/normalized_production_data.csv')
@@ -36,21 +25,13 @@ print(f"\n📋 Original column names (first 30):")
 for i, col in enumerate(df_full.columns[:30], 1):
     print(f"  {i:3d}. {col}")
 
-# Apply mapping to ALL columns
-new_columns = []
-unmapped = []
-
-for col in df_full.columns:
-    col_upper = col.upper()
-    
-    if col_upper in code_to_name:
-        new_columns.append(code_to_name[col_upper])
-    else:
-        # Keep original if not in mapping
-        new_columns.append(col.lower())
-        unmapped.append(col)
-
-df_full.columns = new_columns
+# Apply mapping to ALL columns in one rename.
+# Legacy names are kept here: phase1.5-3 select COMPLETE.csv columns by them.
+df_full, unmapped = apply_registry(df_full, registry, target='legacy_name')
+
+# Keep original (lowercased) if not in registry
+df_full = df_full.rename(columns={col: col.lower() for col in unmapped})
+unmapped = [col for col in unmapped if col.lower() not in ('id', 'block_code')]
 
 print(f"\n⚠️  Unmapped columns: {len(unmapped)}")
 if unmapped:
@@ -0,0 +1,219 @@
+"""
+MONTHLY PRODUCTION STORE
+========================
+Purpose: Hold production_monthly (block × year × month, month stored as
+         VARCHAR 'Jan'..'Dec') as one float32 array per metric with shape
+         (blocks, months), so monthly trends, rolling windows, YTD and
+         seasonal indices are computed for ALL blocks at once with NumPy
+         instead of grouping long-format rows on every rerun.
+
+Store (dict):
+- values      {metric: float32 array (n_blocks, n_months)}, NaN = no data
+- blocks      DataFrame, one row per array row: block_code, estate, division
+- first_year  month index 0 = January of first_year; the month axis always
+              covers whole years (n_months = 12 × n_years), so YTD and the
+              seasonal index are plain reshapes to (n_blocks, n_years, 12)
+- years, built_at
+
+Building is a single scatter of the long rows into the arrays - linear in
+the number of rows, so appending more years of history only makes the
+arrays longer. Estate comes from the block code prefix (kpi_cube) and
+division from blocks.division, the same as the annual cube.
+
+Usage:
+    from monthly_store import build_store, group_totals, rolling_sum, ytd
+    store = build_store(df_monthly, df_blocks)
+    labels, tons = group_totals(store, 'real_ton', by='estate')   # (estates, months)
+    rolling_sum(tons, 3); ytd(tons); seasonal_index(tons)
+
+    python monthly_store.py      # summary from the local snapshot
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dashboard_metrics import timed
+from kpi_cube import ALL, ESTATE_BY_PREFIX
+
+METRICS = ['real_ton', 'potensi_ton', 'gap_ton', 'real_jum_jjg', 'potensi_jum_jjg']
+MONTH_LABELS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# First three letters, English and Indonesian (phase3 writes 'Jan'..'Dec')
+MONTH_NUMBER = {name.lower(): i for i, name in enumerate(MONTH_LABELS, 1)}
+MONTH_NUMBER.update({'mei': 5, 'agu': 8, 'ags': 8, 'okt': 10, 'nop': 11, 'des': 12})
+
+
+def month_number(months):
+    """1..12 for month names ('Jan', 'januari', 'Okt') or numbers ('3', '03'); 0 when unknown (vectorized)"""
+    # Only the few distinct spellings are parsed, then spread back with the codes
+    codes, uniques = pd.factorize(pd.Series(months).astype(str))
+    text = pd.Series(uniques).str.strip().str.lower()
+    numeric = pd.to_numeric(text, errors='coerce')
+    number = text.str[:3].map(MONTH_NUMBER).fillna(numeric.where(numeric.between(1, 12)))
+    lookup = np.append(number.fillna(0).to_numpy(dtype=np.int16), np.int16(0))  # code -1 (NaN) → 0
+    return lookup[codes]
+
+
+@timed('aggregate.monthly_store')
+def build_store(df_monthly, df_blocks=None):
+    """Scatter the long production_monthly rows into (blocks, months) arrays, see module docstring"""
+    df = df_monthly[['block_code', 'year', 'month'] + [m for m in METRICS if m in df_monthly.columns]].copy()
+    df['month_num'] = month_number(df['month'])
+    df['year'] = pd.to_numeric(df['year'], errors='coerce')
+    df = df[(df['month_num'] > 0) & df['year'].notna() & df['block_code'].notna()]
+    if df.empty:
+        raise ValueError("production_monthly has no rows with a valid block, year and month")
+
+    years = sorted(int(y) for y in df['year'].unique())
+    first_year = years[0]
+    n_months = 12 * (years[-1] - first_year + 1)
+
+    rows, block_codes = pd.factorize(df['block_code'], sort=True)
+    block_codes = np.asarray(block_codes)
+    cols = (df['year'].to_numpy().astype(np.int64) - first_year) * 12 + df['month_num'].to_numpy() - 1
+
+    shape = (len(block_codes), n_months)
+    cells = rows * n_months + cols  # flat (block, month) position
+
+    values = {}
+    for metric in METRICS:
+        data = (pd.to_numeric(df[metric], errors='coerce').to_numpy(dtype=np.float64)
+                if metric in df.columns else np.full(len(df), np.nan))
+        present = ~np.isnan(data)
+        # Duplicate (block, month) rows are summed; cells without any value stay NaN
+        sums = np.bincount(cells[present], weights=data[present], minlength=shape[0] * shape[1])
+        counts = np.bincount(cells[present], minlength=shape[0] * shape[1])
+        values[metric] = np.where(counts > 0, sums, np.nan).astype(np.float32).reshape(shape)
+
+    blocks = pd.DataFrame({'block_code': block_codes})
+    blocks['estate'] = blocks['block_code'].str[0].map(ESTATE_BY_PREFIX).fillna('-')
+    if df_blocks is not None and 'division' in df_blocks.columns:
+        division = df_blocks.drop_duplicates('block_code').set_index('block_code')['division']
+        blocks['division'] = blocks['block_code'].map(division).fillna('-')
+    else:
+        blocks['division'] = '-'
+
+    return {
+        'values': values,
+        'blocks': blocks,
+        'first_year': first_year,
+        'years': years,
+        'built_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def periods(store):
+    """Month-start timestamps of the month axis"""
+    n_months = next(iter(store['values'].values())).shape[1]
+    return pd.date_range(f"{store['first_year']}-01-01", periods=n_months, freq='MS')
+
+
+def block_mask(store, estate=ALL, division=ALL):
+    blocks = store['blocks']
+    mask = np.ones(len(blocks), dtype=bool)
+    if estate not in (None, ALL):
+        mask &= (blocks['estate'] == estate).to_numpy()
+    if division not in (None, ALL):
+        mask &= (blocks['division'] == division).to_numpy()
+    return mask
+
+
+def group_totals(store, metric, by=None, estate=ALL, division=ALL):
+    """
+    (labels, totals) - totals is (groups, months), summed over the blocks of
+    each estate/division (by=None: one portfolio row labelled 'All').
+    NaN where no block of the group has data for that month.
+    """
+    mask = block_mask(store, estate, division)
+    values = store['values'][metric][mask]
+    if by is None:
+        codes, labels = np.zeros(len(values), dtype=np.int64), np.array([ALL])
+    else:
+        codes, labels = pd.factorize(store['blocks'].loc[mask, by].to_numpy(), sort=True)
+
+    # One-hot (groups × blocks) @ (blocks × months): every group in one BLAS call
+    onehot = np.zeros((len(labels), len(values)), dtype=np.float32)
+    onehot[codes, np.arange(len(values))] = 1
+    present = ~np.isnan(values)
+    totals = onehot.astype(np.float64) @ np.where(present, values, 0).astype(np.float64)
+    totals[onehot @ present.astype(np.float32) == 0] = np.nan
+    return np.asarray(labels), totals
+
+
+def rolling_sum(series, window):
+    """Trailing `window`-month sum along the last axis; NaN until a full window of observed months"""
+    series = np.asarray(series, dtype=np.float64)
+    present = ~np.isnan(series)
+    pad = [(0, 0)] * (series.ndim - 1) + [(1, 0)]
+    sums = np.cumsum(np.pad(np.where(present, series, 0), pad), axis=-1)
+    counts = np.cumsum(np.pad(present.astype(np.int64), pad), axis=-1)
+    window_sum = sums[..., window:] - sums[..., :-window]
+    window_n = counts[..., window:] - counts[..., :-window]
+    result = np.full(series.shape, np.nan)
+    result[..., window - 1:] = np.where(window_n == window, window_sum, np.nan)
+    return result
+
+
+def ytd(series):
+    """Year-to-date cumulative sum along the last axis (whole years); NaN after the last reported month"""
+    series = np.asarray(series, dtype=np.float64)
+    by_year = series.reshape(series.shape[:-1] + (-1, 12))
+    cumulative = np.nancumsum(by_year, axis=-1).reshape(series.shape)
+    return np.where(np.isnan(series), np.nan, cumulative)
+
+
+def seasonal_index(series):
+    """
+    (..., 12): average of each calendar month over the years, as % of the
+    average month (100 = a typical month). Months never reported are NaN.
+    """
+    series = np.asarray(series, dtype=np.float64)
+    by_year = series.reshape(series.shape[:-1] + (-1, 12))
+    present = ~np.isnan(by_year)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        month_mean = np.where(present, by_year, 0).sum(axis=-2) / present.sum(axis=-2)
+        reported = ~np.isnan(month_mean)
+        overall = np.where(reported, month_mean, 0).sum(axis=-1, keepdims=True) / reported.sum(axis=-1, keepdims=True)
+        return month_mean / np.where(overall != 0, overall, np.nan) * 100
+
+
+def trend_frame(store, metric, by=None, estate=ALL, division=ALL, view='monthly', window=3):
+    """Long DataFrame (period, group, value) for line charts; view = monthly | rolling | ytd"""
+    labels, totals = group_totals(store, metric, by, estate, division)
+    if view == 'rolling':
+        totals = rolling_sum(totals, window)
+    elif view == 'ytd':
+        totals = ytd(totals)
+    frame = pd.DataFrame(totals.T, index=periods(store), columns=labels)
+    frame.index.name = 'period'
+    return frame.reset_index().melt(id_vars='period', var_name='group', value_name='value').dropna(subset=['value'])
+
+
+def main():
+    from snapshot_store import read_table
+
+    print("=" * 80)
+    print("MONTHLY PRODUCTION STORE")
+    print("=" * 80)
+
+    store = build_store(read_table('production_monthly'), read_table('blocks'))
+    n_blocks, n_months = store['values']['real_ton'].shape
+    size_kb = sum(v.nbytes for v in store['values'].values()) / 1024
+    print(f"\n✅ {n_blocks} blocks × {n_months} months ({store['years'][0]}-{store['years'][-1]}), "
+          f"{len(METRICS)} metrics in {size_kb:,.0f} KB")
+
+    labels, tons = group_totals(store, 'real_ton', by='estate')
+    annual = np.nansum(tons.reshape(len(labels), -1, 12), axis=-1)
+    print(f"\nProduction (Ton) per year\n{'Estate':8s}" + ''.join(f"{year:>14d}" for year in store['years']))
+    for label, row in zip(labels, annual):
+        print(f"{label:8s}" + ''.join(f"{value:14,.1f}" for value in row))
+
+    index = seasonal_index(group_totals(store, 'real_ton')[1])[0]
+    print("\nSeasonal index (portfolio, 100 = average month):")
+    print('  ' + '  '.join(f"{m} {v:5.1f}" for m, v in zip(MONTH_LABELS, index)))
+
+
+if __name__ == "__main__":
+    main()
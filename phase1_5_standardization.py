@@ -20,236 +20,242 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime
-
-print("=" * 100)
-print("PHASE 1.5: BLOCK CODE STANDARDIZATION")
-print("=" * 100)
-print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-# ============================================================================
-# STEP 1: Load normalized_production_data_COMPLETE.csv to understand structure
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 1: Analyzing normalized_production_data_COMPLETE.csv structure")
-print("=" * 100)
-
-df_complete = pd.read_csv('output/normalized_production_data_COMPLETE.csv', nrows=10)
-print(f"✅ Loaded sample data: {df_complete.shape}")
-print(f"\nFirst 20 columns:")
-for i, col in enumerate(df_complete.columns[:20], 1):
-    print(f"  {i:2d}. {col}")
-
-# Check if block_code column exists
-if 'block_code' in df_complete.columns:
-    print(f"\n✅ Found 'block_code' column")
-    print(f"Sample block codes: {df_complete['block_code'].head().tolist()}")
-    block_col_name = 'block_code'
-elif 'blok' in str(df_complete.columns).lower():
-    block_cols = [c for c in df_complete.columns if 'blok' in str(c).lower()]
-    block_col_name = block_cols[0]
-    print(f"\n✅ Found block column: '{block_col_name}'")
-else:
-    # Assume column 2 might be block code
-    block_col_name = df_complete.columns[1]
-    print(f"\n⚠️  Using column '{block_col_name}' as block identifier")
-
-# ============================================================================
-# STEP 2: Load FULL data from normalized_production_data_COMPLETE.csv
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 2: Loading FULL block list from normalized_production_data_COMPLETE.csv")
-print("=" * 100)
-
-df_complete_full = pd.read_csv('output/normalized_production_data_COMPLETE.csv')
-print(f"✅ Loaded complete data: {df_complete_full.shape}")
-
-# Extract unique blocks
-if block_col_name in df_complete_full.columns:
-    blocks_complete = df_complete_full[[block_col_name]].drop_duplicates()
-    blocks_complete = blocks_complete.rename(columns={block_col_name: 'block_code'})
-    print(f"✅ Extracted {len(blocks_complete)} unique blocks")
-    print(f"\nSample block codes:")
-    print(blocks_complete.head(20))
-else:
-    print(f"❌ Column '{block_col_name}' not found!")
-
-# Check for other block-related columns
-block_related_cols = [c for c in df_complete_full.columns if 'blok' in str(c).lower() or 
-                      'block' in str(c).lower() or 'estate' in str(c).lower() or
-                      'divisi' in str(c).lower() or 'kode' in str(c).lower()]
-print(f"\nBlock-related columns in complete file:")
-for col in block_related_cols[:10]:
-    print(f"  - {col}")
-
-# ============================================================================
-# STEP 3: Extract blocks from Realisasi PT SR.xlsx (proper parsing)
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 3: Extracting blocks from Realisasi PT SR.xlsx (proper parsing)")
-print("=" * 100)
-
-# Load Inti sheet - skip header rows and use proper column
-df_realisasi_inti_raw = pd.read_excel('source/Realisasi vs Potensi PT SR.xlsx',
-                                       sheet_name='Real VS Potensi Inti',
-                                       header=None)
-print(f"✅ Loaded Inti raw: {df_realisasi_inti_raw.shape}")
-
-# Based on our check, data starts around row 9, column 2 is block code
-# Let's find where actual data starts
-print("\nFinding data start row...")
-for i in range(20):
-    row_val = df_realisasi_inti_raw.iloc[i, :5].tolist()
-    print(f"  Row {i}: {row_val}")
-    # Look for row with numeric value in first column (ID)
-    if pd.notna(df_realisasi_inti_raw.iloc[i, 0]) and isinstance(df_realisasi_inti_raw.iloc[i, 0], (int, float)):
-        if df_realisasi_inti_raw.iloc[i, 0] == 1:  # First ID
-            data_start_row = i
-            print(f"\n✅ Data starts at row {data_start_row}")
-            break
-
-# Extract header row (might be 1-2 rows before data)
-header_row = data_start_row - 1
-print(f"Header row: {data_start_row - 1}")
-print(f"Headers: {df_realisasi_inti_raw.iloc[header_row, :10].tolist()}")
-
-# Load properly with header
-df_realisasi_inti = pd.read_excel('source/Realisasi vs Potensi PT SR.xlsx',
-                                   sheet_name='Real VS Potensi Inti',
-                                   skiprows=header_row,
-                                   nrows=700)  # Safety limit
-print(f"\n✅ Loaded Inti with proper header: {df_realisasi_inti.shape}")
-print(f"\nColumn names (first 10):")
-for i, col in enumerate(df_realisasi_inti.columns[:10], 1):
-    print(f"  {i:2d}. {col}")
-
-# Identify block code column
-block_col_inti = df_realisasi_inti.columns[2] if len(df_realisasi_inti.columns) > 2 else df_realisasi_inti.columns[1]
-print(f"\nUsing column '{block_col_inti}' as block code")
-print(f"Sample values: {df_realisasi_inti[block_col_inti].head(10).tolist()}")
-
-# Extract unique blocks from Inti
-blocks_inti = df_realisasi_inti[block_col_inti].dropna().unique()
-print(f"\n✅ Extracted {len(blocks_inti)} unique Inti blocks")
-
-# Same for Plasma
-df_realisasi_plasma = pd.read_excel('source/Realisasi vs Potensi PT SR.xlsx',
-                                     sheet_name='Real VS Potensi Plasma',
-                                     skiprows=header_row,
-                                     nrows=700)
-print(f"\n✅ Loaded Plasma with proper header: {df_realisasi_plasma.shape}")
-
-block_col_plasma = df_realisasi_plasma.columns[2] if len(df_realisasi_plasma.columns) > 2 else df_realisasi_plasma.columns[1]
-blocks_plasma = df_realisasi_plasma[block_col_plasma].dropna().unique()
-print(f"✅ Extracted {len(blocks_plasma)} unique Plasma blocks")
-
-# Combine
-all_blocks_realisasi = set(list(blocks_inti) + list(blocks_plasma))
-print(f"\n✅ Total unique blocks in Realisasi file: {len(all_blocks_realisasi)}")
-print(f"Sample: {list(all_blocks_realisasi)[:20]}")
-
-# ============================================================================
-# STEP 4: Reconcile block codes
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 4: Reconciling block codes")
-print("=" * 100)
-
-# Get blocks from normalized_production_data_COMPLETE
-blocks_normalized = set(blocks_complete['block_code'].values)
-print(f"\nBlocks in normalized_production_data_COMPLETE: {len(blocks_normalized)}")
-print(f"Sample: {list(blocks_normalized)[:20]}")
-
-print(f"\nBlocks in Realisasi file: {len(all_blocks_realisasi)}")
-print(f"Sample: {list(all_blocks_realisasi)[:20]}")
-
-# Find matches
-matches = blocks_normalized & all_blocks_realisasi
-only_in_normalized = blocks_normalized - all_blocks_realisasi
-only_in_realisasi = all_blocks_realisasi - blocks_normalized
-
-print(f"\n📊 Reconciliation Results:")
-print(f"  ✅ Blocks in BOTH: {len(matches)}")
-print(f"  ⚠️  Only in Normalized: {len(only_in_normalized)}")
-print(f"  ⚠️  Only in Realisasi: {len(only_in_realisasi)}")
-
-if len(matches) > 0:
-    print(f"\n✅ Found {len(matches)} matching blocks!")
-    print(f"Sample matches: {list(matches)[:20]}")
-
-# ============================================================================
-# STEP 5: Create master blocks table
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 5: Creating master blocks table")
-print("=" * 100)
-
-# Use blocks from normalized_production_data_COMPLETE as base
-# Add estate_id from existing normalized_blocks_v2.csv
-df_blocks_old = pd.read_csv('output/normalized_blocks_v2.csv')
-
-# Create master table
-df_blocks_master = blocks_complete.copy()
-df_blocks_master['block_code_standardized'] = df_blocks_master['block_code']
-
-# Add flags
-df_blocks_master['has_production_data'] = df_blocks_master['block_code'].isin(all_blocks_realisasi)
-df_blocks_master['category'] = df_blocks_master['block_code'].apply(
-    lambda x: 'Inti' if x in blocks_inti else ('Plasma' if x in blocks_plasma else 'Unknown')
-)
-
-# Add ID column
-df_blocks_master.insert(0, 'id', range(1, len(df_blocks_master) + 1))
-
-# Try to map estate_id from old blocks (if possible by fuzzy matching or other means)
-# For now, we'll leave estate_id as NULL and populate later if needed
-
-print(f"\n✅ Created master blocks table: {len(df_blocks_master)} blocks")
-print(f"\nCategory distribution:")
-print(df_blocks_master['category'].value_counts())
-print(f"\nProduction data availability:")
-print(df_blocks_master['has_production_data'].value_counts())
-
-# ============================================================================
-# STEP 6: Check for F005A duplicate
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 6: Checking for F005A duplicate")
-print("=" * 100)
-
-f005a_count = (df_blocks_master['block_code'] == 'F005A').sum()
-print(f"F005A occurrences: {f005a_count}")
-
-if f005a_count > 1:
-    print(f"⚠️  Found {f005a_count} F005A entries - removing duplicates...")
-    df_blocks_master = df_blocks_master.drop_duplicates(subset=['block_code'], keep='first')
-    # Reset IDs
-    df_blocks_master['id'] = range(1, len(df_blocks_master) + 1)
-    print(f"✅ After deduplication: {len(df_blocks_master)} blocks")
-
-# ============================================================================
-# STEP 7: Save outputs
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 7: Saving outputs")
-print("=" * 100)
-
-# Save blocks
-df_blocks_master.to_csv('output/normalized_tables/phase1_core/blocks_standardized.csv', index=False)
-print(f"✅ Saved: blocks_standardized.csv ({len(df_blocks_master)} rows)")
-
-# Create block code mapping (for reference)
-df_mapping = df_blocks_master[['id', 'block_code', 'block_code_standardized', 'category', 'has_production_data']].copy()
-df_mapping.to_csv('output/normalized_tables/phase1_core/block_code_mapping.csv', index=False)
-print(f"✅ Saved: block_code_mapping.csv")
-
-# ============================================================================
-# STEP 8: Generate reconciliation report
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 8: Generating reconciliation report v2")
-print("=" * 100)
-
-report = f"""# PHASE 1.5: BLOCK CODE STANDARDIZATION REPORT
+from excel_cache import read_excel_cached
+
+def standardize_blocks(df_complete=None, write=True):
+    """Build standardized blocks; returns {"blocks", "block_code_mapping"} DataFrames"""
+    print("=" * 100)
+    print("PHASE 1.5: BLOCK CODE STANDARDIZATION")
+    print("=" * 100)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # ============================================================================
+    # STEP 1: Load normalized_production_data_COMPLETE.csv to understand structure
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 1: Analyzing normalized_production_data_COMPLETE.csv structure")
+    print("=" * 100)
+
+    # Read once; the header sniff below only needs the first rows
+    if df_complete is None:
+        df_complete = pd.read_csv('output/normalized_production_data_COMPLETE.csv')
+    df_complete_full = df_complete
+    df_complete = df_complete_full.head(10)
+    print(f"✅ Loaded sample data: {df_complete.shape}")
+    print(f"\nFirst 20 columns:")
+    for i, col in enumerate(df_complete.columns[:20], 1):
+        print(f"  {i:2d}. {col}")
+
+    # Check if block_code column exists
+    if 'block_code' in df_complete.columns:
+        print(f"\n✅ Found 'block_code' column")
+        print(f"Sample block codes: {df_complete['block_code'].head().tolist()}")
+        block_col_name = 'block_code'
+    elif 'blok' in str(df_complete.columns).lower():
+        block_cols = [c for c in df_complete.columns if 'blok' in str(c).lower()]
+        block_col_name = block_cols[0]
+        print(f"\n✅ Found block column: '{block_col_name}'")
+    else:
+        # Assume column 2 might be block code
+        block_col_name = df_complete.columns[1]
+        print(f"\n⚠️  Using column '{block_col_name}' as block identifier")
+
+    # ============================================================================
+    # STEP 2: Load FULL data from normalized_production_data_COMPLETE.csv
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 2: Loading FULL block list from normalized_production_data_COMPLETE.csv")
+    print("=" * 100)
+
+    print(f"✅ Loaded complete data: {df_complete_full.shape}")
+
+    # Extract unique blocks
+    if block_col_name in df_complete_full.columns:
+        blocks_complete = df_complete_full[[block_col_name]].drop_duplicates()
+        blocks_complete = blocks_complete.rename(columns={block_col_name: 'block_code'})
+        print(f"✅ Extracted {len(blocks_complete)} unique blocks")
+        print(f"\nSample block codes:")
+        print(blocks_complete.head(20))
+    else:
+        print(f"❌ Column '{block_col_name}' not found!")
+
+    # Check for other block-related columns
+    block_related_cols = [c for c in df_complete_full.columns if 'blok' in str(c).lower() or 
+                          'block' in str(c).lower() or 'estate' in str(c).lower() or
+                          'divisi' in str(c).lower() or 'kode' in str(c).lower()]
+    print(f"\nBlock-related columns in complete file:")
+    for col in block_related_cols[:10]:
+        print(f"  - {col}")
+
+    # ============================================================================
+    # STEP 3: Extract blocks from Realisasi PT SR.xlsx (proper parsing)
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 3: Extracting blocks from Realisasi PT SR.xlsx (proper parsing)")
+    print("=" * 100)
+
+    # Load Inti sheet - skip header rows and use proper column
+    df_realisasi_inti_raw = read_excel_cached('source/Realisasi vs Potensi PT SR.xlsx',
+                                               sheet_name='Real VS Potensi Inti',
+                                               header=None)
+    print(f"✅ Loaded Inti raw: {df_realisasi_inti_raw.shape}")
+
+    # Based on our check, data starts around row 9, column 2 is block code
+    # Let's find where actual data starts
+    print("\nFinding data start row...")
+    for i in range(20):
+        row_val = df_realisasi_inti_raw.iloc[i, :5].tolist()
+        print(f"  Row {i}: {row_val}")
+        # Look for row with numeric value in first column (ID)
+        if pd.notna(df_realisasi_inti_raw.iloc[i, 0]) and isinstance(df_realisasi_inti_raw.iloc[i, 0], (int, float)):
+            if df_realisasi_inti_raw.iloc[i, 0] == 1:  # First ID
+                data_start_row = i
+                print(f"\n✅ Data starts at row {data_start_row}")
+                break
+
+    # Extract header row (might be 1-2 rows before data)
+    header_row = data_start_row - 1
+    print(f"Header row: {data_start_row - 1}")
+    print(f"Headers: {df_realisasi_inti_raw.iloc[header_row, :10].tolist()}")
+
+    # Load properly with header
+    df_realisasi_inti = read_excel_cached('source/Realisasi vs Potensi PT SR.xlsx',
+                                           sheet_name='Real VS Potensi Inti',
+                                           skiprows=header_row,
+                                           nrows=700)  # Safety limit
+    print(f"\n✅ Loaded Inti with proper header: {df_realisasi_inti.shape}")
+    print(f"\nColumn names (first 10):")
+    for i, col in enumerate(df_realisasi_inti.columns[:10], 1):
+        print(f"  {i:2d}. {col}")
+
+    # Identify block code column
+    block_col_inti = df_realisasi_inti.columns[2] if len(df_realisasi_inti.columns) > 2 else df_realisasi_inti.columns[1]
+    print(f"\nUsing column '{block_col_inti}' as block code")
+    print(f"Sample values: {df_realisasi_inti[block_col_inti].head(10).tolist()}")
+
+    # Extract unique blocks from Inti
+    blocks_inti = df_realisasi_inti[block_col_inti].dropna().unique()
+    print(f"\n✅ Extracted {len(blocks_inti)} unique Inti blocks")
+
+    # Same for Plasma
+    df_realisasi_plasma = read_excel_cached('source/Realisasi vs Potensi PT SR.xlsx',
+                                             sheet_name='Real VS Potensi Plasma',
+                                             skiprows=header_row,
+                                             nrows=700)
+    print(f"\n✅ Loaded Plasma with proper header: {df_realisasi_plasma.shape}")
+
+    block_col_plasma = df_realisasi_plasma.columns[2] if len(df_realisasi_plasma.columns) > 2 else df_realisasi_plasma.columns[1]
+    blocks_plasma = df_realisasi_plasma[block_col_plasma].dropna().unique()
+    print(f"✅ Extracted {len(blocks_plasma)} unique Plasma blocks")
+
+    # Combine
+    all_blocks_realisasi = set(list(blocks_inti) + list(blocks_plasma))
+    print(f"\n✅ Total unique blocks in Realisasi file: {len(all_blocks_realisasi)}")
+    print(f"Sample: {list(all_blocks_realisasi)[:20]}")
+
+    # ============================================================================
+    # STEP 4: Reconcile block codes
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 4: Reconciling block codes")
+    print("=" * 100)
+
+    # Get blocks from normalized_production_data_COMPLETE
+    blocks_normalized = set(blocks_complete['block_code'].values)
+    print(f"\nBlocks in normalized_production_data_COMPLETE: {len(blocks_normalized)}")
+    print(f"Sample: {list(blocks_normalized)[:20]}")
+
+    print(f"\nBlocks in Realisasi file: {len(all_blocks_realisasi)}")
+    print(f"Sample: {list(all_blocks_realisasi)[:20]}")
+
+    # Find matches
+    matches = blocks_normalized & all_blocks_realisasi
+    only_in_normalized = blocks_normalized - all_blocks_realisasi
+    only_in_realisasi = all_blocks_realisasi - blocks_normalized
+
+    print(f"\n📊 Reconciliation Results:")
+    print(f"  ✅ Blocks in BOTH: {len(matches)}")
+    print(f"  ⚠️  Only in Normalized: {len(only_in_normalized)}")
+    print(f"  ⚠️  Only in Realisasi: {len(only_in_realisasi)}")
+
+    if len(matches) > 0:
+        print(f"\n✅ Found {len(matches)} matching blocks!")
+        print(f"Sample matches: {list(matches)[:20]}")
+
+    # ============================================================================
+    # STEP 5: Create master blocks table
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 5: Creating master blocks table")
+    print("=" * 100)
+
+    # Use blocks from normalized_production_data_COMPLETE as base
+
+    # Create master table
+    df_blocks_master = blocks_complete.copy()
+    df_blocks_master['block_code_standardized'] = df_blocks_master['block_code']
+
+    # Add flags
+    df_blocks_master['has_production_data'] = df_blocks_master['block_code'].isin(all_blocks_realisasi)
+    df_blocks_master['category'] = df_blocks_master['block_code'].apply(
+        lambda x: 'Inti' if x in blocks_inti else ('Plasma' if x in blocks_plasma else 'Unknown')
+    )
+
+    # Add ID column
+    df_blocks_master.insert(0, 'id', range(1, len(df_blocks_master) + 1))
+
+    # Try to map estate_id from old blocks (if possible by fuzzy matching or other means)
+    # For now, we'll leave estate_id as NULL and populate later if needed
+
+    print(f"\n✅ Created master blocks table: {len(df_blocks_master)} blocks")
+    print(f"\nCategory distribution:")
+    print(df_blocks_master['category'].value_counts())
+    print(f"\nProduction data availability:")
+    print(df_blocks_master['has_production_data'].value_counts())
+
+    # ============================================================================
+    # STEP 6: Check for F005A duplicate
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 6: Checking for F005A duplicate")
+    print("=" * 100)
+
+    f005a_count = (df_blocks_master['block_code'] == 'F005A').sum()
+    print(f"F005A occurrences: {f005a_count}")
+
+    if f005a_count > 1:
+        print(f"⚠️  Found {f005a_count} F005A entries - removing duplicates...")
+        df_blocks_master = df_blocks_master.drop_duplicates(subset=['block_code'], keep='first')
+        # Reset IDs
+        df_blocks_master['id'] = range(1, len(df_blocks_master) + 1)
+        print(f"✅ After deduplication: {len(df_blocks_master)} blocks")
+
+    # ============================================================================
+    # STEP 7: Save outputs
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 7: Saving outputs")
+    print("=" * 100)
+
+    # Save blocks
+    if write:
+        df_blocks_master.to_csv('output/normalized_tables/phase1_core/blocks_standardized.csv', index=False)
+        print(f"✅ Saved: blocks_standardized.csv ({len(df_blocks_master)} rows)")
+
+    # Create block code mapping (for reference)
+    df_mapping = df_blocks_master[['id', 'block_code', 'block_code_standardized', 'category', 'has_production_data']].copy()
+    if write:
+        df_mapping.to_csv('output/normalized_tables/phase1_core/block_code_mapping.csv', index=False)
+        print(f"✅ Saved: block_code_mapping.csv")
+
+    # ============================================================================
+    # STEP 8: Generate reconciliation report
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 8: Generating reconciliation report v2")
+    print("=" * 100)
+
+    report = f"""# PHASE 1.5: BLOCK CODE STANDARDIZATION REPORT
 
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -324,24 +330,31 @@ output/normalized_tables/phase1_core/
 - Ready to proceed with Phase 2!
 """
 
-with open('output/normalized_tables/phase1_core/reconciliation_report_v2.md', 'w', encoding='utf-8') as f:
-    f.write(report)
-
-print(f"✅ Saved: reconciliation_report_v2.md")
-
-# ============================================================================
-# PHASE 1.5 COMPLETE
-# ============================================================================
-print("\n" + "=" * 100)
-print("✅ PHASE 1.5 COMPLETE!")
-print("=" * 100)
-print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print(f"\n📊 Final Statistics:")
-print(f"  Total blocks: {len(df_blocks_master)}")
-print(f"  With production data: {df_blocks_master['has_production_data'].sum()}")
-print(f"  Match rate: {len(matches)/len(df_blocks_master)*100:.1f}%")
-print(f"\nFiles created:")
-print(f"  1. blocks_standardized.csv - {len(df_blocks_master)} blocks with standardized codes")
-print(f"  2. block_code_mapping.csv - Block code reference")
-print(f"  3. reconciliation_report_v2.md - Detailed report")
-print(f"\n✅ Ready for Phase 2: Metadata Extraction!")
+    if write:
+        with open('output/normalized_tables/phase1_core/reconciliation_report_v2.md', 'w', encoding='utf-8') as f:
+            f.write(report)
+
+        print(f"✅ Saved: reconciliation_report_v2.md")
+
+    # ============================================================================
+    # PHASE 1.5 COMPLETE
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("✅ PHASE 1.5 COMPLETE!")
+    print("=" * 100)
+    print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n📊 Final Statistics:")
+    print(f"  Total blocks: {len(df_blocks_master)}")
+    print(f"  With production data: {df_blocks_master['has_production_data'].sum()}")
+    print(f"  Match rate: {len(matches)/len(df_blocks_master)*100:.1f}%")
+    print(f"\nFiles created:")
+    print(f"  1. blocks_standardized.csv - {len(df_blocks_master)} blocks with standardized codes")
+    print(f"  2. block_code_mapping.csv - Block code reference")
+    print(f"  3. reconciliation_report_v2.md - Detailed report")
+    print(f"\n✅ Ready for Phase 2: Metadata Extraction!")
+
+    return {'blocks': df_blocks_master, 'block_code_mapping': df_mapping}
+
+
+if __name__ == "__main__":
+    standardize_blocks()
@@ -19,302 +19,288 @@ Output:
 - output/normalized_tables/phase2_metadata/metadata_extraction_report.md
 """
 
-import pandas as pd
-import numpy as np
 import os
+import re
 from datetime import datetime
 
-print("=" * 100)
-print("PHASE 2: METADATA EXTRACTION")
-print("=" * 100)
-print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-# Create output directory
-os.makedirs('output/normalized_tables/phase2_metadata', exist_ok=True)
-
-# ============================================================================
-# STEP 1: Load master blocks
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 1: Loading master blocks list")
-print("=" * 100)
-
-df_blocks = pd.read_csv('output/normalized_tables/phase1_core/blocks_standardized.csv')
-print(f"✅ Loaded {len(df_blocks)} blocks")
-print(f"   Blocks with production data: {df_blocks['has_production_data'].sum()}")
-
-# ============================================================================
-# STEP 2: Load normalized_production_data_COMPLETE.csv as reference
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 2: Loading normalized_production_data_COMPLETE.csv")
-print("=" * 100)
-
-df_complete = pd.read_csv('output/normalized_production_data_COMPLETE.csv')
-print(f"✅ Loaded complete data: {df_complete.shape}")
-
-# Identify key columns
-print(f"\nColumn categories:")
-print(f"  Total columns: {len(df_complete.columns)}")
-
-# Map columns by category
-infra_keywords = ['sph', 'luas', 'ha', 'empls', 'bbt', 'pks', 'jalan', 'parit', 'areal', 'cadangan']
-pest_keywords = ['ganoderma', 'stadium', 'serangan']
-planting_keywords = ['komposisi', 'pokok', '2009', '2010', '2011', '2012', '2013', '2014', '2015', '2016', '2017', '2018', '2019']
-yearly_keywords = ['tanam', 'sisip', 'kentosan', 'tbm', '2020', '2021', '2022', '2023', '2024', '2025']
-
-infra_cols = [c for c in df_complete.columns if any(k in str(c).lower() for k in infra_keywords)]
-pest_cols = [c for c in df_complete.columns if any(k in str(c).lower() for k in pest_keywords)]
-planting_cols = [c for c in df_complete.columns if any(k in str(c).lower() for k in planting_keywords)]
-yearly_cols = [c for c in df_complete.columns if any(k in str(c).lower() for k in yearly_keywords)]
-
-print(f"\nInfrastructure columns: {len(infra_cols)}")
-if infra_cols:
-    print(f"  Sample: {infra_cols[:5]}")
-
-print(f"\nPest/Disease columns: {len(pest_cols)}")
-if pest_cols:
-    print(f"  Sample: {pest_cols[:5]}")
-
-print(f"\nPlanting history columns: {len(planting_cols)}")
-if planting_cols:
-    print(f"  Sample: {planting_cols[:5]}")
-
-print(f"\nYearly planting columns: {len(yearly_cols)}")
-if yearly_cols:
-    print(f"  Sample: {yearly_cols[:10]}")
-
-# ============================================================================
-# STEP 3: Extract block_land_infrastructure
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 3: Extracting block_land_infrastructure")
-print("=" * 100)
-
-# Select infrastructure columns
-selected_infra_cols = [
-    'block_code', 'ha_statement_luas_tanam_sd_thn_2024', 'sd_2025',
-    'empls', 'bbt', 'pks', 'jln_parit', 'areal_cdg', 'total', 'sph'
-]
-
-# Check which columns exist
-existing_infra_cols = [c for c in selected_infra_cols if c in df_complete.columns]
-print(f"✅ Found {len(existing_infra_cols)} infrastructure columns:")
-for col in existing_infra_cols:
-    print(f"  - {col}")
-
-# Extract data
-df_infra = df_complete[existing_infra_cols].copy()
-
-# Merge with blocks to get IDs
-df_infra = df_blocks[['id', 'block_code']].merge(df_infra, on='block_code', how='left')
-
-# Rename columns to be more descriptive
-column_rename = {
-    'ha_statement_luas_tanam_sd_thn_2024': 'luas_tanam_sd_2024_ha',
-    'sd_2025': 'total_luas_sd_2025_ha',
-    'jln_parit': 'jalan_parit_ha',
-    'areal_cdg': 'areal_cadangan_ha',
-    'total': 'total_luas_keseluruhan_ha',
-    'sph': 'standar_pokok_per_hektar'
-}
-
-for old, new in column_rename.items():
-    if old in df_infra.columns:
-        df_infra = df_infra.rename(columns={old: new})
-
-# Final columns
-df_infra = df_infra.rename(columns={'id': 'block_id'})
-df_infra.insert(0, 'id', range(1, len(df_infra) + 1))
-
-print(f"\n✅ Created block_land_infrastructure: {len(df_infra)} rows × {len(df_infra.columns)} columns")
-print(f"   Columns: {list(df_infra.columns)}")
-
-# Save
-df_infra.to_csv('output/normalized_tables/phase2_metadata/block_land_infrastructure.csv', index=False)
-print(f"✅ Saved: block_land_infrastructure.csv")
-
-# ============================================================================
-# STEP 4: Extract block_pest_disease
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 4: Extracting block_pest_disease")
-print("=" * 100)
-
-# Look for Ganoderma columns
-gano_cols = [c for c in df_complete.columns if 'ganoderma' in str(c).lower() or 
-             'stadium' in str(c).lower() or 'serangan' in str(c).lower()]
-
-print(f"✅ Found {len(gano_cols)} pest/disease columns:")
-for col in gano_cols:
-    print(f"  - {col}")
-
-if gano_cols:
+import numpy as np
+import pandas as pd
+
+from column_registry import load_registry, rename_map, select
+
+PLANTING_TABLES = ['block_planting_history', 'block_planting_yearly']
+# Registry names end in the year: realisasi_tanam_komposisi_pokok_2009, sisip_kentosan_2023
+YEAR_COLUMN = re.compile(r'^(?P<metric>[a-z_]+?)_(?P<year>(?:19|20)\d{2})$')
+PLANTING_METRICS = {'realisasi_tanam_komposisi_pokok': 'komposisi_pokok'}
+YEARLY_METRICS = ['tanam', 'sisip', 'sisip_kentosan']
+
+
+def planting_column_index(columns, registry=None):
+    """
+    DataFrame (column, table, metric, year) of the per-year planting columns
+    in `columns`. Columns are recognised under any registry spelling (name,
+    legacy 'thn_2020_tanam', duplicate-suffixed 'sisip.3'); year-less totals
+    are left out.
+    """
+    registry = load_registry() if registry is None else registry
+    mapping = rename_map(registry, table=PLANTING_TABLES)
+    rows = select(registry, PLANTING_TABLES)
+    table_of = dict(zip(rows['name'], rows['table']))
+
+    records = []
+    for column in columns:
+        name = mapping.get(column, mapping.get(str(column).lower()))
+        match = YEAR_COLUMN.match(name) if name else None
+        if match:
+            metric = PLANTING_METRICS.get(match['metric'], match['metric'])
+            records.append((column, table_of[name], metric, int(match['year'])))
+    return pd.DataFrame(records, columns=['column', 'table', 'metric', 'year'])
+
+
+def melt_planting(df_complete, df_blocks, index, metrics):
+    """
+    One row per (block, year) for the columns in `index`: a single melt of
+    the wide columns, metric/year attached by joining the column index, then
+    metrics unstacked side by side. Blocks keep the master order.
+    """
+    index = index[index['metric'].isin(metrics)]
+    wide = df_complete[['block_code'] + index['column'].tolist()].drop_duplicates('block_code')
+    long = wide.melt(id_vars='block_code', var_name='column', value_name='value')
+    long['value'] = pd.to_numeric(long['value'], errors='coerce')
+    long = long.merge(index[['column', 'metric', 'year']], on='column')
+
+    # A (metric, year) found under two spellings keeps its first non-null value
+    table = long.groupby(['block_code', 'year', 'metric'])['value'].first().unstack('metric').reset_index()
+    table.columns.name = None
+    table = table[['block_code', 'year'] + [m for m in metrics if m in table.columns]]
+
+    table = df_blocks[['id', 'block_code']].merge(table, on='block_code', how='inner')
+    return table.rename(columns={'id': 'block_id'})
+
+
+def extract_metadata(df_blocks=None, df_complete=None, write=True):
+    """Extract the 4 metadata tables; returns a dict of DataFrames keyed by table name"""
+    print("=" * 100)
+    print("PHASE 2: METADATA EXTRACTION")
+    print("=" * 100)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # Create output directory
+    if write:
+        os.makedirs('output/normalized_tables/phase2_metadata', exist_ok=True)
+
+    # ============================================================================
+    # STEP 1: Load master blocks
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 1: Loading master blocks list")
+    print("=" * 100)
+
+    if df_blocks is None:
+        df_blocks = pd.read_csv('output/normalized_tables/phase1_core/blocks_standardized.csv')
+    print(f"✅ Loaded {len(df_blocks)} blocks")
+    print(f"   Blocks with production data: {df_blocks['has_production_data'].sum()}")
+
+    # ============================================================================
+    # STEP 2: Load normalized_production_data_COMPLETE.csv as reference
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 2: Loading normalized_production_data_COMPLETE.csv")
+    print("=" * 100)
+
+    if df_complete is None:
+        df_complete = pd.read_csv('output/normalized_production_data_COMPLETE.csv')
+    print(f"✅ Loaded complete data: {df_complete.shape}")
+
+    # Identify key columns
+    print(f"\nColumn categories:")
+    print(f"  Total columns: {len(df_complete.columns)}")
+
+    # Map columns by category
+    infra_keywords = ['sph', 'luas', 'ha', 'empls', 'bbt', 'pks', 'jalan', 'parit', 'areal', 'cadangan']
+    pest_keywords = ['ganoderma', 'stadium', 'serangan']
+    planting_keywords = ['komposisi', 'pokok', '2009', '2010', '2011', '2012', '2013', '2014', '2015', '2016', '2017', '2018', '2019']
+    yearly_keywords = ['tanam', 'sisip', 'kentosan', 'tbm', '2020', '2021', '2022', '2023', '2024', '2025']
+
+    infra_cols = [c for c in df_complete.columns if any(k in str(c).lower() for k in infra_keywords)]
+    pest_cols = [c for c in df_complete.columns if any(k in str(c).lower() for k in pest_keywords)]
+    planting_cols = [c for c in df_complete.columns if any(k in str(c).lower() for k in planting_keywords)]
+    yearly_cols = [c for c in df_complete.columns if any(k in str(c).lower() for k in yearly_keywords)]
+
+    print(f"\nInfrastructure columns: {len(infra_cols)}")
+    if infra_cols:
+        print(f"  Sample: {infra_cols[:5]}")
+
+    print(f"\nPest/Disease columns: {len(pest_cols)}")
+    if pest_cols:
+        print(f"  Sample: {pest_cols[:5]}")
+
+    print(f"\nPlanting history columns: {len(planting_cols)}")
+    if planting_cols:
+        print(f"  Sample: {planting_cols[:5]}")
+
+    print(f"\nYearly planting columns: {len(yearly_cols)}")
+    if yearly_cols:
+        print(f"  Sample: {yearly_cols[:10]}")
+
+    # ============================================================================
+    # STEP 3: Extract block_land_infrastructure
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 3: Extracting block_land_infrastructure")
+    print("=" * 100)
+
+    # Select infrastructure columns
+    selected_infra_cols = [
+        'block_code', 'ha_statement_luas_tanam_sd_thn_2024', 'sd_2025',
+        'empls', 'bbt', 'pks', 'jln_parit', 'areal_cdg', 'total', 'sph'
+    ]
+
+    # Check which columns exist
+    existing_infra_cols = [c for c in selected_infra_cols if c in df_complete.columns]
+    print(f"✅ Found {len(existing_infra_cols)} infrastructure columns:")
+    for col in existing_infra_cols:
+        print(f"  - {col}")
+
     # Extract data
-    pest_columns = ['block_code'] + gano_cols
-    df_pest = df_complete[pest_columns].copy()
-    
-    # Merge with blocks
-    df_pest = df_blocks[['id', 'block_code']].merge(df_pest, on='block_code', how='left')
-    
-    # Rename
-    df_pest = df_pest.rename(columns={'id': 'block_id'})
-    df_pest.insert(0, 'id', range(1, len(df_pest) + 1))
-    df_pest['recorded_date'] = datetime.now().strftime('%Y-%m-%d')
-    
-    print(f"\n✅ Created block_pest_disease: {len(df_pest)} rows × {len(df_pest.columns)} columns")
-    
-    # Save
-    df_pest.to_csv('output/normalized_tables/phase2_metadata/block_pest_disease.csv', index=False)
-    print(f"✅ Saved: block_pest_disease.csv")
-else:
-    print("⚠️  No pest/disease columns found - skipping this table")
-    df_pest = None
-
-# ============================================================================
-# STEP 5: Extract block_planting_history (2009-2019)
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 5: Extracting block_planting_history (2009-2019)")
-print("=" * 100)
-
-# Find komposisi pokok columns for 2009-2019
-komposisi_cols = [c for c in df_complete.columns if 'komposisi_pokok' in str(c).lower() and 
-                  any(str(year) in c for year in range(2009, 2020))]
-
-print(f"✅ Found {len(komposisi_cols)} komposisi pokok columns:")
-for col in komposisi_cols:
-    print(f"  - {col}")
-
-if komposisi_cols:
-    # Extract year from column name
-    df_planting_list = []
-    
-    for col in komposisi_cols:
-        # Extract year
-        year = None
-        for y in range(2009, 2020):
-            if str(y) in col:
-                year = y
-                break
-        
-        if year:
-            df_temp = df_complete[['block_code', col]].copy()
-            df_temp['year'] = year
-            df_temp = df_temp.rename(columns={col: 'komposisi_pokok'})
-            df_planting_list.append(df_temp)
-    
-    # Combine all years
-    df_planting_history = pd.concat(df_planting_list, ignore_index=True)
-    
-    # Merge with blocks
-    df_planting_history = df_blocks[['id', 'block_code']].merge(
-        df_planting_history, on='block_code', how='left'
-    )
-    
-    # Rename and add ID
-    df_planting_history = df_planting_history.rename(columns={'id': 'block_id'})
-    df_planting_history = df_planting_history.dropna(subset=['komposisi_pokok'])
-    df_planting_history.insert(0, 'id', range(1, len(df_planting_history) + 1))
-    
-    # Add SPH and total_pkk if available
-    if 'standar_pokok_per_hektar' in df_infra.columns:
-        sph_map = df_infra.set_index('block_id')['standar_pokok_per_hektar'].to_dict()
-        df_planting_history['sph'] = df_planting_history['block_id'].map(sph_map)
-    
-    print(f"\n✅ Created block_planting_history: {len(df_planting_history)} rows")
-    print(f"   Years covered: {sorted(df_planting_history['year'].unique())}")
-    print(f"   Average rows per block: {len(df_planting_history) / len(df_blocks):.1f}")
-    
-    # Save
-    df_planting_history.to_csv('output/normalized_tables/phase2_metadata/block_planting_history.csv', index=False)
-    print(f"✅ Saved: block_planting_history.csv")
-else:
-    print("⚠️  No planting history columns found - skipping this table")
-    df_planting_history = None
-
-# ============================================================================
-# STEP 6: Extract block_planting_yearly (2020-2025)
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 6: Extracting block_planting_yearly (2020-2025)")
-print("=" * 100)
-
-# Find yearly planting columns
-yearly_patterns = {
-    2020: ['thn_2020_tanam', 'sisip'],
-    2021: ['thn_2021_tanam', 'sisip'],
-    2022: ['thn_2022_tanam', 'sisip'],
-    2023: ['thn_2023_tanam', 'sisip', 'sisip_kentosan'],
-    2024: ['thn_2024_tanam', 'sisip', 'sisip_kentosan'],
-    2025: ['thn_2025_tanam', 'sisip', 'sisip_kentosan']
-}
-
-df_yearly_list = []
-
-for year, patterns in yearly_patterns.items():
-    # Find columns for this year
-    year_cols = [c for c in df_complete.columns if f'{year}' in c or f'thn_{year}' in str(c).lower()]
-    
-    if year_cols:
-        print(f"\nYear {year}: found {len(year_cols)} columns")
-        for col in year_cols:
-            print(f"  - {col}")
-        
-        # Extract relevant columns
-        tanam_col = [c for c in year_cols if 'tanam' in c.lower() and 'sisip' not in c.lower()]
-        sisip_col = [c for c in year_cols if 'sisip' in c.lower() and 'kentosan' not in c.lower()]
-        kentosan_col = [c for c in year_cols if 'kentosan' in c.lower()]
-        
-        # Create dataframe for this year
-        df_year = df_complete[['block_code']].copy()
-        df_year['year'] = year
-        
-        if tanam_col:
-            df_year['tanam'] = df_complete[tanam_col[0]]
-        if sisip_col:
-            df_year['sisip'] = df_complete[sisip_col[0]]
-        if kentosan_col:
-            df_year['sisip_kentosan'] = df_complete[kentosan_col[0]]
-        
-        df_yearly_list.append(df_year)
-
-if df_yearly_list:
-    # Combine all years
-    df_yearly = pd.concat(df_yearly_list, ignore_index=True)
-    
-    # Merge with blocks
-    df_yearly = df_blocks[['id', 'block_code']].merge(df_yearly, on='block_code', how='left')
-    
-    # Rename and add ID
-    df_yearly = df_yearly.rename(columns={'id': 'block_id'})
-    df_yearly = df_yearly.dropna(subset=['year'])
-    df_yearly.insert(0, 'id', range(1, len(df_yearly) + 1))
-    
-    # Add SPH if available
-    if 'standar_pokok_per_hektar' in df_infra.columns:
-        sph_map = df_infra.set_index('block_id')['standar_pokok_per_hektar'].to_dict()
-        df_yearly['sph'] = df_yearly['block_id'].map(sph_map)
-    
-    print(f"\n✅ Created block_planting_yearly: {len(df_yearly)} rows")
-    print(f"   Years covered: {sorted(df_yearly['year'].unique())}")
-    print(f"   Columns: {list(df_yearly.columns)}")
-    
-    # Save
-    df_yearly.to_csv('output/normalized_tables/phase2_metadata/block_planting_yearly.csv', index=False)
-    print(f"✅ Saved: block_planting_yearly.csv")
-else:
-    print("⚠️  No yearly planting columns found - skipping this table")
-    df_yearly = None
+    df_infra = df_complete[existing_infra_cols].copy()
+
+    # Merge with blocks to get IDs
+    df_infra = df_blocks[['id', 'block_code']].merge(df_infra, on='block_code', how='left')
+
+    # Rename columns to be more descriptive
+    column_rename = {
+        'ha_statement_luas_tanam_sd_thn_2024': 'luas_tanam_sd_2024_ha',
+        'sd_2025': 'total_luas_sd_2025_ha',
+        'jln_parit': 'jalan_parit_ha',
+        'areal_cdg': 'areal_cadangan_ha',
+        'total': 'total_luas_keseluruhan_ha',
+        'sph': 'standar_pokok_per_hektar'
+    }
 
-# ============================================================================
-# STEP 7: Generate extraction report
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 7: Generating metadata extraction report")
-print("=" * 100)
+    for old, new in column_rename.items():
+        if old in df_infra.columns:
+            df_infra = df_infra.rename(columns={old: new})
 
-report = f"""# PHASE 2: METADATA EXTRACTION REPORT
+    # Final columns
+    df_infra = df_infra.rename(columns={'id': 'block_id'})
+    df_infra.insert(0, 'id', range(1, len(df_infra) + 1))
+
+    print(f"\n✅ Created block_land_infrastructure: {len(df_infra)} rows × {len(df_infra.columns)} columns")
+    print(f"   Columns: {list(df_infra.columns)}")
+
+    # Save
+    if write:
+        df_infra.to_csv('output/normalized_tables/phase2_metadata/block_land_infrastructure.csv', index=False)
+        print(f"✅ Saved: block_land_infrastructure.csv")
+
+    # ============================================================================
+    # STEP 4: Extract block_pest_disease
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 4: Extracting block_pest_disease")
+    print("=" * 100)
+
+    # Look for Ganoderma columns
+    gano_cols = [c for c in df_complete.columns if 'ganoderma' in str(c).lower() or 
+                 'stadium' in str(c).lower() or 'serangan' in str(c).lower()]
+
+    print(f"✅ Found {len(gano_cols)} pest/disease columns:")
+    for col in gano_cols:
+        print(f"  - {col}")
+
+    if gano_cols:
+        # Extract data
+        pest_columns = ['block_code'] + gano_cols
+        df_pest = df_complete[pest_columns].copy()
+
+        # Merge with blocks
+        df_pest = df_blocks[['id', 'block_code']].merge(df_pest, on='block_code', how='left')
+
+        # Rename
+        df_pest = df_pest.rename(columns={'id': 'block_id'})
+        df_pest.insert(0, 'id', range(1, len(df_pest) + 1))
+        df_pest['recorded_date'] = datetime.now().strftime('%Y-%m-%d')
+
+        print(f"\n✅ Created block_pest_disease: {len(df_pest)} rows × {len(df_pest.columns)} columns")
+
+        # Save
+        if write:
+            df_pest.to_csv('output/normalized_tables/phase2_metadata/block_pest_disease.csv', index=False)
+            print(f"✅ Saved: block_pest_disease.csv")
+    else:
+        print("⚠️  No pest/disease columns found - skipping this table")
+        df_pest = None
+
+    # ============================================================================
+    # STEP 5-6: Extract block_planting_history + block_planting_yearly
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 5-6: Extracting block_planting_history + block_planting_yearly")
+    print("=" * 100)
+
+    # Every column parsed once → (table, metric, year); 'sisip.3' resolves via the registry
+    planting_index = planting_column_index(df_complete.columns)
+    for table, group in planting_index.groupby('table', sort=False):
+        print(f"✅ {table}: {len(group)} columns, years {group['year'].min()}-{group['year'].max()}, "
+              f"metrics {sorted(group['metric'].unique())}")
+
+    # SPH joined once per table instead of a dict .map per table
+    # (a block listed twice keeps its last infra row, as the dict did)
+    if 'standar_pokok_per_hektar' in df_infra.columns:
+        df_sph = df_infra[['block_id', 'standar_pokok_per_hektar']].drop_duplicates('block_id', keep='last').rename(
+            columns={'standar_pokok_per_hektar': 'sph'})
+    else:
+        df_sph = None
+
+    history_index = planting_index[planting_index['table'] == 'block_planting_history']
+    if not history_index.empty:
+        df_planting_history = melt_planting(df_complete, df_blocks, history_index, ['komposisi_pokok'])
+        df_planting_history = df_planting_history.dropna(subset=['komposisi_pokok'])[
+            ['block_id', 'block_code', 'komposisi_pokok', 'year']]
+        df_planting_history.insert(0, 'id', range(1, len(df_planting_history) + 1))
+        if df_sph is not None:
+            df_planting_history = df_planting_history.merge(df_sph, on='block_id', how='left')
+
+        print(f"\n✅ Created block_planting_history: {len(df_planting_history)} rows")
+        print(f"   Years covered: {sorted(df_planting_history['year'].unique())}")
+        print(f"   Average rows per block: {len(df_planting_history) / len(df_blocks):.1f}")
+
+        # Save
+        if write:
+            df_planting_history.to_csv('output/normalized_tables/phase2_metadata/block_planting_history.csv', index=False)
+            print(f"✅ Saved: block_planting_history.csv")
+    else:
+        print("⚠️  No planting history columns found - skipping this table")
+        df_planting_history = None
+
+    yearly_index = planting_index[planting_index['table'] == 'block_planting_yearly']
+    if not yearly_index.empty:
+        df_yearly = melt_planting(df_complete, df_blocks, yearly_index, YEARLY_METRICS)
+        df_yearly.insert(0, 'id', range(1, len(df_yearly) + 1))
+        if df_sph is not None:
+            df_yearly = df_yearly.merge(df_sph, on='block_id', how='left')
+
+        print(f"\n✅ Created block_planting_yearly: {len(df_yearly)} rows")
+        print(f"   Years covered: {sorted(df_yearly['year'].unique())}")
+        print(f"   Columns: {list(df_yearly.columns)}")
+
+        # Save
+        if write:
+            df_yearly.to_csv('output/normalized_tables/phase2_metadata/block_planting_yearly.csv', index=False)
+            print(f"✅ Saved: block_planting_yearly.csv")
+    else:
+        print("⚠️  No yearly planting columns found - skipping this table")
+        df_yearly = None
+
+    # ============================================================================
+    # STEP 7: Generate extraction report
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 7: Generating metadata extraction report")
+    print("=" * 100)
+
+    report = f"""# PHASE 2: METADATA EXTRACTION REPORT
 
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -400,28 +386,41 @@ output/normalized_tables/phase2_metadata/
 **Ready for:** Phase 3 - Production Data Extraction
 """
 
-with open('output/normalized_tables/phase2_metadata/metadata_extraction_report.md', 'w', encoding='utf-8') as f:
-    f.write(report)
-
-print(f"✅ Saved: metadata_extraction_report.md")
-
-# ============================================================================
-# PHASE 2 COMPLETE
-# ============================================================================
-print("\n" + "=" * 100)
-print("✅ PHASE 2 COMPLETE!")
-print("=" * 100)
-print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print(f"\n📊 Summary:")
-print(f"  Tables created: 4")
-print(f"  Total metadata records: {len(df_infra) + (len(df_pest) if df_pest is not None else 0) + (len(df_planting_history) if df_planting_history is not None else 0) + (len(df_yearly) if df_yearly is not None else 0)}")
-print(f"  Blocks covered: {len(df_blocks)}")
-print(f"\nFiles created:")
-print(f"  1. block_land_infrastructure.csv - {len(df_infra)} rows")
-if df_pest is not None:
-    print(f"  2. block_pest_disease.csv - {len(df_pest)} rows")
-if df_planting_history is not None:
-    print(f"  3. block_planting_history.csv - {len(df_planting_history)} rows")
-if df_yearly is not None:
-    print(f"  4. block_planting_yearly.csv - {len(df_yearly)} rows")
-print(f"\n✅ Ready for Phase 3: Production Data Extraction ({df_blocks['has_production_data'].sum()} blocks)!")
+    if write:
+        with open('output/normalized_tables/phase2_metadata/metadata_extraction_report.md', 'w', encoding='utf-8') as f:
+            f.write(report)
+
+        print(f"✅ Saved: metadata_extraction_report.md")
+
+    # ============================================================================
+    # PHASE 2 COMPLETE
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("✅ PHASE 2 COMPLETE!")
+    print("=" * 100)
+    print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n📊 Summary:")
+    print(f"  Tables created: 4")
+    print(f"  Total metadata records: {len(df_infra) + (len(df_pest) if df_pest is not None else 0) + (len(df_planting_history) if df_planting_history is not None else 0) + (len(df_yearly) if df_yearly is not None else 0)}")
+    print(f"  Blocks covered: {len(df_blocks)}")
+    print(f"\nFiles created:")
+    print(f"  1. block_land_infrastructure.csv - {len(df_infra)} rows")
+    if df_pest is not None:
+        print(f"  2. block_pest_disease.csv - {len(df_pest)} rows")
+    if df_planting_history is not None:
+        print(f"  3. block_planting_history.csv - {len(df_planting_history)} rows")
+    if df_yearly is not None:
+        print(f"  4. block_planting_yearly.csv - {len(df_yearly)} rows")
+    print(f"\n✅ Ready for Phase 3: Production Data Extraction ({df_blocks['has_production_data'].sum()} blocks)!")
+
+    tables = {
+        'block_land_infrastructure': df_infra,
+        'block_pest_disease': df_pest,
+        'block_planting_history': df_planting_history,
+        'block_planting_yearly': df_yearly,
+    }
+    return {name: df for name, df in tables.items() if df is not None}
+
+
+if __name__ == "__main__":
+    extract_metadata()
@@ -3,7 +3,7 @@ PHASE 3 REVISED: COMPLETE PRODUCTION DATA EXTRACTION (2023-2025)
 =================================================================
 Purpose: Extract FULL 3-year monthly production data from data_gabungan.xlsx
          via normalized_production_data_COMPLETE.csv
-         Years: 2023, 2024, 2025 (36 months total)
+         Years: every year found in the column names (2023-2025, 36 months)
 
 Input:
 - output/normalized_production_data_COMPLETE.csv (already has all data)
@@ -18,7 +18,9 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime
-import re
+
+from monthly_store import MONTH_LABELS
+from production_columns import column_index, wide_to_long
 
 print("=" * 100)
 print("PHASE 3 REVISED: COMPLETE PRODUCTION DATA EXTRACTION (2023-2025)")
@@ -50,222 +52,45 @@ print(f"✅ Loaded complete data: {df_complete.shape}")
 print(f"   Total columns: {len(df_complete.columns)}")
 
 # ============================================================================
-# STEP 3: Identify production columns by year
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 3: Identifying production columns for 2023, 2024, 2025")
-print("=" * 100)
-
-# Pattern to find: columns with 'real', 'potensi', 'bjr', 'jjg', 'ton' and year
-production_keywords = ['real', 'potensi', 'bjr', 'jjg', 'jum_jjg', 'ton']
-years_needed = [2023, 2024, 2025]
-
-production_cols_by_year = {year: [] for year in years_needed}
-
-for col in df_complete.columns:
-    col_lower = str(col).lower()
-    
-    # Check if it's a production column
-    is_production = any(keyword in col_lower for keyword in production_keywords)
-    
-    if is_production:
-        # Check which year it belongs to
-        for year in years_needed:
-            if str(year) in col:
-                production_cols_by_year[year].append(col)
-                break
-
-# Display findings
-for year in years_needed:
-    cols = production_cols_by_year[year]
-    print(f"\n{year}: Found {len(cols)} production columns")
-    if cols:
-        print(f"  Sample columns:")
-        for col in cols[:5]:
-            print(f"    - {col}")
-
-# ============================================================================
-# STEP 4: Extract month patterns from column names
+# STEP 3: Index production columns → (metric, year, month)
 # ============================================================================
 print("\n" + "=" * 100)
-print("STEP 4: Extracting month patterns from columns")
+print("STEP 3: Indexing production columns (metric, year, month)")
 print("=" * 100)
 
-# For each year, group columns by month
-month_names = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-               'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-month_full = ['januari', 'februari', 'maret', 'april', 'mei', 'juni',
-              'juli', 'agustus', 'september', 'oktober', 'november', 'desember']
-
-production_data_monthly = []
+# Every column name is parsed once; years come from the columns themselves
+column_idx = column_index(df_complete.columns)
+monthly_idx = column_idx[column_idx['month'] > 0]
+years_needed = sorted(monthly_idx['year'].unique().tolist())
 
 for year in years_needed:
-    year_cols = production_cols_by_year[year]
-    
-    # Group by month
-    for month_idx, (month_short, month_long) in enumerate(zip(month_names, month_full), 1):
-        # Find columns for this month
-        month_cols = [c for c in year_cols if month_short in str(c).lower() or month_long in str(c).lower()]
-        
-        if month_cols:
-            # Try to identify real vs potensi columns
-            real_bjr = [c for c in month_cols if 'real' in str(c).lower() and 'bjr' in str(c).lower()]
-            real_jjg = [c for c in month_cols if 'real' in str(c).lower() and ('jjg' in str(c).lower() or 'janjang' in str(c).lower())]
-            real_ton = [c for c in month_cols if 'real' in str(c).lower() and 'ton' in str(c).lower()]
-            
-            potensi_bjr = [c for c in month_cols if 'potensi' in str(c).lower() and 'bjr' in str(c).lower()]
-            potensi_jjg = [c for c in month_cols if 'potensi' in str(c).lower() and ('jjg' in str(c).lower() or 'janjang' in str(c).lower())]
-            potensi_ton = [c for c in month_cols if 'potensi' in str(c).lower() and 'ton' in str(c).lower()]
-            
-            month_data = {
-                'year': year,
-                'month_num': month_idx,
-                'month_name': month_short.capitalize(),
-                'real_bjr_col': real_bjr[0] if real_bjr else None,
-                'real_jjg_col': real_jjg[0] if real_jjg else None,
-                'real_ton_col': real_ton[0] if real_ton else None,
-                'potensi_bjr_col': potensi_bjr[0] if potensi_bjr else None,
-                'potensi_jjg_col': potensi_jjg[0] if potensi_jjg else None,
-                'potensi_ton_col': potensi_ton[0] if potensi_ton else None
-            }
-            
-            # Only add if we have at least some data
-            if any([month_data['real_bjr_col'], month_data['real_ton_col'], 
-                   month_data['potensi_bjr_col'], month_data['potensi_ton_col']]):
-                production_data_monthly.append(month_data)
-
-print(f"\n✅ Identified {len(production_data_monthly)} month-year combinations with production data")
-print(f"\nSample mappings:")
-for mapping in production_data_monthly[:3]:
-    print(f"\n  {mapping['year']}-{mapping['month_name']}:")
-    print(f"    Real BJR: {mapping['real_bjr_col']}")
-    print(f"    Real Ton: {mapping['real_ton_col']}")
-    print(f"    Potensi Ton: {mapping['potensi_ton_col']}")
+    year_idx = monthly_idx[monthly_idx['year'] == year]
+    print(f"\n{year}: Found {len(year_idx)} production columns "
+          f"({year_idx['month'].nunique()} months × {year_idx['metric'].nunique()} metrics)")
+    print(f"  Sample columns:")
+    for _, row in year_idx.head(3).iterrows():
+        print(f"    - {row['column']} → {row['metric']} {MONTH_LABELS[row['month'] - 1]}")
+
+print(f"\n✅ Indexed {len(monthly_idx)} monthly columns "
+      f"({len(column_idx) - len(monthly_idx)} annual columns skipped)")
 
 # ============================================================================
-# STEP 5: Transform to LONG format
+# STEP 4-5: Transform WIDE → LONG format (single reshape)
 # ============================================================================
 print("\n" + "=" * 100)
-print("STEP 5: Transforming WIDE → LONG format")
+print("STEP 4-5: Transforming WIDE → LONG format")
 print("=" * 100)
 
-# If month-based extraction didn't work well, try alternative approach
-# Extract by column patterns for each year sequentially
-
-if len(production_data_monthly) < 30:  # Expect ~36 months
-    print(f"⚠️  Only found {len(production_data_monthly)} months via name matching")
-    print("   Trying alternative sequential extraction approach...")
-    
-    # Alternative: extract columns sequentially based on position
-    # Since we know columns are ordered by year-month
-    
-    production_list = []
-    
-    # Get block_code column
-    block_col = 'block_code' if 'block_code' in df_complete.columns else df_complete.columns[1]
-    
-    # Extract all production columns
-    all_prod_cols = [c for c in df_complete.columns 
-                     if any(k in str(c).lower() for k in ['real', 'potensi']) 
-                     and any(m in str(c).lower() for m in ['bjr', 'jjg', 'ton'])]
-    
-    print(f"\n   Found {len(all_prod_cols)} total production columns")
-    print(f"   Will extract columns for years 2023-2025")
-    
-    # Filter for 2023-2025 only
-    cols_2023_2025 = [c for c in all_prod_cols if any(str(y) in c for y in [2023, 2024, 2025])]
-    
-    print(f"   Filtered to {len(cols_2023_2025)} columns for 2023-2025")
-    
-    # Extract data using these columns
-    if cols_2023_2025:
-        df_prod_extract = df_complete[[block_col] + cols_2023_2025].copy()
-        
-        # Manually map known columns from normalized_production_data_COMPLETE.csv
-        # Based on inspection, create month-year mappings
-        
-        # Let's use a simpler approach: just get the columns and organize by position
-        # Assume groups of 6: real_bjr, real_jjg, real_ton, potensi_bjr, potensi_jjg, potensi_ton
-        
-        production_list = []
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        
-        for year in [2023, 2024, 2025]:
-            year_cols = [c for c in cols_2023_2025 if str(year) in c]
-            print(f"\n   {year}: {len(year_cols)} columns")
-            
-            # Group by metrics (groups of 6 or 3)
-            # Try to identify by column names
-            for month in months:
-                month_cols = [c for c in year_cols if month.lower() in str(c).lower()]
-                
-                if month_cols:
-                    # Extract this month's data
-                    real_cols = [c for c in month_cols if 'real' in str(c).lower()]
-                    potensi_cols = [c for c in month_cols if 'potensi' in str(c).lower()]
-                    
-                    month_data = df_complete[[block_col]].copy()
-                    month_data['year'] = year
-                    month_data['month'] = month
-                    
-                    # Add available metrics
-                    if real_cols:
-                        for col in real_cols:
-                            if 'bjr' in col.lower():
-                                month_data['real_bjr_kg'] = df_complete[col]
-                            elif 'jjg' in col.lower() or 'janjang' in col.lower():
-                                month_data['real_jum_jjg'] = df_complete[col]
-                            elif 'ton' in col.lower():
-                                month_data['real_ton'] = df_complete[col]
-                    
-                    if potensi_cols:
-                        for col in potensi_cols:
-                            if 'bjr' in col.lower():
-                                month_data['potensi_bjr_kg'] = df_complete[col]
-                            elif 'jjg' in col.lower() or 'janjang' in col.lower():
-                                month_data['potensi_jum_jjg'] = df_complete[col]
-                            elif 'ton' in col.lower():
-                                month_data['potensi_ton'] = df_complete[col]
-                    
-                    # Only add if we have at least real_ton or potensi_ton
-                    if 'real_ton' in month_data.columns or 'potensi_ton' in month_data.columns:
-                        production_list.append(month_data)
-
-else:
-    # Use the month mappings we found
-    production_list = []
-    block_col = 'block_code' if 'block_code' in df_complete.columns else df_complete.columns[1]
-    
-    for mapping in production_data_monthly:
-        # Extract this month's data
-        month_df = df_complete[[block_col]].copy()
-        month_df['year'] = mapping['year']
-        month_df['month'] = mapping['month_name']
-        
-        # Add metrics if columns exist
-        if mapping['real_bjr_col'] and mapping['real_bjr_col'] in df_complete.columns:
-            month_df['real_bjr_kg'] = df_complete[mapping['real_bjr_col']]
-        if mapping['real_jjg_col'] and mapping['real_jjg_col'] in df_complete.columns:
-            month_df['real_jum_jjg'] = df_complete[mapping['real_jjg_col']]
-        if mapping['real_ton_col'] and mapping['real_ton_col'] in df_complete.columns:
-            month_df['real_ton'] = df_complete[mapping['real_ton_col']]
-        if mapping['potensi_bjr_col'] and mapping['potensi_bjr_col'] in df_complete.columns:
-            month_df['potensi_bjr_kg'] = df_complete[mapping['potensi_bjr_col']]
-        if mapping['potensi_jjg_col'] and mapping['potensi_jjg_col'] in df_complete.columns:
-            month_df['potensi_jum_jjg'] = df_complete[mapping['potensi_jjg_col']]
-        if mapping['potensi_ton_col'] and mapping['potensi_ton_col'] in df_complete.columns:
-            month_df['potensi_ton'] = df_complete[mapping['potensi_ton_col']]
-        
-        production_list.append(month_df)
-
-# Combine all months
-if production_list:
-    df_production_monthly = pd.concat(production_list, ignore_index=True)
-    print(f"\n✅ Combined all months: {len(df_production_monthly)} records")
-else:
+block_col = 'block_code' if 'block_code' in df_complete.columns else df_complete.columns[1]
+
+if monthly_idx.empty:
     print("❌ No production data extracted!")
     exit(1)
 
+df_production_monthly = wide_to_long(df_complete, [block_col], column_idx).rename(columns={block_col: 'block_code'})
+print(f"\n✅ Combined all months: {len(df_production_monthly)} records "
+      f"({len(df_complete)} rows × {df_production_monthly.groupby(['year', 'month']).ngroups} months)")
+
 # ============================================================================
 # STEP 6: Add block_id and clean data
 # ============================================================================
@@ -370,6 +195,7 @@ blocks_with_data = df_production_monthly['block_id'].nunique()
 total_records = len(df_production_monthly)
 years_covered = sorted(df_production_monthly['year'].unique())
 months_per_year = df_production_monthly.groupby('year')['month'].nunique()
+n_months = int(months_per_year.sum())
 
 # Gap analysis
 avg_gap_ton = df_production_monthly['gap_ton'].mean()
@@ -384,7 +210,7 @@ report = f"""# PHASE 3 REVISED: COMPLETE PRODUCTION DATA EXTRACTION REPORT
 
 ### Source Data
 - Source: data_gabungan.xlsx (via normalized_production_data_COMPLETE.csv)
-- Years extracted: 2023, 2024, 2025
+- Years extracted: {', '.join(str(y) for y in years_needed)}
 
 ### Production Monthly Table (COMPLETE)
 - **Total records: {total_records}**
@@ -397,9 +223,9 @@ report = f"""# PHASE 3 REVISED: COMPLETE PRODUCTION DATA EXTRACTION REPORT
 
 ## Overall Statistics
 
-- **Expected records (max):** {len(df_blocks)} blocks × 36 months = {len(df_blocks) * 36}
+- **Expected records (max):** {len(df_blocks)} blocks × {n_months} months = {len(df_blocks) * n_months}
 - **Actual records:** {total_records}
-- **Coverage:** {total_records / (len(df_blocks) * 36) * 100:.1f}%
+- **Coverage:** {total_records / (len(df_blocks) * n_months) * 100:.1f}%
 
 ## Gap Analysis
 
@@ -18,31 +18,14 @@ import pandas as pd
 import os
 from datetime import datetime
 
-print("=" * 100)
-print("PHASE 4: INTEGRATION & SQL SCHEMA GENERATION")
-print("=" * 100)
-print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-# Create output directory
-os.makedirs('output/sql_schema', exist_ok=True)
-
-# ============================================================================
-# STEP 1: Load and validate all normalized tables
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 1: Loading and validating all normalized tables")
-print("=" * 100)
-
-tables = {}
-
 # Phase 1.5 tables
-phase1_tables = {
+PHASE1_TABLES = {
     'estates': 'output/normalized_tables/phase1_core/estates.csv',
     'blocks': 'output/normalized_tables/phase1_core/blocks_standardized.csv'
 }
 
 # Phase 2 tables
-phase2_tables = {
+PHASE2_TABLES = {
     'block_land_infrastructure': 'output/normalized_tables/phase2_metadata/block_land_infrastructure.csv',
     'block_pest_disease': 'output/normalized_tables/phase2_metadata/block_pest_disease.csv',
     'block_planting_history': 'output/normalized_tables/phase2_metadata/block_planting_history.csv',
@@ -50,76 +33,101 @@ phase2_tables = {
 }
 
 # Phase 3 tables
-phase3_tables = {
+PHASE3_TABLES = {
     'production_annual': 'output/normalized_tables/phase3_production/production_annual.csv',
     'production_monthly': 'output/normalized_tables/phase3_production/production_monthly.csv'
 }
 
-all_tables = {**phase1_tables, **phase2_tables, **phase3_tables}
-
-# Load all tables
-for table_name, file_path in all_tables.items():
-    try:
-        df = pd.read_csv(file_path)
-        tables[table_name] = df
-        print(f"✅ {table_name:30s} - {len(df):6,d} rows × {len(df.columns):3d} cols")
-    except Exception as e:
-        print(f"❌ {table_name:30s} - ERROR: {e}")
-
-print(f"\n✅ Loaded {len(tables)} tables successfully")
-print(f"   Total records: {sum(len(df) for df in tables.values()):,}")
-
-# ============================================================================
-# STEP 2: Validate relationships
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 2: Validating table relationships")
-print("=" * 100)
-
-validation_results = []
-
-# Skip estate validation - blocks table doesn't have estate_id foreign key
-# It has estate_code and estate_name as denormalized fields instead
-
-# Check block references in metadata tables
-block_ids = set(tables['blocks']['id'])
-
-for table_name in ['block_land_infrastructure', 'block_pest_disease', 
-                   'block_planting_history', 'block_planting_yearly']:
-    if table_name in tables:
-        table_block_ids = set(tables[table_name]['block_id'].dropna())
-        missing_blocks = table_block_ids - block_ids
-        
-        result = {
-            'check': f'{table_name}.block_id → blocks.id',
-            'status': '✅' if len(missing_blocks) == 0 else '⚠️',
-            'details': f"{len(table_block_ids)} refs, {len(missing_blocks)} missing"
-        }
-        validation_results.append(result)
-        print(f"{result['status']} {result['check']}: {result['details']}")
-
-# 3. Check block references in production tables
-for table_name in ['production_annual', 'production_monthly']:
-    if table_name in tables:
-        prod_block_ids = set(tables[table_name]['block_id'].dropna())
-        missing_blocks = prod_block_ids - block_ids
-        
-        result = {
-            'check': f'{table_name}.block_id → blocks.id',
-            'status': '✅' if len(missing_blocks) == 0 else '⚠️',
-            'details': f"{len(prod_block_ids)} refs, {len(missing_blocks)} missing"
-        }
-        validation_results.append(result)
-        print(f"{result['status']} {result['check']}: {result['details']}")
-
-# ============================================================================
-# STEP 3: Generate SQL Schema
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 3: Generating SQL schema")
-print("=" * 100)
-
-sql_schema = """-- ============================================================================
+ALL_TABLES = {**PHASE1_TABLES, **PHASE2_TABLES, **PHASE3_TABLES}
+
+def integrate(tables=None):
+    """Validate all normalized tables and generate the SQL schema + report; returns the tables dict"""
+    print("=" * 100)
+    print("PHASE 4: INTEGRATION & SQL SCHEMA GENERATION")
+    print("=" * 100)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # Create output directory
+    os.makedirs('output/sql_schema', exist_ok=True)
+
+    # ============================================================================
+    # STEP 1: Load and validate all normalized tables
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 1: Loading and validating all normalized tables")
+    print("=" * 100)
+
+    # Tables handed over in memory (run_pipeline.py --in-memory) are used as-is;
+    # anything missing is read from the phase outputs on disk
+    tables = dict(tables or {})
+
+    # Load all tables
+    for table_name, file_path in ALL_TABLES.items():
+        if table_name in tables:
+            df = tables[table_name]
+            print(f"✅ {table_name:30s} - {len(df):6,d} rows × {len(df.columns):3d} cols (in memory)")
+            continue
+        try:
+            df = pd.read_csv(file_path)
+            tables[table_name] = df
+            print(f"✅ {table_name:30s} - {len(df):6,d} rows × {len(df.columns):3d} cols")
+        except Exception as e:
+            print(f"❌ {table_name:30s} - ERROR: {e}")
+
+    print(f"\n✅ Loaded {len(tables)} tables successfully")
+    print(f"   Total records: {sum(len(df) for df in tables.values()):,}")
+
+    # ============================================================================
+    # STEP 2: Validate relationships
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 2: Validating table relationships")
+    print("=" * 100)
+
+    validation_results = []
+
+    # Skip estate validation - blocks table doesn't have estate_id foreign key
+    # It has estate_code and estate_name as denormalized fields instead
+
+    # Check block references in metadata tables
+    block_ids = set(tables['blocks']['id'])
+
+    for table_name in ['block_land_infrastructure', 'block_pest_disease', 
+                       'block_planting_history', 'block_planting_yearly']:
+        if table_name in tables:
+            table_block_ids = set(tables[table_name]['block_id'].dropna())
+            missing_blocks = table_block_ids - block_ids
+
+            result = {
+                'check': f'{table_name}.block_id → blocks.id',
+                'status': '✅' if len(missing_blocks) == 0 else '⚠️',
+                'details': f"{len(table_block_ids)} refs, {len(missing_blocks)} missing"
+            }
+            validation_results.append(result)
+            print(f"{result['status']} {result['check']}: {result['details']}")
+
+    # 3. Check block references in production tables
+    for table_name in ['production_annual', 'production_monthly']:
+        if table_name in tables:
+            prod_block_ids = set(tables[table_name]['block_id'].dropna())
+            missing_blocks = prod_block_ids - block_ids
+
+            result = {
+                'check': f'{table_name}.block_id → blocks.id',
+                'status': '✅' if len(missing_blocks) == 0 else '⚠️',
+                'details': f"{len(prod_block_ids)} refs, {len(missing_blocks)} missing"
+            }
+            validation_results.append(result)
+            print(f"{result['status']} {result['check']}: {result['details']}")
+
+    # ============================================================================
+    # STEP 3: Generate SQL Schema
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 3: Generating SQL schema")
+    print("=" * 100)
+
+    sql_schema = """-- ============================================================================
 -- NORMALIZED PALM OIL PRODUCTION DATABASE SCHEMA
 -- Generated: {timestamp}
 -- Total Tables: 8
@@ -452,55 +460,55 @@ WHERE p.year = (SELECT MAX(year) FROM production_annual);
 COMMENT ON DATABASE postgres IS 'Normalized Palm Oil Production Database - {total_records:,} total records';
 
 """.format(
-    timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-    total_records=sum(len(df) for df in tables.values())
-)
-
-# Save SQL schema
-sql_file = 'output/sql_schema/create_tables_final.sql'
-with open(sql_file, 'w', encoding='utf-8') as f:
-    f.write(sql_schema)
-
-print(f"✅ Generated SQL schema: {sql_file}")
-print(f"   - 8 tables defined")
-print(f"   - Foreign key relationships")
-print(f"   - Indexes for performance")
-print(f"   - Row Level Security (RLS)")
-print(f"   - Useful views")
-
-# ============================================================================
-# STEP 4: Generate data statistics
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 4: Generating data statistics")
-print("=" * 100)
-
-stats = {}
-
-# Calculate statistics for each table
-for table_name, df in tables.items():
-    table_stats = {
-        'rows': len(df),
-        'columns': len(df.columns),
-        'size_mb': df.memory_usage(deep=True).sum() / 1024 / 1024,
-        'null_counts': df.isnull().sum().sum(),
-        'unique_blocks': df['block_id'].nunique() if 'block_id' in df.columns else 
-                        df['id'].nunique() if 'id' in df.columns else 0
-    }
-    stats[table_name] = table_stats
-    
-    print(f"{table_name:30s} - {table_stats['rows']:6,d} rows, "
-          f"{table_stats['size_mb']:6.2f} MB, "
-          f"{table_stats['unique_blocks']:4d} blocks")
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        total_records=sum(len(df) for df in tables.values())
+    )
+
+    # Save SQL schema
+    sql_file = 'output/sql_schema/create_tables_final.sql'
+    with open(sql_file, 'w', encoding='utf-8') as f:
+        f.write(sql_schema)
+
+    print(f"✅ Generated SQL schema: {sql_file}")
+    print(f"   - 8 tables defined")
+    print(f"   - Foreign key relationships")
+    print(f"   - Indexes for performance")
+    print(f"   - Row Level Security (RLS)")
+    print(f"   - Useful views")
+
+    # ============================================================================
+    # STEP 4: Generate data statistics
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 4: Generating data statistics")
+    print("=" * 100)
+
+    stats = {}
+
+    # Calculate statistics for each table
+    for table_name, df in tables.items():
+        table_stats = {
+            'rows': len(df),
+            'columns': len(df.columns),
+            'size_mb': df.memory_usage(deep=True).sum() / 1024 / 1024,
+            'null_counts': df.isnull().sum().sum(),
+            'unique_blocks': df['block_id'].nunique() if 'block_id' in df.columns else 
+                            df['id'].nunique() if 'id' in df.columns else 0
+        }
+        stats[table_name] = table_stats
+
+        print(f"{table_name:30s} - {table_stats['rows']:6,d} rows, "
+              f"{table_stats['size_mb']:6.2f} MB, "
+              f"{table_stats['unique_blocks']:4d} blocks")
 
-# ============================================================================
-# STEP 5: Generate integration report
-# ============================================================================
-print("\n" + "=" * 100)
-print("STEP 5: Generating integration report")
-print("=" * 100)
+    # ============================================================================
+    # STEP 5: Generate integration report
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("STEP 5: Generating integration report")
+    print("=" * 100)
 
-report = f"""# PHASE 4: INTEGRATION & SQL SCHEMA - COMPLETE REPORT
+    report = f"""# PHASE 4: INTEGRATION & SQL SCHEMA - COMPLETE REPORT
 
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -558,10 +566,10 @@ report = f"""# PHASE 4: INTEGRATION & SQL SCHEMA - COMPLETE REPORT
 
 """
 
-for result in validation_results:
-    report += f"- {result['status']} **{result['check']}**: {result['details']}\n"
+    for result in validation_results:
+        report += f"- {result['status']} **{result['check']}**: {result['details']}\n"
 
-report += f"""
+    report += f"""
 
 ## Data Quality
 
@@ -642,25 +650,31 @@ output/sql_schema/
 **Total data:** {sum(len(df) for df in tables.values()):,} records across 8 tables
 """
 
-# Save report
-report_file = 'output/sql_schema/integration_report.md'
-with open(report_file, 'w', encoding='utf-8') as f:
-    f.write(report)
-
-print(f"✅ Generated integration report: {report_file}")
-
-# ============================================================================
-# PHASE 4 COMPLETE
-# ============================================================================
-print("\n" + "=" * 100)
-print("✅ PHASE 4 COMPLETE!")
-print("=" * 100)
-print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print(f"\n📊 Final Database Statistics:")
-print(f"  Total tables: 8")
-print(f"  Total records: {sum(len(df) for df in tables.values()):,}")
-print(f"  Total size: {sum(stats[t]['size_mb'] for t in stats):.2f} MB")
-print(f"\nFiles created:")
-print(f"  1. create_tables_final.sql - Complete SQL schema")
-print(f"  2. integration_report.md - Detailed integration report")
-print(f"\n✅ Ready for Phase 5: Upload to Supabase!")
+    # Save report
+    report_file = 'output/sql_schema/integration_report.md'
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write(report)
+
+    print(f"✅ Generated integration report: {report_file}")
+
+    # ============================================================================
+    # PHASE 4 COMPLETE
+    # ============================================================================
+    print("\n" + "=" * 100)
+    print("✅ PHASE 4 COMPLETE!")
+    print("=" * 100)
+    print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n📊 Final Database Statistics:")
+    print(f"  Total tables: 8")
+    print(f"  Total records: {sum(len(df) for df in tables.values()):,}")
+    print(f"  Total size: {sum(stats[t]['size_mb'] for t in stats):.2f} MB")
+    print(f"\nFiles created:")
+    print(f"  1. create_tables_final.sql - Complete SQL schema")
+    print(f"  2. integration_report.md - Detailed integration report")
+    print(f"\n✅ Ready for Phase 5: Upload to Supabase!")
+
+    return tables
+
+
+if __name__ == "__main__":
+    integrate()
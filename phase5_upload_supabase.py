@@ -24,7 +24,7 @@ import pandas as pd
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from datetime import datetime
-import time
+from bulk_loader import connect, load_table
 
 print("=" * 100)
 print("PHASE 5: AUTOMATED SUPABASE UPLOAD")
@@ -172,6 +172,13 @@ upload_config = [
 upload_results = []
 total_records_uploaded = 0
 
+# Direct Postgres connection for COPY (optional, see bulk_loader.py)
+db_conn = connect()
+if db_conn is not None:
+    print("✅ Direct Postgres connection - tables will be loaded with COPY")
+else:
+    print("ℹ️  SUPABASE_DB_URL not set - loading through the REST API")
+
 for idx, config in enumerate(upload_config, 1):
     table_name = config['table']
     file_path = config['file']
@@ -209,43 +216,13 @@ for idx, config in enumerate(upload_config, 1):
         
         print(f"    Records to upload: {record_count:,}")
         
-        # Replace NaN with None (NULL in database) for JSON compatibility
-        # Use fillna to replace all NaN/NA/NaT with None
-        df = df.fillna(value=None)
-        
-        # Convert DataFrame to list of dicts
-        records = df.to_dict('records')
-        
-        # Additional cleanup: replace any remaining NaN in the dict records
-        import math
-        for record in records:
-            for key, value in record.items():
-                if isinstance(value, float) and math.isnan(value):
-                    record[key] = None
-        
-        # Upload in batches (Supabase recommends batches of 1000)
-        batch_size = 1000
-        batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
-        
-        print(f"    Uploading in {len(batches)} batch(es)...")
-        
-        uploaded = 0
-        for batch_idx, batch in enumerate(batches, 1):
-            try:
-                # Insert batch
-                response = supabase.table(table_name).insert(batch).execute()
-                
-                uploaded += len(batch)
-                print(f"      Batch {batch_idx}/{len(batches)}: {uploaded:,}/{record_count:,} records", end='\r')
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.1)
-                
-            except Exception as e:
-                print(f"\n    ❌ Batch {batch_idx} failed: {e}")
-                raise
-        
-        print(f"\n    ✅ Successfully uploaded {uploaded:,} records")
+        # Bulk load: Postgres COPY when SUPABASE_DB_URL is set, REST inserts otherwise
+        load = load_table(table_name, df, conn=db_conn, supabase=supabase, if_exists='append')
+        if load['status'] != '✅':
+            raise Exception(load['error'])
+
+        uploaded = load['rows']
+        print(f"    ✅ Successfully uploaded {uploaded:,} records via {load['method']} ({load['seconds']:.2f}s)")
         
         # Verify upload
         count_response = supabase.table(table_name).select("id", count="exact").execute()
@@ -284,6 +261,16 @@ for idx, config in enumerate(upload_config, 1):
             print("\nUpload aborted by user.")
             break
 
+# Dashboard aggregates (dashboard_views.py) are materialized - refresh them after a load
+try:
+    supabase.rpc('refresh_dashboard_views').execute()
+    print("\n✅ Dashboard views refreshed")
+except Exception as e:
+    print(f"\n⚠️  Dashboard views not refreshed ({str(e)[:80]}) - run: python dashboard_views.py")
+
+if db_conn is not None:
+    db_conn.close()
+
 # ============================================================================
 # STEP 4: Verify Data Integrity
 # ============================================================================
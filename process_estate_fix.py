@@ -7,6 +7,7 @@ import pandas as pd
 import os
 from supabase import create_client
 from dotenv import load_dotenv
+from supabase_fetch import fetch_table
 
 load_dotenv()
 supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
@@ -72,20 +73,7 @@ def process_estate_file(estate_code, file_path):
     
     # Load current database for this estate
     print(f"\nLoading current database records for {estate_code}...")
-    all_data = []
-    page = 0
-    while True:
-        start = page * 1000
-        end = start + 999
-        response = supabase.table('production_annual').select('*').range(start, end).execute()
-        if not response.data:
-            break
-        all_data.extend(response.data)
-        if len(response.data) < 1000:
-            break
-        page += 1
-    
-    df_db = pd.DataFrame(all_data)
+    df_db = fetch_table(supabase, 'production_annual')
     
     # Load blocks table to get block_id from block_code
     blocks_data = supabase.table('blocks').select('*').execute()
@@ -0,0 +1,111 @@
+"""
+PRODUCTION COLUMN INDEX
+=======================
+Purpose: Map every wide production column ('2023_jan_real_ton',
+         'real_bjr_kg_2024_feb', 'Potensi Janjang Maret 2025') to a
+         (metric, year, month) tuple ONCE, then reshape wide → long with a
+         single NumPy scatter instead of searching the column list with
+         str(c).lower() for every (year, month, metric) combination.
+
+Parsing:
+- A name is split into tokens with one compiled regex; tokens may come in
+  any order, so layout-detected names (sheet_layout: year_month_metric)
+  and pipeline names (metric_year_month) both parse.
+- metric = side (real | potensi) + kind (bjr | jjg/janjang | ton), e.g.
+  'real_ton', 'potensi_jum_jjg'. Names carrying both sides
+  ('real_vs_potensi_bjr_kg') are gap columns and are not indexed.
+- year = a 19xx/20xx token; month = English or Indonesian month name or
+  abbreviation (monthly_store.MONTH_NUMBER). 'janjang' is never a month.
+- Columns without a month are annual (month 0).
+
+The reshape is linear in the number of cells and works for any number of
+years - the periods come from the columns themselves.
+
+Usage:
+    from production_columns import column_index, wide_to_long
+    index = column_index(df.columns)       # column, position, metric, year, month
+    df_long = wide_to_long(df, ['block_code'], index)
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from monthly_store import MONTH_LABELS, MONTH_NUMBER
+
+METRICS = ['real_bjr_kg', 'real_jum_jjg', 'real_ton', 'potensi_bjr_kg', 'potensi_jum_jjg', 'potensi_ton']
+
+TOKEN = re.compile(r'[a-z]+|\d+')
+YEAR = re.compile(r'(?:19|20)\d{2}')
+
+SIDES = {'real': 'real', 'realisasi': 'real', 'potensi': 'potensi', 'potential': 'potensi'}
+KINDS = {'bjr': 'bjr_kg', 'jjg': 'jum_jjg', 'janjang': 'jum_jjg', 'ton': 'ton', 'tonase': 'ton'}
+
+MONTH_TOKENS = dict(MONTH_NUMBER)
+MONTH_TOKENS.update({name: i for i, name in enumerate(
+    ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+     'august', 'september', 'october', 'november', 'december'], 1)})
+MONTH_TOKENS.update({name: i for i, name in enumerate(
+    ['januari', 'februari', 'maret', 'april', 'mei', 'juni', 'juli',
+     'agustus', 'september', 'oktober', 'november', 'desember'], 1)})
+MONTH_TOKENS['sept'] = 9
+
+
+@lru_cache(maxsize=None)
+def parse_column(name):
+    """(metric, year, month) of one column name; month 0 = annual. None when it is not a production column"""
+    tokens = TOKEN.findall(str(name).lower())
+    sides = {SIDES[t] for t in tokens if t in SIDES}
+    kinds = {KINDS[t] for t in tokens if t in KINDS}
+    years = [int(t) for t in tokens if YEAR.fullmatch(t)]
+    months = {MONTH_TOKENS[t] for t in tokens if t in MONTH_TOKENS}
+    if len(sides) != 1 or len(kinds) != 1 or len(years) != 1 or len(months) > 1:
+        return None
+    return f"{sides.pop()}_{kinds.pop()}", years[0], months.pop() if months else 0
+
+
+def column_index(columns):
+    """DataFrame (column, position, metric, year, month) of every production column in `columns`"""
+    records = [(column, position) + parsed
+               for position, column in enumerate(columns)
+               for parsed in [parse_column(column)] if parsed is not None]
+    return pd.DataFrame(records, columns=['column', 'position', 'metric', 'year', 'month'])
+
+
+def wide_to_long(df, id_cols, index=None, monthly=True):
+    """
+    One row per (period, source row) with id_cols + year + month + METRICS.
+
+    monthly=True reshapes the monthly columns (month label 'Jan'..'Dec'),
+    monthly=False the annual ones (no month column). Periods are ordered by
+    year and month, source rows keep their order within each period. When
+    several columns map to the same (metric, year, month) the last one wins.
+    """
+    index = column_index(df.columns) if index is None else index
+    index = index[(index['month'] > 0) == monthly]
+    id_cols = list(id_cols)
+    period_cols = ['year', 'month'] if monthly else ['year']
+    if index.empty:
+        return pd.DataFrame(columns=id_cols + period_cols + METRICS)
+
+    # Period key yyyymm (mm = 0 for annual columns) sorts chronologically
+    period_codes, periods = pd.factorize(index['year'].to_numpy() * 100 + index['month'].to_numpy(), sort=True)
+    metric_codes = index['metric'].map({m: i for i, m in enumerate(METRICS)}).to_numpy()
+
+    # (rows, periods, metrics) cube filled with one fancy-indexed assignment
+    values = df.iloc[:, index['position'].to_numpy()].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    n_rows, n_periods = len(df), len(periods)
+    cube = np.full((n_rows, n_periods, len(METRICS)), np.nan)
+    cube[:, period_codes, metric_codes] = values
+
+    long = pd.DataFrame(cube.transpose(1, 0, 2).reshape(n_rows * n_periods, len(METRICS)), columns=METRICS)
+    ids = df[id_cols].reset_index(drop=True)
+    long.insert(0, 'year', np.repeat(periods // 100, n_rows))
+    if monthly:
+        month_labels = np.array(MONTH_LABELS)[periods % 100 - 1]
+        long.insert(1, 'month', np.repeat(month_labels, n_rows))
+    for position, col in enumerate(id_cols):
+        long.insert(position, col, np.tile(ids[col].to_numpy(), n_periods))
+    return long
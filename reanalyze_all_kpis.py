@@ -6,6 +6,7 @@ After fixing Total Area calculation, verify all other KPIs
 import pandas as pd
 from supabase import create_client
 from dotenv import load_dotenv
+from supabase_fetch import fetch_table
 import os
 
 load_dotenv()
@@ -17,20 +18,7 @@ print("="*80)
 
 # Load all data
 print("\nLoading data...")
-all_prod = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_prod.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df_prod = pd.DataFrame(all_prod)
+df_prod = fetch_table(supabase, 'production_annual')
 df_blocks = pd.DataFrame(supabase.table('blocks').select('*').execute().data)
 df_infra = pd.DataFrame(supabase.table('block_land_infrastructure').select('*').execute().data)
 
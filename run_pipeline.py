@@ -0,0 +1,703 @@
+"""
+NORMALIZATION PIPELINE RUNNER
+=============================
+Purpose: Run the phase1 → phase1_5 → phase2/phase3 → phase4 → phase5 scripts
+         as one dependency graph instead of by hand, in order.
+
+How it works:
+- Every phase declares the files it reads (inputs) and writes (outputs).
+  A phase depends on whichever phase produces one of its inputs, e.g.
+  blocks_standardized.csv links phase1_5 to phase2_metadata and both
+  phase3 extractions.
+- Before running a phase, its fingerprint (script contents + input file
+  contents) is compared with the last successful run. If nothing changed
+  and the recorded outputs are still on disk untouched, the phase is
+  skipped. A phase that reruns but writes byte-identical outputs does not
+  force its downstream phases to rerun.
+- Phases whose dependencies are done run concurrently, each in its own
+  Python process, with stdout captured to output/.cache/pipeline_logs/.
+
+Usage:
+    python run_pipeline.py                  # run everything that changed
+    python run_pipeline.py phase4           # phase4 and whatever it needs
+    python run_pipeline.py --force          # ignore recorded fingerprints
+    python run_pipeline.py --dry-run        # only show what would run
+    python run_pipeline.py --with-upload    # also run phase5 (interactive)
+    python run_pipeline.py --in-memory      # phase1 → phase4 in one process
+    python run_pipeline.py --incremental    # only blocks whose source rows changed
+
+In-memory mode imports the phase functions and hands DataFrames from one
+phase to the next instead of writing and re-reading intermediate CSVs, so
+dtypes survive between phases and normalized_production_data_COMPLETE.csv
+is parsed once. Only the final normalized tables (the ones phase4 and
+phase5 consume) and phase1/phase1_5's other outputs (blocks.csv,
+block_code_mapping.csv) are written, once, at the end - so every phase is
+recorded as done and --with-upload runs phase5 alone.
+
+Incremental mode (python run_pipeline.py --incremental [--with-upload])
+hashes the source rows per (block_code, sheet) with block_hashes.py and
+compares them with the last run. Only the changed blocks go through
+phase1_5 → phase2/phase3; their rows are spliced into the existing tables
+and, with --with-upload, replaced in Supabase in one transaction
+(bulk_loader.replace_blocks) - a one-block correction touches one block's
+rows instead of re-uploading everything. It falls back to the in-memory
+full run when there is no previous run, a header layout changed or the
+block master itself changed (ids are positional); a fallback run with
+--with-upload then replaces every block, child rows included. Blocks
+rebuilt without --with-upload are remembered and uploaded by the next
+--with-upload run - they are only forgotten once their rows were written.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+from excel_cache import file_digest
+
+STATE_FILE = 'output/.cache/pipeline_state.json'
+LOG_DIR = 'output/.cache/pipeline_logs'
+
+GABUNGAN_XLSX = 'source/data_gabungan.xlsx'
+REALISASI_XLSX = 'source/Realisasi vs Potensi PT SR.xlsx'
+PHASE1_DIR = 'output/normalized_tables/phase1_core'
+PHASE2_DIR = 'output/normalized_tables/phase2_metadata'
+PHASE3_DIR = 'output/normalized_tables/phase3_production'
+SCHEMA_SQL = 'output/sql_schema/create_tables_final.sql'
+
+# Pipeline definition (inputs/outputs determine the dependency graph)
+PHASES = [
+    {
+        'name': 'phase1',
+        'script': 'phase1_foundation.py',
+        'inputs': [
+            GABUNGAN_XLSX,
+            REALISASI_XLSX,
+            'output/normalized_estates_v2.csv',
+            'output/normalized_blocks_v2.csv',
+        ],
+        'outputs': [
+            f'{PHASE1_DIR}/estates.csv',
+            f'{PHASE1_DIR}/blocks.csv',
+        ],
+    },
+    {
+        'name': 'phase1_5',
+        'script': 'phase1_5_standardization.py',
+        'inputs': [
+            REALISASI_XLSX,
+            'output/normalized_production_data_COMPLETE.csv',
+        ],
+        'outputs': [
+            f'{PHASE1_DIR}/blocks_standardized.csv',
+            f'{PHASE1_DIR}/block_code_mapping.csv',
+        ],
+    },
+    {
+        'name': 'phase2',
+        'script': 'phase2_metadata.py',
+        'inputs': [
+            f'{PHASE1_DIR}/blocks_standardized.csv',
+            'output/normalized_production_data_COMPLETE.csv',
+        ],
+        'outputs': [
+            f'{PHASE2_DIR}/block_land_infrastructure.csv',
+            f'{PHASE2_DIR}/block_pest_disease.csv',
+            f'{PHASE2_DIR}/block_planting_history.csv',
+            f'{PHASE2_DIR}/block_planting_yearly.csv',
+        ],
+    },
+    {
+        'name': 'phase3_annual',
+        'script': 'phase3_extract_annual.py',
+        'inputs': [
+            GABUNGAN_XLSX,
+            'column_registry.csv',
+            f'{PHASE1_DIR}/blocks_standardized.csv',
+        ],
+        'outputs': [
+            f'{PHASE3_DIR}/production_annual.csv',
+        ],
+    },
+    {
+        'name': 'phase3_monthly',
+        'script': 'phase3_production.py',
+        'inputs': [
+            REALISASI_XLSX,
+            f'{PHASE1_DIR}/blocks_standardized.csv',
+        ],
+        'outputs': [
+            f'{PHASE3_DIR}/production_monthly.csv',
+        ],
+    },
+    {
+        'name': 'phase4',
+        'script': 'phase4_integration.py',
+        'inputs': [
+            f'{PHASE1_DIR}/estates.csv',
+            f'{PHASE1_DIR}/blocks_standardized.csv',
+            f'{PHASE2_DIR}/block_land_infrastructure.csv',
+            f'{PHASE2_DIR}/block_pest_disease.csv',
+            f'{PHASE2_DIR}/block_planting_history.csv',
+            f'{PHASE2_DIR}/block_planting_yearly.csv',
+            f'{PHASE3_DIR}/production_annual.csv',
+            f'{PHASE3_DIR}/production_monthly.csv',
+        ],
+        'outputs': [
+            SCHEMA_SQL,
+        ],
+    },
+    {
+        'name': 'phase5',
+        'script': 'phase5_upload_supabase.py',
+        'inputs': [
+            SCHEMA_SQL,
+            f'{PHASE1_DIR}/estates.csv',
+            f'{PHASE1_DIR}/blocks_standardized.csv',
+            f'{PHASE2_DIR}/block_land_infrastructure.csv',
+            f'{PHASE2_DIR}/block_pest_disease.csv',
+            f'{PHASE2_DIR}/block_planting_history.csv',
+            f'{PHASE2_DIR}/block_planting_yearly.csv',
+            f'{PHASE3_DIR}/production_annual.csv',
+            f'{PHASE3_DIR}/production_monthly.csv',
+        ],
+        'outputs': [],
+        # Prompts for confirmation and talks to Supabase: opt-in, run in foreground
+        'interactive': True,
+        'default': False,
+    },
+]
+
+
+def build_dependencies(phases):
+    """Map each phase name to the set of phases producing its inputs"""
+    producers = {}
+    for phase in phases:
+        for output in phase['outputs']:
+            producers[output] = phase['name']
+
+    return {
+        phase['name']: {producers[i] for i in phase['inputs'] if i in producers and producers[i] != phase['name']}
+        for phase in phases
+    }
+
+
+def topological_order(phases, deps):
+    """Phase names in dependency order (raises on cycles)"""
+    order = []
+    visiting = set()
+    done = set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle at phase '{name}'")
+        visiting.add(name)
+        for dep in sorted(deps[name]):
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for phase in phases:
+        visit(phase['name'])
+    return order
+
+
+def select_phases(phases, deps, targets, with_upload):
+    """Targets plus everything they transitively need"""
+    if not targets:
+        targets = [p['name'] for p in phases if p.get('default', True) or with_upload]
+
+    known = {p['name'] for p in phases}
+    unknown = [t for t in targets if t not in known]
+    if unknown:
+        raise ValueError(f"Unknown phase(s): {', '.join(unknown)}. Available: {', '.join(sorted(known))}")
+
+    selected = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in selected:
+            selected.add(name)
+            stack.extend(deps[name])
+    return selected
+
+
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def phase_fingerprint(phase):
+    """Hash of the phase script and all of its input files"""
+    sha = hashlib.sha256()
+    for path in [phase['script']] + sorted(phase['inputs']):
+        sha.update(path.encode('utf-8'))
+        sha.update(file_digest(path).encode('utf-8') if os.path.exists(path) else b'<missing>')
+    return sha.hexdigest()
+
+
+def output_digests(phase):
+    return {path: file_digest(path) for path in phase['outputs'] if os.path.exists(path)}
+
+
+def is_up_to_date(phase, fingerprint, state):
+    """True when the last successful run used the same inputs and its outputs are intact"""
+    record = state.get(phase['name'])
+    if not record or record.get('fingerprint') != fingerprint:
+        return False
+    if phase.get('interactive'):
+        return False
+    return output_digests(phase) == record.get('outputs') and len(record.get('outputs', {})) == len(phase['outputs'])
+
+
+def run_phase(phase):
+    """Run one phase script in its own Python process; returns (returncode, seconds, log_path)"""
+    start = time.time()
+
+    if phase.get('interactive'):
+        result = subprocess.run([sys.executable, phase['script']])
+        return result.returncode, time.time() - start, None
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{phase['name']}.log")
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    with open(log_path, 'w', encoding='utf-8') as log:
+        result = subprocess.run([sys.executable, phase['script']], stdout=log, stderr=subprocess.STDOUT, env=env)
+    return result.returncode, time.time() - start, log_path
+
+
+def run_pipeline(targets=None, force=False, dry_run=False, with_upload=False, jobs=None, phases=PHASES):
+    """Run the selected phases in dependency order; returns True on success"""
+    by_name = {p['name']: p for p in phases}
+    deps = build_dependencies(phases)
+    order = [n for n in topological_order(phases, deps) if n in select_phases(phases, deps, targets, with_upload)]
+    state = {} if force else load_state()
+    saved_state = load_state()
+
+    print("=" * 100)
+    print("NORMALIZATION PIPELINE")
+    print("=" * 100)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Phases: {' → '.join(order)}")
+
+    if dry_run:
+        # Without running anything, only phases with unchanged inputs can be predicted as skipped
+        print()
+        pending_upstream = set()
+        for name in order:
+            phase = by_name[name]
+            if deps[name] & pending_upstream or not is_up_to_date(phase, phase_fingerprint(phase), state):
+                pending_upstream.add(name)
+                print(f"  ▶️  {name:16s} would run ({phase['script']})")
+            else:
+                print(f"  ⏭️  {name:16s} up to date")
+        return True
+
+    results = {}
+    remaining = list(order)
+    failed = set()
+    started_at = time.time()
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 2) as pool:
+        running = {}
+
+        while remaining or running:
+            # Schedule every phase whose dependencies have finished
+            for name in list(remaining):
+                phase = by_name[name]
+                wanted_deps = deps[name] & set(order)
+                if wanted_deps & failed:
+                    remaining.remove(name)
+                    failed.add(name)
+                    results[name] = ('⛔', 'upstream failed', 0.0)
+                    print(f"⛔ {name:16s} skipped - upstream phase failed")
+                    continue
+                if not wanted_deps <= set(results):
+                    continue
+                if phase.get('interactive') and running:
+                    continue  # interactive phases own the terminal
+
+                remaining.remove(name)
+                fingerprint = phase_fingerprint(phase)
+                if is_up_to_date(phase, fingerprint, state):
+                    results[name] = ('⏭️', 'up to date', 0.0)
+                    print(f"⏭️  {name:16s} up to date")
+                    continue
+
+                missing = [i for i in phase['inputs'] if not os.path.exists(i)]
+                if missing:
+                    failed.add(name)
+                    results[name] = ('❌', f"missing input {missing[0]}", 0.0)
+                    print(f"❌ {name:16s} missing input: {', '.join(missing)}")
+                    continue
+
+                print(f"▶️  {name:16s} running {phase['script']}...")
+                running[pool.submit(run_phase, phase)] = (name, fingerprint)
+
+                if phase.get('interactive'):
+                    break
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, fingerprint = running.pop(future)
+                phase = by_name[name]
+                returncode, elapsed, log_path = future.result()
+
+                if returncode == 0:
+                    saved_state[name] = {
+                        'fingerprint': fingerprint,
+                        'outputs': output_digests(phase),
+                        'finished_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                        'seconds': round(elapsed, 2),
+                    }
+                    state[name] = saved_state[name]
+                    save_state(saved_state)
+                    results[name] = ('✅', 'done', elapsed)
+                    print(f"✅ {name:16s} done in {elapsed:.1f}s")
+                else:
+                    failed.add(name)
+                    results[name] = ('❌', f"exit code {returncode}", elapsed)
+                    log_hint = f" (log: {log_path})" if log_path else ""
+                    print(f"❌ {name:16s} failed with exit code {returncode}{log_hint}")
+
+    print("\n" + "=" * 100)
+    print("PIPELINE SUMMARY")
+    print("=" * 100)
+    for name in order:
+        status, detail, elapsed = results.get(name, ('❔', 'not run', 0.0))
+        print(f"  {status} {name:16s} {detail:20s} {elapsed:6.1f}s")
+    print(f"\nTotal wall time: {time.time() - started_at:.1f}s")
+
+    return not failed
+
+
+def record_phases(timings, written):
+    """
+    Record phases run outside the graph runner (in-memory / incremental)
+    whose declared outputs were all written by this run, so the graph runner
+    does not redo them on its next run. A phase with an output left over from
+    an older run (e.g. phase1_5's block_code_mapping.csv in incremental mode)
+    stays unrecorded and reruns in the graph.
+    """
+    state = load_state()
+    for phase in PHASES:
+        if phase['name'] in timings and phase['outputs'] and set(phase['outputs']) <= written:
+            state[phase['name']] = {
+                'fingerprint': phase_fingerprint(phase),
+                'outputs': output_digests(phase),
+                'finished_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'seconds': round(timings[phase['name']], 2),
+            }
+    save_state(state)
+
+
+def run_in_memory():
+    """Run phase1 → phase4 in this process, passing DataFrames between phases"""
+    import pandas as pd
+    from phase1_foundation import build_foundation
+    from phase1_5_standardization import standardize_blocks
+    from phase2_metadata import extract_metadata
+    from phase3_extract_annual import extract_annual_production
+    from phase3_production import extract_monthly_production
+    from phase4_integration import ALL_TABLES, integrate
+
+    started_at = time.time()
+    timings = {}
+
+    def timed(name, func, *args, **kwargs):
+        start = time.time()
+        result = func(*args, **kwargs)
+        timings[name] = time.time() - start
+        return result
+
+    # Shared by phase1_5 and phase2 - parse it once
+    df_complete = pd.read_csv('output/normalized_production_data_COMPLETE.csv')
+
+    foundation = timed('phase1', build_foundation, write=False)
+    standardized = timed('phase1_5', standardize_blocks, df_complete=df_complete, write=False)
+    df_blocks = standardized['blocks']
+
+    tables = {'estates': foundation['estates'], 'blocks': df_blocks}
+    tables.update(timed('phase2', extract_metadata, df_blocks=df_blocks, df_complete=df_complete, write=False))
+    tables['production_annual'] = timed('phase3_annual', extract_annual_production, df_blocks=df_blocks, write=False)
+    tables['production_monthly'] = timed('phase3_monthly', extract_monthly_production, df_blocks=df_blocks, write=False)
+
+    # Materialize the final tables once
+    print("\n" + "=" * 100)
+    print("Writing final normalized tables")
+    print("=" * 100)
+    written = set()
+    for table_name, file_path in ALL_TABLES.items():
+        if table_name in tables:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            tables[table_name].to_csv(file_path, index=False)
+            written.add(file_path)
+            print(f"✅ Saved: {file_path} ({len(tables[table_name])} rows)")
+
+    # The other phase1/phase1_5 outputs - small, and without them neither phase is
+    # recorded, so --with-upload would re-parse the workbooks for phase5's inputs
+    side_outputs = {
+        f'{PHASE1_DIR}/blocks.csv': foundation['blocks'],
+        f'{PHASE1_DIR}/block_code_mapping.csv': standardized['block_code_mapping'],
+    }
+    for file_path, df in side_outputs.items():
+        df.to_csv(file_path, index=False)
+        written.add(file_path)
+        print(f"✅ Saved: {file_path} ({len(df)} rows)")
+
+    timed('phase4', integrate, tables)
+    written.add(SCHEMA_SQL)
+    record_phases(timings, written)
+
+    print("\n" + "=" * 100)
+    print("IN-MEMORY PIPELINE SUMMARY")
+    print("=" * 100)
+    for name, elapsed in timings.items():
+        print(f"  ✅ {name:16s} {elapsed:6.1f}s")
+    print(f"\nTotal wall time: {time.time() - started_at:.1f}s")
+
+    return tables
+
+
+def splice_blocks(existing, fresh, block_ids, key='block_id'):
+    """
+    `existing` with every row of `block_ids` replaced by the rows in `fresh`.
+    Replaced child rows get new ids after the table's highest id, so an id
+    is never reused for different content; 'blocks' rows keep their own ids.
+    """
+    kept = existing[~existing[key].isin(block_ids)]
+    fresh = fresh.copy()
+    if key != 'id' and 'id' in fresh.columns:
+        start = int(existing['id'].max()) + 1 if len(existing) else 1
+        fresh['id'] = range(start, start + len(fresh))
+
+    import pandas as pd
+    table = pd.concat([kept, fresh[[c for c in existing.columns if c in fresh.columns]]], ignore_index=True)
+    if key == 'id':
+        table = table.sort_values('id', kind='stable', ignore_index=True)
+    return table
+
+
+def upload_blocks(block_codes, tables=None, rest=False):
+    """
+    Replace the rows of `block_codes` in Supabase/Postgres
+    (bulk_loader.replace_blocks); block_codes=None replaces every block.
+    True only when every table was written.
+    """
+    import pandas as pd
+    from dotenv import load_dotenv
+    from bulk_loader import open_target, replace_blocks
+    from phase4_integration import ALL_TABLES
+
+    load_dotenv()
+    tables = dict(tables or {})
+    for table_name, file_path in ALL_TABLES.items():
+        if table_name not in tables and table_name != 'estates':
+            tables[table_name] = pd.read_csv(file_path)
+    tables.pop('estates', None)
+
+    if block_codes is None:
+        block_ids, changed = None, tables
+        label = f"all {len(tables['blocks'])} blocks"
+    else:
+        block_ids = tables['blocks'].loc[tables['blocks']['block_code'].isin(block_codes), 'id']
+        key_of = {name: 'id' if name == 'blocks' else 'block_id' for name in tables}
+        changed = {name: df[df[key_of[name]].isin(block_ids)] for name, df in tables.items()}
+        label = f"{len(block_ids)} changed blocks"
+
+    print("\n" + "=" * 100)
+    print(f"Uploading {label}")
+    print("=" * 100)
+    conn, supabase = open_target(rest=rest)
+    if conn is None and supabase is None:
+        return False
+    try:
+        results = replace_blocks(changed, block_ids, conn=conn, supabase=supabase)
+    finally:
+        if conn is not None:
+            conn.close()
+
+    for result in results:
+        if result['status'] == '✅':
+            print(f"  ✅ {result['table']:30s} {result['rows']:7,d} rows in, {result['existing']:7,d} out")
+        else:
+            print(f"  ❌ {result['table']:30s} {result['error'] or 'rolled back'}")
+    return all(r['status'] == '✅' for r in results)
+
+
+def run_incremental(with_upload=False, rest=False):
+    """
+    Rebuild only the blocks whose source rows changed (block_hashes.py) and
+    splice them into the normalized tables; falls back to run_in_memory()
+    when the changes cannot be applied block by block. Returns True on success.
+    """
+    import pandas as pd
+    import block_hashes
+    from phase1_5_standardization import standardize_blocks
+    from phase2_metadata import extract_metadata
+    from phase3_extract_annual import extract_annual_production
+    from phase3_production import extract_monthly_production
+    from phase4_integration import ALL_TABLES, integrate
+
+    started_at = time.time()
+    timings = {}
+
+    def timed(name, func, *args, **kwargs):
+        start = time.time()
+        result = func(*args, **kwargs)
+        timings[name] = time.time() - start
+        return result
+
+    print("=" * 100)
+    print("INCREMENTAL PIPELINE")
+    print("=" * 100)
+
+    saved = block_hashes.load_state()
+    current = timed('hashing', block_hashes.scan_sources, saved)
+    changes = block_hashes.diff_sources(saved.get('sources'), current)
+    pending = set(saved.get('pending_upload', []))
+    pending_full = saved.get('pending_full', False)
+
+    missing = [path for path in ALL_TABLES.values() if not os.path.exists(path)]
+    if not changes['full'] and missing:
+        changes['full'] = f"no previous output {missing[0]}"
+    block_hashes.print_changes(changes)
+
+    tables = None
+    codes = changes['blocks']
+    if not changes['full'] and codes:
+        df_complete = pd.read_csv(block_hashes.COMPLETE_CSV)
+        df_blocks = timed('phase1_5', standardize_blocks, df_complete=df_complete, write=False)['blocks']
+
+        # Block ids are positional: a new, dropped or reordered block renumbers the master
+        df_saved = pd.read_csv(ALL_TABLES['blocks'])
+        if not df_saved[['id', 'block_code']].reset_index(drop=True).equals(
+                df_blocks[['id', 'block_code']].reset_index(drop=True)):
+            changes['full'] = 'block master changed (blocks added, removed or renumbered)'
+            print(f"⚠️  Full run needed: {changes['full']}")
+
+    if changes['full']:
+        tables = run_in_memory()
+        # Ids may have been renumbered: the next upload replaces every block
+        block_hashes.commit(current, pending | set(tables['blocks']['block_code']), pending_full=True)
+        if with_upload:
+            if not upload_blocks(None, tables, rest=rest):
+                return False
+            block_hashes.commit(current)
+        else:
+            print("\n⬆️  Full rebuild not uploaded yet - run with --with-upload")
+        return True
+
+    if codes:
+        subset = df_blocks[df_blocks['block_code'].isin(codes)]
+        block_ids = subset['id']
+        fresh = {'blocks': subset}
+        fresh.update(timed('phase2', extract_metadata, df_blocks=subset,
+                           df_complete=df_complete[df_complete['block_code'].isin(codes)], write=False))
+        fresh['production_annual'] = timed('phase3_annual', extract_annual_production, df_blocks=subset, write=False)
+        fresh['production_monthly'] = timed('phase3_monthly', extract_monthly_production, df_blocks=subset,
+                                            write=False)
+
+        print("\n" + "=" * 100)
+        print(f"Splicing {len(subset)} blocks into the normalized tables")
+        print("=" * 100)
+        start = time.time()
+        tables = {}
+        written = set()
+        for table_name, file_path in ALL_TABLES.items():
+            if table_name not in fresh:
+                continue
+            existing = pd.read_csv(file_path)
+            tables[table_name] = splice_blocks(existing, fresh[table_name], block_ids,
+                                               key='id' if table_name == 'blocks' else 'block_id')
+            tables[table_name].to_csv(file_path, index=False)
+            written.add(file_path)
+            print(f"✅ {table_name:30s} {len(fresh[table_name]):7,d} rows replaced → {len(tables[table_name]):,} rows")
+        timings['splice'] = time.time() - start
+
+        timed('phase4', integrate, tables)
+        written.add(SCHEMA_SQL)
+        record_phases(timings, written)
+
+        pending |= codes
+        block_hashes.commit(current, pending, pending_full)
+    else:
+        print("\n✅ No block changed since the last run")
+
+    uploaded = True
+    if with_upload and pending:
+        start = time.time()
+        uploaded = upload_blocks(None if pending_full else pending, tables, rest=rest)
+        timings['upload'] = time.time() - start
+        if uploaded:
+            block_hashes.commit(current)
+    elif pending:
+        print(f"\n⬆️  {len(pending)} blocks not uploaded yet - run with --with-upload")
+
+    print("\n" + "=" * 100)
+    print("INCREMENTAL PIPELINE SUMMARY")
+    print("=" * 100)
+    print(f"  Changed blocks: {len(codes)}")
+    for name, elapsed in timings.items():
+        print(f"  ✅ {name:16s} {elapsed:6.1f}s")
+    print(f"\nTotal wall time: {time.time() - started_at:.1f}s")
+
+    return uploaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the normalization pipeline as a dependency graph')
+    parser.add_argument('targets', nargs='*', help='Phases to run (default: all except phase5)')
+    parser.add_argument('--force', action='store_true', help='Rerun phases even if inputs are unchanged')
+    parser.add_argument('--dry-run', action='store_true', help='Show which phases would run')
+    parser.add_argument('--with-upload', action='store_true', help='Include phase5 Supabase upload')
+    parser.add_argument('--jobs', type=int, default=None, help='Maximum phases running in parallel')
+    parser.add_argument('--in-memory', action='store_true',
+                        help='Run phase1-phase4 in one process, writing only the final tables')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Rebuild (and with --with-upload replace) only blocks whose source rows changed')
+    parser.add_argument('--rest', action='store_true', help='Incremental upload over the Supabase REST API')
+    args = parser.parse_args()
+
+    if args.incremental:
+        sys.exit(0 if run_incremental(with_upload=args.with_upload, rest=args.rest) else 1)
+
+    if args.in_memory:
+        run_in_memory()
+        if args.with_upload:
+            sys.exit(0 if run_pipeline(['phase5'], with_upload=True) else 1)
+        return
+
+    try:
+        success = run_pipeline(args.targets, force=args.force, dry_run=args.dry_run,
+                               with_upload=args.with_upload, jobs=args.jobs)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
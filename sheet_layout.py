@@ -0,0 +1,282 @@
+"""
+SHEET LAYOUT DETECTOR
+=====================
+Purpose: One header detector for the source workbooks instead of a
+         different scan in every script (max non-null row, "column 0 == 1",
+         hard-coded skiprows=4). Finds where the data starts, flattens the
+         multi-row header band (year → month → metric, category → detail →
+         code) into one canonical name per column, and caches the result
+         next to the workbook hash in the excel_cache manifest - later runs
+         read with a fixed skiprows without scanning again.
+
+Layout (dict):
+- data_start     first data row = skiprows for a header=None read
+- title_rows     leading rows with a single label ('DATA GABUNGAN ...')
+- band_rows      header band rows, top to bottom
+- header_row     leaf row of the band (densest, lowest)
+- code_row       band row whose labels are all distinct (K001, C001, ...),
+                 None when the sheet has none
+- numbering_row  column-number row (1, 2, 3, ...) between band and data
+- columns        canonical names: band labels joined top-down, e.g.
+                 '2014_jan_real_bjr', 'produksi_2023_real_ton'
+- codes          labels of code_row, None without one
+- fingerprint    hash of the band contents + data_start; equal fingerprints
+                 = same layout, whatever the data rows hold
+
+Detection (first SCAN_ROWS rows, streamed with excel_stream.head_rows):
+- anchor       : the column-number row (1, 2, 3, ... by column position),
+                 else the code row (as wide as the band, all labels distinct)
+- data row     : first row below the anchor that is at least
+                 MIN_NUMERIC_SHARE numeric - header labels are text. Data rows
+                 may be sparse (data_gabungan fills 81 of 177 cells when most
+                 metric columns are empty), so below an anchor their width
+                 does not matter
+- no anchor    : (Realisasi sheets) a data row must also be at least half as
+                 filled as the widest row, and so must the row after it
+- upper band rows are sparse where cells were merged; they are
+  forward-filled within the span of the row above before joining
+
+Usage:
+    from sheet_layout import detect_layout, read_with_layout
+    layout = detect_layout('source/data_gabungan.xlsx', 'Lembar1')
+    layout['data_start'], layout['codes'][:3]        # 10, ['K001', 'K002', 'NOMOR']
+    df, layout = read_with_layout('source/Realisasi vs Potensi PT SR.xlsx', 'Real VS Potensi Inti')
+
+    python sheet_layout.py                    # layouts of every sheet in source/*.xlsx
+    python sheet_layout.py --refresh          # detect again, ignore cached layouts
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import numbers
+import re
+from datetime import datetime
+
+from excel_cache import (CACHE_DIR, _header_names, _open_entry, _resolve_sheet, _update_manifest,
+                         read_excel_cached)
+
+SCAN_ROWS = 30
+MIN_NUMERIC_SHARE = 0.3
+DENSE_SHARE = 0.5  # a data row fills at least half as many cells as the widest row
+LAYOUT_VERSION = 2  # bump when detection rules change → cached layouts are re-detected
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def _filled(row):
+    return [(i, v) for i, v in enumerate(row) if v is not None]
+
+
+def _is_numbering_row(row):
+    cells = _filled(row)
+    if len(cells) < 3 or not all(_is_number(v) for _, v in cells):
+        return False
+    first = cells[0][0]
+    return all(v == i - first + 1 for i, v in cells)
+
+
+def _is_code_row(row, band_width):
+    cells = _filled(row)
+    return (len(cells) >= max(3, band_width * DENSE_SHARE)
+            and all(isinstance(v, str) for _, v in cells)
+            and len({v for _, v in cells}) == len(cells))
+
+
+def _slug(value):
+    return re.sub(r'[^0-9a-z]+', '_', str(value).strip().lower()).strip('_')
+
+
+def _fill_band(band):
+    """
+    Forward-fill merged-cell gaps of the upper band rows, restarting at every
+    label change of the row above (a month never spills into the next year).
+    """
+    filled = []
+    parent = [None] * (len(band[0]) if band else 0)
+    for row in band:
+        current = list(row)
+        last = None
+        for i, value in enumerate(current):
+            if i > 0 and parent[i] != parent[i - 1]:
+                last = None
+            if value is None:
+                current[i] = last
+            else:
+                last = value
+        filled.append(current)
+        parent = [(p, c) for p, c in zip(parent, current)]
+    return filled
+
+
+def _column_names(rows, band_rows, header_row, code_row, width):
+    # Rows above the leaf that are sparser than it hold merged spans
+    leaf_count = len(_filled(rows[header_row]))
+    upper = [r for r in band_rows if r < header_row and len(_filled(rows[r])) < leaf_count]
+    filled = dict(zip(upper, _fill_band([rows[r] for r in upper])))
+
+    names = []
+    for i in range(width):
+        tokens = []
+        for r in band_rows:
+            if r == code_row:
+                continue
+            value = filled[r][i] if r in filled else rows[r][i]
+            for token in _slug(value).split('_') if value is not None else []:
+                if token and token not in tokens:
+                    tokens.append(token)
+        if tokens:
+            names.append('_'.join(tokens))
+        elif code_row is not None and rows[code_row][i] is not None:
+            names.append(_slug(rows[code_row][i]))
+        else:
+            names.append(None)  # → 'Unnamed: i', like read_excel
+    return _header_names(names)
+
+
+def layout_from_rows(rows):
+    """Detect the layout of a sheet from its first rows (list of row lists)"""
+    width = max((len(row) for row in rows), default=0)
+    rows = [list(row) + [None] * (width - len(row)) for row in rows]
+    counts = [len(_filled(row)) for row in rows]
+    widest = max(counts, default=0)
+
+    def is_record(r):
+        cells = _filled(rows[r])
+        if counts[r] == 0 or _is_numbering_row(rows[r]):
+            return False
+        return sum(_is_number(v) for _, v in cells) / len(cells) >= MIN_NUMERIC_SHARE
+
+    def is_data(r):
+        return is_record(r) and counts[r] >= widest * DENSE_SHARE
+
+    # Anchor on the numbering row, else the last code row above the first record
+    anchor = next((r for r in range(len(rows)) if _is_numbering_row(rows[r])), None)
+    if anchor is None:
+        first_record = next((r for r in range(len(rows)) if is_record(r)), len(rows))
+        code_rows = [r for r in range(first_record) if _is_code_row(rows[r], widest)]
+        anchor = code_rows[-1] if code_rows else None
+
+    if anchor is not None:
+        data_start = next((r for r in range(anchor + 1, len(rows)) if is_record(r)), None)
+    else:
+        data_start = next((r for r in range(1, len(rows))
+                           if is_data(r) and (r + 1 >= len(rows) or counts[r + 1] == 0 or is_data(r + 1))), None)
+    if data_start is None:
+        raise ValueError(f"No data rows found in the first {len(rows)} rows")
+
+    title_rows = []
+    for r in range(data_start):
+        if counts[r] == 0:
+            continue
+        if counts[r] == 1 and rows[r][0] is not None:
+            title_rows.append(r)
+        else:
+            break
+
+    numbering_row = next((r for r in range(data_start) if _is_numbering_row(rows[r])), None)
+    band_rows = [r for r in range(data_start)
+                 if counts[r] and r not in title_rows and r != numbering_row]
+    if not band_rows:
+        raise ValueError(f"No header rows found above data row {data_start}")
+
+    band_max = max(counts[r] for r in band_rows)
+    header_row = max(r for r in band_rows if counts[r] == band_max)
+    code_rows = [r for r in band_rows
+                 if counts[r] == band_max
+                 and all(isinstance(v, str) for _, v in _filled(rows[r]))
+                 and len({v for _, v in _filled(rows[r])}) == counts[r]]
+    code_row = code_rows[-1] if code_rows else None
+
+    fingerprint = hashlib.sha256(json.dumps(
+        {'band': [rows[r] for r in band_rows], 'band_rows': band_rows, 'data_start': data_start},
+        default=str).encode()).hexdigest()[:16]
+
+    return {
+        'version': LAYOUT_VERSION,
+        'data_start': data_start,
+        'title_rows': title_rows,
+        'band_rows': band_rows,
+        'header_row': header_row,
+        'code_row': code_row,
+        'numbering_row': numbering_row,
+        'width': width,
+        'columns': _column_names(rows, band_rows, header_row, code_row, width),
+        'codes': None if code_row is None else [None if v is None else str(v) for v in rows[code_row]],
+        'fingerprint': fingerprint,
+    }
+
+
+def detect_layout(path, sheet_name=0, scan_rows=SCAN_ROWS, refresh=False, cache_dir=CACHE_DIR):
+    """
+    Layout of one sheet, see module docstring. Cached per workbook content
+    (SHA-256) in the excel_cache manifest, so only a changed workbook is
+    scanned again.
+    """
+    from excel_stream import head_rows
+
+    entry_dir, manifest = _open_entry(path, cache_dir)
+    sheet = _resolve_sheet(manifest, sheet_name)
+    cached = manifest.get('layouts', {}).get(sheet)
+    if cached and cached.get('version') == LAYOUT_VERSION and not refresh:
+        return cached
+
+    layout = layout_from_rows(head_rows(path, sheet, nrows=scan_rows))
+    layout['sheet'] = sheet
+    layout['detected_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    _update_manifest(entry_dir, 'layouts', sheet, layout)
+    return layout
+
+
+def read_with_layout(path, sheet_name=0, names='columns', usecols=None, cache_dir=CACHE_DIR):
+    """
+    (DataFrame of the data rows, layout). names='columns' labels columns
+    with the canonical names, names='codes' with the code row (falls back
+    to canonical names where a column has no code).
+    """
+    layout = detect_layout(path, sheet_name, cache_dir=cache_dir)
+    df = read_excel_cached(path, sheet_name=layout['sheet'], header=None, skiprows=layout['data_start'],
+                           usecols=usecols, cache_dir=cache_dir)
+
+    labels = layout['columns']
+    if names == 'codes' and layout['codes']:
+        labels = [code or name for code, name in zip(layout['codes'], labels)]
+    # Columns are source positions here (header=None read)
+    df.columns = [labels[i] if i < len(labels) else f"Unnamed: {i}" for i in df.columns]
+    return df, layout
+
+
+def main():
+    from excel_cache import sheet_names
+
+    parser = argparse.ArgumentParser(description='Detect header layouts of the source workbooks')
+    parser.add_argument('paths', nargs='*', help='Workbooks (default: source/*.xlsx)')
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached layouts')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("SHEET LAYOUT DETECTION")
+    print("=" * 80)
+
+    for path in args.paths or sorted(glob.glob('source/*.xlsx')):
+        for sheet in sheet_names(path):
+            print(f"\n📄 {path} [{sheet}]")
+            try:
+                layout = detect_layout(path, sheet, refresh=args.refresh)
+            except ValueError as e:
+                print(f"   ⚠️  {e}")
+                continue
+            print(f"   Data starts at row {layout['data_start']} (skiprows={layout['data_start']})")
+            print(f"   Header band rows: {layout['band_rows']} (leaf {layout['header_row']}, "
+                  f"codes {layout['code_row']}, numbering {layout['numbering_row']})")
+            print(f"   Columns ({layout['width']}): {layout['columns'][:6]} ...")
+            print(f"   Fingerprint: {layout['fingerprint']} (detected {layout['detected_at']})")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
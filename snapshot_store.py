@@ -0,0 +1,290 @@
+"""
+SUPABASE SNAPSHOT STORE
+=======================
+Purpose: Keep a local, versioned copy of the Supabase tables so the
+         validate_* / verify_* / check_* scripts run offline and repeatably
+         instead of downloading the same tables on every run.
+
+Layout (output/.cache/snapshot/):
+- manifest.json   version stamp, refresh time, per-table rows + watermark
+- <table>.parquet one file per table (<table>.pkl when pyarrow is missing)
+
+Refresh:
+- First run (or --full) downloads every table with fetch_tables().
+- Later runs are incremental: rows with updated_at (or created_at) at or
+  after the stored watermark are fetched and merged by id. If the row count
+  then differs from Supabase's exact count (rows were deleted), that table
+  is downloaded in full.
+  Note: tables without updated_at only pick up inserts/deletes - after
+  in-place UPDATEs run a --full refresh.
+
+Usage:
+    python snapshot_store.py           # create or incrementally refresh
+    python snapshot_store.py --full    # re-download every table
+    python snapshot_store.py --info    # show what the snapshot holds
+
+In scripts:
+    from snapshot_store import read_table
+    df_prod = read_table('production_annual')   # snapshot if present, else live
+
+Set SNAPSHOT_LIVE=1 to make read_table() always query Supabase.
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from supabase_fetch import fetch_count, fetch_table, fetch_tables, get_client
+
+SNAPSHOT_DIR = 'output/.cache/snapshot'
+MANIFEST_FILE = 'manifest.json'
+
+SNAPSHOT_TABLES = [
+    'estates',
+    'blocks',
+    'block_land_infrastructure',
+    'block_pest_disease',
+    'block_planting_history',
+    'block_planting_yearly',
+    'production_annual',
+    'production_monthly',
+    'divisions',
+]
+
+_loaded = {}
+_announced = False
+
+
+def _manifest_path(snapshot_dir):
+    return os.path.join(snapshot_dir, MANIFEST_FILE)
+
+
+def load_manifest(snapshot_dir=SNAPSHOT_DIR):
+    path = _manifest_path(snapshot_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest, snapshot_dir):
+    path = _manifest_path(snapshot_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def save_frame(df, table, snapshot_dir):
+    """Parquet when available, pickle otherwise; returns the file name (replaced atomically)"""
+    try:
+        file_name = f"{table}.parquet"
+        tmp_path = os.path.join(snapshot_dir, f"{file_name}.tmp")
+        df.to_parquet(tmp_path, index=False)
+    except (ImportError, ValueError, TypeError):
+        # No parquet engine, or object columns pyarrow cannot type
+        file_name = f"{table}.pkl"
+        tmp_path = os.path.join(snapshot_dir, f"{file_name}.tmp")
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, os.path.join(snapshot_dir, file_name))
+    return file_name
+
+
+def read_frame(file_name, snapshot_dir):
+    path = os.path.join(snapshot_dir, file_name)
+    if file_name.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _watermark_column(df):
+    for col in ('updated_at', 'created_at'):
+        if col in df.columns:
+            return col
+    return None
+
+
+def _table_entry(df, file_name):
+    col = _watermark_column(df)
+    watermark = None
+    if col is not None and df[col].notna().any():
+        watermark = str(df[col].dropna().max())
+    return {
+        'file': file_name,
+        'rows': len(df),
+        'columns': list(df.columns),
+        'watermark_column': col,
+        'watermark': watermark,
+        'fetched_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def _refresh_incremental(client, table, entry, snapshot_dir):
+    """Merge rows changed since the watermark; None when a full download is needed"""
+    if not entry.get('watermark') or 'id' not in entry.get('columns', []):
+        return None
+
+    local = read_frame(entry['file'], snapshot_dir)
+    fetched = fetch_table(client, table, filters=[('gte', entry['watermark_column'], entry['watermark'])])
+
+    if len(fetched) and list(fetched.columns) != list(local.columns):
+        return None  # schema changed
+
+    n_changed = _count_changed(local, fetched)
+    if n_changed:
+        merged = pd.concat([local[~local['id'].isin(fetched['id'])], fetched], ignore_index=True)
+        merged = merged.sort_values('id').reset_index(drop=True)
+    else:
+        merged = local
+
+    if len(merged) != fetch_count(client, table):
+        return None  # deletes happened - counts only line up after a full reload
+    return merged, n_changed
+
+
+def _count_changed(local, fetched):
+    """Rows in `fetched` that are new or differ from the local copy (>= watermark re-fetches boundary rows)"""
+    if not len(fetched):
+        return 0
+
+    def as_objects(df):
+        return df.astype(object).where(df.notna(), None)
+
+    new = fetched.set_index('id')
+    old = local[local['id'].isin(fetched['id'])].set_index('id')
+    is_new = ~new.index.isin(old.index)
+    common = new.index[~is_new]
+    differs = (as_objects(new.loc[common]) != as_objects(old.loc[common, new.columns])).any(axis=1)
+    return int(is_new.sum() + differs.sum())
+
+
+def take_snapshot(client=None, tables=SNAPSHOT_TABLES, full=False, snapshot_dir=SNAPSHOT_DIR):
+    """Create or refresh the snapshot; returns the new manifest"""
+    client = client or get_client()
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    manifest = load_manifest(snapshot_dir)
+    if manifest is None or full:
+        manifest = {'version': manifest['version'] if manifest else 0, 'tables': {}}
+
+    to_download = []
+    changed_any = False
+
+    for table in tables:
+        entry = manifest['tables'].get(table)
+        if entry is None:
+            to_download.append(table)
+            continue
+
+        try:
+            result = _refresh_incremental(client, table, entry, snapshot_dir)
+        except Exception as e:
+            print(f"⚠️  {table:28s} incremental refresh failed ({e}) - downloading in full")
+            result = None
+
+        if result is None:
+            to_download.append(table)
+            continue
+
+        df, n_changed = result
+        if n_changed:
+            manifest['tables'][table] = _table_entry(df, save_frame(df, table, snapshot_dir))
+            changed_any = True
+            print(f"🔄 {table:28s} {n_changed:,} new/updated rows → {len(df):,} rows")
+        else:
+            print(f"✅ {table:28s} unchanged ({len(df):,} rows)")
+
+    if to_download:
+        # Tables that do not exist in this project (e.g. divisions) are skipped individually
+        frames = {}
+        try:
+            frames = fetch_tables(client, {t: {} for t in to_download})
+        except Exception:
+            for table in to_download:
+                try:
+                    frames[table] = fetch_table(client, table)
+                except Exception as e:
+                    print(f"⚠️  {table:28s} skipped - {str(e)[:80]}")
+
+        for table, df in frames.items():
+            manifest['tables'][table] = _table_entry(df, save_frame(df, table, snapshot_dir))
+            changed_any = True
+            print(f"⬇️  {table:28s} downloaded {len(df):,} rows")
+
+    if changed_any:
+        manifest['version'] += 1
+    manifest['refreshed_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    manifest['source'] = os.getenv('SUPABASE_URL')
+    _save_manifest(manifest, snapshot_dir)
+
+    _loaded.clear()
+    return manifest
+
+
+def read_table(table, live=None, client=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Table as a DataFrame - from the local snapshot by default.
+
+    Falls back to a live (paginated) download when the snapshot does not
+    contain the table. live=True (or SNAPSHOT_LIVE=1) always goes live.
+    """
+    global _announced
+
+    if live is None:
+        live = os.getenv('SNAPSHOT_LIVE', '').lower() in ('1', 'true', 'yes')
+
+    if not live:
+        if table in _loaded:
+            return _loaded[table].copy()
+
+        manifest = load_manifest(snapshot_dir)
+        entry = manifest['tables'].get(table) if manifest else None
+        if entry is not None:
+            if not _announced:
+                print(f"📦 Using local snapshot v{manifest['version']} (refreshed {manifest['refreshed_at']}) "
+                      f"- SNAPSHOT_LIVE=1 to query Supabase")
+                _announced = True
+            _loaded[table] = read_frame(entry['file'], snapshot_dir)
+            return _loaded[table].copy()
+
+        print(f"⚠️  '{table}' not in local snapshot - fetching live (run: python snapshot_store.py)")
+
+    return fetch_table(client or get_client(), table)
+
+
+def print_info(snapshot_dir=SNAPSHOT_DIR):
+    manifest = load_manifest(snapshot_dir)
+    if manifest is None:
+        print(f"❌ No snapshot in {snapshot_dir} - run: python snapshot_store.py")
+        return
+
+    print(f"Snapshot v{manifest['version']} - refreshed {manifest['refreshed_at']}")
+    print(f"Source: {manifest.get('source')}")
+    print(f"\n{'Table':30s} {'Rows':>8s}  {'Watermark':28s} File")
+    for table, entry in manifest['tables'].items():
+        watermark = f"{entry['watermark_column']}={entry['watermark']}" if entry['watermark'] else '-'
+        print(f"{table:30s} {entry['rows']:8,d}  {watermark[:28]:28s} {entry['file']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local snapshot of the Supabase tables')
+    parser.add_argument('--full', action='store_true', help='Re-download every table')
+    parser.add_argument('--info', action='store_true', help='Show snapshot contents')
+    args = parser.parse_args()
+
+    if args.info:
+        print_info()
+        return
+
+    print("=" * 80)
+    print("SUPABASE SNAPSHOT")
+    print("=" * 80)
+    manifest = take_snapshot(full=args.full)
+    print(f"\n✅ Snapshot v{manifest['version']} saved to {SNAPSHOT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+SUPABASE PAGINATED FETCH
+========================
+Purpose: One shared way to read whole Supabase tables into DataFrames.
+
+PostgREST caps every response at 1000 rows, so full-table reads need range()
+pagination. Instead of walking the pages one after another, fetch_table():
+1. asks for the exact row count (with the same filters),
+2. issues all page requests at once from a thread pool,
+3. stitches the pages back in order into a DataFrame.
+
+Pages are ordered by `id` by default so concurrent ranges never overlap or
+skip rows; pass order=None for views without an id column.
+
+fetch_tables() does the same for several tables in one burst, e.g.
+    tables = fetch_tables(supabase, {
+        'production_annual': {},
+        'block_pest_disease': {'columns': 'block_id, ganoderma_pct'},
+    })
+
+Filters are either a dict ({'year': 2023} → .eq) or a list of
+(operator, column, value) tuples using the postgrest method names:
+    [('eq', 'year', 2023), ('in_', 'block_id', [1, 2, 3]), ('gte', 'month', 6)]
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+PAGE_SIZE = 1000
+MAX_WORKERS = 8
+
+_client = None
+
+
+def get_client():
+    """Supabase client from SUPABASE_URL + SUPABASE_SERVICE_KEY (or SUPABASE_KEY), created once"""
+    global _client
+    if _client is None:
+        from dotenv import load_dotenv
+        from supabase import create_client
+
+        load_dotenv()
+        _client = create_client(os.getenv('SUPABASE_URL'),
+                                os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_KEY'))
+    return _client
+
+
+def _apply_filters(query, filters):
+    if not filters:
+        return query
+    if isinstance(filters, dict):
+        filters = [('eq', column, value) for column, value in filters.items()]
+    for operator, column, value in filters:
+        query = getattr(query, operator)(column, value)
+    return query
+
+
+def _column_list(columns):
+    if columns == '*':
+        return None
+    return [c.strip() for c in columns.split(',') if c.strip()]
+
+
+def fetch_count(client, table, filters=None):
+    """Exact number of rows matching the filters"""
+    query = client.table(table).select('*', count='exact').limit(1)
+    return _apply_filters(query, filters).execute().count or 0
+
+
+def _fetch_page(client, table, columns, filters, order, start, end):
+    query = _apply_filters(client.table(table).select(columns), filters)
+    if order:
+        query = query.order(order)
+    return query.range(start, end).execute().data
+
+
+def fetch_table(client, table, columns='*', filters=None, order='id', dtypes=None,
+                page_size=PAGE_SIZE, max_workers=MAX_WORKERS, executor=None):
+    """
+    All rows of `table` (optionally projected/filtered) as a DataFrame.
+
+    columns: PostgREST select string ('*' or 'id, block_id, year')
+    dtypes:  optional {column: dtype} applied with astype
+    executor: reuse an existing ThreadPoolExecutor (used by fetch_tables)
+    """
+    if client is None:
+        client = get_client()
+
+    total = fetch_count(client, table, filters)
+    ranges = [(start, min(start + page_size, total) - 1) for start in range(0, total, page_size)]
+
+    if len(ranges) <= 1 or (executor is None and max_workers <= 1):
+        pages = [_fetch_page(client, table, columns, filters, order, s, e) for s, e in ranges]
+    else:
+        owned = executor is None
+        pool = executor or ThreadPoolExecutor(max_workers=min(max_workers, len(ranges)))
+        try:
+            futures = [pool.submit(_fetch_page, client, table, columns, filters, order, s, e) for s, e in ranges]
+            pages = [f.result() for f in futures]
+        finally:
+            if owned:
+                pool.shutdown()
+
+    rows = [row for page in pages for row in page]
+    df = pd.DataFrame(rows, columns=_column_list(columns) if not rows else None)
+
+    if dtypes:
+        df = df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+    return df
+
+
+def fetch_tables(client, requests, max_workers=MAX_WORKERS):
+    """
+    Fetch several tables concurrently.
+
+    requests: {table_name: {fetch_table keyword arguments}} - a 'table' key
+              overrides the table name, so one table can be fetched twice
+              under different names with different filters.
+    Returns {name: DataFrame}.
+    """
+    if client is None:
+        client = get_client()
+
+    # Tables run on their own pool; their pages share a second one so a
+    # table waiting on its pages never blocks a page worker
+    with ThreadPoolExecutor(max_workers=max(1, len(requests))) as table_pool, \
+            ThreadPoolExecutor(max_workers=max_workers) as page_pool:
+        futures = {}
+        for name, kwargs in requests.items():
+            kwargs = dict(kwargs)
+            table = kwargs.pop('table', name)
+            futures[name] = table_pool.submit(fetch_table, client, table, executor=page_pool, **kwargs)
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,517 @@
+"""
+SYNTHETIC PLANTATION DATA GENERATOR
+===================================
+Purpose: Realistic fake data at any scale (tens of thousands of blocks,
+         10+ years monthly) so the pipeline, the upload scripts and the
+         dashboards can be measured at the size of a multi-company group,
+         not only at our ~641 blocks × 3 years.
+
+Generates, from one random seed:
+1. Normalized tables in the phase 1-3 output layout (same columns):
+   estates, divisions, blocks, block_land_infrastructure, block_pest_disease,
+   block_planting_history, block_planting_yearly, production_monthly,
+   production_annual
+2. Source workbooks shaped like the real ones (optional, --no-xlsx skips):
+   - data_gabungan.xlsx, sheet Lembar1: title rows, multi-row header band,
+     code row (K001 ... P115), column-number row, data from row 11 - every
+     value in its column_registry.csv column
+   - Realisasi vs Potensi PT SR.xlsx, sheets 'Real VS Potensi Inti' /
+     'Real VS Potensi Plasma': No / Estate / Blok, then year → month →
+     Real BJR, Janjang, Ton, Potensi BJR, Janjang, Ton
+
+How realistic:
+- Block codes keep the estate prefix letter the dashboards map to AME / OLE /
+  DBE (kpi_cube.ESTATE_BY_PREFIX), ~50 blocks per division like the real data
+- Planting year, seed variety and area are sampled from
+  output/normalized_blocks_v2.csv when present (the real distribution)
+- Potential yield (Ton/ha/year) and bunch weight (BJR) follow palm age
+  curves fitted to normalized_production_data_COMPLETE.csv: nothing before
+  age 3, ~20 Ton/ha from age 10, slow decline after 20
+- Realisation = potential × block efficiency (~0.75) × estate-year weather
+  × monthly noise, spread over the year with a seasonal peak in Sep-Nov
+- Ganoderma attack is zero-inflated and grows with palm age (~2% mean)
+
+Output layout (<out> mirrors output/):
+- <out>/normalized_tables/phase1_core/ estates.csv, divisions.csv, blocks_standardized.csv
+- <out>/normalized_tables/phase2_metadata/ ...
+- <out>/normalized_tables/phase3_production/ production_annual.csv, production_monthly.csv
+- <out>/source/data_gabungan.xlsx, <out>/source/Realisasi vs Potensi PT SR.xlsx
+
+Usage:
+    python synthetic_data.py                            # 641 blocks, 2014-2025
+    python synthetic_data.py --blocks 20000 --years 2014-2025 --no-xlsx
+    python synthetic_data.py --blocks 50000 --out output/synthetic/group --seed 7
+
+    from synthetic_data import generate
+    tables = generate(n_blocks=5000, years=range(2016, 2026))
+
+    python benchmark_suite.py --data output/synthetic/b20000   # benchmark on it
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from kpi_cube import ESTATE_BY_PREFIX
+from phase4_integration import ALL_TABLES
+
+REFERENCE_BLOCKS = 'output/normalized_blocks_v2.csv'
+DEFAULT_OUT = 'output/synthetic'
+
+ESTATES = {'AME': 'Estate AME', 'OLE': 'Estate OLE', 'DBE': 'Estate DBE'}
+ESTATE_SHARE = {'AME': 0.35, 'OLE': 0.30, 'DBE': 0.35}
+BLOCKS_PER_DIVISION = 50
+INTI_SHARE = 0.80
+PRODUCTION_SHARE = 0.98  # blocks that appear in the Realisasi workbook
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+# Monthly share of the annual crop (peak Sep-Nov, low Feb-Apr), mean 1
+SEASONALITY = np.array([0.78, 0.72, 0.80, 0.88, 0.95, 1.00, 1.05, 1.12, 1.22, 1.25, 1.20, 1.03])
+SEASONALITY = SEASONALITY / SEASONALITY.mean()
+
+# Palm age (years) → potential Ton/ha/year and potential BJR (kg per bunch)
+YIELD_CURVE = ([0, 2.5, 3, 4, 5, 6, 8, 10, 13, 18, 22, 25, 30],
+               [0, 0, 4.0, 7.0, 8.5, 11.5, 16.0, 19.5, 21.0, 22.0, 21.0, 19.0, 16.0])
+BJR_CURVE = ([0, 3, 4, 5, 6, 8, 10, 13, 16, 20, 25],
+             [0, 2.6, 3.2, 4.2, 5.8, 7.0, 7.8, 8.8, 10.8, 13.0, 16.0])
+
+DEFAULT_YEARS = range(2014, 2026)
+DEFAULT_VARIETIES = ['Socfindo', 'Topaz', 'PPKS', 'SRIWIJAYA', 'Lonsum', 'Socfin', 'Dami Mas']
+PLANTING_HISTORY_YEARS = range(2009, 2020)  # block_planting_history
+PLANTING_YEARLY_YEARS = range(2020, 2026)   # block_planting_yearly
+METRICS = ['real_bjr_kg', 'real_jum_jjg', 'real_ton', 'potensi_bjr_kg', 'potensi_jum_jjg', 'potensi_ton']
+
+
+def table_paths(out):
+    """Where each normalized table goes below `out` (same layout as output/)"""
+    paths = {name: os.path.join(out, os.path.relpath(path, 'output')) for name, path in ALL_TABLES.items()}
+    paths['divisions'] = os.path.join(out, 'normalized_tables', 'phase1_core', 'divisions.csv')
+    return paths
+
+
+def _reference_blocks(path=REFERENCE_BLOCKS):
+    """Real (year_planted, seed_variety, area_ha) rows to sample from, or None"""
+    if not os.path.exists(path):
+        return None
+    ref = pd.read_csv(path)
+    ref = ref[(ref['year_planted'] > 0) & (ref['area_ha'] > 0) & (ref['seed_variety'].astype(str) != '0')]
+    return ref[['year_planted', 'seed_variety', 'area_ha']].reset_index(drop=True) if len(ref) else None
+
+
+def _block_codes(n, estate):
+    """n unique 5-character codes whose first letter maps to `estate` ('A001A', 'B001A', ..., 'A002A')"""
+    letters = [p for p, e in ESTATE_BY_PREFIX.items() if e == estate]
+    capacity = len(letters) * 999 * 26
+    if n > capacity:
+        raise ValueError(f"{estate}: at most {capacity:,} block codes, asked for {n:,}")
+    k = np.arange(n)
+    letter = np.array(letters)[k % len(letters)]
+    idx = k // len(letters)
+    number = idx % 999 + 1
+    suffix = np.array([chr(65 + s) for s in range(26)])[idx // 999]
+    codes = pd.Series(letter) + pd.Series(number).map('{:03d}'.format) + pd.Series(suffix)
+    return codes.to_numpy()
+
+
+def _master_tables(n_blocks, rng, reference):
+    """estates, divisions, blocks"""
+    estates = pd.DataFrame({'id': np.arange(1, len(ESTATES) + 1),
+                            'estate_code': list(ESTATES),
+                            'estate_name': list(ESTATES.values())})
+    share = np.array([ESTATE_SHARE[e] for e in ESTATES])
+    per_estate = np.floor(share / share.sum() * n_blocks).astype(int)
+    per_estate[0] += n_blocks - per_estate.sum()
+
+    divisions, frames = [], []
+    for estate_id, estate, n in zip(estates['id'], estates['estate_code'], per_estate):
+        codes = _block_codes(n, estate)
+        n_div = max(1, int(round(n / BLOCKS_PER_DIVISION)))
+        first_id = len(divisions) + 1
+        divisions += [(first_id + i, f"{estate}{i + 1:03d}", f"{estate} Division {i + 1}", estate_id)
+                      for i in range(n_div)]
+        # Neighbouring block numbers share a division
+        div_index = np.arange(n) * n_div // max(n, 1)
+        frames.append(pd.DataFrame({'block_code': codes, 'estate_id': estate_id,
+                                    'estate_code': estate, 'division_id': first_id + div_index}))
+    divisions = pd.DataFrame(divisions, columns=['id', 'division_code', 'division_name', 'estate_id'])
+
+    blocks = pd.concat(frames, ignore_index=True)
+    blocks.insert(0, 'id', np.arange(1, len(blocks) + 1))
+    blocks['division'] = blocks['division_id'].map(divisions.set_index('id')['division_code'])
+    blocks['block_code_standardized'] = blocks['block_code']
+    blocks['category'] = np.where(rng.random(len(blocks)) < INTI_SHARE, 'Inti', 'Plasma')
+    blocks['has_production_data'] = rng.random(len(blocks)) < PRODUCTION_SHARE
+
+    if reference is not None:
+        sample = reference.iloc[rng.integers(0, len(reference), len(blocks))].reset_index(drop=True)
+        blocks['year_planted'] = sample['year_planted'].astype(int).to_numpy()
+        blocks['seed_variety'] = sample['seed_variety'].to_numpy()
+        area = sample['area_ha'].to_numpy() * rng.uniform(0.9, 1.1, len(blocks))
+    else:
+        blocks['year_planted'] = rng.integers(2008, 2024, len(blocks))
+        blocks['seed_variety'] = rng.choice(DEFAULT_VARIETIES, len(blocks))
+        area = rng.gamma(4.0, 5.0, len(blocks))
+    blocks['area_ha'] = np.clip(area, 0.5, 60).round(2)
+    return estates, divisions, blocks
+
+
+def _metadata_tables(blocks, rng, recorded_date):
+    """block_land_infrastructure, block_pest_disease, block_planting_history, block_planting_yearly"""
+    n = len(blocks)
+    area = blocks['area_ha'].to_numpy()
+    planted = blocks['year_planted'].to_numpy()
+    ids = {'block_id': blocks['id'].to_numpy(), 'block_code': blocks['block_code'].to_numpy()}
+
+    sph_standard = rng.choice([130, 136, 143], n, p=[0.2, 0.6, 0.2]).astype(float)
+    sph_actual = np.clip(rng.normal(0.92, 0.06, n), 0.6, 1.05) * sph_standard
+    total_pkk = np.round(area * sph_actual)
+    added = np.where(rng.random(n) < 0.03, rng.exponential(2.0, n), 0).round(2)
+    reserve = np.where(rng.random(n) < 0.08, rng.exponential(3.0, n), 0).round(2)
+    roads = (area * rng.uniform(0.02, 0.07, n)).round(2)
+
+    def rare_count(p, scale):
+        return np.where(rng.random(n) < p, rng.integers(1, scale, n), 0).astype(str)
+
+    infra = pd.DataFrame({
+        'id': np.arange(1, n + 1), **ids,
+        'luas_tanam_sd_2024_ha': area,
+        'total_luas_sd_2025_ha': (area + added).round(2),
+        'empls': rare_count(0.01, 5), 'bbt': rare_count(0.005, 20), 'pks': rare_count(0.003, 20),
+        'jalan_parit_ha': roads,
+        'areal_cadangan_ha': reserve,
+        'total_luas_keseluruhan_ha': (area + added + roads + reserve).round(2),
+        'standar_pokok_per_hektar': sph_standard,
+        'sph_aktual': sph_actual.round(2),
+        'total_pkk': total_pkk,
+    })
+
+    # Ganoderma: most blocks little or none, older blocks more
+    age = np.clip(datetime.now().year - planted, 0, None)
+    infected = rng.random(n) < np.clip(0.35 + age * 0.03, 0, 0.9)
+    rate = np.where(infected, np.clip(rng.lognormal(np.log(0.012), 1.1, n) * (0.5 + age / 15), 0, 0.6), 0)
+    total_attack = np.round(total_pkk * rate)
+    stadium_1_2 = rng.binomial(total_attack.astype(np.int64), 0.65)
+    pest = pd.DataFrame({
+        'id': np.arange(1, n + 1), **ids,
+        'serangan_ganoderma_pkk_stadium_1_2': stadium_1_2.astype(float),
+        'stadium_3_4': (total_attack - stadium_1_2).astype(float),
+        'total_serangan': total_attack,
+        'pct_serangan': np.where(total_pkk > 0, total_attack / np.where(total_pkk > 0, total_pkk, 1), 0).round(4),
+        'recorded_date': recorded_date,
+    })
+
+    # Planting history: the komposisi pokok of the planting year (2009-2019)
+    history_mask = np.isin(planted, list(PLANTING_HISTORY_YEARS))
+    history = pd.DataFrame({
+        'block_id': ids['block_id'][history_mask], 'block_code': ids['block_code'][history_mask],
+        'komposisi_pokok': total_pkk[history_mask], 'year': planted[history_mask],
+        'sph': sph_standard[history_mask],
+    })
+    history.insert(0, 'id', np.arange(1, len(history) + 1))
+
+    # Planting yearly: every block × 2020-2025 - new planting, supplies (sisip), kentosan from 2023
+    years = np.array(list(PLANTING_YEARLY_YEARS))
+    block_idx = np.repeat(np.arange(n), len(years))
+    year = np.tile(years, n)
+    pokok = total_pkk[block_idx]
+    tanam = np.where(planted[block_idx] == year, pokok, 0)
+    sisip = rng.poisson(pokok * 0.008 * (planted[block_idx] < year))
+    kentosan = np.where(year >= 2023, rng.poisson(pokok * 0.002), np.nan)
+    yearly = pd.DataFrame({
+        'id': np.arange(1, len(year) + 1),
+        'block_id': ids['block_id'][block_idx], 'block_code': ids['block_code'][block_idx], 'year': year,
+        'tanam': tanam.astype(float), 'sisip': sisip.astype(float), 'sisip_kentosan': kentosan,
+        'sph': sph_standard[block_idx],
+    })
+    return infra, pest, history, yearly
+
+
+def _production_tables(blocks, years, rng, created_at):
+    """production_monthly and production_annual (annual = sum of the months)"""
+    prod = blocks[blocks['has_production_data']]
+    n, n_years = len(prod), len(years)
+    area = prod['area_ha'].to_numpy()[:, None, None]
+    planted = prod['year_planted'].to_numpy()[:, None, None]
+    year = np.asarray(years, dtype=float)[None, :, None]
+    month = np.arange(12, dtype=float)[None, None, :]
+
+    age = year - planted + (month + 0.5) / 12                           # (blocks, years, months)
+    site = rng.lognormal(0, 0.10, (n, 1, 1))                             # soil / variety
+    potensi_ton = area * site * np.interp(age, *YIELD_CURVE) / 12 * SEASONALITY[None, None, :]
+    potensi_bjr = np.interp(age, *BJR_CURVE) * rng.normal(1, 0.04, (n, 1, 1))
+
+    efficiency = rng.beta(12, 4, (n, 1, 1))                              # mean 0.75
+    estate_codes, estate_idx = np.unique(prod['estate_code'].to_numpy(), return_inverse=True)
+    weather = rng.normal(1, 0.06, (len(estate_codes), n_years))[estate_idx][:, :, None]
+    real_ton = potensi_ton * efficiency * weather * rng.lognormal(0, 0.12, (n, n_years, 12))
+    real_bjr = potensi_bjr * np.clip(rng.normal(0.95, 0.08, (n, n_years, 12)), 0.6, 1.3)
+
+    def bunches(ton, bjr):
+        return np.where(bjr > 0, np.round(ton * 1000 / np.where(bjr > 0, bjr, 1)), 0)
+
+    values = {
+        'real_bjr_kg': np.where(real_ton > 0, real_bjr, 0),
+        'real_jum_jjg': bunches(real_ton, real_bjr),
+        'real_ton': real_ton,
+        'potensi_bjr_kg': np.where(potensi_ton > 0, potensi_bjr, 0),
+        'potensi_jum_jjg': bunches(potensi_ton, potensi_bjr),
+        'potensi_ton': potensi_ton,
+    }
+
+    monthly = pd.DataFrame({
+        'block_id': np.repeat(prod['id'].to_numpy(), n_years * 12),
+        'block_code': np.repeat(prod['block_code'].to_numpy(), n_years * 12),
+        'year': np.tile(np.repeat(np.asarray(years), 12), n),
+        'month': np.tile(MONTHS, n * n_years),
+        **{metric: array.reshape(-1).round(2) for metric, array in values.items()},
+    })
+
+    annual_ton = {m: values[m].sum(axis=2) for m in ('real_ton', 'potensi_ton', 'real_jum_jjg', 'potensi_jum_jjg')}
+    annual = pd.DataFrame({
+        'block_id': np.repeat(prod['id'].to_numpy(), n_years),
+        'block_code': np.repeat(prod['block_code'].to_numpy(), n_years),
+        'year': np.tile(np.asarray(years), n),
+    })
+    for side in ('real', 'potensi'):
+        ton, jjg = annual_ton[f'{side}_ton'], annual_ton[f'{side}_jum_jjg']
+        annual[f'{side}_bjr_kg'] = np.where(jjg > 0, ton * 1000 / np.where(jjg > 0, jjg, 1), 0).reshape(-1).round(2)
+        annual[f'{side}_jum_jjg'] = jjg.reshape(-1)
+        annual[f'{side}_ton'] = ton.reshape(-1).round(2)
+
+    for df in (monthly, annual):
+        # Same derived columns as phase3: gap = real - potensi, % of potensi (0 when no potensi)
+        for suffix in ('bjr_kg', 'jum_jjg', 'ton'):
+            df[f'gap_{suffix}'] = (df[f'real_{suffix}'] - df[f'potensi_{suffix}']).round(2)
+        for suffix, pct in (('bjr_kg', 'bjr'), ('jum_jjg', 'jjg'), ('ton', 'ton')):
+            potensi = df[f'potensi_{suffix}'].to_numpy()
+            df[f'gap_pct_{pct}'] = np.where(potensi != 0, (df[f'gap_{suffix}'] / np.where(potensi != 0, potensi, 1) * 100).round(2), 0)
+        df.insert(0, 'id', np.arange(1, len(df) + 1))
+        df['created_at'] = created_at
+    return monthly, annual
+
+
+def generate(n_blocks=641, years=DEFAULT_YEARS, seed=42, reference=REFERENCE_BLOCKS):
+    """All normalized tables as {name: DataFrame}, see module docstring"""
+    rng = np.random.default_rng(seed)
+    years = sorted(int(y) for y in years)
+    now = datetime.now()
+    ref = _reference_blocks(reference) if reference else None
+
+    estates, divisions, blocks = _master_tables(n_blocks, rng, ref)
+    infra, pest, history, yearly = _metadata_tables(blocks, rng, now.strftime('%Y-%m-%d'))
+    monthly, annual = _production_tables(blocks, years, rng, now.strftime('%Y-%m-%d %H:%M:%S'))
+    return {
+        'estates': estates,
+        'divisions': divisions,
+        'blocks': blocks,
+        'block_land_infrastructure': infra,
+        'block_pest_disease': pest,
+        'block_planting_history': history,
+        'block_planting_yearly': yearly,
+        'production_annual': annual,
+        'production_monthly': monthly,
+    }
+
+
+def write_tables(tables, out):
+    """CSV per table in the phase 1-3 layout below `out`; returns {name: path}"""
+    paths = table_paths(out)
+    for name, df in tables.items():
+        os.makedirs(os.path.dirname(paths[name]), exist_ok=True)
+        df.to_csv(paths[name], index=False)
+    return {name: paths[name] for name in tables}
+
+
+# ============================================================================
+# WORKBOOKS
+# ============================================================================
+
+def gabungan_frame(tables):
+    """One row per block with every column_registry name that the tables can fill"""
+    from column_registry import load_registry
+
+    blocks = tables['blocks'].set_index('id')
+    infra = tables['block_land_infrastructure'].set_index('block_id').reindex(blocks.index)
+    pest = tables['block_pest_disease'].set_index('block_id').reindex(blocks.index)
+    history = tables['block_planting_history'].pivot(index='block_id', columns='year', values='komposisi_pokok')
+    yearly = tables['block_planting_yearly'].pivot(index='block_id', columns='year',
+                                                   values=['tanam', 'sisip', 'sisip_kentosan'])
+    annual = tables['production_annual']
+    annual_wide = annual.pivot(index='block_id', columns='year',
+                               values=[c for c in annual.columns if c.startswith(('real_', 'potensi_', 'gap_'))
+                                       and not c.startswith('gap_pct')])
+
+    columns = {
+        'kode_blok': blocks['block_code'], 'tahun_tanam': blocks['year_planted'],
+        'nomor_urut': pd.Series(np.arange(1, len(blocks) + 1), index=blocks.index),
+        'estate_lama': blocks['estate_code'], 'estate_code': blocks['estate_code'],
+        'divisi_lama': blocks['division'], 'divisi_code': blocks['division'],
+        # Old-style code 'A 01' from 'A001A'
+        'blok_lama': blocks['block_code'].str[0] + ' ' + blocks['block_code'].str[1:4].astype(int).map('{:02d}'.format),
+        'kode_blok_baru': blocks['block_code_standardized'],
+        'tahun_tanam_utama': blocks['year_planted'], 'varietas_bibit': blocks['seed_variety'],
+        'penambahan_luas_ha': infra['total_luas_sd_2025_ha'] - infra['luas_tanam_sd_2024_ha'],
+        'realisasi_tanam_komposisi_pokok_header': infra['total_pkk'],
+        'total_sd_2019_pokok': history.sum(axis=1).reindex(blocks.index),
+        'total_tanam': yearly['tanam'].sum(axis=1).reindex(blocks.index),
+        'total_sisip': yearly['sisip'].sum(axis=1).reindex(blocks.index),
+        'total_kentosan': yearly['sisip_kentosan'].sum(axis=1).reindex(blocks.index),
+        'serangan_ganoderma_stadium_1_2': pest['serangan_ganoderma_pkk_stadium_1_2'],
+        'serangan_ganoderma_stadium_3_4': pest['stadium_3_4'],
+        'serangan_ganoderma_total': pest['total_serangan'],
+        'serangan_ganoderma_pct': pest['pct_serangan'],
+        'estate_produksi': blocks['estate_code'], 'blok_produksi': blocks['block_code'],
+        'luas_produksi_ha': infra['total_luas_sd_2025_ha'], 'pokok_produksi': infra['total_pkk'],
+        'tahun_tanam_produksi': blocks['year_planted'], 'sph_produksi': infra['sph_aktual'],
+    }
+    for col in ('luas_tanam_sd_2024_ha', 'total_luas_sd_2025_ha', 'empls', 'bbt', 'pks', 'jalan_parit_ha',
+                'areal_cadangan_ha', 'total_luas_keseluruhan_ha', 'standar_pokok_per_hektar', 'total_pkk',
+                'sph_aktual'):
+        columns[col] = infra[col]
+    for year in history.columns:
+        columns[f'realisasi_tanam_komposisi_pokok_{year}'] = history[year].reindex(blocks.index)
+    for (metric, year) in yearly.columns:
+        columns[f'{metric}_{year}'] = yearly[(metric, year)].reindex(blocks.index)
+    for (metric, year) in annual_wide.columns:
+        columns[f'{metric}_{year}'] = annual_wide[(metric, year)].reindex(blocks.index)
+
+    registry = load_registry()
+    frame = pd.DataFrame({name: columns[name] for name in registry['name'] if name in columns}, index=blocks.index)
+    return frame.reset_index(drop=True), registry
+
+
+def _excel_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value
+
+
+def write_gabungan(tables, path):
+    """data_gabungan.xlsx-shaped workbook (sheet Lembar1), columns placed by column_registry.csv"""
+    from openpyxl import Workbook
+
+    frame, registry = gabungan_frame(tables)
+    width = int(registry['position'].max()) + 1
+    rows = registry.set_index('name')
+
+    def band(label_of):
+        row = [None] * width
+        for name, r in rows.iterrows():
+            row[r['position']] = label_of(name, r)
+        return row
+
+    def group(name, r):
+        parts = name.rsplit('_', 1)
+        if r['code'].startswith('P') and parts[-1].isdigit():
+            return f"PRODUKSI {parts[-1]}"
+        return (r['table'] or 'referensi').replace('_', ' ').upper()
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Lembar1')
+    ws.append(['DATA GABUNGAN (SYNTHETIC)'])
+    ws.append([f"Generated {datetime.now().strftime('%Y-%m-%d %H:%M')} - {len(frame):,} blocks"])
+    ws.append([])
+    ws.append(band(group))                                                          # row 3: category
+    ws.append(band(lambda name, r: name.split('_')[0].upper()))                     # row 4: sub-header
+    ws.append(band(lambda name, r: r['legacy_name']))                               # row 5: details
+    ws.append(band(lambda name, r: r['code']))                                      # row 6: code row
+    ws.append(band(lambda name, r: r['unit'] or None))                              # row 7: units
+    ws.append([])
+    ws.append(list(range(1, width + 1)))                                            # row 9: column numbers
+
+    positions = [int(rows.loc[name, 'position']) for name in frame.columns]
+    values = frame.astype(object).where(frame.notna(), None).to_numpy()
+    for record in values:
+        row = [None] * width
+        for position, value in zip(positions, record):
+            row[position] = value.item() if hasattr(value, 'item') else value
+        ws.append(row)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    wb.save(path)
+
+
+def write_realisasi(tables, path):
+    """Realisasi vs Potensi PT SR.xlsx-shaped workbook: Inti and Plasma sheets, year → month → 6 metrics"""
+    from openpyxl import Workbook
+
+    monthly = tables['production_monthly']
+    blocks = tables['blocks'].set_index('id')
+    years = sorted(monthly['year'].unique())
+    wide = monthly.pivot_table(index='block_id', columns=['year', 'month'], values=METRICS, sort=False)
+    column_order = [(metric, year, month) for year in years for month in MONTHS for metric in METRICS]
+    wide = wide.reindex(columns=pd.MultiIndex.from_tuples(column_order)).round(2)
+
+    labels = ['Real BJR', 'Real Janjang', 'Real Ton', 'Potensi BJR', 'Potensi Janjang', 'Potensi Ton']
+    wb = Workbook(write_only=True)
+    for category in ('Inti', 'Plasma'):
+        block_ids = [b for b in wide.index if blocks.loc[b, 'category'] == category]
+        ws = wb.create_sheet(f'Real VS Potensi {category}')
+        ws.append([f'REALISASI VS POTENSI PT SR - {category.upper()} (SYNTHETIC)'])
+        ws.append([])
+        ws.append([None] * 3 + [year if i % 72 == 0 else None for year in years for i in range(72)])
+        ws.append([None] * 3 + [month if i % 6 == 0 else None for _ in years for month in MONTHS for i in range(6)])
+        ws.append(['No', 'Estate', 'Blok'] + labels * (12 * len(years)))
+        values = wide.loc[block_ids].to_numpy()
+        for no, (block_id, row) in enumerate(zip(block_ids, values), 1):
+            ws.append([no, blocks.loc[block_id, 'estate_code'], blocks.loc[block_id, 'block_code']]
+                      + [None if np.isnan(v) else float(v) for v in row])
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    wb.save(path)
+
+
+def _parse_years(spec):
+    if '-' in spec:
+        start, end = spec.split('-', 1)
+        return range(int(start), int(end) + 1)
+    return [int(y) for y in spec.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic plantation data generator')
+    parser.add_argument('--blocks', type=int, default=641, help='Number of blocks (default 641, like the real data)')
+    parser.add_argument('--years', default=f"{DEFAULT_YEARS[0]}-{DEFAULT_YEARS[-1]}",
+                        help='Production years, e.g. 2014-2025 or 2023,2024,2025')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', help=f'Output directory (default {DEFAULT_OUT}/b<blocks>)')
+    parser.add_argument('--no-xlsx', action='store_true', help='Only the normalized tables, no workbooks')
+    args = parser.parse_args()
+
+    out = args.out or os.path.join(DEFAULT_OUT, f"b{args.blocks}")
+    years = _parse_years(args.years)
+
+    print("=" * 80)
+    print("SYNTHETIC PLANTATION DATA GENERATOR")
+    print("=" * 80)
+    print(f"📊 {args.blocks:,} blocks × {len(years)} years ({years[0]}-{years[-1]}), seed {args.seed}")
+    print(f"📁 {out}")
+
+    start = time.time()
+    tables = generate(args.blocks, years, args.seed)
+    print(f"\n✅ Generated in {time.time() - start:.1f}s")
+
+    start = time.time()
+    paths = write_tables(tables, out)
+    for name, df in tables.items():
+        print(f"  {name:28s} {len(df):>12,} rows  → {paths[name]}")
+    print(f"✅ Tables written in {time.time() - start:.1f}s")
+
+    if not args.no_xlsx:
+        start = time.time()
+        write_gabungan(tables, os.path.join(out, 'source', 'data_gabungan.xlsx'))
+        write_realisasi(tables, os.path.join(out, 'source', 'Realisasi vs Potensi PT SR.xlsx'))
+        print(f"✅ Workbooks written to {os.path.join(out, 'source')} in {time.time() - start:.1f}s")
+
+    annual = tables['production_annual']
+    summary = annual.groupby('year')[['real_ton', 'potensi_ton']].sum()
+    print(f"\n{'Year':6s} {'Real Ton':>14s} {'Potensi Ton':>14s} {'Real/Potensi':>13s}")
+    for year, row in summary.iterrows():
+        ratio = row['real_ton'] / row['potensi_ton'] * 100 if row['potensi_ton'] else 0
+        print(f"{year:<6d} {row['real_ton']:14,.0f} {row['potensi_ton']:14,.0f} {ratio:12.1f}%")
+
+
+if __name__ == "__main__":
+    main()
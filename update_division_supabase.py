@@ -11,6 +11,8 @@ from supabase import create_client
 from dotenv import load_dotenv
 import os
 import pandas as pd
+from bulk_loader import connect
+from division_update import load_division_mapping, apply_division_mapping, print_report
 
 # Load environment
 load_dotenv()
@@ -53,54 +55,21 @@ if proceed != 'y':
 
 # Step 2: Load division mapping
 print('\n\nStep 2: Loading division mapping...')
-df_mapping = pd.read_csv('output/block_division_mapping.csv')
+df_mapping = load_division_mapping('output/block_division_mapping.csv')
 print(f'   Loaded {len(df_mapping)} block->division mappings')
 
-# Step 3: Update blocks in Supabase
+# Step 3: Update blocks in Supabase (one set-based update, see division_update.py)
 print('\n\nStep 3: Updating blocks with division info...')
-
-# Get all blocks from Supabase
-response = supabase.table('blocks').select('id, block_code').execute()
-blocks_db = pd.DataFrame(response.data)
-print(f'   Found {len(blocks_db)} blocks in database')
-
-# Merge with division mapping
-blocks_to_update = blocks_db.merge(
-    df_mapping[['block_code', 'division']],
-    on='block_code',
-    how='left'
-)
-
-# Filter blocks that have division
-blocks_with_division = blocks_to_update[blocks_to_update['division'].notna()]
-print(f'   {len(blocks_with_division)} blocks have division mapping')
-
-# Update in batches
-batch_size = 100
-total_updated = 0
-errors = 0
-
-for i in range(0, len(blocks_with_division), batch_size):
-    batch = blocks_with_division.iloc[i:i+batch_size]
-    
-    for _, row in batch.iterrows():
-        try:
-            supabase.table('blocks').update({
-                'division': row['division']
-            }).eq('id', row['id']).execute()
-            
-            total_updated += 1
-            
-            if total_updated % 50 == 0:
-                print(f'   Updated {total_updated}/{len(blocks_with_division)} blocks...')
-                
-        except Exception as e:
-            print(f'   Error updating block {row["block_code"]}: {e}')
-            errors += 1
+db_conn = connect()
+try:
+    report = apply_division_mapping(df_mapping, conn=db_conn, supabase=supabase)
+finally:
+    if db_conn is not None:
+        db_conn.close()
+print_report(report)
 
 print(f'\n✅ Update complete!')
-print(f'   Successfully updated: {total_updated} blocks')
-print(f'   Errors: {errors}')
+print(f'   Successfully updated: {report["changed"]} blocks ({report["unchanged"]} already correct)')
 
 # Step 4: Verify
 print('\n\nStep 4: Verifying update...')
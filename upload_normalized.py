@@ -9,6 +9,7 @@ import time
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from datetime import datetime
+from bulk_loader import connect, load_table
 
 # Load environment variables
 load_dotenv()
@@ -29,6 +30,9 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 # Initialize Supabase client
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Optional direct Postgres connection (SUPABASE_DB_URL) for COPY loads
+db_conn = connect()
+
 print("=" * 100)
 print("UPLOAD NORMALIZED DATA TO SUPABASE")
 print("=" * 100)
@@ -79,54 +83,22 @@ def upload_table(table_name, csv_file, description, batch_size=100):
     print(f"\n📂 Loading CSV file...")
     df = pd.read_csv(csv_file)
     
-    # Replace NaN with None for JSON compatibility
-    df = df.where(pd.notna(df), None)
-    
     total_rows = len(df)
     print(f"   ✓ Loaded: {total_rows} rows × {len(df.columns)} columns")
     
-    # Convert to list of dictionaries
-    print(f"\n📦 Converting to JSON format...")
-    records = df.to_dict('records')
-    print(f"   ✓ Converted: {len(records)} records")
-    
-    # Upload in batches
-    print(f"\n⬆️  Uploading to Supabase (batch size: {batch_size})...")
+    # Bulk load (COPY over SUPABASE_DB_URL, else REST inserts in batches)
+    method = 'Postgres COPY' if db_conn is not None else f'REST, batch size: {batch_size}'
+    print(f"\n⬆️  Uploading to Supabase ({method})...")
     
-    total_batches = (total_rows + batch_size - 1) // batch_size
-    success_count = 0
-    error_count = 0
     start_time = time.time()
+    result = load_table(table_name, df, conn=db_conn, supabase=supabase,
+                        if_exists='append', batch_size=batch_size)
     
-    for i in range(0, total_rows, batch_size):
-        batch_num = (i // batch_size) + 1
-        batch = records[i:i + batch_size]
-        
-        try:
-            # Upload batch
-            response = supabase.table(table_name).insert(batch).execute()
-            
-            success_count += len(batch)
-            
-            # Progress indicator
-            progress = (batch_num / total_batches) * 100
-            elapsed = time.time() - start_time
-            rate = success_count / elapsed if elapsed > 0 else 0
-            
-            print(f"   Batch {batch_num}/{total_batches} ({progress:.1f}%): "
-                  f"✓ {len(batch)} rows uploaded "
-                  f"[{success_count}/{total_rows}] "
-                  f"({rate:.1f} rows/sec)")
-            
-            # Small delay to avoid rate limiting
-            time.sleep(0.1)
-            
-        except Exception as e:
-            error_count += len(batch)
-            print(f"   Batch {batch_num}/{total_batches}: ❌ Error - {str(e)[:100]}")
-            
-            # Continue with next batch
-            continue
+    if result['status'] == '✅':
+        success_count, error_count = result['rows'], 0
+    else:
+        success_count, error_count = 0, total_rows
+        print(f"   ❌ Error - {str(result['error'])[:100]}")
     
     # Summary
     elapsed_time = time.time() - start_time
@@ -135,7 +107,7 @@ def upload_table(table_name, csv_file, description, batch_size=100):
     print(f"   ✓ Success: {success_count} rows")
     print(f"   ❌ Failed: {error_count} rows")
     print(f"   ⏱  Time: {elapsed_time:.2f} seconds")
-    print(f"   ⚡ Rate: {success_count / elapsed_time:.1f} rows/sec")
+    print(f"   ⚡ Rate: {success_count / max(elapsed_time, 1e-9):.1f} rows/sec")
     
     if error_count == 0:
         print(f"\n✅ {table_name} uploaded successfully!")
@@ -170,9 +142,6 @@ def main():
             'success': result
         })
         
-        # Pause between tables
-        time.sleep(1)
-    
     # Overall summary
     overall_elapsed = time.time() - overall_start
     
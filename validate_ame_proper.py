@@ -4,12 +4,7 @@ Using correct estate relationship via divisions table
 """
 
 import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("="*80)
 print("AME 2023 VALIDATION - USING PROPER ESTATE RELATIONSHIP")
@@ -37,32 +32,16 @@ print(f"  Target: {excel_target:,.2f} Ton")
 print("\n2. Loading Supabase (with estate joins)...")
 
 # Production data
-all_prod = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_prod.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df_prod = pd.DataFrame(all_prod)
+df_prod = read_table('production_annual')
 
 # Blocks
-blocks_data = supabase.table('blocks').select('*').execute()
-df_blocks = pd.DataFrame(blocks_data.data)
+df_blocks = read_table('blocks')
 
 # Divisions (has estate info)
-divisions_data = supabase.table('divisions').select('*').execute()
-df_divisions = pd.DataFrame(divisions_data.data)
+df_divisions = read_table('divisions')
 
 # Estates
-estates_data = supabase.table('estates').select('*').execute()
-df_estates = pd.DataFrame(estates_data.data)
+df_estates = read_table('estates')
 
 print(f"  Production records: {len(df_prod)}")
 print(f"  Blocks: {len(df_blocks)}")
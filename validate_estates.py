@@ -0,0 +1,278 @@
+"""
+ESTATE / YEAR VALIDATION ENGINE - Excel vs Supabase
+===================================================
+Purpose: Validate production_annual against the estates' Excel reports
+         (source/data_produksi_{ESTATE}_{YEAR}.xlsx) for every estate and
+         year in one pass.
+
+How it works:
+1. Every available Excel file is read once and stacked into one table
+   (estate, year, block_code, excel_actual, excel_target).
+2. production_annual / blocks / divisions / estates are loaded once
+   (local snapshot by default, see snapshot_store.py) and reduced to
+   (estate, year, block_code, db_actual, db_target).
+3. One outer merge on (estate, year, block_code) classifies every block:
+   match / value_diff / missing_in_db / extra_in_db.
+
+Output:
+- Console summary per estate/year (+ missing/extra blocks)
+- output/validation/discrepancies.csv (every non-matching block)
+- output/validation/summary.csv
+
+Usage:
+    python validate_estates.py                         # all estates, all years
+    python validate_estates.py --estate OLE --year 2024
+    python validate_estates.py --file AME:2023:source/AME_2023_validation.xlsx
+"""
+
+import argparse
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from excel_cache import read_excel_cached
+from snapshot_store import read_table
+
+ESTATES = ['AME', 'OLE', 'DBE']
+YEARS = [2023, 2024, 2025]
+
+SOURCE_PATTERN = 'source/data_produksi_{estate}_{year}.xlsx'
+# Older names the estates sent their files under
+ALTERNATE_FILES = {
+    ('AME', 2023): ['source/AME_2023_validation.xlsx', 'source/AME_2023.xlsx'],
+}
+
+# DB block codes renamed to keep estates apart; Excel uses the plain code
+DB_CODE_ALIASES = {'F005A_OLE': 'F005A'}
+
+TOLERANCE_TON = 0.01
+OUTPUT_DIR = 'output/validation'
+
+
+def find_source_files(estates=ESTATES, years=YEARS, overrides=None):
+    """{(estate, year): path} for every Excel report that exists"""
+    overrides = overrides or {}
+    files = {}
+    for estate in estates:
+        for year in years:
+            key = (estate, year)
+            candidates = [overrides[key]] if key in overrides else \
+                [SOURCE_PATTERN.format(estate=estate, year=year)] + ALTERNATE_FILES.get(key, [])
+            for path in candidates:
+                if os.path.exists(path):
+                    files[key] = path
+                    break
+    return files
+
+
+def _pick_column(columns, exact, keywords):
+    if exact in columns:
+        return exact
+    for col in columns:
+        if any(k in str(col).lower() for k in keywords):
+            return col
+    return None
+
+
+def read_excel_report(path):
+    """One estate/year report → block_code, excel_actual, excel_target"""
+    df = read_excel_cached(path)
+
+    # Some exports carry a second (units) header row
+    if len(df) and df.iloc[0].isna().any():
+        df = df.iloc[1:].reset_index(drop=True)
+
+    block_col = _pick_column(df.columns, 'BLOCK', ['block', 'blok'])
+    actual_col = _pick_column(df.columns, 'Realisasi', ['realisasi', 'real'])
+    target_col = _pick_column(df.columns, 'Potensi', ['potensi', 'target'])
+    if block_col is None or actual_col is None:
+        raise ValueError(f"{path}: cannot find block/realisasi columns in {list(df.columns)}")
+
+    report = pd.DataFrame({
+        'block_code': df[block_col],
+        'excel_actual': pd.to_numeric(df[actual_col], errors='coerce'),
+        'excel_target': pd.to_numeric(df[target_col], errors='coerce') if target_col is not None else np.nan,
+    })
+    report = report.dropna(subset=['block_code'])
+    report['block_code'] = report['block_code'].astype(str).str.strip()
+    return report
+
+
+def load_excel_sources(files):
+    """All reports stacked, summed per (estate, year, block_code)"""
+    frames = []
+    for (estate, year), path in sorted(files.items()):
+        try:
+            report = read_excel_report(path)
+        except Exception as e:
+            print(f"  ❌ {estate} {year}: {e}")
+            continue
+        report.insert(0, 'year', year)
+        report.insert(0, 'estate', estate)
+        frames.append(report)
+        print(f"  ✓ {estate} {year}: {len(report):4d} blocks from {path}")
+
+    if not frames:
+        return pd.DataFrame(columns=['estate', 'year', 'block_code', 'excel_actual', 'excel_target'])
+
+    excel = pd.concat(frames, ignore_index=True)
+    return excel.groupby(['estate', 'year', 'block_code'], as_index=False)[['excel_actual', 'excel_target']].sum(min_count=1)
+
+
+def load_database():
+    """production_annual resolved to (estate, year, block_code, db_actual, db_target)"""
+    df_prod = read_table('production_annual')
+    df_blocks = read_table('blocks')
+
+    cols = ['id', 'block_code'] + [c for c in ('division_id', 'estate_code') if c in df_blocks.columns]
+    df = df_prod.merge(df_blocks[cols].rename(columns={'id': 'block_pk', 'estate_code': 'block_estate_code'}),
+                       left_on='block_id', right_on='block_pk', how='left', suffixes=('_prod', ''))
+    if 'block_code_prod' in df.columns:
+        df['block_code'] = df['block_code'].fillna(df['block_code_prod'])
+
+    # Estate through blocks → divisions → estates when that hierarchy exists
+    estate = pd.Series(np.nan, index=df.index, dtype=object)
+    if 'division_id' in df.columns:
+        try:
+            df_divisions = read_table('divisions')
+            df_estates = read_table('estates')
+            division_estate = df_divisions[['id', 'estate_id']].merge(
+                df_estates[['id', 'estate_code']], left_on='estate_id', right_on='id', suffixes=('', '_e'))
+            estate = df['division_id'].map(division_estate.set_index('id')['estate_code'])
+        except Exception as e:
+            print(f"  ⚠️  divisions/estates not available ({str(e)[:60]}) - using blocks.estate_code")
+    if 'block_estate_code' in df.columns:
+        estate = estate.fillna(df['block_estate_code'])
+
+    db = pd.DataFrame({
+        'estate': estate,
+        'year': pd.to_numeric(df['year'], errors='coerce'),
+        'block_code': df['block_code'].replace(DB_CODE_ALIASES),
+        'db_actual': pd.to_numeric(df['real_ton'], errors='coerce'),
+        'db_target': pd.to_numeric(df['potensi_ton'], errors='coerce'),
+    }).dropna(subset=['estate', 'year', 'block_code'])
+    db['year'] = db['year'].astype(int)
+
+    return db.groupby(['estate', 'year', 'block_code'], as_index=False)[['db_actual', 'db_target']].sum(min_count=1)
+
+
+def compare(excel, db, tolerance=TOLERANCE_TON):
+    """Single outer merge → one row per (estate, year, block_code) with a status"""
+    # Only judge estate/years we actually have an Excel report for
+    covered = excel[['estate', 'year']].drop_duplicates()
+    db = db.merge(covered, on=['estate', 'year'], how='inner')
+
+    merged = excel.merge(db, on=['estate', 'year', 'block_code'], how='outer', indicator=True)
+    merged['diff_actual'] = merged['excel_actual'].fillna(0) - merged['db_actual'].fillna(0)
+    merged['diff_target'] = merged['excel_target'].fillna(0) - merged['db_target'].fillna(0)
+
+    merged['status'] = np.select(
+        [merged['_merge'] == 'left_only',
+         merged['_merge'] == 'right_only',
+         (merged['diff_actual'].abs() > tolerance) | (merged['diff_target'].abs() > tolerance)],
+        ['missing_in_db', 'extra_in_db', 'value_diff'],
+        default='match'
+    )
+    return merged.drop(columns='_merge').sort_values(['estate', 'year', 'block_code']).reset_index(drop=True)
+
+
+def summarize(result):
+    """Totals and status counts per estate/year"""
+    totals = result.groupby(['estate', 'year'])[['excel_actual', 'db_actual', 'excel_target', 'db_target']].sum()
+    counts = pd.crosstab([result['estate'], result['year']], result['status'])
+    for status in ('match', 'value_diff', 'missing_in_db', 'extra_in_db'):
+        if status not in counts.columns:
+            counts[status] = 0
+
+    summary = totals.join(counts[['match', 'value_diff', 'missing_in_db', 'extra_in_db']])
+    summary['diff_actual'] = summary['excel_actual'] - summary['db_actual']
+    summary['diff_target'] = summary['excel_target'] - summary['db_target']
+    return summary.reset_index()
+
+
+def print_report(result, summary, max_blocks=20):
+    print("\n" + "=" * 80)
+    print("SUMMARY PER ESTATE / YEAR")
+    print("=" * 80)
+    print(f"\n{'Estate':6s} {'Year':>4s} {'Excel Ton':>12s} {'DB Ton':>12s} {'Diff':>10s}  "
+          f"{'Match':>5s} {'Diff':>5s} {'Miss':>5s} {'Extra':>5s}")
+    for row in summary.itertuples(index=False):
+        flag = '✅' if row.value_diff == row.missing_in_db == row.extra_in_db == 0 else '⚠️'
+        print(f"{row.estate:6s} {row.year:4d} {row.excel_actual:12,.2f} {row.db_actual:12,.2f} "
+              f"{row.diff_actual:+10,.2f}  {row.match:5d} {row.value_diff:5d} {row.missing_in_db:5d} "
+              f"{row.extra_in_db:5d} {flag}")
+
+    issues = result[result['status'] != 'match']
+    for (estate, year), group in issues.groupby(['estate', 'year']):
+        print(f"\n{estate} {year}:")
+        for status, label, value_col in [('missing_in_db', 'Missing in Supabase', 'excel_actual'),
+                                         ('extra_in_db', 'Extra in Supabase', 'db_actual'),
+                                         ('value_diff', 'Value differences', 'diff_actual')]:
+            rows = group[group['status'] == status]
+            if len(rows) == 0:
+                continue
+            print(f"  ⚠️  {label} ({len(rows)} blocks, {rows[value_col].sum():+,.2f} Ton):")
+            for r in rows.head(max_blocks).itertuples(index=False):
+                print(f"    - {r.block_code}: {getattr(r, value_col):,.2f} Ton")
+            if len(rows) > max_blocks:
+                print(f"    ... and {len(rows) - max_blocks} more")
+
+
+def validate(estates=ESTATES, years=YEARS, overrides=None, output_dir=OUTPUT_DIR):
+    """Run the full validation; returns (result, summary) DataFrames"""
+    print("=" * 80)
+    print("VALIDATION ENGINE - EXCEL vs SUPABASE")
+    print("=" * 80)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    print("\n1. Loading Excel reports...")
+    files = find_source_files(estates, years, overrides)
+    if not files:
+        print(f"  ⏳ No Excel reports found ({SOURCE_PATTERN})")
+        return None, None
+    excel = load_excel_sources(files)
+
+    print("\n2. Loading Supabase production data (once)...")
+    db = load_database()
+    print(f"  ✓ {len(db):,} block-years")
+
+    print("\n3. Comparing...")
+    result = compare(excel, db)
+    summary = summarize(result)
+    print_report(result, summary)
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        result[result['status'] != 'match'].to_csv(os.path.join(output_dir, 'discrepancies.csv'), index=False)
+        summary.to_csv(os.path.join(output_dir, 'summary.csv'), index=False)
+        print(f"\n✅ Saved: {output_dir}/discrepancies.csv, {output_dir}/summary.csv")
+
+    return result, summary
+
+
+def main(argv=None):
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description='Validate production_annual against the estate Excel reports')
+    parser.add_argument('--estate', action='append', choices=ESTATES, help='Estate(s) to validate (default: all)')
+    parser.add_argument('--year', action='append', type=int, help='Year(s) to validate (default: all)')
+    parser.add_argument('--file', action='append', default=[], metavar='ESTATE:YEAR:PATH',
+                        help='Use a specific Excel file for one estate/year')
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+
+    overrides = {}
+    for spec in args.file:
+        estate, year, path = spec.split(':', 2)
+        overrides[(estate.upper(), int(year))] = path
+
+    estates = args.estate or sorted({e for e, _ in overrides} or ESTATES)
+    years = args.year or sorted({y for _, y in overrides} or YEARS)
+    validate(estates, years, overrides)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,18 +8,7 @@ Analyzing where the numbers come from:
 4. Risk Exposure: 1335 Blocks (↑ 69.7% of portfolio)
 """
 
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-# Initialize Supabase
-supabase = create_client(
-    os.getenv('SUPABASE_URL'),
-    os.getenv('SUPABASE_SERVICE_KEY')
-)
+from snapshot_store import read_table
 
 print("=" * 70)
 print("VERIFYING KEY PERFORMANCE INDICATORS")
@@ -27,38 +16,17 @@ print("=" * 70)
 
 # Load production data (ALL YEARS)
 print("\n1. Loading production_annual data...")
-all_data = []
-page_size = 1000
-page = 0
-
-while True:
-    start = page * page_size
-    end = start + page_size - 1
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    
-    if not response.data:
-        break
-        
-    all_data.extend(response.data)
-    
-    if len(response.data) < page_size:
-        break
-        
-    page += 1
-
-df_prod = pd.DataFrame(all_data)
+df_prod = read_table('production_annual')
 print(f"   Loaded {len(df_prod)} production records")
 
 # Load blocks
 print("\n2. Loading blocks data...")
-response = supabase.table('blocks').select('*').execute()
-df_blocks = pd.DataFrame(response.data)
+df_blocks = read_table('blocks')
 print(f"   Loaded {len(df_blocks)} blocks")
 
 # Load infrastructure
 print("\n3. Loading infrastructure data...")
-response = supabase.table('block_land_infrastructure').select('*').execute()
-df_infra = pd.DataFrame(response.data)
+df_infra = read_table('block_land_infrastructure')
 print(f"   Loaded {len(df_infra)} infrastructure records")
 
 # Merge data
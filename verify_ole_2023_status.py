@@ -3,40 +3,18 @@ VERIFY OLE 2023 STATUS
 Check if data exists in Supabase and matches expected totals.
 """
 
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("VERIFYING OLE 2023 DATA IN SUPABASE")
 print("="*60)
 
 # Load Data
-all_prod = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_prod.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df_prod = pd.DataFrame(all_prod)
+df_prod = read_table('production_annual')
 
 # Load Hierarchy
-blocks_data = supabase.table('blocks').select('*').execute()
-df_blocks = pd.DataFrame(blocks_data.data)
-divisions_data = supabase.table('divisions').select('*').execute()
-df_divisions = pd.DataFrame(divisions_data.data)
-estates_data = supabase.table('estates').select('*').execute()
-df_estates = pd.DataFrame(estates_data.data)
+df_blocks = read_table('blocks')
+df_divisions = read_table('divisions')
+df_estates = read_table('estates')
 
 # Join
 df = df_prod.merge(df_blocks[['id', 'block_code', 'division_id']], 
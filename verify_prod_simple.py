@@ -1,29 +1,10 @@
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("PRODUCTION VERIFICATION")
 print("="*60)
 
 # Load all production data
-all_data = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_data.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df = pd.DataFrame(all_data)
+df = read_table('production_annual')
 print(f"\nTotal records: {len(df)}")
 
 # Check each year
@@ -1,10 +1,4 @@
-import pandas as pd
-from supabase import create_client
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+from snapshot_store import read_table
 
 print("="*80)
 print("DETAILED PRODUCTION VERIFICATION - ALL YEARS")
@@ -12,20 +6,7 @@ print("="*80)
 
 # Load ALL production data
 print("\nLoading production_annual data...")
-all_data = []
-page = 0
-while True:
-    start = page * 1000
-    end = start + 999
-    response = supabase.table('production_annual').select('*').range(start, end).execute()
-    if not response.data:
-        break
-    all_data.extend(response.data)
-    if len(response.data) < 1000:
-        break
-    page += 1
-
-df = pd.DataFrame(all_data)
+df = read_table('production_annual')
 print(f"Total records loaded: {len(df)}")
 print(f"Years in data: {sorted(df['year'].unique())}")
 
@@ -120,7 +101,7 @@ print("BREAKDOWN BY ESTATE (2023)")
 print("="*80)
 
 # Load blocks to get estate info
-df_blocks = pd.DataFrame(supabase.table('blocks').select('*').execute().data)
+df_blocks = read_table('blocks')
 df_full = df.merge(df_blocks[['id', 'block_code']], left_on='block_id', right_on='id', how='left')
 
 df_2023 = df_full[df_full['year'] == 2023]